@@ -0,0 +1,240 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+asyncio counterpart of :class:`~openstack.proxy2.BaseProxy`.
+
+The requests are built by the same :class:`~openstack.resource2.Resource`
+helpers as the synchronous proxies and sent through an
+:class:`~openstack.aio_session.AsyncSession`. Lists are async generators.
+
+This module requires Python 3.6 or later and the optional ``aiohttp``
+dependency.
+"""
+
+import asyncio
+
+from openstack import exceptions
+from openstack import proxy2
+from openstack import waiter
+
+
+def _not_found(resource_type, value, e):
+    # Reraise with a more specific type and message
+    return exceptions.ResourceNotFound(
+        message="No %s found for %s" % (resource_type.__name__, value),
+        details=e.details, response=e.response,
+        request_id=e.request_id, url=e.url, method=e.method,
+        http_status=e.http_status, cause=e.cause, code=e.code)
+
+
+class AsyncProxy(object):
+    """Base of the asyncio proxies
+
+    Like :class:`~openstack.proxy2.BaseProxy`, service specific subclasses
+    expose public methods on top of the protected ones defined here.
+    """
+
+    def __init__(self, session):
+        """
+        :param session: The :class:`~openstack.aio_session.AsyncSession`
+                        sending the requests.
+        """
+        self._session = session
+
+    # These only build resources and send nothing.
+    _get_resource = proxy2.BaseProxy._get_resource
+    _get_uri_attribute = proxy2.BaseProxy._get_uri_attribute
+
+    async def _request(self, res, method, uri, **kwargs):
+        plan = type(res)._get_request_plan(self._session)
+        return await self._session.request(
+            uri, method, endpoint_filter=res.service,
+            endpoint_override=plan.endpoint_override,
+            microversion=plan.microversion, **kwargs)
+
+    async def _get(self, resource_type, value=None, requires_id=True,
+                   **attrs):
+        """Get a resource
+
+        See :meth:`openstack.proxy2.BaseProxy._get`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        if not res.allow_get:
+            raise exceptions.MethodNotSupported(res, "get")
+        request = res._prepare_request(requires_id=requires_id)
+        try:
+            response = await self._request(res, "GET", request.uri)
+        except exceptions.NotFoundException as e:
+            raise _not_found(resource_type, value, e)
+        res._translate_response(response)
+        return res
+
+    async def _head(self, resource_type, value=None, **attrs):
+        """Retrieve a resource's header
+
+        See :meth:`openstack.proxy2.BaseProxy._head`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        if not res.allow_head:
+            raise exceptions.MethodNotSupported(res, "head")
+        request = res._prepare_request()
+        response = await self._request(res, "HEAD", request.uri,
+                                       headers={"Accept": ""})
+        res._translate_response(response, has_body=False)
+        return res
+
+    async def _create(self, resource_type, prepend_key=True, **attrs):
+        """Create a resource from attributes
+
+        See :meth:`openstack.proxy2.BaseProxy._create`.
+        """
+        res = resource_type.new(**attrs)
+        if not res.allow_create:
+            raise exceptions.MethodNotSupported(res, "create")
+        request = res._prepare_request(requires_id=res.put_create,
+                                       prepend_key=prepend_key)
+        method = "PUT" if res.put_create else "POST"
+        response = await self._request(res, method, request.uri,
+                                       json=request.body,
+                                       headers=request.headers)
+        res._translate_response(response)
+        return res
+
+    async def _update(self, resource_type, value, prepend_key=True,
+                      has_body=True, **attrs):
+        """Update a resource
+
+        See :meth:`openstack.proxy2.BaseProxy._update`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        # The id cannot be dirty for an update
+        res._body._dirty.discard("id")
+        res._body._dirty.discard(res._body_mapping()["id"])
+        if not any([res._body.dirty, res._header.dirty]):
+            return res
+        if not res.allow_update:
+            raise exceptions.MethodNotSupported(res, "update")
+        request = res._prepare_request(prepend_key=prepend_key)
+        method = "PATCH" if res.patch_update else "PUT"
+        response = await self._request(res, method, request.uri,
+                                       json=request.body,
+                                       headers=request.headers)
+        res._translate_response(response, has_body=has_body)
+        return res
+
+    async def _delete(self, resource_type, value, ignore_missing=True,
+                      has_body=False, params=None, **attrs):
+        """Delete a resource
+
+        See :meth:`openstack.proxy2.BaseProxy._delete`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        if not res.allow_delete:
+            raise exceptions.MethodNotSupported(res, "delete")
+        request = res._prepare_request()
+        try:
+            response = await self._request(res, "DELETE", request.uri,
+                                           headers={"Accept": ""},
+                                           params=params)
+        except exceptions.NotFoundException as e:
+            if ignore_missing:
+                return None
+            raise _not_found(resource_type, value, e)
+        res._translate_response(response, has_body=has_body)
+        return res
+
+    async def _list(self, resource_type, value=None, paginated=False,
+                    lightweight=False, **attrs):
+        """List a resource
+
+        This is an async generator following the marker pagination of
+        :meth:`openstack.resource2.Resource.list`. Resources overriding
+        ``list`` with a different pagination scheme are not supported.
+
+        See :meth:`openstack.proxy2.BaseProxy._list`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        if not res.allow_list:
+            raise exceptions.MethodNotSupported(res, "list")
+        cls = type(res)
+        query_params = cls._query_mapping._transpose(attrs)
+        uri = cls.get_list_uri(attrs)
+        while query_params is not None:
+            response = await self._request(
+                res, "GET", uri, headers={"Accept": "application/json"},
+                params=query_params)
+            response_json = response.json()
+            if cls.resources_key:
+                resources = cls.find_value_by_accessor(response_json,
+                                                       cls.resources_key)
+            else:
+                resources = response_json
+
+            yielded = 0
+            new_marker = None
+            for data in resources:
+                value = cls._existing_from_page(data, lightweight)
+                new_marker = value.id
+                yielded += 1
+                yield value
+
+            query_params = cls._get_next_query(response_json, resources,
+                                               yielded, new_marker,
+                                               query_params, paginated)
+
+    async def wait_for_status(self, value, status, failures=None,
+                              interval=2, wait=120, backoff=None):
+        """Wait for a resource to be in a particular status.
+
+        See :func:`openstack.resource2.wait_for_status`.
+        """
+        if value.status == status:
+            return value
+        failures = failures or []
+        delays = (backoff or waiter.Backoff.fixed(interval)).delays()
+        total_sleep = 0
+        while total_sleep < wait:
+            await self._get(type(value), value)
+            if value.status == status:
+                return value
+            if value.status in failures:
+                raise exceptions.ResourceFailure(
+                    "Resource %s transitioned to failure state %s" %
+                    (value.id, value.status))
+            delay = next(delays)
+            await asyncio.sleep(delay)
+            total_sleep += delay
+        raise exceptions.ResourceTimeout(
+            "Timeout waiting for %s to transition to %s" % (value.id, status))
+
+    async def wait_for_delete(self, value, interval=2, wait=120,
+                              backoff=None):
+        """Wait for the resource to be deleted.
+
+        See :func:`openstack.resource2.wait_for_delete`.
+        """
+        delays = (backoff or waiter.Backoff.fixed(interval)).delays()
+        total_sleep = 0
+        while total_sleep < wait:
+            try:
+                await self._get(type(value), value)
+            except exceptions.NotFoundException:
+                return value
+            delay = next(delays)
+            await asyncio.sleep(delay)
+            total_sleep += delay
+        raise exceptions.ResourceTimeout(
+            "Timeout waiting for %s delete" % value.id)
+
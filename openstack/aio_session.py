@@ -0,0 +1,254 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+asyncio variant of the SDK sessions, built on ``aiohttp``.
+
+An :class:`AsyncSession` wraps a configured
+:class:`~openstack.aksksession.ASKSession` or
+:class:`~openstack.tokenid_session.TokenSession`. It reuses the way that
+session builds, signs or authenticates its requests, and sends them from the
+running event loop, so that thousands of calls can be in flight without a
+thread each::
+
+    from openstack import aio_proxy
+    from openstack import aio_session
+    from openstack.compute.v2 import server
+
+    async def main(conn):
+        async with aio_session.AsyncSession(conn.session) as sess:
+            proxy = aio_proxy.AsyncProxy(sess)
+            async for value in proxy._list(server.Server, paginated=True):
+                print(value.name)
+
+This module requires Python 3.5 or later and the optional ``aiohttp``
+dependency.
+"""
+
+import asyncio
+import functools
+import io
+import json
+import ssl
+
+from keystoneauth1 import exceptions as _exceptions
+from requests import structures
+from six.moves.urllib import parse
+
+from openstack import exceptions
+from openstack import instrumentation
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:
+    aiohttp = None
+
+#: Default maximum number of connections open at the same time.
+DEFAULT_CONNECTION_LIMIT = 100
+
+
+class AsyncResponse(object):
+    """Response of an :class:`AsyncSession` request, already fully read
+
+    It exposes the subset of :class:`requests.Response` used by the
+    resources and the exception mapping.
+    """
+
+    def __init__(self, method, url, status_code, reason, headers, content,
+                 encoding=None):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = structures.CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, "replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncSession(object):
+    """Send the requests of a synchronous session from an event loop"""
+
+    def __init__(self, session, limit=DEFAULT_CONNECTION_LIMIT,
+                 limit_per_host=0):
+        """
+        :param session: The configured session which resolves endpoints
+                        and builds the requests, such as an
+                        :class:`~openstack.aksksession.ASKSession` or a
+                        :class:`~openstack.tokenid_session.TokenSession`.
+        :param int limit: Maximum number of connections open at the same
+                          time, 0 for no limit.
+        :param int limit_per_host: Maximum number of connections open to the
+                                   same host, 0 for no limit.
+        """
+        if aiohttp is None:
+            raise exceptions.SDKException(
+                "aiohttp is required to use the asyncio session")
+        self.session = session
+        self.profile = session.profile
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._client = None
+        self._endpoints = {}
+        self._endpoint_locks = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Close the connections of this session"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _get_client(self):
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host,
+                ssl=self._get_ssl())
+            self._client = aiohttp.ClientSession(connector=connector)
+        return self._client
+
+    def _get_ssl(self):
+        verify = getattr(self.session, "verify", True)
+        cert = getattr(self.session, "cert", None)
+        if verify is False:
+            return False
+        if verify is True and not cert:
+            return None
+        context = ssl.create_default_context(
+            cafile=verify if isinstance(verify, str) else None)
+        if cert:
+            if isinstance(cert, (tuple, list)):
+                context.load_cert_chain(*cert)
+            else:
+                context.load_cert_chain(cert)
+        return context
+
+    async def get_endpoint(self, service_type, interface=None):
+        """Return the endpoint of a service
+
+        The endpoint is resolved once per service by the wrapped session,
+        in the default executor since the discovery is blocking, then kept
+        for the lifetime of this session. Concurrent callers wait for the
+        first resolution.
+        """
+        key = (service_type, interface)
+        endpoint = self._endpoints.get(key)
+        if endpoint:
+            return endpoint
+        lock = self._endpoint_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            endpoint = self._endpoints.get(key)
+            if not endpoint:
+                loop = asyncio.get_event_loop()
+                endpoint = await loop.run_in_executor(None, functools.partial(
+                    self.session.get_endpoint, interface=interface,
+                    service_type=service_type))
+                if endpoint:
+                    self._endpoints[key] = endpoint
+            return endpoint
+
+    async def request(self, url, method, endpoint_filter=None,
+                      endpoint_override=None, raise_exc=True, **kwargs):
+        """Send a request
+
+        Takes the arguments of the ``request`` method of the wrapped
+        session, such as ``json``, ``headers``, ``params`` or
+        ``microversion``.
+
+        :return: An :class:`AsyncResponse`.
+        :raises: :class:`~openstack.exceptions.HttpException` when
+                 ``raise_exc`` is set and the response is an error.
+        """
+        if (not parse.urlparse(url).netloc and not endpoint_override and
+                endpoint_filter):
+            base_url = await self.get_endpoint(endpoint_filter.service_type,
+                                               endpoint_filter.interface)
+            if not parse.urlparse(base_url).netloc:
+                raise exceptions.EndpointNotFound()
+            url = "%s/%s" % (base_url.rstrip("/"), url.lstrip("/"))
+
+        hooks = getattr(self.session, "hooks", None)
+        trace = hooks.start(endpoint_filter and endpoint_filter.service_type,
+                            method, url) if hooks else None
+        url, kwargs = self.session._build_request(
+            url, method, endpoint_filter=endpoint_filter,
+            endpoint_override=endpoint_override, trace=trace, **kwargs)
+        params = kwargs.get("params")
+        if params:
+            query = parse.urlencode([(k, v) for k, v in params.items()
+                                     if v is not None], doseq=True)
+            url = "%s%s%s" % (url, "&" if "?" in url else "?", query)
+        data = kwargs.get("data")
+        if hasattr(data, "read") and not isinstance(data, io.IOBase):
+            data = data.read()
+        timeout = kwargs.get("timeout")
+        if timeout is not None:
+            timeout = aiohttp.ClientTimeout(total=timeout)
+
+        if trace is not None:
+            trace.fire(instrumentation.SENT)
+            started = trace.start()
+        try:
+            async with self._get_client().request(
+                    method, yarl.URL(url, encoded=True),
+                    headers=kwargs["headers"], data=data,
+                    timeout=timeout) as resp:
+                if trace is not None:
+                    trace.record("first_byte", started)
+                content = await resp.read()
+        except aiohttp.ClientError as e:
+            raise exceptions.SDKException(message=str(e), cause=e)
+
+        response = AsyncResponse(method, url, resp.status, resp.reason,
+                                 resp.headers, content,
+                                 encoding=resp.charset)
+        if trace is not None:
+            trace.record("send", started)
+            trace.attach(response)
+            trace.bytes_in = len(content)
+            trace.fire(instrumentation.FIRST_BYTE)
+        if raise_exc and response.status_code >= 400:
+            raise exceptions.from_exception(
+                _exceptions.from_response(response, method, url))
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request(url, "GET", **kwargs)
+
+    async def head(self, url, **kwargs):
+        return await self.request(url, "HEAD", **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request(url, "POST", **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request(url, "PUT", **kwargs)
+
+    async def patch(self, url, **kwargs):
+        return await self.request(url, "PATCH", **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request(url, "DELETE", **kwargs)
@@ -14,6 +14,7 @@
 # CONDITIONS OF ANY KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations under the License.
 
+import collections
 import functools
 import hashlib
 import hmac
@@ -21,11 +22,17 @@ from six.moves import urllib
 import sys
 import itertools
 import datetime
+import tempfile
+import threading
 import requests
-from keystoneauth1.session import TCPKeepAliveAdapter, _JSONEncoder, _determine_user_agent
+import six
+from keystoneauth1.session import TCPKeepAliveAdapter, _determine_user_agent
 from openstack.exceptions import EndpointNotFound, SDKException
 from openstack.session import DEFAULT_USER_AGENT
 from openstack import session as osession
+from openstack import endpoint_cache as _endpoint_cache
+from openstack import instrumentation
+from openstack import jsonutils
 from keystoneauth1 import _utils as log_utils
 from openstack import utils
 from openstack.session import map_exceptions
@@ -41,16 +48,26 @@ PYTHON2 = "2"
 UTF8 = "utf-8"
 PROJECTIAMURL = "https://iam.%s.%s/v3/"
 GLOBALIAMURL = "https://iam.%s/v3/"
+SIGNING_KEY_CACHE_SIZE = 64
+PAYLOAD_CHUNK_SIZE = 64 * 1024
+PAYLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+CONTENTSHA256HEADER = "X-Sdk-Content-Sha256"
 
 _logger = log_utils.get_logger(__name__)
 
 
-def construct_session(session_obj=None):
+def construct_session(session_obj=None, transport=None):
     """
     # NOTE(morganfainberg): if the logic in this function changes be sure to
     # update the betamax fixture's '_construct_session_with_betamax" function
     # as well.
+
+    When a :class:`~openstack.transport.Transport` is given, the new session
+    uses its shared connection pools.
     """
+    if not session_obj and transport is not None:
+        session_obj = transport.new_session()
     if not session_obj:
         session_obj = requests.Session()
         # Use TCPKeepAliveAdapter to fix bug 1323862
@@ -59,6 +76,10 @@ def construct_session(session_obj=None):
     return session_obj
 
 
+def _get_netloc(url):
+    return urllib.parse.urlparse(url).netloc if url else ""
+
+
 def get_utf8_bytes(message):
     """
     Get the bytes array encoded by utf-8
@@ -79,6 +100,189 @@ def get_utf8_bytes(message):
             return message.decode(codename).encode(UTF8)
 
 
+def is_stream(body):
+    """
+    Whether the body is a file-like object or an iterable of chunks
+    that must not be loaded in memory at once
+    """
+    if body is None or isinstance(body, (six.string_types, six.binary_type,
+                                         bytearray, memoryview, dict,
+                                         list, tuple)):
+        return False
+    return hasattr(body, "read") or hasattr(body, "__iter__")
+
+
+def _read_chunks(body, chunk_size):
+    while True:
+        chunk = body.read(chunk_size)
+        if not chunk:
+            break
+        yield get_utf8_bytes(chunk) if isinstance(chunk, six.text_type) else chunk
+
+
+def _seekable(body):
+    try:
+        return body.seekable()
+    except AttributeError:
+        try:
+            body.seek(body.tell())
+            return True
+        except (AttributeError, IOError, OSError, ValueError):
+            return False
+
+
+class _MemoryviewReader(object):
+    """
+    File-like wrapper that lets a memoryview body be sent in chunks
+    without copying it into a bytes object first
+    """
+
+    def __init__(self, view):
+        self._view = memoryview(view).cast("B") if six.PY3 else memoryview(view)
+        self._pos = 0
+
+    def __len__(self):
+        return len(self._view) - self._pos
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        chunk = self._view[self._pos:end]
+        self._pos += len(chunk)
+        return chunk
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += len(self._view)
+        self._pos = offset
+        return self._pos
+
+
+def prepare_payload(body, chunk_size=PAYLOAD_CHUNK_SIZE):
+    """
+    Make a request body both hashable and sendable without buffering it twice.
+
+    File-like bodies which can seek are returned as is, memoryviews are wrapped
+    in a chunked reader, and generators or non seekable streams are spooled
+    once to a temporary file so that they can be hashed and then sent.
+    :param body: the http request body
+    :param chunk_size: the size of the chunks read from the body
+    :return: the body to be sent
+    """
+    if isinstance(body, memoryview):
+        return _MemoryviewReader(body)
+    if not is_stream(body):
+        return body
+    if hasattr(body, "read"):
+        if _seekable(body):
+            return body
+        chunks = _read_chunks(body, chunk_size)
+    else:
+        chunks = body
+    spool = tempfile.SpooledTemporaryFile(max_size=PAYLOAD_SPOOL_SIZE)
+    for chunk in chunks:
+        spool.write(get_utf8_bytes(chunk) if isinstance(chunk, six.text_type) else chunk)
+    spool.seek(0)
+    return spool
+
+
+def hash_payload(body, chunk_size=PAYLOAD_CHUNK_SIZE):
+    """
+    Compute the hex SHA-256 digest of a request body.
+
+    File-like bodies are read incrementally in chunks of chunk_size and
+    rewound to their original position afterwards, so that the same stream
+    can be sent.
+    :param body: the http request body
+    :param chunk_size: the size of the chunks read from the body
+    :return: the hex digest of the body
+    """
+    sha256 = hashlib.sha256()
+    if not body:
+        pass
+    elif isinstance(body, (bytearray, memoryview)):
+        sha256.update(body)
+    elif isinstance(body, _MemoryviewReader):
+        sha256.update(body._view[body.tell():])
+    elif hasattr(body, "read"):
+        position = body.tell()
+        for chunk in _read_chunks(body, chunk_size):
+            sha256.update(chunk)
+        body.seek(position)
+    elif six.PY3 and isinstance(body, six.binary_type):
+        sha256.update(body)
+    else:
+        sha256.update(get_utf8_bytes(body))
+    return sha256.hexdigest()
+
+
+class _SigningKeyCache(object):
+    """
+    Bounded cache of derived signing keys.
+
+    A signing key only depends on the UTC date, the region and the service,
+    so it is kept per (date, region, service) and evicted in least recently
+    used order once ``maxsize`` keys are held. Keys derived for an older date
+    are dropped as soon as a newer date is seen.
+    """
+
+    def __init__(self, maxsize=SIGNING_KEY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._date = None
+        self._keys = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._keys.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # refresh the LRU position of the key
+            del self._keys[key]
+            self._keys[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            date = key[0]
+            if self._date is None or date > self._date:
+                # day rollover, keys of the previous days are stale
+                self._date = date
+                for stale in [k for k in self._keys if k[0] < date]:
+                    del self._keys[stale]
+            self._keys.pop(key, None)
+            self._keys[key] = value
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self._date = None
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        :return: a dict with the size of the cache, hit and miss counters and
+                 the hit rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {"size": len(self._keys),
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "hit_rate": float(self.hits) / total if total else 0.0}
+
+
 class AkSksignature(object):
     """
     aksk signature class
@@ -105,6 +309,7 @@ class AkSksignature(object):
         self.sk = secretkey
         self.region = region
         self.headtosign = ['Host', 'X-Sdk-Date']
+        self.signing_key_cache = _SigningKeyCache()
 
     def _make_canonical_request(self, method=None, url=None, headers=None, params=None, body=EMPTYSTRING):
         """
@@ -117,8 +322,10 @@ class AkSksignature(object):
         :type headers : python dict
         :param params : the http request query parametrers
         :type params : python dict
-        :param body : the http request body
-        :type body : python dict
+        :param body : the http request body, it can be a string, bytes,
+                      a memoryview or a file-like object which is hashed
+                      in chunks
+        :type body : string
         :return: A string of canonical request
 
         """
@@ -154,8 +361,10 @@ class AkSksignature(object):
         canonical_header = '\n'.join(canonical_header)
         canonical_header += '\n'
         signed_header = ';'.join([k.lower() for k in self.headtosign])
-        body = body if body  else ""
-        request_payload = hashlib.sha256(get_utf8_bytes(body)).hexdigest()
+        if headers.get(CONTENTSHA256HEADER) == UNSIGNED_PAYLOAD:
+            request_payload = UNSIGNED_PAYLOAD
+        else:
+            request_payload = hash_payload(body)
         return '\n'.join(
             [canonical_method, canonical_uri, canonical_querystring, canonical_header, signed_header, request_payload])
 
@@ -190,6 +399,22 @@ class AkSksignature(object):
         :type svr :string
         :return: A string to be used as the key when encry the request string
         """
+        cache_key = (dtstamp[0:8], self.region, svr)
+        signing_key = self.signing_key_cache.get(cache_key)
+        if signing_key is None:
+            signing_key = self._derive_signing_key(dtstamp, svr)
+            self.signing_key_cache.set(cache_key, signing_key)
+        return signing_key
+
+    def _derive_signing_key(self, dtstamp, svr):
+        """
+        Run the HMAC chain date -> region -> service -> terminator
+        :param dtstamp: datetime stamp of UTC
+        :type dtstamp : string
+        :param svr: the name of service defined in  sdk
+        :type svr :string
+        :return: the derived signing key
+        """
         ksecret = "SDK" + self.sk
         kdate = hmac.new(get_utf8_bytes(ksecret),
                          get_utf8_bytes(dtstamp[0:8]),
@@ -253,6 +478,12 @@ class ASKSession(osession.Session):
                  redirect=30, additional_headers=None,
                  app_name=None, app_version=None,
                  additional_user_agent=None,
+                 unsigned_payload=False,
+                 endpoint_cache=None,
+                 transport=None,
+                 retry_policy=None,
+                 hooks=None,
+                 json_codec=None,
                  **kwargs
                  ):
         self.auth_url = kwargs.get('auth_url', None)
@@ -268,7 +499,7 @@ class ASKSession(osession.Session):
         else:
             self.user_agent = DEFAULT_USER_AGENT
         self.profile = profile
-        self.session = construct_session(None)
+        self.session = construct_session(None, transport)
         self.original_ip = original_ip
         self.verify = verify
         self.cert = cert
@@ -279,37 +510,64 @@ class ASKSession(osession.Session):
         self.app_version = app_version
         self.additional_user_agent = additional_user_agent or []
         self._determined_user_agent = None
-        self._json = _JSONEncoder()
+        self.json_codec = jsonutils.get_codec(json_codec)
+        self._json = self.json_codec
         self._securitytoken = kwargs.get("securitytoken", None)
+        self.unsigned_payload = unsigned_payload
+        self.retry_policy = retry_policy
+        self.hooks = hooks if hooks is not None else instrumentation.Hooks()
         if timeout is not None:
             self.timeout = float(timeout)
         self.__endpoint = _endpoint
-        self.__iam_endpoint = None
-        self.__endpoint_cache = {}
-
-    @map_exceptions
-    def request(self, url, method, json=None, original_ip=None,
-                user_agent=None, redirect=None, endpoint_filter=None,
-                raise_exc=True, log=True, microversion=None,
-                endpoint_override=None, connect_retries=0,
-                allow=None, client_name=None, client_version=None,
-                **kwargs):
+        # share the endpoint catalog with the sessions of the same cloud,
+        # region and project which use the same cache
+        self.endpoint_cache = endpoint_cache if endpoint_cache is not None else _endpoint_cache.MemoryEndpointCache()
+        self._endpoint_cache_key = "|".join([self.auth_url or "", self.domain or "", self.region or "",
+                                             self.project_id or "", self.domain_id or ""])
+
+    def _build_request(self, url, method, json=None, user_agent=None,
+                       endpoint_filter=None, microversion=None,
+                       endpoint_override=None, client_name=None,
+                       client_version=None, trace=None, **kwargs):
+        """
+        Resolve the url of a request and build its signed headers and body
+        :param trace: the :class:`~openstack.instrumentation.RequestTrace`
+                      recording the endpoint and signing durations
+        :return: a tuple of the absolute url and the keyword arguments of the
+                 transport, holding the headers and the encoded data
+        """
+        if trace is not None:
+            started = trace.start()
         headers = kwargs.setdefault('headers', dict())
 
         if microversion:
             self._set_microversion_headers(headers, microversion, None, endpoint_filter)
         if self._securitytoken:
             headers.setdefault("X-Security-Token", self._securitytoken)
-        if not urllib.parse.urlparse(url).netloc:
+        # parse each url once, the host header is the netloc of the final url
+        netloc = urllib.parse.urlparse(url).netloc
+        if not netloc:
+            base_url = ""
             if endpoint_override:
                 base_url = endpoint_override % {"project_id": self.project_id}
             elif endpoint_filter:
                 base_url = self.get_endpoint(interface=endpoint_filter.interface,
                                              service_type=endpoint_filter.service_type)
-            if not urllib.parse.urlparse(base_url).netloc:
+                if not _get_netloc(base_url):
+                    # the cached catalog may be stale, fetch it again once
+                    self.invalidate_endpoint_cache(endpoint_filter.service_type)
+                    base_url = self.get_endpoint(interface=endpoint_filter.interface,
+                                                 service_type=endpoint_filter.service_type)
+            netloc = _get_netloc(base_url)
+            if not netloc:
                 raise exceptions.EndpointNotFound()
             url = '%s/%s' % (base_url.rstrip('/'), url.lstrip('/'))
-        headers.setdefault("Host", urllib.parse.urlparse(url).netloc)
+        if trace is not None:
+            trace.url = url
+            trace.record("endpoint", started)
+            trace.fire(instrumentation.ENDPOINT_RESOLVED)
+            started = trace.start()
+        headers.setdefault("Host", netloc)
         if self.cert:
             kwargs.setdefault('cert', self.cert)
         if self.timeout is not None:
@@ -359,6 +617,10 @@ class ASKSession(osession.Session):
 
         if json is not None:
             kwargs['data'] = self._json.encode(json)
+        elif kwargs.get('data') is not None:
+            kwargs['data'] = prepare_payload(kwargs['data'])
+        if self.unsigned_payload:
+            headers.setdefault(CONTENTSHA256HEADER, UNSIGNED_PAYLOAD)
         # surpport  maas,map_reduce when without request body
         headers.setdefault('Content-Type', 'application/json')
         if self.domain_id:
@@ -376,10 +638,6 @@ class ASKSession(osession.Session):
         # if requests_auth:
         #     kwargs['auth'] = requests_auth
 
-        # Query parameters that are included in the url string will
-        # be logged properly, but those sent in the `params` parameter
-        # (which the requests library handles) need to be explicitly
-        # picked out so they can be included in the URL that gets loggged.
         query_params = kwargs.get('params', dict())
         headers.setdefault("X-Sdk-Date", datetime.datetime.strftime(datetime.datetime.utcnow(), "%Y%m%dT%H%M%SZ"))
         signedstring = self.signer.signature(method=method,
@@ -388,8 +646,37 @@ class ASKSession(osession.Session):
                                              svr=endpoint_filter.service_type if endpoint_filter else '',
                                              params=query_params,
                                              data=kwargs.get("data", None))
-        # print(signedstring)
         headers.setdefault("Authorization", signedstring)
+        if trace is not None:
+            trace.bytes_out = instrumentation.payload_size(kwargs.get("data"))
+            trace.record("sign", started)
+            trace.fire(instrumentation.SIGNED)
+        return url, kwargs
+
+    @map_exceptions
+    def request(self, url, method, json=None, original_ip=None,
+                user_agent=None, redirect=None, endpoint_filter=None,
+                raise_exc=True, log=True, microversion=None,
+                endpoint_override=None, connect_retries=0,
+                allow=None, client_name=None, client_version=None,
+                **kwargs):
+        trace = self.hooks.start(endpoint_filter and endpoint_filter.get('service_type'),
+                                 method, url) if self.hooks else None
+        url, kwargs = self._build_request(url, method, json=json,
+                                          user_agent=user_agent,
+                                          endpoint_filter=endpoint_filter,
+                                          microversion=microversion,
+                                          endpoint_override=endpoint_override,
+                                          client_name=client_name,
+                                          client_version=client_version,
+                                          trace=trace,
+                                          **kwargs)
+        headers = kwargs['headers']
+        # Query parameters that are included in the url string will
+        # be logged properly, but those sent in the `params` parameter
+        # (which the requests library handles) need to be explicitly
+        # picked out so they can be included in the URL that gets loggged.
+        query_params = kwargs.get('params', dict())
         if log:
             self._http_log_request(url, method=method,
                                    data=kwargs.get('data'),
@@ -407,7 +694,22 @@ class ASKSession(osession.Session):
                                  url, method, redirect, log, _logger,
                                  connect_retries)
 
-        resp = send(**kwargs)
+        if trace is not None:
+            trace.fire(instrumentation.SENT)
+            started = trace.start()
+        if self.retry_policy is None:
+            resp = send(**kwargs)
+        else:
+            resp = self.retry_policy.send(
+                method, functools.partial(send, **kwargs),
+                service_type=endpoint_filter and endpoint_filter.get('service_type'),
+                body=kwargs.get('data'))
+        if trace is not None:
+            trace.record("send", started)
+            trace.durations["first_byte"] = resp.elapsed.total_seconds()
+            trace.attach(resp)
+            trace.fire(instrumentation.FIRST_BYTE)
+        self.json_codec.bind(resp)
 
         # log callee and caller request-id for each api call
         if log:
@@ -452,25 +754,32 @@ class ASKSession(osession.Session):
         return ""
 
     def _get_endpoint_from_iamdata(self, service_type):
+        return self.endpoint_cache.get_or_create(self._get_endpoint_key(service_type),
+                                                 functools.partial(self._resolve_endpoint, service_type))
+
+    def _get_endpoint_key(self, service_type):
+        version = self.profile.get_filter(service_type).version
+        return "%s|%s|%s" % (self._endpoint_cache_key, service_type.replace('-', '_'), version)
+
+    def _get_iam_catalog(self):
+        if self.region:
+            fetch = self.__fetch_all_endpoint_service_project_level
+        else:
+            fetch = self.__fetch_all_endpoint_service_global_level
+        return self.endpoint_cache.get_or_create(self._endpoint_cache_key + "|catalog", fetch)
+
+    def _resolve_endpoint(self, service_type):
         service_type_iam = service_type.replace('-', '_')
-        if self.__endpoint_cache.get(service_type_iam, ""):
-            return self.__endpoint_cache.get(service_type_iam)
-        if not self.__iam_endpoint:
-            if self.region:
-                self.__iam_endpoint = self.__fetch_all_endpoint_service_project_level()
-            else:
-                self.__iam_endpoint = self.__fetch_all_endpoint_service_global_level()
+        iam_endpoint = self._get_iam_catalog() or {}
         filt = self.profile.get_filter(service_type)
-        sc_endpoint = self.__iam_endpoint.get(service_type_iam, "")
+        sc_endpoint = iam_endpoint.get(service_type_iam, "")
         if not sc_endpoint:
             return sc_endpoint
 
         if service_type == "object-store":
-            self.__endpoint_cache[service_type_iam] = sc_endpoint
             return sc_endpoint
 
         if service_type == "iam":
-            self.__endpoint_cache[service_type_iam] = sc_endpoint
             return sc_endpoint
         try:
             endpoint = self._get_endpoint_versions(service_type,
@@ -482,12 +791,25 @@ class ASKSession(osession.Session):
             _logger.debug("Using %s as %s %s endpoint",
                           match, "public", service_type)
 
-            self.__endpoint_cache[service_type_iam] = match
             return match
         except (EndpointNotFound, SDKException):
-            self.__endpoint_cache[service_type_iam] = sc_endpoint
             return sc_endpoint
 
+    def invalidate_endpoint_cache(self, service_type=None):
+        """
+        Drop the cached catalog and the resolved endpoint of a service
+        :param service_type: the service type whose endpoint is dropped,
+                             all the services of the profile when None
+        :type service_type: string
+        """
+        self.endpoint_cache.delete(self._endpoint_cache_key + "|catalog")
+        if service_type:
+            service_types = [service_type]
+        else:
+            service_types = list(self.profile.service_keys)
+        for service_type in service_types:
+            self.endpoint_cache.delete(self._get_endpoint_key(service_type))
+
     def _get_endpoint_from_configdata(self, service_type, interface):
         service_type = service_type.upper().replace('-', '_')
         base_url = ""
@@ -15,6 +15,7 @@
 from openstack.cdn.exceptions import CDNException
 from openstack import exceptions
 from openstack import resource2 as resource
+from openstack import utils
 
 
 class QueryParameters(resource.QueryParameters):
@@ -78,7 +79,7 @@ class Resource(resource.Resource):
                                      page_number=query_page_number_key)
 
     @classmethod
-    def list(cls, session, paginated=False, **params):
+    def list(cls, session, paginated=False, concurrency=1, **params):
         """This method is a generator which yields resource objects.
 
         This resource object list generator handles pagination and takes query
@@ -92,6 +93,10 @@ class Resource(resource.Resource):
                                **When paginated is False only one
                                page of data will be returned regardless
                                of the API's support of pagination.**
+        :param int concurrency: The number of pages fetched at the same time
+                                once the first page tells the total number
+                                of resources. Pages are still yielded in
+                                order.
         :param dict params: These keyword arguments are passed through the
             :meth:`~openstack.resource2.QueryParamter._transpose` method
             to find if any of them match expected query parameters to be
@@ -122,20 +127,8 @@ class Resource(resource.Resource):
         uri = cls.get_list_uri(params)
 
         while more_data:
-            endpoint_override = cls.service.get_endpoint_override()
-            resp = session.get(uri, endpoint_filter=cls.service,
-                               endpoint_override=endpoint_override,
-                               headers={"Accept": "application/json"},
-                               params=query_params)
-            response_json = resp.json()
-            cls.check_error(response_json)
-            if cls.resources_key:
-                resources = cls.find_value_by_accessor(response_json,
-                                                       cls.resources_key)
-            else:
-                resources = response_json
-            if resources is None:
-                resources = []
+            response_json, resources = cls._get_page_resources(
+                session, uri, query_params)
 
             if not resources:
                 return
@@ -148,8 +141,55 @@ class Resource(resource.Resource):
                 return
             more_data, next_page_num = cls.get_next_pagination(response_json,
                                                                query_params)
+            if more_data and concurrency > 1:
+                for value in cls._list_pages(session, uri, query_params,
+                                             response_json, concurrency):
+                    yield value
+                return
             query_params[cls.query_page_number_key] = next_page_num
 
+    @classmethod
+    def _get_page_resources(cls, session, uri, query_params):
+        endpoint_override = cls.service.get_endpoint_override()
+        resp = session.get(uri, endpoint_filter=cls.service,
+                           endpoint_override=endpoint_override,
+                           headers={"Accept": "application/json"},
+                           params=query_params)
+        response_json = resp.json()
+        cls.check_error(response_json)
+        if cls.resources_key:
+            resources = cls.find_value_by_accessor(response_json,
+                                                   cls.resources_key)
+        else:
+            resources = response_json
+        if resources is None:
+            resources = []
+        return response_json, resources
+
+    @classmethod
+    def _list_pages(cls, session, uri, query_params, response, concurrency):
+        """Fetch the pages following the current one in parallel"""
+        total = cls.find_value_by_accessor(response, cls.total_path) or 0
+        page_size = int(query_params.get(cls.query_page_size_key))
+        page_number = int(query_params.get(cls.query_page_number_key))
+        last = (total + page_size - 1) // page_size
+
+        def fetch(number):
+            page_params = dict(query_params)
+            page_params[cls.query_page_number_key] = number
+            return cls._get_page_resources(session, uri, page_params)[1]
+
+        pages = utils.iter_concurrently(fetch, range(page_number + 1, last + 1),
+                                        concurrency)
+        try:
+            for resources in pages:
+                if not resources:
+                    return
+                for data in resources:
+                    yield cls.existing(**data)
+        finally:
+            pages.close()
+
     @classmethod
     def get_next_pagination(cls, response, query_params):
         total = cls.find_value_by_accessor(response, cls.total_path) or 0
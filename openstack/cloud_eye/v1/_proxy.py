@@ -12,10 +12,11 @@
 # CONDITIONS OF ANY KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations under the License.
 
-from openstack.cloud_eye import cloud_eye_service
+from openstack.cloud_eye.v1 import aggregation as _aggregation
 from openstack.cloud_eye.v1 import alarm as _alarm
 from openstack.cloud_eye.v1 import metric as _metric
 from openstack.cloud_eye.v1 import metric_data as _metric_data
+from openstack.cloud_eye.v1 import publisher as _publisher
 from openstack.cloud_eye.v1 import quota as _quota
 from openstack.exceptions import InvalidRequest
 from openstack import proxy2
@@ -176,6 +177,39 @@ class Proxy(proxy2.BaseProxy):
         else:
             raise InvalidRequest('Attribute `dimensions` should be a list')
 
+    def bulk_metric_aggregations(self, series, start, end, period,
+                                 filter="average", concurrency=8,
+                                 max_points=_aggregation.MAX_POINTS):
+        """Retrieve the aggregations of many metrics over a time range
+
+        The time range is split in windows of at most ``max_points``
+        periods, and the windows of all the series are queried
+        concurrently.
+
+        :param series: An iterable of ``(namespace, metric_name,
+                       dimensions)`` tuples, where dimensions is a list of
+                       at most three dicts, for example
+                       [{"name":"instance_id", "value":"instance-id"}]
+        :param start: The start of the time range, a
+                      :class:`datetime.datetime` or epoch millis.
+        :param end: The end of the time range, a
+                    :class:`datetime.datetime` or epoch millis.
+        :param int period: data time period, 1, 300, 1200, 3600, 14400 or
+                           86400 seconds.
+        :param str filter: metric data aggregation method, ``average``,
+                           ``variance``, ``min``, ``max`` or ``sum``.
+        :param int concurrency: The number of queries run at the same time.
+        :param int max_points: Most datapoints asked in one query.
+
+        :returns: A list of
+                  :class:`~openstack.cloud_eye.v1.aggregation.Series`, in
+                  the order of ``series``, holding the timestamps and the
+                  values of the datapoints as arrays.
+        """
+        return _aggregation.query(self._session, series, start, end, period,
+                                  filter=filter, concurrency=concurrency,
+                                  max_points=max_points)
+
     def add_metric_data(self, data):
         """Create Metric Data from a list of attributes
 
@@ -202,13 +236,29 @@ class Proxy(proxy2.BaseProxy):
                 }]
 
         """
-        service = cloud_eye_service.CloudEyeService()
+        service = _metric_data.MetricData.service
         session = self._session
         return session.post('/metric-data',
                             endpoint_filter=service,
                             endpoint_override=service.get_endpoint_override(),
                             json=data)
 
+    def metric_publisher(self, **kwargs):
+        """Return a publisher posting metric data in the background
+
+        The calls to its ``put`` method only add the points to a buffer,
+        they are posted in batches by its threads. Close it to post the
+        remaining points.
+
+        :param dict kwargs: The arguments of the
+                            :class:`~openstack.cloud_eye.v1.publisher.
+                            MetricPublisher`, e.g. ``flush_interval`` and
+                            ``max_queue``.
+        :returns: A started
+                  :class:`~openstack.cloud_eye.v1.publisher.MetricPublisher`
+        """
+        return _publisher.MetricPublisher(self, **kwargs)
+
     def quotas(self):
         """Retrieve a generator of quotas
 
@@ -0,0 +1,181 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Bulk queries of Cloud Eye metric aggregations.
+
+The time range of every series is split in windows of at most
+:data:`MAX_POINTS` periods, and the windows of all the series are queried
+concurrently. The datapoints of a series are returned as two arrays::
+
+    series = conn.cloud_eye.bulk_metric_aggregations(
+        [("SYS.ECS", "cpu_util",
+          [{"name": "instance_id", "value": instance_id}])
+         for instance_id in instance_ids],
+        start, end, period=300, filter="average")
+    for item in series:
+        plot(item.timestamps, item.values)
+"""
+
+import array
+import datetime
+import math
+
+from openstack.cloud_eye.v1 import metric_data as _metric_data
+from openstack import exceptions
+from openstack import utils
+
+#: Most datapoints asked in one query.
+MAX_POINTS = 3000
+
+#: The aggregation periods of the API, in seconds.
+PERIODS = (1, 300, 1200, 3600, 14400, 86400)
+
+#: The aggregation methods of the API.
+FILTERS = ("average", "variance", "min", "max", "sum")
+
+# epoch milliseconds, "q" is not available before python 3.3
+_TIMESTAMP_TYPE = "q" if "q" in getattr(array, "typecodes", "") else "d"
+
+
+class Series(object):
+    """The datapoints of one metric, as columns
+
+    :attr:`timestamps` holds the epoch milliseconds of the datapoints in
+    ascending order and :attr:`values` their aggregated value, NaN when the
+    datapoint has no value for the filter.
+    """
+
+    def __init__(self, namespace, metric_name, dimensions, filter):
+        self.namespace = namespace
+        self.metric_name = metric_name
+        self.dimensions = dimensions
+        self.filter = filter
+        self.unit = None
+        self.timestamps = array.array(_TIMESTAMP_TYPE)
+        self.values = array.array("d")
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __repr__(self):
+        return "Series(%r, %r, %r, %d datapoints)" % (
+            self.namespace, self.metric_name, self.dimensions, len(self))
+
+    def extend(self, datapoints):
+        """Append the datapoints of the next window
+
+        The datapoints at or before the last timestamp, which the adjacent
+        windows both return, are skipped.
+        """
+        last = self.timestamps[-1] if self.timestamps else None
+        for point in sorted(datapoints, key=lambda point: point["timestamp"]):
+            timestamp = point["timestamp"]
+            if last is not None and timestamp <= last:
+                continue
+            value = point.get(self.filter)
+            self.timestamps.append(timestamp)
+            self.values.append(float("nan") if value is None else value)
+            last = timestamp
+            if self.unit is None:
+                self.unit = point.get("unit")
+
+
+def to_epoch(value):
+    """Return a time as epoch milliseconds
+
+    :param value: A :class:`datetime.datetime` or epoch milliseconds.
+    """
+    if isinstance(value, datetime.datetime):
+        return utils.get_epoch_time(value)
+    return int(value)
+
+
+def split_windows(start, end, period, max_points=MAX_POINTS):
+    """Split a time range in windows of at most ``max_points`` periods
+
+    :param int start: The start of the range, in epoch milliseconds.
+    :param int end: The end of the range, in epoch milliseconds.
+    :param int period: The aggregation period, in seconds.
+    :param int max_points: Most datapoints in a window.
+    :return: A list of ``(from, to)`` tuples covering the range.
+    """
+    if end <= start:
+        raise exceptions.InvalidRequest(
+            "The end of the time range must be after its start")
+    width = int(period) * 1000 * max(int(max_points), 1)
+    count = int(math.ceil(float(end - start) / width))
+    return [(start + i * width, min(start + (i + 1) * width, end))
+            for i in range(count)]
+
+
+def dimension_query(dimensions):
+    """Return the ``dim.N`` query parameters of dimensions
+
+    :param list dimensions: At most three dicts with a ``name`` and a
+                            ``value``.
+    """
+    if not isinstance(dimensions, list):
+        raise exceptions.InvalidRequest(
+            'Attribute `dimensions` should be a list')
+    if len(dimensions) > 3:
+        raise exceptions.InvalidRequest(
+            'Attribute `dimensions` at most could have three dimensions')
+    return dict(("dim.%d" % idx, dimension['name'] + ',' + dimension['value'])
+                for idx, dimension in enumerate(dimensions))
+
+
+def query(session, series, start, end, period, filter="average",
+          concurrency=8, max_points=MAX_POINTS):
+    """Query the aggregations of many metrics over a time range
+
+    See :meth:`~openstack.cloud_eye.v1._proxy.Proxy.bulk_metric_aggregations`.
+
+    :return: A list of :class:`Series`, in the order of ``series``.
+    """
+    if int(period) not in PERIODS:
+        raise exceptions.InvalidRequest(
+            "Invalid period %r, expected one of %s" %
+            (period, ", ".join(str(value) for value in PERIODS)))
+    if filter not in FILTERS:
+        raise exceptions.InvalidRequest(
+            "Invalid filter %r, expected one of %s" %
+            (filter, ", ".join(FILTERS)))
+    windows = split_windows(to_epoch(start), to_epoch(end), period,
+                            max_points)
+    results = []
+    queries = []
+    for namespace, metric_name, dimensions in series:
+        base = dimension_query(dimensions)
+        base.update(namespace=namespace, metric_name=metric_name,
+                    period=int(period), filter=filter)
+        result = Series(namespace, metric_name, dimensions, filter)
+        results.append(result)
+        for window_start, window_end in windows:
+            params = dict(base)
+            params["from"] = window_start
+            params["to"] = window_end
+            queries.append((result, params))
+
+    def fetch(item):
+        result, params = item
+        return result, _metric_data.MetricAggregation.list_datapoints(
+            session, **params)
+
+    # the windows of a series are fetched in order, so that each one
+    # extends the columns of the previous one
+    for result, datapoints in utils.iter_concurrently(fetch, queries,
+                                                      concurrency):
+        result.extend(datapoints)
+    return results
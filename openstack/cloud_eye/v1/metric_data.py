@@ -74,3 +74,22 @@ class MetricAggregation(resource.Resource):
     timestamp = resource.Body('timestamp')
     #: Metric Data Unit
     unit = resource.Body('unit')
+
+    @classmethod
+    def list_datapoints(cls, session, **params):
+        """Fetch the raw datapoints of one query
+
+        Unlike :meth:`list`, no resource is built from the datapoints, which
+        are returned as the dicts of the response body.
+
+        :param session: The session to use for making this request.
+        :param dict params: The query parameters, named as in
+                            ``_query_mapping``.
+        :return: A list of dicts.
+        """
+        endpoint_override = cls.service.get_endpoint_override()
+        resp = session.get(cls.base_path, endpoint_filter=cls.service,
+                           endpoint_override=endpoint_override,
+                           headers={"Accept": "application/json"},
+                           params=cls._query_mapping._transpose(params))
+        return resp.json().get(cls.resources_key) or []
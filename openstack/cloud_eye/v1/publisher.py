@@ -0,0 +1,297 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Background publisher of Cloud Eye metric data.
+
+The threads producing metric data points put them in the buffer of a
+:class:`MetricPublisher`, which returns at once. Sender threads post them
+in batches as large as Cloud Eye accepts, when a batch is full or when its
+oldest point waited ``flush_interval`` seconds::
+
+    publisher = conn.cloud_eye.metric_publisher(flush_interval=5)
+    ...
+    publisher.put({"metric": {...}, "ttl": 172800,
+                   "collect_time": 1463598260000, "value": 60, "unit": "%"})
+    ...
+    publisher.close()
+    print(publisher.stats())
+"""
+
+import collections
+import json
+import threading
+import time
+
+from keystoneauth1 import _utils as log_utils
+
+from openstack.cloud_eye.v1 import metric_data as _metric_data
+from openstack import exceptions
+from openstack import instrumentation
+
+_logger = log_utils.get_logger(__name__)
+
+#: Most points posted in one request.
+MAX_BATCH_COUNT = 50
+
+#: Largest body posted in one request, in bytes.
+MAX_BATCH_BYTES = 512 * 1024
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def to_body(point):
+    """Return the request body of a metric data point
+
+    :param point: A dict in the format of the Cloud Eye API, or a
+                  :class:`~openstack.cloud_eye.v1.metric_data.MetricData`.
+    """
+    if not isinstance(point, _metric_data.MetricData):
+        return point
+    body = {
+        "metric": {
+            "namespace": point.namespace,
+            "metric_name": point.metric_name,
+            "dimensions": point.dimensions or [],
+        },
+        "ttl": point.ttl,
+        "collect_time": point.collect_time,
+        "value": point.value,
+        "unit": point.unit,
+    }
+    if point.value_type is not None:
+        body["type"] = point.value_type
+    return body
+
+
+class MetricPublisher(object):
+    """Buffer of metric data points posted by background threads"""
+
+    def __init__(self, proxy, max_batch_count=MAX_BATCH_COUNT,
+                 max_batch_bytes=MAX_BATCH_BYTES, flush_interval=1.0,
+                 max_queue=10000, senders=1):
+        """
+        :param proxy: The cloud eye :class:`~openstack.cloud_eye.v1._proxy.
+                      Proxy` posting the batches.
+        :param int max_batch_count: Most points posted in one request.
+        :param int max_batch_bytes: Largest body posted in one request.
+        :param float flush_interval: Longest time in seconds a point waits
+                                     for its batch to fill up.
+        :param int max_queue: Most points waiting to be posted. The points
+                              put in a full buffer are dropped, or wait for
+                              room when a timeout is given to :meth:`put`.
+        :param int senders: The number of threads posting batches.
+        """
+        self.proxy = proxy
+        self.max_batch_count = max_batch_count
+        self.max_batch_bytes = max_batch_bytes
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._cond = threading.Condition()
+        self._buffer = collections.deque()
+        self._buffer_bytes = 0
+        # points put and not yet posted or failed
+        self._pending = 0
+        self._flushing = False
+        self._closed = False
+        self._counters = collections.Counter()
+        self._latency = instrumentation.Histogram()
+        self._delay = instrumentation.Histogram()
+        self._threads = []
+        for _ in range(max(int(senders), 1)):
+            thread = threading.Thread(target=self._run)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def put(self, point, timeout=0):
+        """Add a point to the buffer
+
+        :param point: A dict in the format of the Cloud Eye API, or a
+                      :class:`~openstack.cloud_eye.v1.metric_data.MetricData`.
+        :param float timeout: How long to wait for room in a full buffer,
+                              ``None`` to wait as long as needed. The point
+                              is dropped at once by default.
+        :return: ``False`` when the point was dropped.
+        :raises: :class:`~openstack.exceptions.SDKException` when the
+                 publisher is closed.
+        """
+        body = to_body(point)
+        # an upper bound of the size of the body as the sessions encode it
+        size = len(json.dumps(body)) + 1
+        if size + 2 > self.max_batch_bytes:
+            _logger.warning("Dropping a metric data point of %d bytes, more "
+                            "than the %d bytes of a batch", size,
+                            self.max_batch_bytes)
+            self._count("oversized")
+            return False
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            if self._closed:
+                raise exceptions.SDKException("The publisher is closed")
+            while len(self._buffer) >= self.max_queue:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    self._counters["dropped"] += 1
+                    return False
+                self._cond.wait(remaining)
+                if self._closed:
+                    raise exceptions.SDKException("The publisher is closed")
+            self._buffer.append((body, size, time.time()))
+            self._buffer_bytes += size
+            self._pending += 1
+            self._counters["put"] += 1
+            # the senders wait for the first point, then for a full batch
+            if len(self._buffer) == 1 or self._batch_ready():
+                self._cond.notify_all()
+        return True
+
+    def put_many(self, points, timeout=0):
+        """Add points to the buffer
+
+        :return: The number of points dropped.
+        """
+        return sum(not self.put(point, timeout) for point in points)
+
+    def flush(self, timeout=None):
+        """Post the buffered points now and wait for them to be posted
+
+        :param float timeout: How long to wait in seconds, ``None`` to wait
+                              as long as needed.
+        :return: ``False`` when points are still pending after ``timeout``.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            self._flushing = True
+            self._cond.notify_all()
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._flushing = False
+        return True
+
+    def close(self, timeout=None):
+        """Post the buffered points and stop the sender threads
+
+        :param float timeout: How long to wait in seconds for the points to
+                              be posted, ``None`` to wait as long as needed.
+        :return: ``False`` when points are still pending after ``timeout``.
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if flushed:
+            for thread in self._threads:
+                thread.join(timeout)
+        return flushed
+
+    def stats(self):
+        """Return the counters and latencies of the publisher
+
+        :return: A dict with the number of ``queued`` points, the numbers of
+                 points ``put``, ``sent`` and ``failed``, of ``batches``
+                 posted and ``failed_batches``, of points ``dropped`` in a
+                 full buffer and of ``oversized`` points, and the
+                 ``latency`` of the requests and the ``delay`` from put to
+                 posted of the points, as dicts of their ``mean``, ``p50``,
+                 ``p99`` and ``max`` in seconds.
+        """
+        with self._cond:
+            result = dict((key, self._counters[key]) for key in
+                          ("put", "sent", "failed", "batches",
+                           "failed_batches", "dropped", "oversized"))
+            result["queued"] = len(self._buffer)
+            result["latency"] = self._latency.summary()
+            result["delay"] = self._delay.summary()
+        return result
+
+    def _count(self, key, value=1):
+        with self._cond:
+            self._counters[key] += value
+
+    def _batch_ready(self):
+        return (len(self._buffer) >= self.max_batch_count or
+                self._buffer_bytes + 2 > self.max_batch_bytes)
+
+    def _next_batch(self):
+        # Wait for a full batch, an old enough point, a flush or the close,
+        # and take the batch out of the buffer. None once closed.
+        with self._cond:
+            while True:
+                if self._buffer:
+                    if (self._closed or self._flushing or
+                            self._batch_ready()):
+                        break
+                    wait = (self._buffer[0][2] + self.flush_interval -
+                            time.time())
+                    if wait <= 0:
+                        break
+                elif self._closed:
+                    return None
+                else:
+                    wait = None
+                self._cond.wait(wait)
+
+            batch = []
+            size = 2
+            while (self._buffer and len(batch) < self.max_batch_count and
+                   size + self._buffer[0][1] <= self.max_batch_bytes):
+                item = self._buffer.popleft()
+                size += item[1]
+                self._buffer_bytes -= item[1]
+                batch.append(item)
+            if not self._buffer:
+                self._flushing = False
+            # there is room for the producers waiting in put
+            self._cond.notify_all()
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            started = _clock()
+            try:
+                self.proxy.add_metric_data([item[0] for item in batch])
+            except Exception:
+                _logger.warning("Failed to post %d metric data points",
+                                len(batch), exc_info=True)
+                failed = True
+            else:
+                failed = False
+            latency = _clock() - started
+            now = time.time()
+            with self._cond:
+                if failed:
+                    self._counters["failed"] += len(batch)
+                    self._counters["failed_batches"] += 1
+                else:
+                    self._counters["sent"] += len(batch)
+                    self._counters["batches"] += 1
+                    for item in batch:
+                        self._delay.observe(now - item[2])
+                self._latency.observe(latency)
+                self._pending -= len(batch)
+                self._cond.notify_all()
+
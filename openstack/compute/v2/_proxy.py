@@ -43,6 +43,7 @@ from openstack.compute.v2 import volume_attachment as _volume_attachment
 from openstack.compute.v2 import quota
 from openstack import proxy2
 from openstack import resource2
+from openstack import waiter
 
 
 class Proxy(proxy2.BaseProxy):
@@ -876,9 +877,37 @@ class Proxy(proxy2.BaseProxy):
         server.unshelve(self._session)
 
     def wait_for_server(self, server, status='ACTIVE', failures=['ERROR'],
-                        interval=2, wait=120):
+                        interval=2, wait=120, backoff=None):
         return resource2.wait_for_status(self._session, server, status,
-                                         failures, interval, wait)
+                                         failures, interval, wait,
+                                         backoff=backoff)
+
+    def wait_for_servers(self, servers, status='ACTIVE', failures=['ERROR'],
+                         wait=120, backoff=None, concurrency=10):
+        """Wait for many servers to be in a particular status
+
+        All the pending servers are checked in every round, and the rounds
+        are spaced out with an exponential backoff.
+
+        :param servers: A list of
+                        :class:`~openstack.compute.v2.server.Server`.
+        :param status: Desired status of the servers.
+        :param list failures: Statuses that would indicate the transition
+                              failed such as 'ERROR'.
+        :param wait: Maximum number of seconds to wait for the transitions.
+        :param backoff: The :class:`~openstack.waiter.Backoff` spacing the
+                        rounds out.
+        :param concurrency: The number of servers fetched at the same time.
+
+        :returns: A generator of ``(server, error)`` tuples as the servers
+                  complete, see :func:`openstack.waiter.wait_for_statuses`.
+        """
+        servers = [self._get_resource(_server.Server, server)
+                   for server in servers]
+        return waiter.wait_for_statuses(self._session, servers, status,
+                                        failures=failures, wait=wait,
+                                        backoff=backoff,
+                                        concurrency=concurrency)
 
     def create_server_interface(self, server, **attrs):
         """Create a new server interface from attributes
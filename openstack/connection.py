@@ -176,8 +176,8 @@ _logger = logging.getLogger(__name__)
 class Connection(object):
     def __init__(self, session=None, authenticator=None, profile=None,
                  verify=True, timeout=None, cert=None, user_agent=None,
-                 auth_plugin="password",
-                 **auth_args):
+                 auth_plugin="password", transport=None, retry_policy=None,
+                 json_codec=None, **auth_args):
         """Create a context for a connection to a cloud provider.
 
         A connection needs a transport and an authenticator.  The user may pass
@@ -223,6 +223,17 @@ class Connection(object):
             HTTP header.
         :param str auth_plugin: The name of authentication plugin to use.
             The default value is ``password``.
+        :param transport: The connection pools shared with other
+            connections, whatever their kind of session. By default each
+            connection has its own pools.
+        :type transport: :class:`~openstack.transport.Transport`
+        :param retry_policy: The policy retrying the throttled and failed
+            requests and rate limiting them. None are retried by default.
+        :type retry_policy: :class:`~openstack.retry.RetryPolicy`
+        :param json_codec: The codec, or its name, encoding the request
+            bodies and decoding the response bodies. By default the fastest
+            one installed: ``orjson``, ``ujson`` or ``json``.
+        :type json_codec: :class:`~openstack.jsonutils.Codec`
         :param auth_args: The rest of the parameters provided are assumed to be
             authentication arguments that are used by the authentication
             plugin.
@@ -268,7 +279,12 @@ class Connection(object):
                                                 domain=auth_args.get('domain', None),
                                                 securitytoken=auth_args.get("securitytoken", None),
                                                 auth_url=auth_args.get('auth_url', None),
-                                                domain_id=auth_args.get("domain_id", None)
+                                                domain_id=auth_args.get("domain_id", None),
+                                                unsigned_payload=auth_args.get("unsigned_payload", False),
+                                                endpoint_cache=auth_args.get("endpoint_cache", None),
+                                                transport=transport,
+                                                retry_policy=retry_policy,
+                                                json_codec=json_codec
                                                 )
         elif auth_args.get('auth_token', None):
             self.session = token_session.TokenSession(self.profile,
@@ -278,6 +294,9 @@ class Connection(object):
                                                       user_agent=user_agent,
                                                       auth_url=auth_args.get('auth_url', None),
                                                       auth_token=auth_args.get('auth_token', None),
+                                                      session=transport.new_session() if transport else None,
+                                                      retry_policy=retry_policy,
+                                                      json_codec=json_codec,
                                                       # project_id=auth_args.get('project_id', None)
                                                       )
 
@@ -287,7 +306,9 @@ class Connection(object):
                                                             **auth_args)
             self.session = _session.Session(
                 self.profile, auth=self.authenticator, verify=verify, timeout=timeout,
-                cert=cert, user_agent=user_agent)
+                cert=cert, user_agent=user_agent,
+                session=transport.new_session() if transport else None,
+                retry_policy=retry_policy, json_codec=json_codec)
         self._open()
 
     def _create_authenticator(self, authenticator, auth_plugin, **args):
@@ -306,10 +327,23 @@ class Connection(object):
     def _open(self):
         """Open the connection.
 
-        NOTE(thowe): Have this set up some lazy loader instead.
+        The proxy of a service is only imported and created the first time
+        its attribute is accessed, see :meth:`__getattr__`.
         """
-        for service in self.profile.get_services():
-            self._load(service)
+        self._proxy_services = self.profile.get_service_modules()
+
+    def __getattr__(self, name):
+        # Only called when the attribute is not found, so a proxy is
+        # loaded once and then read from the instance dict.
+        services = self.__dict__.get("_proxy_services", {})
+        if name not in services:
+            raise AttributeError("%r object has no attribute %r" %
+                                 (self.__class__.__name__, name))
+        service = self.profile._get_filter(services[name])
+        self._load(service)
+        if name not in self.__dict__:
+            raise AttributeError("Unable to load service %s" % name)
+        return self.__dict__[name]
 
     def _load(self, service):
         attr_name = service.get_service_module()
@@ -12,6 +12,7 @@
 # CONDITIONS OF ANY KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations under the License.
 
+from openstack.cts.v1 import export as _export
 from openstack.cts.v1 import trace as _trace
 from openstack.cts.v1 import tracker as _tracker
 from openstack import proxy2
@@ -92,3 +93,26 @@ class Proxy(proxy2.BaseProxy):
             tracker_name = tracker
 
         return self._list(_trace.TraceV2, tracker_name=tracker_name, **query)
+
+    def trace_exporter(self, tracker, start, end, **kwargs):
+        """Return a resumable exporter of the traces of a time range
+
+        :param tracker: tracker name or an object of
+                        :class:`~openstack.cts.v1.tracker.Tracker`
+        :param start: The start of the time range, a
+                      :class:`datetime.datetime` or epoch millis.
+        :param end: The end of the time range, a
+                    :class:`datetime.datetime` or epoch millis.
+        :param dict kwargs: The arguments of the
+                            :class:`~openstack.cts.v1.export.TraceExporter`,
+                            e.g. ``shards``, ``checkpoint`` and the filters
+                            of the traces.
+        :returns: A :class:`~openstack.cts.v1.export.TraceExporter`
+        """
+        if isinstance(tracker, _tracker.Tracker):
+            tracker_name = tracker.tracker_name
+        else:
+            tracker_name = tracker
+
+        return _export.TraceExporter(self._session, tracker_name, start, end,
+                                     **kwargs)
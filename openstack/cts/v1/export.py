@@ -0,0 +1,302 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Resumable export of the traces of a tracker.
+
+The time range is split in shards whose pages are fetched concurrently.
+The traces are exported as the dicts of the response bodies, without
+building :class:`~openstack.cts.v1.trace.Trace` resources, and the marker
+of every shard is saved in a checkpoint file once its page is exported,
+so that an interrupted export resumes where it stopped::
+
+    exporter = conn.cts.trace_exporter("system", start, end, shards=8,
+                                       checkpoint="/var/lib/cts/system.json")
+    with open("traces.ndjson", "a") as out:
+        exporter.write_ndjson(out)
+
+The pages exported after the last checkpoint are exported again on
+resume, ingestion must tolerate duplicates.
+"""
+
+import collections
+from concurrent import futures
+import json
+import os
+import threading
+import time
+
+from six.moves import queue as _queue
+
+from openstack.cts.v1 import trace as _trace
+from openstack import exceptions
+from openstack import instrumentation
+from openstack import jsonutils
+from openstack import utils
+
+#: Most traces returned in one page.
+MAX_LIMIT = 200
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def _get_page(session, trace_type, tracker_name, query):
+    # Return the raw traces of a page and the marker of the next one
+    uri = trace_type.base_path % {"tracker_name": tracker_name}
+    endpoint_override = trace_type.service.get_endpoint_override()
+    resp = session.get(uri, endpoint_filter=trace_type.service,
+                       endpoint_override=endpoint_override,
+                       headers={"Accept": "application/json"},
+                       params=trace_type._query_mapping._transpose(query))
+    body = resp.json() or {}
+    meta_data = body.get("meta_data") or {}
+    return body.get(trace_type.resources_key) or [], meta_data.get("marker")
+
+
+def split_shards(start, end, shards):
+    """Split a time range in shards of equal duration
+
+    :param int start: The start of the range, in epoch milliseconds.
+    :param int end: The end of the range, in epoch milliseconds, included.
+    :param int shards: The number of shards.
+    :return: A list of ``(from, to)`` tuples, both included.
+    """
+    if end <= start:
+        raise exceptions.InvalidRequest(
+            "The end of the time range must be after its start")
+    span = end - start + 1
+    shards = max(min(int(shards), span), 1)
+    bounds = [start + span * i // shards for i in range(shards + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(shards)]
+
+
+class Checkpoint(object):
+    """The state of an export, saved in a JSON file
+
+    The file is replaced atomically, it always holds a complete state.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Return the saved state, None when there is none"""
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except IOError as e:
+            if not os.path.exists(self.path):
+                return None
+            raise exceptions.SDKException(
+                "Cannot read the checkpoint %s: %s" % (self.path, e))
+
+    def save(self, state):
+        temp = "%s.tmp" % self.path
+        with open(temp, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        getattr(os, "replace", os.rename)(temp, self.path)
+
+
+class TraceExporter(object):
+    """Concurrent, resumable export of the traces of a time range"""
+
+    def __init__(self, session, tracker, start, end, shards=4, concurrency=4,
+                 limit=MAX_LIMIT, checkpoint=None, version=1, **query):
+        """
+        :param session: The session to use for making the requests.
+        :param str tracker: The tracker name.
+        :param start: The start of the time range, a
+                      :class:`datetime.datetime` or epoch millis.
+        :param end: The end of the time range, a
+                    :class:`datetime.datetime` or epoch millis.
+        :param int shards: The number of shards of the time range.
+        :param int concurrency: The number of shards fetched at the same time.
+        :param int limit: The number of traces per page, at most 200.
+        :param str checkpoint: The path of the checkpoint file, created or
+                               resumed from. The export is not resumable
+                               without it.
+        :param int version: 1 to export :class:`~openstack.cts.v1.trace.
+                            Trace`, 2 to export :class:`~openstack.cts.v1.
+                            trace.TraceV2`.
+        :param dict query: Filters of the traces, e.g. ``service_type`` or
+                           ``trace_rating``.
+        """
+        self.session = session
+        self.tracker = tracker
+        self.trace_type = _trace.TraceV2 if version == 2 else _trace.Trace
+        self.concurrency = max(int(concurrency), 1)
+        self.limit = max(min(int(limit), MAX_LIMIT), 1)
+        self.query = query
+        self.checkpoint = Checkpoint(checkpoint) if checkpoint else None
+        start, end = _epoch(start), _epoch(end)
+
+        state = self.checkpoint.load() if self.checkpoint else None
+        if state is None:
+            state = {
+                "tracker": tracker, "from": start, "to": end,
+                "version": version, "query": query,
+                "shards": [{"from": shard_start, "to": shard_end,
+                            "next": None, "time": None, "count": 0,
+                            "done": False}
+                           for shard_start, shard_end in
+                           split_shards(start, end, shards)],
+            }
+        elif (state.get("tracker"), state.get("from"), state.get("to"),
+              state.get("version"), state.get("query")) != (
+                tracker, start, end, version, query):
+            raise exceptions.SDKException(
+                "The checkpoint %s is the one of another export" %
+                checkpoint)
+        self.state = state
+        self._lock = threading.Lock()
+        self._counters = collections.Counter()
+        self._latency = instrumentation.Histogram()
+        self._started = None
+
+    def batches(self):
+        """Export the traces, one page at a time
+
+        The checkpoint of a page is saved when the next one is requested.
+
+        :return: A generator of lists of trace dicts.
+        """
+        pending = [index for index, shard in enumerate(self.state["shards"])
+                   if not shard["done"]]
+        if not pending:
+            return
+        self._started = self._started or time.time()
+        results = _queue.Queue(maxsize=self.concurrency * 2)
+        stopping = threading.Event()
+        executor = futures.ThreadPoolExecutor(max_workers=self.concurrency)
+        for index in pending:
+            executor.submit(self._run_shard, index, results, stopping)
+        try:
+            remaining = len(pending)
+            while remaining:
+                index, traces, marker, done, error = results.get()
+                if error is not None:
+                    raise error
+                if traces:
+                    yield traces
+                shard = self.state["shards"][index]
+                shard["next"] = marker
+                shard["done"] = done
+                shard["count"] += len(traces)
+                if traces:
+                    shard["time"] = traces[-1].get("time")
+                if self.checkpoint:
+                    self.checkpoint.save(self.state)
+                self._count(traces=len(traces), shards_done=int(done))
+                remaining -= done
+        finally:
+            stopping.set()
+            # unblock the workers waiting for room in the results
+            while True:
+                try:
+                    results.get_nowait()
+                except _queue.Empty:
+                    break
+            executor.shutdown(wait=False)
+
+    def __iter__(self):
+        for traces in self.batches():
+            for trace in traces:
+                yield trace
+
+    def write_ndjson(self, out, codec=None):
+        """Write the traces as newline delimited JSON
+
+        Every page is written and flushed before its checkpoint is saved.
+
+        :param out: A file object opened in text mode.
+        :param codec: The :class:`~openstack.jsonutils.Codec` or codec name
+                      encoding the traces, the ``json_codec`` of the
+                      session by default.
+        :return: The number of traces written.
+        """
+        if codec is None:
+            codec = getattr(self.session, "json_codec", None)
+        encode = jsonutils.get_codec(codec).encode
+        count = 0
+        for traces in self.batches():
+            out.write(u"".join(encode(trace) + u"\n" for trace in traces))
+            out.flush()
+            count += len(traces)
+        return count
+
+    def stats(self):
+        """Return the counters of the export
+
+        :return: A dict with the numbers of ``traces`` and ``pages``
+                 exported and failed ``errors`` since the exporter was
+                 created, the ``rate`` of traces per second, the number of
+                 ``shards`` and ``shards_done``, the ``total`` of traces
+                 exported including the previous runs, and the ``latency``
+                 of the page requests as a dict of their ``mean``, ``p50``,
+                 ``p99`` and ``max`` in seconds.
+        """
+        with self._lock:
+            result = dict((key, self._counters[key])
+                          for key in ("traces", "pages", "errors"))
+            result["latency"] = self._latency.summary()
+        elapsed = time.time() - self._started if self._started else 0
+        result["rate"] = result["traces"] / elapsed if elapsed > 0 else 0.0
+        shards = self.state["shards"]
+        result["shards"] = len(shards)
+        result["shards_done"] = sum(1 for shard in shards if shard["done"])
+        result["total"] = sum(shard["count"] for shard in shards)
+        return result
+
+    def _count(self, latency=None, **values):
+        with self._lock:
+            self._counters.update(values)
+            if latency is not None:
+                self._latency.observe(latency)
+
+    def _run_shard(self, index, results, stopping):
+        shard = self.state["shards"][index]
+        query = dict(self.query, limit=self.limit)
+        query["from"] = shard["from"]
+        query["to"] = shard["to"]
+        marker = shard["next"]
+        done = False
+        while not done and not stopping.is_set():
+            if marker:
+                query["next"] = marker
+            started = _clock()
+            try:
+                traces, marker = _get_page(self.session, self.trace_type,
+                                           self.tracker, query)
+            except Exception as e:
+                self._count(errors=1)
+                item = (index, None, None, False, e)
+                done = True
+            else:
+                self._count(_clock() - started, pages=1)
+                done = not marker or len(traces) < self.limit
+                item = (index, traces, marker, done, None)
+            while not stopping.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    break
+                except _queue.Full:
+                    pass
+
+
+def _epoch(value):
+    if hasattr(value, "timetuple"):
+        return utils.get_epoch_time(value)
+    return int(value)
@@ -95,7 +95,7 @@ class TraceV2(ctsresource.Resource):
     _query_mapping = resource.QueryParameters('service_type',
                                               'resource_type',
                                               'resource_id',
-                                              'resource_name'
+                                              'resource_name',
                                               'trace_name',
                                               'limit',
                                               'next',
@@ -12,6 +12,7 @@
 # CONDITIONS OF ANY KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations under the License.
 
+from openstack.dms.v1 import client as _client
 from openstack.dms.v1 import queue as _queue
 from openstack import proxy2
 
@@ -133,7 +134,7 @@ class Proxy(proxy2.BaseProxy):
         if isinstance(queue, _queue.Queue):
             queue_id = queue.id
         consumer_group_id = consume_group
-        if isinstance(queue, _queue.Group):
+        if isinstance(consume_group, _queue.Group):
             consumer_group_id = consume_group.id
 
         return self._list(_queue.MessageConsume, queue_id=queue_id,
@@ -158,5 +159,51 @@ class Proxy(proxy2.BaseProxy):
             consumed_message = [msg]
         return msg.ack(self._session, consumed_message, status=status)
 
+    def ack_messages(self, queue, consume_group, handlers):
+        """Confirm consumed messages by their handlers in one request
+
+        :param queue: The queue id or an instance of
+                      :class:`~openstack.dms.v1.queue.Queue`
+        :param consume_group: The consume group id or an instance of
+                      :class:`~openstack.dms.v1.queue.Group`
+        :param list handlers: A list of ``(handler, status)`` tuples, where
+                              status is ``success`` or ``fail``.
+        :returns: A dict of the ``success`` and ``fail`` numbers.
+        """
+        queue_id = queue
+        if isinstance(queue, _queue.Queue):
+            queue_id = queue.id
+        consumer_group_id = consume_group
+        if isinstance(consume_group, _queue.Group):
+            consumer_group_id = consume_group.id
+        return _queue.MessageConsume.ack_handlers(self._session, queue_id,
+                                                  consumer_group_id, handlers)
+
+    def producer(self, queue, **kwargs):
+        """Return a producer sending messages to a queue in batches
+
+        :param queue: The queue id or an instance of
+                      :class:`~openstack.dms.v1.queue.Queue`
+        :param dict kwargs: The arguments of the
+                            :class:`~openstack.dms.v1.client.Producer`,
+                            e.g. ``concurrency``.
+        :returns: A :class:`~openstack.dms.v1.client.Producer`
+        """
+        return _client.Producer(self, queue, **kwargs)
+
+    def consumer(self, queue, consume_group, **kwargs):
+        """Return a long-polling consumer of a queue
+
+        :param queue: The queue id or an instance of
+                      :class:`~openstack.dms.v1.queue.Queue`
+        :param consume_group: The consume group id or an instance of
+                      :class:`~openstack.dms.v1.queue.Group`
+        :param dict kwargs: The arguments of the
+                            :class:`~openstack.dms.v1.client.Consumer`,
+                            e.g. ``time_wait`` and ``max_in_flight``.
+        :returns: A :class:`~openstack.dms.v1.client.Consumer`
+        """
+        return _client.Consumer(self, queue, consume_group, **kwargs)
+
     def quotas(self):
         return self._list(_queue.Quota)
@@ -0,0 +1,350 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+High throughput producer and consumer of a DMS queue.
+
+A :class:`Producer` sends messages in batches as large as DMS accepts::
+
+    producer = conn.dms.producer(queue)
+    producer.send({"body": line} for line in lines)
+
+A :class:`Consumer` long-polls the queue and yields the messages one at a
+time. The messages are acknowledged in batches, posted while the next
+messages are consumed, and at most ``max_in_flight`` messages are consumed
+and not acknowledged at any time::
+
+    with conn.dms.consumer(queue, group, time_wait=30) as consumer:
+        for message in consumer:
+            handle(message.message)
+
+Both keep the counters returned by their ``stats`` method.
+"""
+
+import collections
+from concurrent import futures
+import json
+import threading
+import time
+
+from keystoneauth1 import _utils as log_utils
+
+from openstack import exceptions
+from openstack import instrumentation
+from openstack import utils
+
+_logger = log_utils.get_logger(__name__)
+
+#: Most messages sent in one request.
+MAX_BATCH_MESSAGES = 10
+
+#: Largest body sent in one request, in bytes.
+MAX_BATCH_BYTES = 512 * 1024
+
+#: Most messages consumed in one request.
+MAX_CONSUME_MESSAGES = 10
+
+#: Longest wait of a consume request for messages, in seconds.
+MAX_TIME_WAIT = 60
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def _get_id(value):
+    return getattr(value, "id", value)
+
+
+class _Stats(object):
+    # Counters and request latencies, shared with the ack thread
+
+    def __init__(self, queue_id):
+        self.queue_id = queue_id
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counters = collections.Counter()
+        self._latency = instrumentation.Histogram()
+
+    def count(self, latency=None, **values):
+        with self._lock:
+            self._counters.update(values)
+            if latency is not None:
+                self._latency.observe(latency)
+
+    def summary(self, rate_key, keys, **extra):
+        with self._lock:
+            result = dict((key, self._counters[key]) for key in keys)
+            result["latency"] = self._latency.summary()
+        elapsed = time.time() - self.started
+        result["rate"] = result[rate_key] / elapsed if elapsed > 0 else 0.0
+        result["queue"] = self.queue_id
+        result.update(extra)
+        return result
+
+
+class Producer(object):
+    """Sender of messages to a queue in batches"""
+
+    def __init__(self, proxy, queue, max_batch_messages=MAX_BATCH_MESSAGES,
+                 max_batch_bytes=MAX_BATCH_BYTES, concurrency=1):
+        """
+        :param proxy: The dms :class:`~openstack.dms.v1._proxy.Proxy`.
+        :param queue: The queue id or an instance of
+                      :class:`~openstack.dms.v1.queue.Queue`
+        :param int max_batch_messages: Most messages sent in one request.
+        :param int max_batch_bytes: Largest body sent in one request.
+        :param int concurrency: The number of requests sent at the same time.
+        """
+        self.proxy = proxy
+        self.queue_id = _get_id(queue)
+        self.max_batch_messages = max_batch_messages
+        self.max_batch_bytes = max_batch_bytes
+        self.concurrency = concurrency
+        self._stats = _Stats(self.queue_id)
+
+    def send(self, messages):
+        """Send messages
+
+        :param messages: An iterable of messages, dicts with a ``body`` and
+                         optional ``attributes`` and ``tags``.
+        :return: The number of messages sent.
+        :raises: :class:`~openstack.exceptions.InvalidRequest` when a message
+                 alone is larger than a batch. The exception of a failed
+                 request is raised once the requests sent before it
+                 completed.
+        """
+        batches = self._batches(messages)
+        return sum(utils.iter_concurrently(self._post, batches,
+                                           self.concurrency))
+
+    def stats(self):
+        """Return the counters of the producer
+
+        :return: A dict with the numbers of messages ``sent`` and ``failed``,
+                 of ``batches`` and ``failed_batches`` and of ``bytes`` sent,
+                 the ``rate`` of messages sent per second, and the
+                 ``latency`` of the requests as a dict of their ``mean``,
+                 ``p50``, ``p99`` and ``max`` in seconds.
+        """
+        return self._stats.summary("sent", ("sent", "failed", "batches",
+                                            "failed_batches", "bytes"))
+
+    def _batches(self, messages):
+        batch = []
+        # the size of {"messages": []}
+        size = size_empty = 16
+        for message in messages:
+            # an upper bound of the size of the message as the session
+            # encodes it
+            message_size = len(json.dumps(message)) + 1
+            if message_size + size_empty > self.max_batch_bytes:
+                raise exceptions.InvalidRequest(
+                    "A message of %d bytes is larger than the %d bytes of a "
+                    "batch" % (message_size, self.max_batch_bytes))
+            if batch and (len(batch) >= self.max_batch_messages or
+                          size + message_size > self.max_batch_bytes):
+                yield batch, size
+                batch = []
+                size = size_empty
+            batch.append(message)
+            size += message_size
+        if batch:
+            yield batch, size
+
+    def _post(self, item):
+        batch, size = item
+        started = _clock()
+        try:
+            self.proxy.send_messages(self.queue_id, messages=batch)
+        except Exception:
+            self._stats.count(_clock() - started, failed=len(batch),
+                              failed_batches=1)
+            raise
+        self._stats.count(_clock() - started, sent=len(batch), batches=1,
+                          bytes=size)
+        return len(batch)
+
+
+class Consumer(object):
+    """Long-polling consumer of a queue for a consumer group
+
+    Iterating the consumer yields the consumed
+    :class:`~openstack.dms.v1.queue.MessageConsume` one at a time. A
+    message is acknowledged with :meth:`ack`, or when the next one is
+    requested if ``auto_ack`` is set. The acknowledgements are posted in
+    one request by a background thread when the next messages are
+    consumed.
+    """
+
+    def __init__(self, proxy, queue, consume_group,
+                 max_msgs=MAX_CONSUME_MESSAGES, time_wait=MAX_TIME_WAIT,
+                 max_in_flight=100, tags=None, auto_ack=True,
+                 stop_when_empty=False):
+        """
+        :param proxy: The dms :class:`~openstack.dms.v1._proxy.Proxy`.
+        :param queue: The queue id or an instance of
+                      :class:`~openstack.dms.v1.queue.Queue`
+        :param consume_group: The consume group id or an instance of
+                              :class:`~openstack.dms.v1.queue.Group`
+        :param int max_msgs: Most messages consumed in one request.
+        :param int time_wait: How long a consume request waits for messages
+                              on an empty queue, in seconds.
+        :param int max_in_flight: Most messages consumed and not yet
+                                  acknowledged.
+        :param list tags: Only consume the messages with these tags.
+        :param bool auto_ack: Acknowledge a message with ``success`` when
+                              the next one is requested. The message being
+                              handled when the iteration stops is not
+                              acknowledged.
+        :param bool stop_when_empty: Stop the iteration when a consume
+                                     request returns no message.
+        """
+        self.proxy = proxy
+        self.queue_id = _get_id(queue)
+        self.consume_group_id = _get_id(consume_group)
+        self.max_msgs = max(min(int(max_msgs), MAX_CONSUME_MESSAGES), 1)
+        self.time_wait = time_wait
+        self.max_in_flight = max(int(max_in_flight), 1)
+        self.tags = tags
+        self.auto_ack = auto_ack
+        self.stop_when_empty = stop_when_empty
+        self.lag = None
+        self._executor = futures.ThreadPoolExecutor(max_workers=1)
+        # (handler, status) acknowledged and not yet posted
+        self._acks = []
+        # (future, number of messages) of the posted acknowledgements
+        self._posted = collections.deque()
+        # consumed and not settled by a completed ack request
+        self._in_flight = 0
+        self._stopped = False
+        self._stats = _Stats(self.queue_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        while not self._stopped:
+            messages = self._consume()
+            if not messages and self.stop_when_empty:
+                return
+            for message in messages:
+                yield message
+                if self.auto_ack:
+                    self.ack(message)
+
+    def ack(self, message, status="success"):
+        """Acknowledge a consumed message
+
+        The acknowledgement is posted with the next consume request, or on
+        :meth:`close`.
+
+        :param message: A consumed
+                        :class:`~openstack.dms.v1.queue.MessageConsume`.
+        :param str status: ``success``, or ``fail`` to consume the message
+                           again.
+        """
+        self._acks.append((message.handler, status))
+
+    def stop(self):
+        """Stop the iteration once the current messages are yielded"""
+        self._stopped = True
+
+    def close(self):
+        """Post the pending acknowledgements and wait for them"""
+        self._stopped = True
+        self._post_acks()
+        while self._posted:
+            self._settle(*self._posted.popleft())
+        self._executor.shutdown(wait=True)
+
+    def refresh_lag(self):
+        """Fetch the number of messages available to the consumer group
+
+        :return: The number of messages the group has not consumed yet,
+                 also returned as ``lag`` by :meth:`stats`.
+        """
+        for group in self.proxy.groups(self.queue_id):
+            if group.id == self.consume_group_id:
+                self.lag = group.available_messages
+                break
+        return self.lag
+
+    def stats(self):
+        """Return the counters of the consumer
+
+        :return: A dict with the numbers of messages ``consumed``,
+                 ``acked``, and ``ack_failed`` by DMS or in a failed
+                 request, of consume ``requests`` and ``empty_requests``,
+                 of messages ``in_flight``, the ``rate`` of messages
+                 consumed per second, the last ``lag`` fetched by
+                 :meth:`refresh_lag`, and the ``latency`` of the consume
+                 requests as a dict of their ``mean``, ``p50``, ``p99``
+                 and ``max`` in seconds.
+        """
+        return self._stats.summary(
+            "consumed", ("consumed", "acked", "ack_failed", "requests",
+                         "empty_requests"),
+            in_flight=self._in_flight, lag=self.lag)
+
+    def _consume(self):
+        # The acknowledgements are posted while the next messages are
+        # consumed, and the ack requests are waited for only when the
+        # window is full.
+        self._post_acks()
+        while self._posted and self._posted[0][0].done():
+            self._settle(*self._posted.popleft())
+        room = self.max_in_flight - self._in_flight
+        while room <= 0 and self._posted:
+            self._settle(*self._posted.popleft())
+            room = self.max_in_flight - self._in_flight
+        if room <= 0:
+            raise exceptions.SDKException(
+                "%d messages are consumed and not acknowledged, ack them "
+                "before consuming more" % self._in_flight)
+
+        query = {"max_msgs": min(self.max_msgs, room),
+                 "time_wait": self.time_wait}
+        if self.tags:
+            query["tags"] = self.tags
+        started = _clock()
+        messages = self.proxy.consume_message(
+            self.queue_id, self.consume_group_id, **query)
+        self._in_flight += len(messages)
+        self._stats.count(_clock() - started, consumed=len(messages),
+                          requests=1, empty_requests=int(not messages))
+        return messages
+
+    def _post_acks(self):
+        if self._acks:
+            acks, self._acks = self._acks, []
+            future = self._executor.submit(
+                self.proxy.ack_messages, self.queue_id,
+                self.consume_group_id, acks)
+            self._posted.append((future, len(acks)))
+
+    def _settle(self, future, count):
+        # The messages of a failed request are consumed again once their
+        # reservation expires, they are not in flight anymore either way.
+        self._in_flight -= count
+        try:
+            result = future.result() or {}
+        except Exception:
+            _logger.warning("Failed to acknowledge %d messages", count,
+                            exc_info=True)
+            self._stats.count(ack_failed=count)
+            return
+        failed = result.get("fail") or 0
+        self._stats.count(acked=count - failed, ack_failed=failed)
@@ -131,9 +131,8 @@ class Message(_dmsresource.Resource):
         endpoint_override = cls.service.get_endpoint_override()
         uri = cls.base_path % {'queue_id': queue_id}
 
-        headers = {}
-        headers.update({'Content-type': 'application/json'})
-        headers.update({'Content-Length': str(len(str(kwargs)))})
+        # Content-Length is the one of the encoded body, set by requests
+        headers = {'Content-type': 'application/json'}
 
         response = session.post(uri, endpoint_filter=cls.service,
                                 endpoint_override=endpoint_override,
@@ -148,7 +147,8 @@ class MessageConsume(resource.Resource):
 
     service = dms_service.DMSService()
 
-    _query_mapping = resource.QueryParameters('max_msgs', 'time_wait')
+    _query_mapping = resource.QueryParameters('max_msgs', 'time_wait',
+                                              tags='tag')
 
     # Properties
     #: Queue id
@@ -169,30 +169,6 @@ class MessageConsume(resource.Resource):
     #: *Type: int
     fail = resource.Body('fail', type=int)
 
-    # NOTES: this API is so different from others, it's not a RESTFUL
-    # style, allow user to pass mulitple tags as the query parameters
-    # which can not leverage method of session directlly.
-    # return an url with query params
-    # it accepts multiple query params e.g. tag=tag1&tag=tag2
-    # S-u-c-k-s, huh !
-    @classmethod
-    def _assemble_query_params(cls, base_url, params):
-        # pop queue_id and consumer_group_id
-        params.pop('queue_id', None)
-        params.pop('consumer_group_id', None)
-        if len(params) == 0:
-            return base_url
-        base_url = base_url + '?'
-        for (p, v) in params.items():
-            if p == 'tags':
-                for tag in v:
-                    base_url = base_url + 'tag=' + tag + '&'
-            else:
-                base_url = base_url + p + '=' + str(v) + '&'
-
-        # remove last `&`
-        return base_url[:-1]
-
     # use get method to consume message, return a list of self
     @classmethod
     def list(cls, session, paginated=False, **params):
@@ -202,38 +178,46 @@ class MessageConsume(resource.Resource):
         uri = cls.base_path % params
         endpoint_override = cls.service.get_endpoint_override()
 
-        tags = params.get("tags", None)
-        # NOTES: this API is so different from others, it's not a RESTFUL
-        # style, allow user to pass mulitple tags as the query parameters
-        # which can not leverage method of session directlly.
-        if tags is not None:
-            if endpoint_override is not None:
-                uri = cls._assemble_query_params(uri, params)
-                full_url = endpoint_override % {'project_id':
-                                                session.get_project_id()}
-                full_url = full_url + uri
-                resp = session.get(full_url, endpoint_filter=cls.service,
-                                   headers=headers)
-            else:
-                # TOOD: Don't support non override yet
-                resp = None
-        else:
-            query_params = cls._query_mapping._transpose(params)
-            resp = session.get(uri, endpoint_filter=cls.service,
-                               endpoint_override=endpoint_override,
-                               headers=headers,
-                               params=query_params)
+        # NOTES: the tags are sent as multiple query parameters,
+        # e.g. tag=tag1&tag=tag2, which requests does for a list value.
+        query_params = cls._query_mapping._transpose(params)
+        resp = session.get(uri, endpoint_filter=cls.service,
+                           endpoint_override=endpoint_override,
+                           headers=headers,
+                           params=query_params)
 
-        if resp is not None:
-            resp = resp.json()
-            ret = []
-            # resp is a list
-            for r in resp:
-                r['queue_id'] = params.get('queue_id')
-                r['consumer_group_id'] = params.get('consumer_group_id')
-                ret.append(cls.existing(**r))
+        resp = resp.json()
+        ret = []
+        # resp is a list
+        for r in resp:
+            r['queue_id'] = params.get('queue_id')
+            r['consumer_group_id'] = params.get('consumer_group_id')
+            ret.append(cls.existing(**r))
 
-            return ret
+        return ret
+
+    @classmethod
+    def ack_handlers(cls, session, queue_id, consumer_group_id, handlers):
+        """Confirm consumed messages by their handlers
+
+        :param session: The session to use for making this request.
+        :param str queue_id: The queue id.
+        :param str consumer_group_id: The consumer group id.
+        :param list handlers: A list of ``(handler, status)`` tuples, where
+                              status is ``success`` or ``fail``.
+        :returns: A dict of the ``success`` and ``fail`` numbers.
+        """
+        endpoint_override = cls.service.get_endpoint_override()
+        base_path = 'ack'.join(cls.base_path.rsplit('messages', 1))
+        uri = base_path % {'queue_id': queue_id,
+                           'consumer_group_id': consumer_group_id}
+        body = {"message": [{"handler": handler, "status": status}
+                            for handler, status in handlers]}
+        response = session.post(uri, endpoint_filter=cls.service,
+                                endpoint_override=endpoint_override,
+                                json=body,
+                                headers={'Content-type': 'application/json'})
+        return response.json()
 
     def ack(self, session, consumed_messages, status='success'):
 
@@ -253,7 +237,6 @@ class MessageConsume(resource.Resource):
 
         headers = self._header.dirty
         headers.update({'Content-type': 'application/json'})
-        headers.update({'Content-Length': str(len(str(body)))})
         response = session.post(uri, endpoint_filter=self.service,
                                 endpoint_override=endpoint_override,
                                 json=body, headers=headers
@@ -16,6 +16,7 @@ from openstack.dns.v2 import name_server as _name_server
 from openstack.dns.v2 import ptr as _ptr
 from openstack.dns.v2 import recordset as _recordset
 from openstack.dns.v2 import router as _router
+from openstack.dns.v2 import sync as _sync
 from openstack.dns.v2 import zone as _zone
 from openstack.exceptions import InvalidRequest
 from openstack import proxy2
@@ -171,6 +172,24 @@ class Proxy(proxy2.BaseProxy):
         query.update({'zone_id': zone.id})
         return self._list(_recordset.Recordset, paginated=True, **query)
 
+    def update_recordset(self, zone, recordset, **attrs):
+        """Update a recordset
+
+        :param zone: The value can be the ID of a zone
+             or a :class:`~openstack.dns.v2.zone.Zone` instance.
+        :param recordset: The value can be the ID of a recordset
+             or a :class:`~openstack.dns.v2.recordset.Recordset` instance.
+        :param dict attrs: The attributes to update on the recordset,
+                           e.g. ``records``, ``ttl`` and ``description``.
+        :returns: The updated recordset
+        :rtype: :class:`~openstack.dns.v2.recordset.Recordset`
+        """
+        zone = self._get_resource(_zone.Zone, zone)
+        recordset = self._get_resource(_recordset.Recordset, recordset,
+                                       zone_id=zone.id)
+        return self._update(_recordset.Recordset, recordset,
+                            prepend_key=False, **attrs)
+
     def delete_recordset(self, zone, recordset, ignore_missing=True):
         """Delete a zone
 
@@ -206,6 +225,29 @@ class Proxy(proxy2.BaseProxy):
         """
         return self._list(_recordset.Recordsets, paginated=True, **query)
 
+    def sync_recordsets(self, zone, records, dry_run=False, **kwargs):
+        """Create, update and delete the recordsets of a zone to match records
+
+        The recordsets of the zone are listed once and only the differences
+        are applied, concurrently.
+
+        :param zone: The value can be the ID of a zone
+             or a :class:`~openstack.dns.v2.zone.Zone` instance.
+        :param records: An iterable of dicts with the ``name``, ``type`` and
+                        ``records`` of the desired recordsets, and optional
+                        ``ttl`` and ``description``.
+        :param bool dry_run: Only compute the changes, without applying them.
+        :param dict kwargs: The arguments of the
+                            :class:`~openstack.dns.v2.sync.ZoneSync`, e.g.
+                            ``prune``, ``types``, ``concurrency`` and
+                            ``rate``.
+        :returns: The changes, with the ``applied`` and ``errors`` of them
+                  unless it is a dry run.
+        :rtype: :class:`~openstack.dns.v2.sync.Plan`
+        """
+        return _sync.ZoneSync(self, zone, records, **kwargs).sync(
+            dry_run=dry_run)
+
     def create_ptr(self, **attrs):
         """Create a new ptr of zone
 
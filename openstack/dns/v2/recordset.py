@@ -27,6 +27,7 @@ class Recordset(resource.Resource):
     allow_create = True
     allow_list = True
     allow_get = True
+    allow_update = True
     allow_delete = True
 
     _query_mapping = resource.QueryParameters(
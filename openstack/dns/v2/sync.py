@@ -0,0 +1,266 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Synchronization of the recordsets of a zone with a desired state.
+
+A :class:`ZoneSync` lists the recordsets of the zone once, indexes them by
+name and type and computes the :class:`Plan` of the recordsets to create,
+update and delete to reach the desired records. The plan is applied
+concurrently, the deletions first, then the updates and the creations::
+
+    desired = [{"name": "api", "type": "A", "records": ["10.0.0.1"]},
+               {"name": "www.example.com.", "type": "CNAME",
+                "records": ["api.example.com."], "ttl": 60}]
+    plan = conn.dns.sync_recordsets(zone, desired, dry_run=True)
+    print(plan.summary())
+    plan = conn.dns.sync_recordsets(zone, desired, rate=20)
+
+The names not ending with a dot are relative to the zone, ``@`` is the
+zone itself. The recordsets created by the system, e.g. the SOA and NS
+recordsets of the zone, are never changed.
+"""
+
+import functools
+import threading
+
+from openstack.dns.v2 import zone as _zone
+from openstack import exceptions
+from openstack import retry
+from openstack import utils
+
+#: Most recordsets listed per page.
+MAX_LIMIT = 500
+
+# the attributes of a desired record sent to create it
+_ATTRIBUTES = ("name", "type", "records", "ttl", "description")
+
+
+def _key(name, type):
+    return name.lower(), type.upper()
+
+
+class Plan(object):
+    """The changes bringing the recordsets of a zone to the desired state"""
+
+    def __init__(self, zone):
+        #: The :class:`~openstack.dns.v2.zone.Zone` synchronized.
+        self.zone = zone
+        #: The desired records to create, as dicts.
+        self.create = []
+        #: ``(recordset, changes)`` tuples of the recordsets to update and
+        #: the dict of their changed attributes.
+        self.update = []
+        #: The recordsets to delete.
+        self.delete = []
+        #: The number of desired records already up to date.
+        self.unchanged = 0
+        #: ``(action, record, error)`` tuples of the changes which failed
+        #: once the plan is applied.
+        self.errors = []
+        #: The number of changes applied successfully.
+        self.applied = 0
+
+    def __len__(self):
+        return len(self.create) + len(self.update) + len(self.delete)
+
+    def summary(self):
+        """Return the number of changes of every kind
+
+        :returns: A dict with the numbers of recordsets to ``create``,
+                  ``update`` and ``delete``, of ``unchanged`` ones, and of
+                  changes ``applied`` and failed with ``errors``.
+        """
+        return {"create": len(self.create), "update": len(self.update),
+                "delete": len(self.delete), "unchanged": self.unchanged,
+                "applied": self.applied, "errors": len(self.errors)}
+
+
+class ZoneSync(object):
+    """Reconcile the recordsets of a zone with desired records"""
+
+    def __init__(self, proxy, zone, records, prune=True, types=None,
+                 concurrency=8, rate=None, limit=MAX_LIMIT):
+        """
+        :param proxy: The dns :class:`~openstack.dns.v2._proxy.Proxy`.
+        :param zone: The value can be the ID of a zone or a
+                     :class:`~openstack.dns.v2.zone.Zone` instance.
+        :param records: An iterable of dicts with the ``name``, ``type`` and
+                        ``records`` of the desired recordsets, and optional
+                        ``ttl`` and ``description`` compared only when they
+                        are given.
+        :param bool prune: Delete the recordsets which are not desired.
+        :param types: The record types synchronized, e.g. ``["A", "SRV"]``,
+                      the recordsets of the other types are left untouched.
+                      All the types by default.
+        :param int concurrency: The number of requests sent at the same time.
+        :param float rate: Most requests sent per second, unlimited when
+                           ``None``.
+        :param int limit: The number of recordsets listed per page.
+        """
+        self.proxy = proxy
+        if isinstance(zone, _zone.Zone) and zone.name:
+            self.zone = zone
+        else:
+            self.zone = proxy.get_zone(zone)
+        self.prune = prune
+        self.types = set(t.upper() for t in types) if types else None
+        self.concurrency = concurrency
+        self.limit = max(min(int(limit), MAX_LIMIT), 1)
+        self._bucket = retry.TokenBucket(rate) if rate else None
+        self._lock = threading.Lock()
+        self.desired = self._index(records)
+
+    def plan(self):
+        """List the recordsets of the zone and compute the changes
+
+        :returns: A :class:`Plan`
+        """
+        plan = Plan(self.zone)
+        current = {}
+        for recordset in self.proxy.recordsets(self.zone, limit=self.limit,
+                                               lightweight=True):
+            if recordset.default or not self._managed(recordset.type):
+                continue
+            key = _key(recordset.name, recordset.type)
+            if key in current:
+                # the same name and type twice, only one is kept
+                if self.prune:
+                    plan.delete.append(recordset)
+                continue
+            current[key] = recordset
+
+        for key, record in self.desired.items():
+            recordset = current.pop(key, None)
+            if recordset is None:
+                plan.create.append(record)
+                continue
+            changes = self._changes(recordset, record)
+            if changes:
+                plan.update.append((recordset, changes))
+            else:
+                plan.unchanged += 1
+        if self.prune:
+            plan.delete.extend(current.values())
+        return plan
+
+    def apply(self, plan=None):
+        """Apply the changes of a plan
+
+        The deletions are applied first so that a name can change of type,
+        then the updates and the creations.
+
+        :param plan: The :class:`Plan` to apply, computed by :meth:`plan`
+                     by default.
+        :returns: A generator of ``(action, record, result, error)`` tuples,
+                  ``action`` being ``create``, ``update`` or ``delete``,
+                  ``record`` the desired record dict or the deleted
+                  recordset, and ``result`` the recordset returned by the
+                  request or ``None`` when it failed with the exception
+                  ``error``. The failed changes are added to the
+                  ``errors`` of the plan.
+        """
+        plan = self.plan() if plan is None else plan
+        phases = (
+            ("delete", [(item, item) for item in plan.delete]),
+            ("update", [(self.desired[_key(item[0].name, item[0].type)], item)
+                        for item in plan.update]),
+            ("create", [(item, item) for item in plan.create]),
+        )
+        for action, items in phases:
+            call = functools.partial(self._call, getattr(self, "_" + action))
+            for record, result, error in utils.iter_concurrently(
+                    call, items, self.concurrency):
+                with self._lock:
+                    if error is None:
+                        plan.applied += 1
+                    else:
+                        plan.errors.append((action, record, error))
+                yield action, record, result, error
+
+    def sync(self, dry_run=False):
+        """Compute the changes and apply them unless it is a dry run
+
+        :param bool dry_run: Only compute the changes.
+        :returns: The :class:`Plan`, with the ``applied`` and ``errors``
+                  of its changes unless it is a dry run.
+        """
+        plan = self.plan()
+        if not dry_run:
+            for _ in self.apply(plan):
+                pass
+        return plan
+
+    def _index(self, records):
+        zone_name = self.zone.name.lower()
+        if not zone_name.endswith("."):
+            zone_name += "."
+        desired = {}
+        for record in records:
+            try:
+                name, type = record["name"], record["type"].upper()
+                values = record["records"]
+            except KeyError as e:
+                raise exceptions.InvalidRequest(
+                    "Desired record %s has no %s" % (record, e))
+            name = name.lower()
+            if name in ("", "@"):
+                name = zone_name
+            elif not name.endswith("."):
+                name = "%s.%s" % (name, zone_name)
+            if not self._managed(type):
+                raise exceptions.InvalidRequest(
+                    "Desired record %s has a type which is not synchronized"
+                    % name)
+            key = _key(name, type)
+            if key in desired:
+                raise exceptions.InvalidRequest(
+                    "Desired record %s %s is given twice" % key)
+            record = dict(record, name=name, type=type, records=list(values))
+            desired[key] = record
+        return desired
+
+    def _managed(self, type):
+        return self.types is None or type.upper() in self.types
+
+    def _changes(self, recordset, record):
+        changes = {}
+        if sorted(recordset.records or []) != sorted(record["records"]):
+            changes["records"] = record["records"]
+        for name in ("ttl", "description"):
+            if name in record and getattr(recordset, name) != record[name]:
+                changes[name] = record[name]
+        return changes
+
+    def _call(self, func, item):
+        record, argument = item
+        if self._bucket is not None:
+            self._bucket.acquire()
+        try:
+            return record, func(argument), None
+        except Exception as e:
+            return record, None, e
+
+    def _create(self, record):
+        attrs = dict((name, record[name])
+                     for name in _ATTRIBUTES
+                     if name in record)
+        return self.proxy.create_recordset(self.zone, **attrs)
+
+    def _update(self, item):
+        recordset, changes = item
+        return self.proxy.update_recordset(self.zone, recordset.id, **changes)
+
+    def _delete(self, recordset):
+        return self.proxy.delete_recordset(self.zone, recordset.id)
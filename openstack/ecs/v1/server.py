@@ -347,6 +347,8 @@ class ServerDetail(Servers):
         flavor_id='flavor'
     )
 
+    total_path = 'count'
+
     # The total number of lists of elastic cloud servers.
     count = resource2.Body('count', type=int)
     # Elastic cloud server details list.
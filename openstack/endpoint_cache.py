@@ -0,0 +1,230 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Endpoint catalog caches for :class:`~openstack.aksksession.ASKSession`.
+
+An :class:`EndpointCache` keeps the service catalog fetched from IAM and the
+version matched endpoint of every service type. One cache instance can be
+shared by many sessions, and :class:`FileEndpointCache` also shares it between
+processes of the same host::
+
+    from openstack import connection
+    from openstack import endpoint_cache
+
+    cache = endpoint_cache.FileEndpointCache("/var/cache/sdk", ttl=3600)
+    conn = connection.Connection(ak=ak, sk=sk, project_id=project_id,
+                                 region=region, domain=domain,
+                                 endpoint_cache=cache)
+
+A user-supplied backend subclasses :class:`EndpointCache` and implements
+:meth:`~EndpointCache.read`, :meth:`~EndpointCache.write` and
+:meth:`~EndpointCache.delete`.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class EndpointCache(object):
+    """Base class of the endpoint caches.
+
+    Entries are stored as ``{"expires": <epoch seconds or None>,
+    "value": <json value>}`` so that any backend can honor the TTL.
+    """
+
+    # Most population locks kept, the keys of a long-lived cache are not
+    # bounded.
+    _MAX_LOCKS = 1024
+
+    def __init__(self, ttl=None):
+        """
+        :param ttl: seconds an entry stays valid, ``None`` means forever
+        """
+        self.ttl = ttl
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def read(self, key):
+        """
+        :param key: the key of the entry
+        :return: the stored entry or None
+        """
+        raise NotImplementedError
+
+    def write(self, key, entry):
+        """
+        :param key: the key of the entry
+        :param entry: the entry to store
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """
+        :param key: the key of the entry to remove
+        """
+        raise NotImplementedError
+
+    def get(self, key):
+        """
+        :param key: the key of the entry
+        :return: the cached value or None if it is missing or expired
+        """
+        entry = self.read(key)
+        if entry is None:
+            return None
+        expires = entry.get("expires")
+        if expires is not None and expires <= time.time():
+            self.delete(key)
+            return None
+        return entry.get("value")
+
+    def set(self, key, value):
+        """
+        :param key: the key of the entry
+        :param value: a json serializable value
+        """
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        self.write(key, {"expires": expires, "value": value})
+
+    def get_or_create(self, key, creator):
+        """Return the cached value, populating it once on a miss.
+
+        Concurrent callers missing the same key wait for the first one to
+        run ``creator`` instead of running it themselves. Empty values are
+        returned but not cached.
+
+        :param key: the key of the entry
+        :param creator: callable without argument returning the value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock(key):
+            value = self.get(key)
+            if value is None:
+                value = creator()
+                if value:
+                    self.set(key, value)
+            return value
+
+    def _lock(self, key):
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                if len(self._locks) >= self._MAX_LOCKS:
+                    self._locks.clear()
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+
+class MemoryEndpointCache(EndpointCache):
+    """Endpoint cache held in the memory of the current process"""
+
+    def __init__(self, ttl=None):
+        super(MemoryEndpointCache, self).__init__(ttl=ttl)
+        self._entries = {}
+
+    def read(self, key):
+        return self._entries.get(key)
+
+    def write(self, key, entry):
+        self._entries[key] = entry
+
+    def delete(self, key):
+        self._entries.pop(key, None)
+
+
+class _FileLock(object):
+    """Serialize the population of one key between processes"""
+
+    def __init__(self, thread_lock, path):
+        self._thread_lock = thread_lock
+        self._path = path
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if fcntl is not None:
+            self._fd = os.open(self._path, os.O_CREAT | os.O_RDWR, 0o600)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+
+class FileEndpointCache(EndpointCache):
+    """Endpoint cache stored as json files in a local directory
+
+    Every key is written to its own file with an atomic rename, so readers
+    never see a partial entry, and population is serialized between
+    processes with a lock file where ``fcntl`` is available.
+    """
+
+    def __init__(self, directory, ttl=None):
+        """
+        :param directory: the directory holding the cache files, it is
+                          created if missing
+        :param ttl: seconds an entry stays valid, ``None`` means forever
+        """
+        super(FileEndpointCache, self).__init__(ttl=ttl)
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, key, suffix=".json"):
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + suffix)
+
+    def read(self, key):
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def write(self, key, entry):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            getattr(os, "replace", os.rename)(tmp, self._path(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _lock(self, key):
+        thread_lock = super(FileEndpointCache, self)._lock(key)
+        return _FileLock(thread_lock, self._path(key, suffix=".lock"))
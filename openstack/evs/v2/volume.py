@@ -143,6 +143,8 @@ class VolumeDetail(Volume):
 
     allow_list = True
 
+    total_path = 'count'
+
     # The total number of lists of elastic cloud volumes.
     count = resource2.Body('count', type=int)
     # Elastic cloud volume details list.
@@ -12,8 +12,8 @@
 # CONDITIONS OF ANY KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations under the License.
 
-import copy
 from openstack.fgs.v2 import functions as _function
+from openstack.fgs.v2 import invoke as _invoke
 from openstack.fgs.v2 import triggers as _trigger
 from openstack import proxy2
 
@@ -148,7 +148,7 @@ class Proxy(proxy2.BaseProxy):
         :param  attrs: usedata
         :return: :class:`~openstack.fgs.v2.functions.FunctionInvocations
         """
-        req_body = copy.deepcopy(attrs)
+        req_body = dict(attrs)
         attrs["function_urn"] = function_urn
         res = _function.FunctionInvocations.new(**attrs)
         return res.create(self._session, prepend_key=False, **req_body)
@@ -159,11 +159,36 @@ class Proxy(proxy2.BaseProxy):
         :param  function_urn: Uniform Resource Name (URN) used to uniquely identify a function.
         :return: :class:`~openstack.fgs.v2.functions.FunctionInvocationsAsync
         """
-        req_body = copy.deepcopy(attrs)
+        req_body = dict(attrs)
         attrs["function_urn"] = function_urn
         res = _function.FunctionInvocationsAsync.new(**attrs)
         return res.create(self._session, prepend_key=False, **req_body)
 
+    def function_invoker(self, function_urn, **kwargs):
+        """
+        Return an invoker executing a function concurrently
+        :param  function_urn: Uniform Resource Name (URN) used to uniquely identify a function.
+        :param  kwargs: The arguments of the :class:`~openstack.fgs.v2.invoke.Invoker`,
+                        e.g. ``asynchronous``, ``concurrency`` and ``rate``.
+        :return: :class:`~openstack.fgs.v2.invoke.Invoker`
+        """
+        return _invoke.Invoker(self._session, function_urn, **kwargs)
+
+    def execute_functions(self, function_urn, payloads, ordered=False, **kwargs):
+        """
+        Executing a Function with every payload concurrently
+        :param  function_urn: Uniform Resource Name (URN) used to uniquely identify a function.
+        :param  payloads: An iterable of usedata, consumed as the results are yielded.
+        :param  ordered: Yield the results in the order of the payloads instead of
+                         as soon as they complete.
+        :param  kwargs: The arguments of the :class:`~openstack.fgs.v2.invoke.Invoker`,
+                        e.g. ``asynchronous``, ``concurrency`` and ``rate``.
+        :return: A generator of ``(index, payload, result, error, latency)`` tuples,
+                 see :meth:`~openstack.fgs.v2.invoke.Invoker.map`
+        """
+        invoker = self.function_invoker(function_urn, **kwargs)
+        return invoker.map(payloads, ordered=ordered)
+
     def create_trigger(self, function_urn, **attrs):
         """
         This API is used to create a trigger.
@@ -16,6 +16,14 @@ from openstack.fgs import fgs_service
 from openstack import resource2 as resource
 from openstack import exceptions
 
+#: Headers of the invocation requests.
+INVOCATION_HEADERS = {"Accept": "*/*",
+                      "Content-type": "application/json;charset=UTF-8",
+                      "x-cf2-passthrough": "true",
+                      "x-cff-log-type": "tail",
+                      "x-cff-request-version": "v1"
+                      }
+
 
 class Function(resource.Resource):
     resources_key = 'functions'
@@ -230,12 +238,7 @@ class FunctionInvocations(Function):
         request = self._prepare_request(requires_id=False,
                                         prepend_key=prepend_key)
         request.body = attrs
-        request.headers = {"Accept": "*/*",
-                           "Content-type": "application/json;charset=UTF-8",
-                           "x-cf2-passthrough": "true",
-                           "x-cff-log-type": "tail",
-                           "x-cff-request-version": "v1"
-                           }
+        request.headers = dict(INVOCATION_HEADERS)
         response = session.post(request.uri, endpoint_filter=self.service,
                                 endpoint_override=endpoint_override,
                                 json=request.body, headers=request.headers)
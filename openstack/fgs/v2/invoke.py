@@ -0,0 +1,145 @@
+# -*- coding:utf-8 -*-
+# Copyright 2019 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Concurrent invocations of a function.
+
+An :class:`Invoker` posts the payloads of an iterable from a bounded pool of
+threads and yields the result of every invocation as soon as it completes,
+with its latency. The payloads are read as the results are consumed, so
+that at most twice ``concurrency`` invocations are pending at any time
+whatever the number of payloads::
+
+    invoker = conn.fgs.function_invoker(function_urn, concurrency=32)
+    for index, payload, result, error, latency in invoker.map(payloads):
+        ...
+    print(invoker.stats())
+
+The asynchronous invocations only queue the executions, ``rate`` spaces
+them out so that a large fan-out does not exceed the function quota.
+The responses are returned as dicts, no resource is built per invocation.
+"""
+
+import collections
+import threading
+import time
+
+from openstack.fgs.v2 import functions as _function
+from openstack import instrumentation
+from openstack import retry
+from openstack import utils
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+class Invoker(object):
+    """Concurrent invocations of one function"""
+
+    def __init__(self, session, function_urn, asynchronous=False,
+                 concurrency=16, rate=None):
+        """
+        :param session: The session to use for making the requests.
+        :param str function_urn: The URN of the function.
+        :param bool asynchronous: Queue the executions instead of waiting
+                                  for their results.
+        :param int concurrency: The number of invocations sent at the same
+                                time.
+        :param float rate: Most invocations sent per second, unlimited when
+                           ``None``.
+        """
+        invocation_type = (_function.FunctionInvocationsAsync if asynchronous
+                           else _function.FunctionInvocations)
+        self.session = session
+        self.function_urn = function_urn
+        self.asynchronous = asynchronous
+        self.concurrency = concurrency
+        self._service = invocation_type.service
+        self._endpoint_override = self._service.get_endpoint_override()
+        self._uri = invocation_type.base_path % {"function_urn": function_urn}
+        self._bucket = retry.TokenBucket(rate) if rate else None
+        self._started = None
+        self._lock = threading.Lock()
+        self._counters = collections.Counter()
+        self._latency = instrumentation.Histogram()
+
+    def invoke(self, payload):
+        """Invoke the function once
+
+        :param payload: The JSON serializable event of the function.
+        :returns: The response body as a dict, with the ``request_id``, and
+                  the ``result``, ``log`` and ``status`` of a synchronous
+                  execution.
+        """
+        if self._bucket is not None:
+            self._bucket.acquire()
+        return self._post(payload)
+
+    def _post(self, payload):
+        response = self.session.post(
+            self._uri, endpoint_filter=self._service,
+            endpoint_override=self._endpoint_override, json=payload,
+            headers=dict(_function.INVOCATION_HEADERS))
+        return response.json()
+
+    def map(self, payloads, ordered=False):
+        """Invoke the function with every payload
+
+        :param payloads: An iterable of JSON serializable events, consumed as
+                         the results are yielded.
+        :param bool ordered: Yield the results in the order of the payloads
+                             instead of as soon as they complete.
+        :returns: A generator of ``(index, payload, result, error,
+                  latency)`` tuples, ``index`` being the position of the
+                  payload, ``result`` the response body of :meth:`invoke`
+                  or ``None`` when it failed with the exception ``error``,
+                  and ``latency`` the duration of the invocation in
+                  seconds, without the wait imposed by ``rate``.
+        """
+        self._started = self._started or time.time()
+        return utils.iter_concurrently(self._invoke, enumerate(payloads),
+                                       self.concurrency, ordered=ordered)
+
+    def stats(self):
+        """Return the counters of the invoker
+
+        :return: A dict with the numbers of ``invoked`` and failed
+                 ``errors`` invocations, the ``rate`` of invocations per
+                 second since the first :meth:`map`, and the ``latency`` of
+                 the invocations as a dict of their ``mean``, ``p50``,
+                 ``p99`` and ``max`` in seconds.
+        """
+        with self._lock:
+            result = dict((key, self._counters[key])
+                          for key in ("invoked", "errors"))
+            result["latency"] = self._latency.summary()
+        elapsed = time.time() - self._started if self._started else 0
+        result["rate"] = result["invoked"] / elapsed if elapsed > 0 else 0.0
+        return result
+
+    def _invoke(self, item):
+        index, payload = item
+        if self._bucket is not None:
+            self._bucket.acquire()
+        # the latency is the one of the call, without the throttling
+        started = _clock()
+        result = error = None
+        try:
+            result = self._post(payload)
+        except Exception as e:
+            error = e
+        latency = _clock() - started
+        with self._lock:
+            self._counters.update(invoked=1, errors=int(error is not None))
+            self._latency.observe(latency)
+        return index, payload, result, error, latency
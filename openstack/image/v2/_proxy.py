@@ -26,17 +26,22 @@
 #         License for the specific language governing permissions and limitations under
 #         the License.
 
+import contextlib
+import mmap
+import sys
+
 from openstack import exceptions
 from openstack.image.v2 import image as _image
 from openstack.image.v2 import member as _member
 from openstack import proxy2
 from openstack import resource2
+from openstack import utils
 
 
 class Proxy(proxy2.BaseProxy):
 
     def upload_image(self, container_format=None, disk_format=None,
-                     data=None, **attrs):
+                     data=None, filename=None, **attrs):
         """Upload a new image from attributes
 
         :param container_format: Format of the container.
@@ -44,7 +49,11 @@ class Proxy(proxy2.BaseProxy):
                                  ovf, ova, or docker.
         :param disk_format: The format of the disk. A valid value is ami,
                             ari, aki, vhd, vmdk, raw, qcow2, vdi, or iso.
-        :param data: The data to be uploaded as an image.
+        :param data: The data to be uploaded as an image: ``bytes``, or a
+                     binary file object or ``mmap`` read in chunks.
+        :param str filename: The path of a file to upload as the data of
+                             the image instead of ``data``. It is mapped
+                             in memory and read in chunks while it is sent.
         :param dict attrs: Keyword arguments which will be used to create
                            a :class:`~openstack.image.v2.image.Image`,
                            comprised of the properties on the Image class.
@@ -61,6 +70,14 @@ class Proxy(proxy2.BaseProxy):
         if not all([container_format, disk_format]):
             raise exceptions.InvalidRequest(
                 "Both container_format and disk_format are required")
+        if filename is not None:
+            with _open_image_file(filename) as data:
+                img = self.upload_image(container_format=container_format,
+                                        disk_format=disk_format, data=data,
+                                        **attrs)
+            # the data is closed with the file
+            img.data = None
+            return img
 
         img = self._create(_image.Image, disk_format=disk_format,
                            container_format=container_format,
@@ -76,7 +93,37 @@ class Proxy(proxy2.BaseProxy):
 
         return img
 
-    def download_image(self, image, stream=False):
+    def import_images(self, images, concurrency=4):
+        """Upload many images at the same time
+
+        :param images: An iterable of dicts of the arguments of
+                       :meth:`upload_image` for every image, e.g. their
+                       ``name``, ``container_format``, ``disk_format``
+                       and ``filename``.
+        :param int concurrency: The number of images uploaded at the same
+                                time. At most this number of files are open
+                                at once.
+
+        :returns: A generator of ``(attrs, image, error)`` tuples in the
+                  order of ``images``: the arguments of the image, the
+                  uploaded :class:`~openstack.image.v2.image.Image` or
+                  ``None``, and the exception raised by its upload or
+                  ``None``. A failed upload does not stop the others.
+        """
+        images = list(images)
+
+        def upload(attrs):
+            try:
+                return self.upload_image(**attrs), None
+            except Exception:
+                return None, sys.exc_info()[1]
+
+        results = utils.iter_concurrently(upload, images, concurrency)
+        for attrs, (image, error) in zip(images, results):
+            yield attrs, image, error
+
+    def download_image(self, image, stream=False, output=None,
+                       chunk_size=_image.DEFAULT_CHUNK_SIZE):
         """Download an image
 
         This will download an image to memory when ``stream=False``, or allow
@@ -97,19 +144,33 @@ class Proxy(proxy2.BaseProxy):
                             the entirety of the response you must explicitly
                             call :meth:`requests.Response.close` or otherwise
                             risk inefficiencies with the ``requests``
-                            library's handling of connections.
+                            library's handling of connections. The
+                            checksum is verified once ``iter_content``
+                            has read the whole data.
 
 
                             When ``False``, return the entire
                             contents of the response.
 
+        :param output: A path, or a binary file object, to write the image
+                       to as it is downloaded. Its checksum is computed
+                       while it is written, the image is never held in
+                       memory.
+        :param int chunk_size: The size of the chunks written to
+                               ``output``, in bytes.
+
         :returns: The bytes comprising the given Image when stream is
                   False, otherwise a :class:`requests.Response`
-                  instance.
+                  instance, or ``None`` when it is written to ``output``.
+        :raises: :class:`~openstack.exceptions.InvalidResponse` when the
+                 checksum of the image does not match.
         """
 
         image = self._get_resource(_image.Image, image)
-        return image.download(self._session, stream=stream)
+        if output is None:
+            return image.download(self._session, stream=stream)
+        return image.download(self._session, output=output,
+                              chunk_size=chunk_size)
 
     def delete_image(self, image, ignore_missing=True):
         """Delete an image
@@ -326,3 +387,22 @@ class Proxy(proxy2.BaseProxy):
         image_id = resource2.Resource._get_id(image)
         return self._update(_member.Member, member_id=member_id,
                             image_id=image_id, **attrs)
+
+
+@contextlib.contextmanager
+def _open_image_file(filename):
+    """Open the data of an image file
+
+    The data is a read only ``mmap`` of the file, or the file itself when
+    it cannot be mapped, e.g. when it is empty.
+    """
+    with open(filename, "rb") as data:
+        try:
+            mapped = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            yield data
+            return
+        try:
+            yield mapped
+        finally:
+            mapped.close()
@@ -28,6 +28,10 @@
 
 import hashlib
 import logging
+import os
+
+import requests
+import six
 
 from openstack import exceptions
 from openstack.image import image_service
@@ -36,6 +40,9 @@ from openstack import utils
 
 _logger = logging.getLogger(__name__)
 
+#: Bytes read at once from the data of an image.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
 
 class Image(resource2.Resource):
     resources_key = 'images'
@@ -330,7 +337,11 @@ class Image(resource2.Resource):
         session.delete(url, endpoint_filter=self.service, endpoint_override = endpoint_override)
 
     def upload(self, session):
-        """Upload data into an existing image"""
+        """Upload data into an existing image
+
+        The data can be ``bytes``, or a binary file object or ``mmap``
+        which is read in chunks while it is sent.
+        """
         url = utils.urljoin(self.base_path, self.id, 'file')
         endpoint_override = self.service.get_endpoint_override()
         session.put(url, endpoint_filter=self.service, data=self.data,
@@ -338,15 +349,70 @@ class Image(resource2.Resource):
                              "Accept": ""},
                     endpoint_override = endpoint_override)
 
-    def download(self, session, stream=False):
-        """Download the data contained in an image"""
-        # TODO(briancurtin): This method should probably offload the get
-        # operation into another thread or something of that nature.
+    def download(self, session, stream=False, output=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        """Download the data contained in an image
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param bool stream: When ``True``, return the streamed
+                            :class:`requests.Response`, with the expected
+                            checksum in its ``content-md5`` header. Its
+                            ``iter_content`` hashes the chunks as they are
+                            consumed and raises once the whole data is read
+                            when the checksum does not match. The data read
+                            from its ``raw`` stream is not verified.
+        :param output: A path, or a binary file object, to write the data
+                       to as it is received. Each chunk is hashed as it is
+                       written so the data is verified without being held
+                       in memory. A file written at a path is removed when
+                       the checksum does not match.
+        :param int chunk_size: The size of the chunks written to
+                               ``output``, in bytes.
+
+        :returns: The data of the image, or the response when ``stream``
+                  is ``True``, or ``None`` when it is written to
+                  ``output``.
+        :raises: :class:`~openstack.exceptions.InvalidResponse` when the
+                 checksum of the data does not match the image's.
+        """
         url = utils.urljoin(self.base_path, self.id, 'file')
         endpoint_override = self.service.get_endpoint_override()
-        resp = session.get(url, endpoint_filter=self.service, stream=stream,
+        resp = session.get(url, endpoint_filter=self.service,
+                           stream=stream or output is not None,
                            endpoint_override = endpoint_override)
+        checksum = self._get_checksum(session, resp)
+
+        # if we are returning the repsonse object, ensure that it
+        # has the content-md5 header so that the caller doesn't
+        # need to jump through the same hoops through which we
+        # just jumped.
+        if stream:
+            resp.headers['content-md5'] = checksum
+            resp.iter_content = self._verified_iter_content(resp, checksum)
+            return resp
 
+        if output is None:
+            self._verify_checksum(checksum,
+                                  hashlib.md5(resp.content).hexdigest())
+            return resp.content
+
+        try:
+            if isinstance(output, six.string_types):
+                with open(output, "wb") as out:
+                    digest = _write_chunks(resp, out, chunk_size)
+            else:
+                digest = _write_chunks(resp, output, chunk_size)
+        finally:
+            resp.close()
+        try:
+            self._verify_checksum(checksum, digest)
+        except exceptions.InvalidResponse:
+            if isinstance(output, six.string_types):
+                os.remove(output)
+            raise
+
+    def _get_checksum(self, session, resp):
         # See the following bug report for details on why the checksum
         # code may sometimes depend on a second GET call.
         # https://bugs.launchpad.net/python-openstacksdk/+bug/1619675
@@ -358,17 +424,27 @@ class Image(resource2.Resource):
             # the checksum attribute.
             details = self.get(session)
             checksum = details.checksum
+        return checksum
 
-        # if we are returning the repsonse object, ensure that it
-        # has the content-md5 header so that the caller doesn't
-        # need to jump through the same hoops through which we
-        # just jumped.
-        if stream:
-            resp.headers['content-md5'] = checksum
-            return resp
+    def _verified_iter_content(self, resp, checksum):
+        iter_content = resp.iter_content
+
+        def verified(chunk_size=1, decode_unicode=False):
+            md5 = hashlib.md5()
+
+            def chunks():
+                for chunk in iter_content(chunk_size):
+                    md5.update(chunk)
+                    yield chunk
+                self._verify_checksum(checksum, md5.hexdigest())
+            if decode_unicode:
+                return requests.utils.stream_decode_response_unicode(
+                    chunks(), resp)
+            return chunks()
+        return verified
 
+    def _verify_checksum(self, checksum, digest):
         if checksum is not None:
-            digest = hashlib.md5(resp.content).hexdigest()
             if digest != checksum:
                 raise exceptions.InvalidResponse(
                     "checksum mismatch: %s != %s" % (checksum, digest))
@@ -376,8 +452,6 @@ class Image(resource2.Resource):
             _logger.warn(
                 "Unable to verify the integrity of image %s" % (self.id))
 
-        return resp.content
-
     def update(self, session, **attrs):
         url = utils.urljoin(self.base_path, self.id)
         headers = {
@@ -392,3 +466,12 @@ class Image(resource2.Resource):
                              endpoint_override=endpoint_override)
         self._translate_response(resp, has_body=True)
         return self
+
+
+def _write_chunks(resp, out, chunk_size):
+    """Write the streamed body of a response, return its MD5 hex digest"""
+    md5 = hashlib.md5()
+    for chunk in resp.iter_content(chunk_size):
+        md5.update(chunk)
+        out.write(chunk)
+    return md5.hexdigest()
@@ -0,0 +1,298 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Timing hooks fired by the sessions at every stage of a request.
+
+Every session has a :class:`Hooks` registry. The callbacks registered on it
+are called with the name of the stage and the :class:`RequestTrace` of the
+request, which holds its service type, method, url template, status, sizes
+and the duration of every stage done so far. The stages are, in order:
+
+* :data:`ENDPOINT_RESOLVED`: the url of the request is known,
+* :data:`SIGNED`: the headers and body are built and signed,
+* :data:`SENT`: the request is about to be sent,
+* :data:`FIRST_BYTE`: the response was received,
+* :data:`PARSED`: the response body was decoded by a resource,
+* :data:`BUILT`: the resources were built from the body.
+
+The last two stages only fire for the requests made by the resources.
+A :class:`LatencyAggregator` collects latency histograms per service and
+operation::
+
+    aggregator = instrumentation.LatencyAggregator()
+    conn.session.hooks.register(aggregator)
+    ...
+    for row in aggregator.summary():
+        print(row["service_type"], row["operation"], row["total"])
+"""
+
+import bisect
+import collections
+import re
+import threading
+import time
+
+from keystoneauth1 import _utils as log_utils
+from requests import utils as requests_utils
+from six.moves.urllib import parse
+
+_logger = log_utils.get_logger(__name__)
+
+ENDPOINT_RESOLVED = "endpoint_resolved"
+SIGNED = "signed"
+SENT = "sent"
+FIRST_BYTE = "first_byte"
+PARSED = "parsed"
+BUILT = "built"
+
+#: The stages, in the order they are fired.
+STAGES = (ENDPOINT_RESOLVED, SIGNED, SENT, FIRST_BYTE, PARSED, BUILT)
+
+#: Upper bounds in seconds of the buckets of the latency histograms.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1, 2.5, 5, 10, 30, 60)
+
+_clock = getattr(time, "perf_counter", time.time)
+
+# Path segments which are ids rather than names: uuids, hexadecimal
+# project ids and numbers.
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}"
+                         r"[0-9a-fA-F]{12}|[0-9a-fA-F]{32}|\d+)$")
+
+
+def url_template(url):
+    """Return the path of an url with its id segments replaced by ``{id}``
+
+    The requests sent to different resources of the same collection share
+    their template, e.g. ``/v2.1/{id}/servers/{id}``.
+    """
+    path = parse.urlparse(url).path
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment
+                    for segment in path.split("/"))
+
+
+def payload_size(data):
+    """Return the number of bytes of a request body, 0 if it is unknown"""
+    if data is None:
+        return 0
+    try:
+        return requests_utils.super_len(data) or 0
+    except Exception:
+        return 0
+
+
+def get_trace(response):
+    """Return the :class:`RequestTrace` of a response, if it is traced"""
+    return getattr(response, "_sdk_trace", None)
+
+
+class RequestTrace(object):
+    """What is known of a request at a stage"""
+
+    def __init__(self, hooks, service_type, method, url):
+        self._hooks = hooks
+        self.service_type = service_type
+        self.method = method.upper()
+        self.url = url
+        self.status = None
+        self.bytes_out = 0
+        self.bytes_in = 0
+        #: Seconds spent in every stage done, by stage name:
+        #: ``endpoint``, ``sign``, ``send``, ``first_byte``, ``parse``
+        #: and ``build``.
+        self.durations = collections.OrderedDict()
+
+    @property
+    def url_template(self):
+        return url_template(self.url)
+
+    @property
+    def operation(self):
+        """The ``METHOD /url/template`` of the request"""
+        return "%s %s" % (self.method, self.url_template)
+
+    def start(self):
+        """Return the current time, to be given to :meth:`record`"""
+        return _clock()
+
+    def record(self, name, started):
+        """Add the time elapsed since ``started`` to a duration"""
+        self.durations[name] = (self.durations.get(name, 0) +
+                                _clock() - started)
+
+    def fire(self, stage):
+        self._hooks._fire(stage, self)
+
+    def attach(self, response):
+        """Attach this trace to a response, see :func:`get_trace`"""
+        self.status = response.status_code
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit():
+            self.bytes_in = int(length)
+        elif getattr(response, "_content_consumed", False):
+            self.bytes_in = len(response.content or b"")
+        response._sdk_trace = self
+
+
+class Hooks(object):
+    """Callbacks of the stages of the requests of a session"""
+
+    def __init__(self):
+        self._callbacks = []
+
+    def __bool__(self):
+        return bool(self._callbacks)
+
+    __nonzero__ = __bool__
+
+    def register(self, callback, stages=None):
+        """Call ``callback(stage, trace)`` at the given stages
+
+        :param callback: Callable taking the stage name and the
+                         :class:`RequestTrace`. Its exceptions are logged
+                         and ignored.
+        :param stages: The stages to call it at, all of them by default.
+        """
+        stages = frozenset(stages) if stages is not None else None
+        self._callbacks = self._callbacks + [(callback, stages)]
+
+    def unregister(self, callback):
+        self._callbacks = [(registered, stages)
+                           for registered, stages in self._callbacks
+                           if registered is not callback]
+
+    def start(self, service_type, method, url):
+        """Return the trace of a new request, None if there is no hook"""
+        if not self._callbacks:
+            return None
+        return RequestTrace(self, service_type, method, url)
+
+    def _fire(self, stage, trace):
+        for callback, stages in self._callbacks:
+            if stages is not None and stage not in stages:
+                continue
+            try:
+                callback(stage, trace)
+            except Exception:
+                _logger.warning("Hook %r failed at stage %s", callback,
+                                stage, exc_info=True)
+
+
+class Histogram(object):
+    """Count of observed values per bucket"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent):
+        """Return the upper bound of the bucket holding a percentile
+
+        The values above the last bucket are reported as the maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(self.buckets):
+                    return min(self.buckets[index], self.max)
+                break
+        return self.max
+
+    def summary(self):
+        """Return the ``mean``, ``p50``, ``p99`` and ``max`` values"""
+        return {
+            "mean": self.total / self.count if self.count else 0,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class LatencyAggregator(object):
+    """Hook collecting latency histograms per service and operation
+
+    The latency of a request is the time from its start to its response,
+    the parse and build durations are collected separately.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def __call__(self, stage, trace):
+        if stage == FIRST_BYTE:
+            values = dict(trace.durations)
+            values["total"] = sum(trace.durations.get(name, 0) for name in
+                                  ("endpoint", "sign", "send"))
+        elif stage == PARSED:
+            values = {"parse": trace.durations.get("parse", 0)}
+        elif stage == BUILT:
+            values = {"build": trace.durations.get("build", 0)}
+        else:
+            return
+        key = (trace.service_type, trace.operation)
+        with self._lock:
+            histograms = self._histograms.setdefault(key, {})
+            for name, value in values.items():
+                if name not in histograms:
+                    histograms[name] = Histogram(self.buckets)
+                histograms[name].observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def summary(self):
+        """Return the statistics of every operation, slowest in total first
+
+        :return: A list of dicts with the ``service_type``, ``operation``,
+                 ``count`` of requests, their ``total``, ``mean``, ``p50``,
+                 ``p90``, ``p99`` and ``max`` latency in seconds, and the
+                 total seconds spent in every stage under ``stages``.
+        """
+        rows = []
+        with self._lock:
+            for (service_type, operation), histograms in \
+                    self._histograms.items():
+                total = histograms.get("total") or Histogram(self.buckets)
+                rows.append({
+                    "service_type": service_type,
+                    "operation": operation,
+                    "count": total.count,
+                    "total": total.total,
+                    "mean": total.total / total.count if total.count else 0,
+                    "p50": total.percentile(50),
+                    "p90": total.percentile(90),
+                    "p99": total.percentile(99),
+                    "max": total.max,
+                    "stages": dict((name, histogram.total) for name, histogram
+                                   in histograms.items() if name != "total"),
+                })
+        rows.sort(key=lambda row: row["total"], reverse=True)
+        return rows
@@ -0,0 +1,349 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+JSON codecs of the request and response bodies.
+
+The sessions encode the request bodies and decode the response bodies with
+a :class:`Codec`. The fastest one installed is used by default: ``orjson``,
+then ``ujson``, then the standard ``json`` module. It can be chosen with
+the ``OS_SDK_JSON_CODEC`` environment variable or per session::
+
+    conn = connection.Connection(json_codec="json", **auth)
+
+:class:`ItemStream` decodes the items of a list response while its body is
+received, see the ``stream`` argument of
+:meth:`~openstack.resource2.Resource.list`.
+"""
+
+import codecs
+import json
+import os
+
+import requests
+import six
+from keystoneauth1 import session as ksa_session
+
+#: Environment variable naming the default codec.
+CODEC_ENV = "OS_SDK_JSON_CODEC"
+
+#: The codecs, fastest first.
+CODEC_NAMES = ("orjson", "ujson", "json")
+
+#: Bytes read at once from a streamed response body.
+CHUNK_SIZE = 64 * 1024
+
+_UTF8 = frozenset(["utf-8", "utf8"])
+_WHITESPACE = " \t\n\r"
+# the bodies requests decodes with another codec than UTF-8
+_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE,
+         codecs.BOM_UTF32_BE)
+
+_fallback_encoder = ksa_session._JSONEncoder()
+_codecs = {}
+
+
+class Codec(object):
+    """Encode and decode JSON documents with a JSON module
+
+    The values the module cannot encode, like the non string keys or the
+    ``uuid`` and ``datetime`` values ujson does not know, are encoded by
+    the standard ``json`` module as keystoneauth does.
+    """
+
+    def __init__(self, name, loads, dumps):
+        """
+        :param str name: The name of the codec.
+        :param loads: Callable decoding a str or UTF-8 bytes document.
+        :param dumps: Callable encoding a value to a str or UTF-8 bytes,
+                      raising ``TypeError`` for the values it cannot encode.
+        """
+        self.name = name
+        self.loads = loads
+        self._dumps = dumps
+        self.response_class = type("JSONResponse", (_Response,),
+                                   {"codec": self})
+
+    def __repr__(self):
+        return "Codec(%r)" % self.name
+
+    def encode(self, value):
+        """Return the JSON document of a value as a str
+
+        This is the ``encode`` method keystoneauth calls on the JSON
+        encoder of its session.
+        """
+        try:
+            data = self._dumps(value)
+        except (TypeError, ValueError, OverflowError):
+            return _fallback_encoder.encode(value)
+        if isinstance(data, six.binary_type):
+            data = data.decode("utf-8")
+        return data
+
+    def bind(self, response):
+        """Make ``response.json()`` decode the body with this codec
+
+        :return: the response
+        """
+        if self.name != "json" and type(response) is requests.Response:
+            # requests.Response has no __slots__, changing the class of the
+            # response is the cheapest way to override its json method.
+            response.__class__ = self.response_class
+        return response
+
+
+class _Response(requests.Response):
+    codec = None
+
+    def json(self, **kwargs):
+        encoding = self.encoding
+        content = self.content
+        if (kwargs or not content or
+                (encoding is not None and encoding.lower() not in _UTF8) or
+                content.startswith(_BOMS)):
+            return super(_Response, self).json(**kwargs)
+        return self.codec.loads(content)
+
+
+def _stdlib_codec():
+    # json.loads only accepts bytes from python 3.6
+    def loads(data):
+        if isinstance(data, six.binary_type):
+            data = data.decode("utf-8")
+        return json.loads(data)
+    return Codec("json", loads, _fallback_encoder.encode)
+
+
+def _orjson_codec():
+    import orjson
+
+    def dumps(value):
+        # orjson encodes the datetime and uuid values itself
+        return orjson.dumps(value, default=_fallback_encoder.default)
+    return Codec("orjson", orjson.loads, dumps)
+
+
+def _ujson_codec():
+    import ujson
+    return Codec("ujson", ujson.loads, ujson.dumps)
+
+
+_FACTORIES = {
+    "json": _stdlib_codec,
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+}
+
+
+def _load(name):
+    codec = _codecs.get(name)
+    if codec is None:
+        if name not in _FACTORIES:
+            raise ValueError("Unknown JSON codec %r, expected one of %s" %
+                             (name, ", ".join(CODEC_NAMES)))
+        codec = _codecs[name] = _FACTORIES[name]()
+    return codec
+
+
+def get_codec(codec=None):
+    """Return a codec
+
+    :param codec: A :class:`Codec`, or the name of a codec in
+                  :data:`CODEC_NAMES`. By default, the codec named by the
+                  ``OS_SDK_JSON_CODEC`` environment variable, or else the
+                  fastest codec installed.
+    :raises: ``ImportError`` when the module of the codec is not installed,
+             ``ValueError`` when the codec is unknown.
+    """
+    if isinstance(codec, Codec):
+        return codec
+    if codec:
+        return _load(codec)
+    name = os.environ.get(CODEC_ENV)
+    if name:
+        return _load(name)
+    for name in CODEC_NAMES:
+        try:
+            return _load(name)
+        except ImportError:
+            pass
+
+
+class _Incomplete(Exception):
+    pass
+
+
+class ItemStream(object):
+    """The items of a list response, decoded as its body is received
+
+    Iterating the stream yields the items of the array under ``key`` in the
+    JSON object of the body one at a time, only holding the chunk of the
+    body they are decoded from. Once they are all yielded, :attr:`document`
+    holds the other members of the object, with an empty list under
+    ``key``, and ``len()`` of the stream is the number of items yielded.
+
+    A dotted ``key`` or a body which is not an object is decoded at once.
+    """
+
+    def __init__(self, chunks, key):
+        """
+        :param chunks: Iterable of the bytes of the body, e.g.
+                       ``response.iter_content(CHUNK_SIZE)``.
+        :param str key: The member holding the items, or None when the
+                        body is the array of the items.
+        """
+        self.key = key
+        self.document = None
+        self.count = 0
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._scanner = json.JSONDecoder()
+        self._buffer = u""
+        self._pos = 0
+        self._eof = False
+        self._started = False
+        self._response = None
+
+    @classmethod
+    def from_response(cls, response, key):
+        """Return the stream of the items of a streamed response"""
+        stream = cls(response.iter_content(CHUNK_SIZE), key)
+        stream._response = response
+        return stream
+
+    def close(self):
+        """Release the connection of the response, if any"""
+        if self._response is not None:
+            self._response.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        if self._started:
+            raise RuntimeError("The items can only be iterated once")
+        self._started = True
+        if self.key and "." in self.key:
+            items = self._iter_whole()
+        else:
+            items = self._iter_document()
+        for item in items:
+            self.count += 1
+            yield item
+
+    def _iter_whole(self):
+        chunks = [self._decoder.decode(chunk) for chunk in self._chunks]
+        chunks.append(self._decoder.decode(b"", True))
+        self.document = json.loads(u"".join(chunks))
+        items = self.document
+        for name in self.key.split("."):
+            items = items.get(name, {}) if isinstance(items, dict) else None
+        return iter(items or [])
+
+    def _iter_document(self):
+        first = self._next_char()
+        if self.key is None and first == u"[":
+            self.document = []
+            for item in self._iter_array():
+                yield item
+        elif self.key is not None and first == u"{":
+            for item in self._iter_members():
+                yield item
+        else:
+            # nothing to stream
+            self.document = self._value()
+
+    def _iter_members(self):
+        document = {}
+        self._pos += 1
+        first = True
+        while self._next_char() != u"}":
+            if not first:
+                self._expect(u",")
+            first = False
+            name = self._value()
+            self._expect(u":")
+            if name == self.key and self._next_char() == u"[":
+                document[name] = []
+                for item in self._iter_array():
+                    yield item
+            else:
+                document[name] = self._value()
+        self._pos += 1
+        self.document = document
+
+    def _iter_array(self):
+        self._pos += 1
+        first = True
+        while self._next_char() != u"]":
+            if not first:
+                self._expect(u",")
+            first = False
+            yield self._value()
+            self._compact()
+        self._pos += 1
+
+    def _fill(self):
+        # Read one more chunk, False at the end of the body
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b"", True)
+        self._eof = True
+        return True
+
+    def _compact(self):
+        if self._pos > CHUNK_SIZE:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+    def _next_char(self):
+        # Skip the whitespaces and return the next character
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of the JSON document")
+
+    def _expect(self, char):
+        found = self._next_char()
+        if found != char:
+            raise ValueError("Expected %r at position %d of the JSON "
+                             "document, found %r" % (char, self._pos, found))
+        self._pos += 1
+
+    def _value(self):
+        self._next_char()
+        while True:
+            try:
+                value, end = self._scanner.raw_decode(self._buffer, self._pos)
+                # a number could go on in the next chunk
+                if end == len(self._buffer) and not self._eof:
+                    raise _Incomplete()
+            except (ValueError, _Incomplete):
+                if not self._fill():
+                    raise
+                continue
+            self._pos = end
+            return value
@@ -12,8 +12,10 @@
 # CONDITIONS OF ANY KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations under the License.
 
+import binascii
 import hashlib
 
+from openstack.kms.v1 import envelope as _envelope
 from openstack.kms.v1 import key as _key
 from openstack import proxy2
 
@@ -184,7 +186,7 @@ class Proxy(proxy2.BaseProxy):
             raise ValueError("plain_text should be provided")
         # user provids plain text, do hash inside sdk
         hash = hashlib.sha256()
-        hex_data = str(plain_text).decode("hex")
+        hex_data = binascii.unhexlify(plain_text)
         hash.update(bytearray(hex_data))
         digest = hash.hexdigest()
         params.update({'plain_text': plain_text + digest})
@@ -238,3 +240,17 @@ class Proxy(proxy2.BaseProxy):
         :rtype: :class:`~openstack.kms.v1.key.Quota`
         """
         return _key.Quota.list(self._session)
+
+    def envelope_encryptor(self, key, **kwargs):
+        """Return an encryptor of data with data keys of a key
+
+        The data is encrypted locally, KMS is called once per data key.
+
+        :param key: key id or an instance of :class:`~openstack.kms.v1.key.Key`
+        :param dict kwargs: The arguments of the
+                            :class:`~openstack.kms.v1.envelope.
+                            EnvelopeEncryptor`, e.g. ``encryption_context``
+                            and ``max_uses``.
+        :rtype: :class:`~openstack.kms.v1.envelope.EnvelopeEncryptor`
+        """
+        return _envelope.EnvelopeEncryptor(self, key, **kwargs)
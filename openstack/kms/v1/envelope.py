@@ -0,0 +1,380 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Local envelope encryption with KMS data keys.
+
+An :class:`EnvelopeEncryptor` asks KMS for a data key, then encrypts the
+data locally with AES-256-GCM. The plaintext data key is kept in memory
+until it has encrypted ``max_uses`` messages or is ``ttl`` seconds old, and
+the data keys decrypted by KMS are cached by their cipher text, so that KMS
+is called once per data key instead of once per message::
+
+    encryptor = conn.kms.envelope_encryptor(key_id)
+    with open("backup.tar", "rb") as src, open("backup.enc", "wb") as dst:
+        encryptor.encrypt_stream(src, dst)
+    with open("backup.enc", "rb") as src, open("backup.tar", "wb") as dst:
+        encryptor.decrypt_stream(src, dst)
+
+The encrypted data starts with a header holding the KMS key id and the
+encrypted data key, followed by the data split in chunks of ``chunk_size``
+bytes. Every chunk is encrypted and authenticated separately, with the
+header and whether it is the last chunk as additional data, so that a
+stream is decrypted in constant memory and a truncated, reordered or
+altered stream fails to decrypt.
+
+It requires the ``cryptography`` package.
+"""
+
+import binascii
+import collections
+import hashlib
+import io
+import os
+import struct
+import threading
+import time
+
+from openstack import exceptions
+
+try:
+    from cryptography import exceptions as _crypto_exceptions
+    from cryptography.hazmat.primitives.ciphers import aead
+except ImportError:
+    aead = None
+
+#: Size of the data keys, in bytes.
+KEY_BYTES = 32
+
+#: Default size of the chunks encrypted separately, in bytes.
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+#: Largest chunk size accepted when decrypting, in bytes.
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+_MAGIC = b"KMSE"
+_VERSION = 1
+_TAG_BYTES = 16
+_NONCE_PREFIX_BYTES = 8
+# magic, version, chunk size, length of the key id
+_HEADER = struct.Struct(">4sBIH")
+_LENGTH = struct.Struct(">H")
+_COUNTER = struct.Struct(">I")
+_MAX_CHUNKS = 2 ** 32
+
+
+def _read_exact(src, size):
+    # Read size bytes, less only at the end of src
+    data = src.read(size)
+    if not data or len(data) == size:
+        return data
+    parts = [data]
+    read = len(data)
+    while read < size:
+        data = src.read(size - read)
+        if not data:
+            break
+        parts.append(data)
+        read += len(data)
+    return b"".join(parts)
+
+
+def _pack_header(key_id, cipher_text, chunk_size, nonce_prefix):
+    key_id = key_id.encode("utf-8")
+    cipher_text = cipher_text.encode("ascii")
+    return b"".join([_HEADER.pack(_MAGIC, _VERSION, chunk_size, len(key_id)),
+                     key_id, _LENGTH.pack(len(cipher_text)), cipher_text,
+                     nonce_prefix])
+
+
+def _read_header(src):
+    # Return the key id, encrypted data key, chunk size, nonce prefix and
+    # the raw header
+    fixed = _read_exact(src, _HEADER.size)
+    if len(fixed) < _HEADER.size:
+        raise exceptions.SDKException("The data is not envelope encrypted")
+    magic, version, chunk_size, key_id_length = _HEADER.unpack(fixed)
+    if magic != _MAGIC:
+        raise exceptions.SDKException("The data is not envelope encrypted")
+    if version != _VERSION:
+        raise exceptions.SDKException(
+            "Unsupported envelope encryption version %d" % version)
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise exceptions.SDKException(
+            "Invalid envelope encryption chunk size %d" % chunk_size)
+    key_id = _read_exact(src, key_id_length)
+    length = _read_exact(src, _LENGTH.size)
+    if len(key_id) < key_id_length or len(length) < _LENGTH.size:
+        raise exceptions.SDKException("The envelope header is truncated")
+    cipher_length = _LENGTH.unpack(length)[0]
+    cipher_text = _read_exact(src, cipher_length)
+    nonce_prefix = _read_exact(src, _NONCE_PREFIX_BYTES)
+    if (len(cipher_text) < cipher_length or
+            len(nonce_prefix) < _NONCE_PREFIX_BYTES):
+        raise exceptions.SDKException("The envelope header is truncated")
+    header = fixed + key_id + length + cipher_text + nonce_prefix
+    return (key_id.decode("utf-8"), cipher_text.decode("ascii"), chunk_size,
+            nonce_prefix, header)
+
+
+def _check(datakey, action):
+    # KMS errors are returned as attributes of the data key
+    if datakey.error_code:
+        raise exceptions.SDKException(
+            "Failed to %s the data key: %s %s" % (action, datakey.error_code,
+                                                  datakey.error_msg))
+    return datakey
+
+
+class _DataKey(object):
+    # A plaintext data key and its cipher, never exposed
+
+    __slots__ = ("key_id", "cipher_text", "cipher", "expires", "uses")
+
+    def __init__(self, key_id, cipher_text, plain, expires):
+        if len(plain) != KEY_BYTES:
+            raise exceptions.SDKException(
+                "KMS returned a data key of %d bytes, %d expected" %
+                (len(plain), KEY_BYTES))
+        self.key_id = key_id
+        self.cipher_text = cipher_text
+        self.cipher = aead.AESGCM(plain)
+        self.expires = expires
+        self.uses = 0
+
+
+class EnvelopeEncryptor(object):
+    """Encrypt and decrypt data locally with cached KMS data keys
+
+    It is thread safe, one instance is meant to be shared by the threads
+    of an application.
+    """
+
+    def __init__(self, proxy, key, encryption_context=None, ttl=300,
+                 max_uses=2 ** 20, cache_size=256,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        :param proxy: The :class:`~openstack.kms.v1._proxy.Proxy` creating
+                      and decrypting the data keys.
+        :param key: The id of the KMS key encrypting the data keys, or an
+                    instance of :class:`~openstack.kms.v1.key.Key`
+        :param dict encryption_context: The encryption context of the data
+                                        keys, required again to decrypt them.
+        :param ttl: Seconds a plaintext data key is kept in memory.
+        :param int max_uses: Most messages or streams encrypted with one data
+                             key before a new one is created.
+        :param int cache_size: Most decrypted data keys kept in memory.
+        :param int chunk_size: Size of the chunks encrypted separately, in
+                               bytes.
+        """
+        if aead is None:
+            raise exceptions.SDKException(
+                "cryptography is required to use the envelope encryption")
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise exceptions.InvalidRequest(
+                "chunk_size must be between 1 and %d" % MAX_CHUNK_SIZE)
+        self.proxy = proxy
+        self.key_id = getattr(key, "key_id", key)
+        self.encryption_context = encryption_context
+        self.ttl = ttl
+        self.max_uses = max_uses
+        self.cache_size = cache_size
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._current = None
+        self._keys = collections.OrderedDict()
+        self._counters = collections.Counter()
+
+    def encrypt(self, data):
+        """Encrypt bytes
+
+        :param bytes data: The plaintext.
+        :returns: The encrypted data, with its header.
+        """
+        out = io.BytesIO()
+        self.encrypt_stream(io.BytesIO(data), out)
+        return out.getvalue()
+
+    def decrypt(self, data):
+        """Decrypt bytes encrypted by :meth:`encrypt` or :meth:`encrypt_stream`
+
+        :param bytes data: The encrypted data, with its header.
+        :returns: The plaintext.
+        """
+        out = io.BytesIO()
+        self.decrypt_stream(io.BytesIO(data), out)
+        return out.getvalue()
+
+    def encrypt_stream(self, src, dst):
+        """Encrypt a stream chunk by chunk
+
+        :param src: A file object opened in binary mode to read the
+                    plaintext from.
+        :param dst: A file object opened in binary mode to write the
+                    encrypted data to.
+        :returns: The number of plaintext bytes encrypted.
+        """
+        datakey = self._encryption_key()
+        nonce_prefix = os.urandom(_NONCE_PREFIX_BYTES)
+        header = _pack_header(datakey.key_id, datakey.cipher_text,
+                              self.chunk_size, nonce_prefix)
+        dst.write(header)
+        total = 0
+        counter = 0
+        chunk = _read_exact(src, self.chunk_size)
+        while True:
+            following = b""
+            if len(chunk) == self.chunk_size:
+                following = _read_exact(src, self.chunk_size)
+            final = not following
+            if counter >= _MAX_CHUNKS:
+                raise exceptions.SDKException(
+                    "Too many chunks to encrypt, use a larger chunk_size")
+            dst.write(datakey.cipher.encrypt(
+                nonce_prefix + _COUNTER.pack(counter), chunk,
+                header + (b"\x01" if final else b"\x00")))
+            total += len(chunk)
+            if final:
+                break
+            chunk = following
+            counter += 1
+        self._count(encrypted_bytes=total, encrypted=1)
+        return total
+
+    def decrypt_stream(self, src, dst):
+        """Decrypt a stream chunk by chunk
+
+        Every chunk is authenticated before it is written, a corrupted
+        stream raises once the chunks before the corruption are written.
+
+        :param src: A file object opened in binary mode to read the
+                    encrypted data from.
+        :param dst: A file object opened in binary mode to write the
+                    plaintext to.
+        :returns: The number of plaintext bytes decrypted.
+        :raises: :class:`~openstack.exceptions.SDKException` when the data
+                 is corrupted, truncated or its data key cannot be decrypted.
+        """
+        key_id, cipher_text, chunk_size, nonce_prefix, header = \
+            _read_header(src)
+        datakey = self._decryption_key(key_id, cipher_text)
+        size = chunk_size + _TAG_BYTES
+        total = 0
+        counter = 0
+        record = _read_exact(src, size)
+        while True:
+            following = b""
+            if len(record) == size:
+                following = _read_exact(src, size)
+            final = not following
+            try:
+                chunk = datakey.cipher.decrypt(
+                    nonce_prefix + _COUNTER.pack(counter), record,
+                    header + (b"\x01" if final else b"\x00"))
+            except _crypto_exceptions.InvalidTag:
+                raise exceptions.SDKException(
+                    "The encrypted data is corrupted or truncated")
+            dst.write(chunk)
+            total += len(chunk)
+            if final:
+                break
+            record = following
+            counter += 1
+        self._count(decrypted_bytes=total, decrypted=1)
+        return total
+
+    def rotate(self):
+        """Create a new data key for the next encryptions"""
+        with self._lock:
+            self._current = None
+
+    def clear(self):
+        """Forget all the plaintext data keys"""
+        with self._lock:
+            self._current = None
+            self._keys.clear()
+
+    def stats(self):
+        """Return the counters of the encryptor
+
+        :return: A dict with the numbers of ``encrypted`` and ``decrypted``
+                 messages or streams, of ``encrypted_bytes`` and
+                 ``decrypted_bytes``, of ``datakeys_created`` and
+                 ``datakeys_decrypted`` by KMS, and of ``cache_hits`` of the
+                 decrypted data keys.
+        """
+        with self._lock:
+            return dict((key, self._counters[key]) for key in (
+                "encrypted", "decrypted", "encrypted_bytes",
+                "decrypted_bytes", "datakeys_created", "datakeys_decrypted",
+                "cache_hits"))
+
+    def _count(self, **values):
+        with self._lock:
+            self._counters.update(values)
+
+    def _context(self):
+        if self.encryption_context:
+            return {"encryption_context": self.encryption_context}
+        return {}
+
+    def _encryption_key(self):
+        # The other threads wait for the data key being created
+        with self._lock:
+            current = self._current
+            if (current is None or current.uses >= self.max_uses or
+                    current.expires <= time.time()):
+                datakey = _check(self.proxy.create_datakey(
+                    self.key_id, datakey_length=str(KEY_BYTES * 8),
+                    **self._context()), "create")
+                current = _DataKey(datakey.key_id or self.key_id,
+                                   datakey.cipher_text,
+                                   binascii.unhexlify(datakey.plain_text),
+                                   time.time() + self.ttl)
+                self._current = current
+                self._remember(current)
+                self._counters["datakeys_created"] += 1
+            current.uses += 1
+            return current
+
+    def _decryption_key(self, key_id, cipher_text):
+        with self._lock:
+            cached = self._keys.get((key_id, cipher_text))
+            if cached is not None and cached.expires > time.time():
+                self._counters["cache_hits"] += 1
+                return cached
+        datakey = _check(self.proxy.decrypt_datakey(
+            key_id, cipher_text=cipher_text,
+            datakey_cipher_length=str(KEY_BYTES), **self._context()),
+            "decrypt")
+        plain = binascii.unhexlify(datakey.data_key)
+        if (datakey.datakey_dgst and datakey.datakey_dgst.lower() !=
+                hashlib.sha256(plain).hexdigest()):
+            raise exceptions.SDKException(
+                "The digest of the data key decrypted by KMS does not match")
+        result = _DataKey(key_id, cipher_text, plain, time.time() + self.ttl)
+        with self._lock:
+            self._remember(result)
+            self._counters["datakeys_decrypted"] += 1
+        return result
+
+    def _remember(self, datakey):
+        # Called with the lock held, evicts the oldest data keys
+        if not self.cache_size:
+            return
+        cache_key = (datakey.key_id, datakey.cipher_text)
+        self._keys.pop(cache_key, None)
+        self._keys[cache_key] = datakey
+        while len(self._keys) > self.cache_size:
+            self._keys.popitem(last=False)
@@ -165,6 +165,10 @@ class DataKey(KmsResource):
     plain_text = resource.Body('plain_text')
     #: Cipher text of the data key
     cipher_text = resource.Body('cipher_text')
+    #: Plain text of the data key, as decrypted by KMS
+    data_key = resource.Body('data_key')
+    #: Digest of the data key decrypted by KMS
+    datakey_dgst = resource.Body('datakey_dgst')
     #: Error code when create a secret key
     error_code = resource.Body('error_code')
     #: Error message when create a secret key
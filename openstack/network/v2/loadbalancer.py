@@ -39,6 +39,7 @@ class LoadBalancer(resource2.Resource):
         "member_address",
         "member_device_id"
     )
+    id_filter = "id"
     # loadbalancer id
     id = resource2.Body("id")
     # tenant id
@@ -26,10 +26,25 @@
 #         License for the specific language governing permissions and limitations under
 #         the License.
 
+import io
+import sys
+import tempfile
+import threading
+import time
+
+import six
+
 from openstack.object_store.v1 import account as _account
 from openstack.object_store.v1 import container as _container
 from openstack.object_store.v1 import obj as _obj
 from openstack import proxy
+from openstack import utils
+
+#: Size of the parts of an object downloaded concurrently.
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+
+# Size above which a segment read from a stream is spooled to disk.
+_SPOOL_SIZE = 8 * 1024 * 1024
 
 
 class Proxy(proxy.BaseProxy):
@@ -204,46 +219,197 @@ class Proxy(proxy.BaseProxy):
         return self._get(_obj.Object, obj,
                          path_args={"container": container_name})
 
-    def download_object(self, obj, container=None, path=None):
+    def _get_object(self, obj, container):
+        container_name = self._get_container_name(obj, container)
+        return self._get_resource(_obj.Object, obj,
+                                  path_args={"container": container_name})
+
+    def iter_object(self, obj, container=None,
+                    chunk_size=_obj.DEFAULT_CHUNK_SIZE):
+        """Generate the data of an object in binary chunks
+
+        :param obj: The value can be the name of an object or a
+                       :class:`~openstack.object_store.v1.obj.Object` instance.
+        :param container: The value can be the name of a container or a
+               :class:`~openstack.object_store.v1.container.Container`
+               instance.
+        :param int chunk_size: The size of the chunks, in bytes.
+
+        :returns: A generator of ``bytes``. Close it to release the
+                  connection before the end of the object.
+        :raises: :class:`~openstack.exceptions.ResourceNotFound`
+                 when no resource can be found.
+        """
+        res = self._get_object(obj, container)
+        return res.stream(self._session, chunk_size=chunk_size)
+
+    def download_object(self, obj, container=None, path=None,
+                        chunk_size=_obj.DEFAULT_CHUNK_SIZE, concurrency=1,
+                        part_size=DEFAULT_PART_SIZE):
         """Download the data contained inside an object to disk.
 
+        The data is written as it is received, one chunk at a time, so the
+        memory used does not depend on the size of the object.
+
         :param obj: The value can be the name of an object or a
                        :class:`~openstack.object_store.v1.obj.Object` instance.
         :param container: The value can be the name of a container or a
                :class:`~openstack.object_store.v1.container.Container`
                instance.
-        :param path str: Location to write the object contents.
+        :param path: Location to write the object contents, or a binary
+                     file object to write them to.
+        :param int chunk_size: The size of the chunks written, in bytes.
+        :param int concurrency: The number of ranged requests downloading
+                                parts of the object at the same time, when
+                                ``path`` is a location and the object is
+                                larger than ``part_size``.
+        :param int part_size: The size of the parts of the object
+                              downloaded concurrently, in bytes.
 
         :raises: :class:`~openstack.exceptions.ResourceNotFound`
                  when no resource can be found.
         """
-        # TODO(briancurtin): download_object should really have the behavior
-        # of get_object, and this writing to a file should not exist.
-        # TODO(briancurtin): This method should probably offload the get
-        # operation into another thread or something of that nature.
-        with open(path, "w") as out:
-            out.write(self.get_object(obj, container))
-
-    def upload_object(self, **attrs):
+        res = self._get_object(obj, container)
+        if concurrency > 1 and isinstance(path, six.string_types):
+            res.head(self._session)
+            size = int(res.content_length or 0)
+            if size > part_size and res.accept_ranges == "bytes":
+                self._download_parts(res, path, size, chunk_size,
+                                     concurrency, part_size)
+                return
+
+        if hasattr(path, "write"):
+            _write_chunks(res.stream(self._session, chunk_size), path)
+            return
+        with open(path, "wb") as out:
+            _write_chunks(res.stream(self._session, chunk_size), out)
+
+    def _download_parts(self, res, path, size, chunk_size, concurrency,
+                        part_size):
+        # Every part is written at its offset by its own file object, and
+        # must come from the version of the object measured by the HEAD.
+        with open(path, "wb") as out:
+            out.truncate(size)
+
+        def download(start):
+            end = min(start + part_size, size) - 1
+            with open(path, "r+b") as out:
+                out.seek(start)
+                _write_chunks(res.stream(self._session, chunk_size,
+                                         start, end, if_match=res.etag),
+                              out)
+
+        for _ in utils.iter_concurrently(download, range(0, size, part_size),
+                                         concurrency):
+            pass
+
+    def upload_object(self, segment_size=None, segment_container=None,
+                      concurrency=1, **attrs):
         """Upload a new object from attributes
 
+        The ``data`` of the object can be ``bytes``, a binary file object
+        or an iterable of ``bytes`` chunks, the file objects and iterables
+        are streamed to the server. With a ``segment_size``, data larger
+        than it, or of unknown size, is uploaded as segments referenced by
+        a static large object manifest, the segments of a seekable file
+        being uploaded concurrently.
+
+        :param int segment_size: The size of the segments, in bytes. The
+                                 data is sent in a single request by
+                                 default.
+        :param str segment_container: The container of the segments,
+                                      ``<container>_segments`` by default.
+                                      It is created when needed.
+        :param int concurrency: The number of segments uploaded at the
+                                same time.
         :param dict attrs: Keyword arguments which will be used to create
                a :class:`~openstack.object_store.v1.obj.Object`,
                comprised of the properties on the Object class.
                **Required**: A `container` argument must be specified,
                which is either the ID of a container or a
                :class:`~openstack.object_store.v1.container.Container`
-               instance.
+               instance. A `filename` argument uploads the file at that
+               location as the data.
 
         :returns: The results of object creation
         :rtype: :class:`~openstack.object_store.v1.container.Container`
         """
         container = attrs.pop("container", None)
         container_name = self._get_container_name(None, container)
-
+        filename = attrs.pop("filename", None)
+        if filename is not None:
+            with open(filename, "rb") as data:
+                attrs["data"] = data
+                return self._upload_object(container_name, segment_size,
+                                           segment_container, concurrency,
+                                           attrs)
+        return self._upload_object(container_name, segment_size,
+                                   segment_container, concurrency, attrs)
+
+    def _upload_object(self, container_name, segment_size, segment_container,
+                       concurrency, attrs):
+        data = attrs.get("data")
+        if segment_size and data is not None:
+            size = _get_size(data)
+            if size is None or size > segment_size:
+                return self._upload_segments(
+                    container_name, attrs, size, segment_size,
+                    segment_container or container_name + "_segments",
+                    concurrency)
         return self._create(_obj.Object,
                             path_args={"container": container_name}, **attrs)
 
+    def _upload_segments(self, container_name, attrs, size, segment_size,
+                         segment_container, concurrency):
+        attrs = dict(attrs)
+        data = attrs.pop("data")
+        prefix = "%s/slo/%.6f/%d" % (attrs["name"], time.time(),
+                                     segment_size)
+        self.create_container(name=segment_container)
+
+        # the names of the segments sent, including those of the uploads
+        # still running when another one fails
+        names = []
+
+        def upload(segment):
+            index, body, length = segment
+            name = "%s/%08d" % (prefix, index)
+            names.append(name)
+            res = _obj.Object.new(container=segment_container, name=name,
+                                  data=body)
+            try:
+                res.create(self._session)
+            finally:
+                if not isinstance(body, _obj.SegmentReader):
+                    body.close()
+            return {"path": "/%s/%s" % (segment_container, name),
+                    "etag": (res.etag or "").strip('"'),
+                    "size_bytes": length}
+
+        try:
+            segments = list(utils.iter_concurrently(
+                upload, _iter_segments(data, size, segment_size),
+                concurrency, wait=True))
+            if not segments:
+                # nothing was read, swift refuses empty segments
+                return self._create(_obj.Object,
+                                    path_args={"container": container_name},
+                                    data=b"", **attrs)
+            manifest = _obj.Object.new(container=container_name, **attrs)
+            return manifest.create_manifest(self._session, segments)
+        except Exception:
+            exc_info = sys.exc_info()
+            for name in names:
+                self._delete_segment("/%s/%s" % (segment_container, name))
+            six.reraise(*exc_info)
+
+    def _delete_segment(self, path):
+        container_name, name = path.lstrip("/").split("/", 1)
+        try:
+            self.delete_object(name, container=container_name)
+        except Exception:
+            pass
+
     def copy_object(self):
         """Copy an object."""
         raise NotImplementedError
@@ -332,3 +498,75 @@ class Proxy(proxy.BaseProxy):
         res = self._get_resource(_obj.Object, obj,
                                  path_args={"container": container_name})
         res.delete_metadata(self._session, keys)
+
+
+def _write_chunks(chunks, out):
+    for chunk in chunks:
+        out.write(chunk)
+
+
+def _get_size(data):
+    # The number of bytes left in the data, None when it is unknown.
+    if isinstance(data, six.binary_type):
+        return len(data)
+    if isinstance(data, six.text_type):
+        return len(data.encode("utf-8"))
+    if hasattr(data, "read") and hasattr(data, "seek"):
+        seekable = getattr(data, "seekable", None)
+        if seekable is not None and not seekable():
+            return None
+        position = data.tell()
+        end = data.seek(0, io.SEEK_END)
+        if end is None:
+            end = data.tell()
+        data.seek(position)
+        return end - position
+    return None
+
+
+def _iter_segments(data, size, segment_size):
+    """Generate the ``(index, body, length)`` of the segments of data
+
+    The segments of ``bytes`` or of a seekable file are read from the data
+    when they are sent, the others are spooled one at a time.
+    """
+    if isinstance(data, six.text_type):
+        data = data.encode("utf-8")
+    if isinstance(data, six.binary_type):
+        data = io.BytesIO(data)
+    if size is not None:
+        start = data.tell()
+        lock = threading.Lock()
+        for index, offset in enumerate(range(0, size, segment_size)):
+            length = min(segment_size, size - offset)
+            yield (index, _obj.SegmentReader(data, start + offset, length,
+                                             lock), length)
+        return
+
+    if hasattr(data, "read"):
+        chunks = iter(lambda: data.read(_obj.DEFAULT_CHUNK_SIZE), b"")
+    else:
+        chunks = iter(data)
+    pending = b""
+    index = 0
+    while True:
+        spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE)
+        length = 0
+        while length < segment_size:
+            chunk = pending or next(chunks, b"")
+            if not chunk:
+                break
+            if isinstance(chunk, six.text_type):
+                chunk = chunk.encode("utf-8")
+            chunk, pending = (chunk[:segment_size - length],
+                              chunk[segment_size - length:])
+            spool.write(chunk)
+            length += len(chunk)
+        if not length:
+            spool.close()
+            return
+        spool.seek(0)
+        yield index, spool, length
+        index += 1
+        if length < segment_size:
+            return
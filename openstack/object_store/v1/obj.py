@@ -28,12 +28,18 @@
 #         the License.
 
 import copy
+import threading
+
 import six
 
+from openstack import exceptions
 from openstack.object_store import object_store_service
 from openstack.object_store.v1 import _base
 from openstack import resource
 
+#: Bytes read at once from an object content.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
 
 class Object(_base.BaseResource):
     _custom_metadata_prefix = "X-Object-Meta-"
@@ -234,6 +240,71 @@ class Object(_base.BaseResource):
         self._set_metadata()
         return resp
 
+    def stream(self, session, chunk_size=DEFAULT_CHUNK_SIZE, start=None,
+               end=None, if_match=None):
+        """Generate the content of the object in binary chunks
+
+        Only one chunk is held in memory at a time. The connection is
+        released when the generator is exhausted or closed.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param int chunk_size: The size of the chunks, in bytes.
+        :param int start: The offset of the first byte to get, for a
+                          ranged request.
+        :param int end: The offset of the last byte to get, included, for a
+                        ranged request. The end of the object by default.
+        :param str if_match: The ETag the object must still have, so that
+                             the parts of a ranged download all come from the
+                             same version of the object.
+        :raises: :exc:`~openstack.exceptions.SDKException` when the server
+                 does not honour the range, or the object has another ETag.
+        """
+        url = self._get_url(self, self.id)
+        headers = {'Accept': 'bytes'}
+        ranged = start is not None or end is not None
+        if ranged:
+            headers['Range'] = 'bytes=%s-%s' % (
+                start or 0, '' if end is None else end)
+        if if_match is not None:
+            headers['If-Match'] = if_match
+        resp = session.get(url, endpoint_filter=self.service,
+                           headers=headers, stream=True)
+        try:
+            if ranged and resp.status_code != 206:
+                raise exceptions.SDKException(
+                    "The range %s of object %s was not honoured" %
+                    (headers['Range'], url))
+            etag = resp.headers.get('etag')
+            if (if_match is not None and etag is not None
+                    and etag.strip('"') != if_match.strip('"')):
+                raise exceptions.SDKException(
+                    "The object %s was changed during the download" % url)
+            for chunk in resp.iter_content(chunk_size):
+                yield chunk
+        finally:
+            resp.close()
+
+    def create_manifest(self, session, segments):
+        """Create the object as a static large object made of segments
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param list segments: The segments of the object, in order, as
+                              dicts with their ``path`` (``/container/name``),
+                              ``etag`` and ``size_bytes``.
+        :return: This :class:`Object` instance.
+        """
+        url = self._get_url(self, self.id)
+
+        headers = self.get_headers()
+        headers['Accept'] = ''
+        resp = session.put(url, endpoint_filter=self.service,
+                           params={'multipart-manifest': 'put'},
+                           json=segments, headers=headers).headers
+        self.set_headers(resp)
+        return self
+
     def create(self, session):
         url = self._get_url(self, self.id)
 
@@ -248,3 +319,51 @@ class Object(_base.BaseResource):
                                 headers=headers).headers
         self.set_headers(resp)
         return self
+
+
+class SegmentReader(object):
+    """File-like view of a segment of a seekable file
+
+    The segments of a file can be read from different threads, each read
+    seeks the file under a lock shared by the segments. It is rewound by
+    the sessions to hash and resend the body of a request.
+    """
+
+    def __init__(self, fileobj, offset, length, lock=None):
+        """
+        :param fileobj: The seekable binary file the segment is part of.
+        :param int offset: The offset of the segment in the file.
+        :param int length: The size of the segment, in bytes.
+        :param lock: The lock serializing the reads of the file.
+        """
+        self._file = fileobj
+        self._offset = offset
+        self._length = length
+        self._lock = lock or threading.Lock()
+        self._position = 0
+
+    def __len__(self):
+        return self._length
+
+    def tell(self):
+        return self._position
+
+    def seek(self, position, whence=0):
+        if whence == 1:
+            position += self._position
+        elif whence == 2:
+            position += self._length
+        self._position = min(max(position, 0), self._length)
+        return self._position
+
+    def read(self, size=-1):
+        remaining = self._length - self._position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if not size:
+            return b''
+        with self._lock:
+            self._file.seek(self._offset + self._position)
+            data = self._file.read(size)
+        self._position += len(data)
+        return data
@@ -67,59 +67,104 @@ The resulting preference print out would look something like::
     service_type=identity,region=zion,version=v3
 """
 
+import collections
 import copy
+import importlib
 import logging
 
 import six
 
 from openstack import exceptions
 from openstack import module_loader
-from openstack.anti_ddos import anti_ddos_service
-from openstack.auto_scaling import auto_scaling_service
-from openstack.block_store import block_store_service
-from openstack.cdn import cdn_service
-from openstack.cloud_eye import cloud_eye_service
-from openstack.compute import compute_service
-from openstack.cts import cts_service
-from openstack.dms import dms_service
-from openstack.dns import dns_service
-from openstack.ecs import ecs_service
-from openstack.evs import evs_service
-from openstack.identity import identity_service
-from openstack.image import image_service
-from openstack.kms import kms_service
-from openstack.load_balancer import load_balancer_service as lb_service
-from openstack.maas import maas_service
-from openstack.map_reduce import map_reduce_service
-from openstack.network import network_service
-from openstack.orchestration import orchestration_service
-from openstack.smn import smn_service
-from openstack.volume_backup import volume_backup_service
-from openstack.vpc import vpc_service
-from openstack.bms import bms_service
-from openstack.deh import deh_service
-from openstack.csbs import csbs_service
-from openstack.ims import ims_service
-from openstack.nat import nat_service
-# from openstack.key_manager import key_manager_service
-# from openstack.bare_metal import bare_metal_service
-# from openstack.cluster import cluster_service
-# from openstack.database import database_service
-# from openstack.message import message_service
-# from openstack.object_store import object_store_service
-from openstack.rds import rds_service
-from openstack.bss import bss_service
-from openstack.bssintl import bss_intl_service
-# from openstack.rds_os import rds_os_service
-# from openstack.telemetry.alarm import alarm_service
-# from openstack.telemetry import telemetry_service
-# from openstack.workflow import workflow_service
-from openstack.fgs import fgs_service
-from openstack.iam import iam_service
-from openstack.tms import tms_service
-from openstack.eps import eps_service
+
 _logger = logging.getLogger(__name__)
 
+#: The services known by default as (service type, connection attribute,
+#: service class, default version). A service module is only imported the
+#: first time the service is used.
+#: Not supported services: message, clustering, database, alarming,
+#: baremetal, key-manager, object-store, rds_os, metering and workflow.
+SERVICES = [
+    ("anti-ddos", "anti_ddos",
+     "openstack.anti_ddos.anti_ddos_service.AntiDDosService", "v1"),
+    ("volume", "block_store",
+     "openstack.block_store.block_store_service.BlockStoreService", "v2"),
+    ("compute", "compute",
+     "openstack.compute.compute_service.ComputeService", "v2"),
+    ("cts", "cts", "openstack.cts.cts_service.CTSService", "v1"),
+    ("dms", "dms", "openstack.dms.dms_service.DMSService", "v1"),
+    ("identity", "identity",
+     "openstack.identity.identity_service.IdentityService", "v3"),
+    ("image", "image", "openstack.image.image_service.ImageService", "v2"),
+    ("kms", "kms", "openstack.kms.kms_service.KMSService", "v1"),
+    ("maas", "maas", "openstack.maas.maas_service.MaaSService", "v1"),
+    ("network", "network",
+     "openstack.network.network_service.NetworkService", "v2.0"),
+    ("orchestration", "orchestration",
+     "openstack.orchestration.orchestration_service.OrchestrationService",
+     "v1"),
+    ("smnv2", "smn", "openstack.smn.smn_service.SMNService", "v2"),
+    # QianBiao.NG HuaWei Services
+    ("dns", "dns", "openstack.dns.dns_service.DNSService", "v2"),
+    ("cesv1", "cloud_eye",
+     "openstack.cloud_eye.cloud_eye_service.CloudEyeService", "v1"),
+    ("asv1", "auto_scaling",
+     "openstack.auto_scaling.auto_scaling_service.AutoScalingService", "v1"),
+    ("vbsv2", "volume_backup",
+     "openstack.volume_backup.volume_backup_service.VolumeBackupService",
+     "v2"),
+    ("mrsv1.1", "map_reduce",
+     "openstack.map_reduce.map_reduce_service.MapReduceService", "v1"),
+    ("evsv2.1", "evs", "openstack.evs.evs_service.EvsServiceV2_1", "v2.1"),
+    ("evs", "evs", "openstack.evs.evs_service.EvsService", "v2"),
+    ("ecs", "ecs", "openstack.ecs.ecs_service.EcsService", "v1"),
+    ("ecsv1.1", "ecs", "openstack.ecs.ecs_service.EcsServiceV1_1", "v1.1"),
+    ("vpcv2.0", "vpc", "openstack.vpc.vpc_service.VpcService", "v2.0"),
+    ("vpc", "vpcv1", "openstack.vpc.vpc_service.VpcServiceV1", "v1"),
+    ("bms", "bms", "openstack.bms.bms_service.BmsService", "v1"),
+    ("deh", "deh", "openstack.deh.deh_service.DehService", "v1.0"),
+    ("data-protect", "csbs", "openstack.csbs.csbs_service.CsbsService", "v1"),
+    ("ims", "ims", "openstack.ims.ims_service.ImsService", "v2"),
+    ("nat", "nat", "openstack.nat.nat_service.NatService", "v2.0"),
+    ("elbv1", "load_balancer",
+     "openstack.load_balancer.load_balancer_service.LoadBalancerService",
+     "v1"),
+    ("bssv1", "bss", "openstack.bss.bss_service.BssService", "v1"),
+    ("bss-intlv1", "bssintl",
+     "openstack.bssintl.bss_intl_service.BssIntlService", "v1"),
+    ("rdsv1", "rds", "openstack.rds.rds_service.RDSService", "v1"),
+    ("rdsv3", "rdsv3", "openstack.rds.rds_service.RDSServiceV3", "v3"),
+    ("cdn", "cdn", "openstack.cdn.cdn_service.CDNService", "v1"),
+    ("iam", "iam", "openstack.iam.iam_service.IamService", "v3.0"),
+    ("fgsv2", "fgs", "openstack.fgs.fgs_service.FGSService", "v2"),
+    ("tms", "tms", "openstack.tms.tms_service.TmsService", "v1"),
+    ("eps", "eps", "openstack.eps.eps_service.EpsService", "v1"),
+]
+
+
+class _ServiceSpec(object):
+    """A service registered by name which is not imported yet"""
+
+    def __init__(self, service_type, module_name, service_class, version):
+        self.service_type = service_type
+        self.module_name = module_name
+        self.service_class = service_class
+        self.version = version
+        # preferences set before the service is loaded
+        self.attrs = {}
+
+    def __repr__(self):
+        return "<%s %s>" % (self.service_class, self.service_type)
+
+    def load(self):
+        module, cls = self.service_class.rsplit(".", 1)
+        serv = getattr(importlib.import_module(module), cls)(
+            version=self.version)
+        serv.interface = None
+        for attr, value in six.iteritems(self.attrs):
+            setattr(serv, attr, value)
+        return serv
+
 
 class Profile(object):
 
@@ -136,64 +181,14 @@ class Profile(object):
         Services are identified by their service type, e.g.: 'identity',
         'compute', etc.
         """
-        self._services = {}
-        # self._services_module = {}
-
-        self._add_service(anti_ddos_service.AntiDDosService(version="v1"))
-        self._add_service(block_store_service.BlockStoreService(version="v2"))
-        self._add_service(compute_service.ComputeService(version="v2"))
-        self._add_service(cts_service.CTSService(version="v1"))
-        self._add_service(dms_service.DMSService(version="v1"))
-        self._add_service(identity_service.IdentityService(version="v3"))
-        self._add_service(image_service.ImageService(version="v2"))
-        self._add_service(kms_service.KMSService(version="v1"))
-        self._add_service(maas_service.MaaSService(version="v1"))
-        self._add_service(network_service.NetworkService(version="v2.0"))
-        self._add_service(orchestration_service.OrchestrationService(version="v1"))
-        self._add_service(smn_service.SMNService(version="v2"))
-        # QianBiao.NG HuaWei Services
-        self._add_service(dns_service.DNSService(version="v2"))
-        self._add_service(cloud_eye_service.CloudEyeService(version="v1"))
-        ass = auto_scaling_service.AutoScalingService(version="v1")
-        self._add_service(ass)
-        vbs_v2 = volume_backup_service.VolumeBackupService(version="v2")
-        self._add_service(vbs_v2)
-        self._add_service(map_reduce_service.MapReduceService(version="v1"))
-        self._add_service(evs_service.EvsServiceV2_1(version='v2.1'))
-        self._add_service(evs_service.EvsService(version='v2'))
-        self._add_service(ecs_service.EcsService(version='v1'))
-        self._add_service(ecs_service.EcsServiceV1_1(version='v1.1'))
-        self._add_service(vpc_service.VpcService(version='v2.0'))
-        self._add_service(vpc_service.VpcServiceV1(version='v1'))
-        self._add_service(bms_service.BmsService(version='v1'))
-        self._add_service(deh_service.DehService(version='v1.0'))
-        self._add_service(csbs_service.CsbsService(version='v1'))
-        self._add_service(ims_service.ImsService(version='v2'))
-        self._add_service(nat_service.NatService(version='v2.0'))
-        self._add_service(lb_service.LoadBalancerService(version='v1'))
-        self._add_service(bss_service.BssService(version='v1'))
-        self._add_service(bss_intl_service.BssIntlService(version='v1'))
-        # not support below service
-        # self._add_service(message_service.MessageService(version="v1"))
-        # self._add_service(cluster_service.ClusterService(version="v1"))
-        # self._add_service(database_service.DatabaseService(version="v1"))
-        # self._add_service(alarm_service.AlarmService(version="v2"))
-        # self._add_service(bare_metal_service.BareMetalService(version="v1"))
-        # self._add_service(key_manager_service.KeyManagerService(version="v1"))
-        # self._add_service(
-            # object_store_service.ObjectStoreService(version="v1"))
-
-        self._add_service(rds_service.RDSService(version="v1"))
-        self._add_service(rds_service.RDSServiceV3(version="v3"))
-        self._add_service(cdn_service.CDNService(version='v1'))
-        self._add_service(iam_service.IamService(version='v3.0'))
-
-        # self._add_service(rds_os_service.RDSService(version="v1"))
-        # self._add_service(telemetry_service.TelemetryService(version="v2"))
-        # self._add_service(workflow_service.WorkflowService(version="v2"))
-        self._add_service(fgs_service.FGSService(version='v2'))
-        self._add_service(tms_service.TmsService(version='v1'))
-        self._add_service(eps_service.EpsService(version='v1'))
+        self._services = collections.OrderedDict()
+        self._service_modules = {}
+        #: Incremented whenever a preference changes, so that the values
+        #: derived from the preferences know when to be computed again.
+        self.generation = 0
+        for service_type, module_name, service_class, version in SERVICES:
+            self._register_service(service_type, module_name, service_class,
+                                   version)
         if plugins:
             for plugin in plugins:
                 self._load_plugin(plugin)
@@ -203,13 +198,24 @@ class Profile(object):
         return repr(self._services)
 
     def _add_service(self, serv):
+        self.generation += 1
         serv.interface = None
         self._services[serv.service_type] = serv
-        # module_name = serv.get_service_module()
-        # self._services_module.setdefault(module_name, []).append(serv)
+        self._service_modules[serv.service_type] = serv.get_service_module()
+
+    def _register_service(self, service_type, module_name, service_class,
+                          version):
+        """Register a service without importing it.
 
-    # def get_module(self, module_name):
-    #     return self._services_module.get(module_name, [])
+        :param str service_type: The service type.
+        :param str module_name: The name of the connection attribute of
+                                the service.
+        :param str service_class: The dotted path of the service class.
+        :param str version: The default version of the service.
+        """
+        self._services[service_type] = _ServiceSpec(
+            service_type, module_name, service_class, version)
+        self._service_modules[service_type] = module_name
 
     def _load_plugin(self, namespace):
         """Load a service plugin.
@@ -236,6 +242,9 @@ class Profile(object):
         :param str service: Desired service type.
         """
         serv = self._services.get(service, None)
+        if isinstance(serv, _ServiceSpec):
+            serv = serv.load()
+            self._services[service] = serv
         if serv is not None:
             return serv
         msg = ("Service %s not in list of valid services: %s" %
@@ -246,15 +255,49 @@ class Profile(object):
         return self.service_keys if service == self.ALL else [service]
 
     def _setter(self, service, attr, value):
+        self.generation += 1
         for service in self._get_services(service):
-            setattr(self._get_filter(service), attr, value)
+            serv = self._services.get(service, None)
+            if isinstance(serv, _ServiceSpec):
+                serv.attrs[attr] = value
+            else:
+                setattr(self._get_filter(service), attr, value)
 
     def get_services(self):
-        """Get a list of all the known services."""
-        services = []
-        for name, service in six.iteritems(self._services):
-            services.append(service)
-        return services
+        """Get a list of all the known services.
+
+        This loads every service which has not been used yet.
+        """
+        return [self._get_filter(service) for service in list(self._services)]
+
+    def get_api_versions(self):
+        """Get the API micro-versions requested for the services.
+
+        :return: A list of ``(service_type, api_version)`` tuples of the
+                 services with an API micro-version, without loading the
+                 services.
+        """
+        versions = []
+        for service_type, serv in six.iteritems(self._services):
+            if isinstance(serv, _ServiceSpec):
+                api_version = serv.attrs.get("api_version")
+            else:
+                api_version = serv.api_version
+            if service_type and api_version:
+                versions.append((service_type, api_version))
+        return versions
+
+    def get_service_modules(self):
+        """Get the connection attribute name of each known service.
+
+        :return: A dict mapping attribute names to service types, without
+                 loading the services. When several services share a name
+                 the one registered last wins.
+        """
+        modules = {}
+        for service in self._services:
+            modules[self._service_modules[service]] = service
+        return modules
 
     def set_name(self, service, name):
         """Set the desired name for the specified service.
@@ -279,6 +322,7 @@ class Profile(object):
         :param str version: Desired service version.
         """
         self._get_filter(service).version = version
+        self.generation += 1
 
     def set_api_version(self, service, api_version):
         """Set the desired API micro-version for the specified service.
@@ -49,15 +49,27 @@ and then returned to the caller.
 
 import collections
 import itertools
+import sys
+import threading
 import time
 import logging
+import weakref
+
+import six
+from six.moves import queue
 
 from openstack import exceptions
 from openstack import format
+from openstack import instrumentation
+from openstack import jsonutils
 from openstack import utils
+from openstack import waiter
 
 _logger = logging.getLogger(__name__)
 
+#: Marks the end of the pages produced by a prefetching list.
+_PAGES_DONE = object()
+
 
 class _BaseComponent(object):
     # The name this component is being tracked as in the Resource
@@ -206,6 +218,22 @@ class _Request(object):
         self.headers = headers
 
 
+class _RequestPlan(object):
+    """What every request of a Resource class through a session shares
+
+    Plans are built once per class and session, and rebuilt when the
+    profile of the session changes. They must be treated as read-only.
+    """
+
+    __slots__ = ("generation", "service", "microversion", "endpoint_override")
+
+    def __init__(self, generation, service, endpoint_override):
+        self.generation = generation
+        self.service = service
+        self.microversion = service.microversion
+        self.endpoint_override = endpoint_override
+
+
 class QueryParameters(object):
     def __init__(self, *names, **mappings):
         """Create a dict of accepted query parameters
@@ -240,6 +268,76 @@ class QueryParameters(object):
         return result
 
 
+class _LightweightResource(object):
+    """Compact read-only representation of a listed resource
+
+    Subclasses are generated once per :class:`Resource` class by
+    :meth:`Resource._get_lightweight_type` with one slot per
+    :class:`Body` attribute. Values are kept as returned by the server,
+    without type conversion or dirty tracking.
+    """
+
+    __slots__ = ()
+
+    #: The Resource class this type represents. The class attributes are
+    #: private so that they cannot collide with an attribute name.
+    _resource_type = None
+    #: Mapping of server-side names to attribute names.
+    _server_names = {}
+    #: Mapping of attribute names to their default value.
+    _defaults = {}
+    #: Attribute name holding the alternate id, if any.
+    _alternate_id = ""
+
+    def __init__(self, data):
+        server_names = self._server_names
+        for key, value in data.items():
+            for name in server_names.get(key, ()):
+                object.__setattr__(self, name, value)
+
+    def __getattr__(self, name):
+        # Only called for slots which were not returned by the server.
+        if name == "id" and self._alternate_id:
+            return getattr(self, self._alternate_id)
+        try:
+            return self._defaults[name]
+        except KeyError:
+            raise AttributeError("%r object has no attribute %r" %
+                                 (self.__class__.__name__, name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is read-only" % self.__class__.__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError("%s is read-only" % self.__class__.__name__)
+
+    def __eq__(self, comparand):
+        return (type(self) is type(comparand) and
+                self.to_dict() == comparand.to_dict())
+
+    def __ne__(self, comparand):
+        return not self == comparand
+
+    def __repr__(self):
+        args = ", ".join("%s=%s" % item for item in self.to_dict().items())
+        return "%s.%s(%s)" % (self._resource_type.__module__,
+                              self.__class__.__name__, args)
+
+    def to_dict(self, ignore_none=False):
+        """Return a dictionary of the attributes of this resource
+
+        :param bool ignore_none: When True, exclude key/value pairs where
+                                 the value is None.
+        """
+        mapping = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if ignore_none and value is None:
+                continue
+            mapping[name] = value
+        return mapping
+
+
 class Resource(object):
     #: Singular form of key for resource.
     resource_key = None
@@ -250,6 +348,12 @@ class Resource(object):
     #: marker key in query, default is `marker`
     query_marker_key = "marker"
     query_limit_key = "limit"
+    #: dotted json path to the total number of resources of a list, when
+    #: the service returns it
+    total_path = None
+    #: query parameter filtering a list by several ids at once, when the
+    #: service supports it. Used by :mod:`openstack.waiter`.
+    id_filter = None
 
     #: The ID of this resource.
     id = Body("id")
@@ -289,13 +393,38 @@ class Resource(object):
         """
         :param sess: ~openstack.session.Session.
         :param resource: ~openstack.resource2.Resource
-        :return: ~openstack.service_filter.ServiceFilter
+        :return: ~openstack.service_filter.ServiceFilter, which must not be
+                 modified since it is shared by the requests of the
+                 resource class.
         """
-        service = session.profile.get_filter(resource.service.service_type)
-        if service:
-            return service
-        else:
-            return resource.service
+        if not isinstance(resource, type):
+            resource = type(resource)
+        return resource._get_request_plan(session).service
+
+    @classmethod
+    def _build_request_plan(cls, session, generation):
+        service = session.profile.get_filter(cls.service.service_type)
+        return _RequestPlan(generation, service or cls.service,
+                            cls.service.get_endpoint_override())
+
+    @classmethod
+    def _get_request_plan(cls, session):
+        """Return the service filter, microversion and endpoint override
+        of the requests of this class through a session
+
+        The plan is cached per session until a setter of its
+        :class:`~openstack.profile.Profile` is called.
+        """
+        generation = getattr(session.profile, "generation", None)
+        if not isinstance(generation, six.integer_types):
+            # Profiles not tracking their changes cannot be cached
+            return cls._build_request_plan(session, generation)
+        plans = cls._cached("request_plans", weakref.WeakKeyDictionary)
+        plan = plans.get(session)
+        if plan is None or plan.generation != generation:
+            plan = plans[session] = cls._build_request_plan(session,
+                                                            generation)
+        return plan
 
     def __init__(self, _synchronized=False, **attrs):
         """The base resource
@@ -344,15 +473,16 @@ class Resource(object):
         `alternate_id` argument to resource.Body.
         """
         if name == "id":
-            if name in self._body:
-                return self._body[name]
+            body = self._body
+            if name in body:
+                return body[name]
 
-            real_id_name = self._body_mapping()[name]
-            if real_id_name in self._body:
-                return self._body[real_id_name]
+            real_id_name, alternate_id = self._id_names()
+            if real_id_name in body:
+                return body[real_id_name]
             else:
                 try:
-                    return self._body[self._alternate_id()]
+                    return body[alternate_id]
                 except KeyError:
                     return None
         else:
@@ -396,21 +526,12 @@ class Resource(object):
         same source dict several times.
         """
 
-        fields = {}
-        for klass in cls.__mro__:
-            for key, component in klass.__dict__.items():
-                if isinstance(component, component_type):
-                    # Make sure base classes don't end up overwriting
-                    # mappings we've found previously in subclasses.
-                    if key not in fields:
-                        fields[key] = component
-                        fields[component.name] = component
+        fields = cls._get_fields(component_type)
 
         relevant_attrs = {}
-        attr_keys = list(attrs.keys())
-        for key in attr_keys:
-            if key in fields:
-                field = fields[key]
+        for key in list(attrs):
+            field = fields.get(key)
+            if field is not None:
                 value = attrs.pop(key)
                 server_side_key = field.name
                 # Convert client-side key names into server-side.
@@ -452,22 +573,76 @@ class Resource(object):
     #
     #     return relevant_attrs
 
+    @classmethod
+    def _cached(cls, key, build):
+        """Return a value computed once per class
+
+        The values live in the own ``__dict__`` of each class so that
+        subclasses never reuse the maps of their parents. Since the
+        components of a class do not change after its definition, the
+        cached values must be treated as read-only.
+
+        :param key: The key of the value in the cache.
+        :param build: A callable without argument computing the value.
+        """
+        cache = cls.__dict__.get("_class_cache")
+        if cache is None:
+            cache = {}
+            cls._class_cache = cache
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = build()
+            return value
+
+    @classmethod
+    def _get_components(cls, component):
+        """Return a dict of attribute names to components of the class
+
+        :param component: A component type or a tuple of them.
+        """
+        def build():
+            components = {}
+            # Since we're looking at class definitions we need to include
+            # subclasses, so check the whole MRO.
+            for klass in cls.__mro__:
+                for key, value in klass.__dict__.items():
+                    if isinstance(value, component):
+                        # Make sure base classes don't end up overwriting
+                        # mappings we've found previously in subclasses.
+                        if key not in components:
+                            components[key] = value
+            return components
+
+        return cls._cached(("components", component), build)
+
+    @classmethod
+    def _get_fields(cls, component):
+        """Return a dict of client and server-side names to components"""
+        def build():
+            fields = {}
+            for klass in cls.__mro__:
+                for key, value in klass.__dict__.items():
+                    if isinstance(value, component):
+                        # Make sure base classes don't end up overwriting
+                        # mappings we've found previously in subclasses.
+                        if key not in fields:
+                            fields[key] = value
+                            fields[value.name] = value
+            return fields
+
+        return cls._cached(("fields", component), build)
+
     @classmethod
     def _get_mapping(cls, component):
         """Return a dict of attributes of a given component on the class
 
         """
-        mapping = {}
-        # Since we're looking at class definitions we need to include
-        # subclasses, so check the whole MRO.
-        for klass in cls.__mro__:
-            for key, value in klass.__dict__.items():
-                if isinstance(value, component):
-                    # Make sure base classes don't end up overwriting
-                    # mappings we've found previously in subclasses.
-                    if key not in mapping:
-                        mapping[key] = value.name
-        return mapping
+        def build():
+            return dict((key, value.name) for key, value
+                        in cls._get_components(component).items())
+
+        return cls._cached(("mapping", component), build)
 
     @classmethod
     def _body_mapping(cls):
@@ -494,11 +669,47 @@ class Resource(object):
         Returns an empty string if no name exists, as this method is
         consumed by _get_id and passed to getattr.
         """
-        for value in cls.__dict__.values():
-            if isinstance(value, Body):
-                if value.alternate_id:
-                    return value.name
-        return ""
+        def build():
+            for value in cls.__dict__.values():
+                if isinstance(value, Body):
+                    if value.alternate_id:
+                        return value.name
+            return ""
+
+        return cls._cached("alternate_id", build)
+
+    @classmethod
+    def _id_names(cls):
+        """Return the server-side names of the id and the alternate id"""
+        def build():
+            return cls._body_mapping()["id"], cls._alternate_id()
+
+        return cls._cached("id_names", build)
+
+    @classmethod
+    def _get_lightweight_type(cls):
+        """Return the compact read-only type of this class
+
+        The type is built on first use of every class, see
+        :class:`_LightweightResource`.
+        """
+        def build():
+            components = cls._get_components(Body)
+            server_names = {}
+            for key, component in components.items():
+                server_names.setdefault(component.name, []).append(key)
+            alternate_id = cls._alternate_id()
+            return type(cls.__name__, (_LightweightResource,), {
+                "__slots__": tuple(sorted(components)),
+                "_resource_type": cls,
+                "_server_names": dict((k, tuple(v))
+                                      for k, v in server_names.items()),
+                "_defaults": dict((k, c.default)
+                                  for k, c in components.items()),
+                "_alternate_id": server_names.get(alternate_id, [""])[0],
+            })
+
+        return cls._cached("lightweight", build)
 
     @staticmethod
     def _get_id(value):
@@ -573,22 +784,11 @@ class Resource(object):
         # isinstance stricly requires this to be a tuple
         components = tuple(components)
 
-        # NOTE: This is similar to the implementation in _get_mapping
-        # but is slightly different in that we're looking at an instance
-        # and we're mapping names on this class to their actual stored
-        # values.
-        # Since we're looking at class definitions we need to include
-        # subclasses, so check the whole MRO.
-        for klass in self.__class__.__mro__:
-            for key, value in klass.__dict__.items():
-                if isinstance(value, components):
-                    # Make sure base classes don't end up overwriting
-                    # mappings we've found previously in subclasses.
-                    if key not in mapping:
-                        value = getattr(self, key, None)
-                        if ignore_none and value is None:
-                            continue
-                        mapping[key] = value
+        for key in self._get_components(components):
+            value = getattr(self, key, None)
+            if ignore_none and value is None:
+                continue
+            mapping[key] = value
 
         return mapping
 
@@ -638,8 +838,15 @@ class Resource(object):
         This method updates attributes that correspond to headers
         and body on this instance and clears the dirty set.
         """
+        trace = instrumentation.get_trace(response)
+        if trace is not None:
+            started = trace.start()
         if has_body:
             body = response.json()
+            if trace is not None:
+                trace.record("parse", started)
+                trace.fire(instrumentation.PARSED)
+                started = trace.start()
             if self.resource_key and self.resource_key in body:
                 body = body[self.resource_key]
 
@@ -651,6 +858,9 @@ class Resource(object):
                                          self._header_mapping())
         self._header.attributes.update(headers)
         self._header.clean()
+        if trace is not None:
+            trace.record("build", started)
+            trace.fire(instrumentation.BUILT)
 
     def create(self, session, prepend_key=True):
         """Create a remote resource based on this instance.
@@ -668,22 +878,21 @@ class Resource(object):
         if not self.allow_create:
             raise exceptions.MethodNotSupported(self, "create")
 
-        endpoint_override = self.service.get_endpoint_override()
-        service = self.get_service_filter(self, session)
+        plan = self._get_request_plan(session)
         if self.put_create:
             request = self._prepare_request(requires_id=True,
                                             prepend_key=prepend_key)
             response = session.put(request.uri, endpoint_filter=self.service,
-                                   endpoint_override=endpoint_override,
+                                   endpoint_override=plan.endpoint_override,
                                    json=request.body, headers=request.headers,
-                                   microversion=service.microversion)
+                                   microversion=plan.microversion)
         else:
             request = self._prepare_request(requires_id=False,
                                             prepend_key=prepend_key)
             response = session.post(request.uri, endpoint_filter=self.service,
-                                    endpoint_override=endpoint_override,
+                                    endpoint_override=plan.endpoint_override,
                                     json=request.body, headers=request.headers,
-                                    microversion=service.microversion)
+                                    microversion=plan.microversion)
 
         self._translate_response(response)
         return self
@@ -704,15 +913,14 @@ class Resource(object):
         if not self.allow_create:
             raise exceptions.MethodNotSupported(self, "create")
 
-        endpoint_override = self.service.get_endpoint_override()
-        service = self.get_service_filter(self, session)
+        plan = self._get_request_plan(session)
         if self.put_create:
             request = self._prepare_request(requires_id=True,
                                             prepend_key=prepend_key)
             response = session.put(request.uri, endpoint_filter=self.service,
-                                   endpoint_override=endpoint_override,
+                                   endpoint_override=plan.endpoint_override,
                                    json=request.body, headers=headers,
-                                   microversion=service.microversion)
+                                   microversion=plan.microversion)
         else:
             request = self._prepare_request(requires_id=False,
                                             prepend_key=prepend_key)
@@ -720,9 +928,9 @@ class Resource(object):
                 request.headers.update(headers)
 
             response = session.post(request.uri, endpoint_filter=self.service,
-                                    endpoint_override=endpoint_override,
+                                    endpoint_override=plan.endpoint_override,
                                     json=request.body, headers=request.headers,
-                                    microversion=service.microversion)
+                                    microversion=plan.microversion)
 
         self._translate_response(response)
         return self
@@ -742,11 +950,10 @@ class Resource(object):
             raise exceptions.MethodNotSupported(self, "get")
 
         request = self._prepare_request(requires_id=requires_id)
-        endpoint_override = self.service.get_endpoint_override()
-        service = self.get_service_filter(self, session)
+        plan = self._get_request_plan(session)
         response = session.get(request.uri, endpoint_filter=self.service,
-                               microversion=service.microversion,
-                               endpoint_override=endpoint_override)
+                               microversion=plan.microversion,
+                               endpoint_override=plan.endpoint_override)
         self._translate_response(response)
         return self
 
@@ -764,11 +971,10 @@ class Resource(object):
             raise exceptions.MethodNotSupported(self, "head")
 
         request = self._prepare_request()
-        endpoint_override = self.service.get_endpoint_override()
-        service = self.get_service_filter(self, session)
+        plan = self._get_request_plan(session)
         response = session.head(request.uri, endpoint_filter=self.service,
-                                microversion=service.microversion,
-                                endpoint_override=endpoint_override,
+                                microversion=plan.microversion,
+                                endpoint_override=plan.endpoint_override,
                                 headers={"Accept": ""})
 
         self._translate_response(response)
@@ -800,18 +1006,17 @@ class Resource(object):
             raise exceptions.MethodNotSupported(self, "update")
 
         request = self._prepare_request(prepend_key=prepend_key)
-        service = self.get_service_filter(self, session)
-        endpoint_override = self.service.get_endpoint_override()
+        plan = self._get_request_plan(session)
         if self.patch_update:
             response = session.patch(request.uri, endpoint_filter=self.service,
-                                     microversion=service.microversion,
-                                     endpoint_override=endpoint_override,
+                                     microversion=plan.microversion,
+                                     endpoint_override=plan.endpoint_override,
                                      json=request.body,
                                      headers=request.headers)
         else:
             response = session.put(request.uri, endpoint_filter=self.service,
-                                   microversion=service.microversion,
-                                   endpoint_override=endpoint_override,
+                                   microversion=plan.microversion,
+                                   endpoint_override=plan.endpoint_override,
                                    json=request.body, headers=request.headers)
 
         self._translate_response(response, has_body=has_body)
@@ -833,11 +1038,10 @@ class Resource(object):
             raise exceptions.MethodNotSupported(self, "delete")
 
         request = self._prepare_request()
-        service = self.get_service_filter(self, session)
-        endpoint_override = self.service.get_endpoint_override()
+        plan = self._get_request_plan(session)
         response = session.delete(request.uri, endpoint_filter=self.service,
-                                  microversion=service.microversion,
-                                  endpoint_override=endpoint_override,
+                                  microversion=plan.microversion,
+                                  endpoint_override=plan.endpoint_override,
                                   headers={"Accept": ""},
                                   params=params)
 
@@ -867,7 +1071,8 @@ class Resource(object):
         return cls.base_path % params
 
     @classmethod
-    def list(cls, session, paginated=False, **params):
+    def list(cls, session, paginated=False, prefetch=0, lightweight=False,
+             stream=False, **params):
         """This method is a generator which yields resource objects.
 
         This resource object list generator handles pagination and takes query
@@ -881,6 +1086,21 @@ class Resource(object):
                                **When paginated is False only one
                                page of data will be returned regardless
                                of the API's support of pagination.**
+        :param int prefetch: When greater than 0 and ``paginated`` is
+                             ``True``, the pages are fetched by a background
+                             worker as soon as the marker of the next page is
+                             known, holding at most ``prefetch`` pages ahead
+                             of the caller. The worker stops when the
+                             generator is closed.
+        :param bool lightweight: When ``True``, yield compact read-only
+                                 objects with the same attribute names as
+                                 this class instead of :class:`Resource`
+                                 instances. Values are not type converted.
+        :param bool stream: When ``True``, the resources of a page are
+                            decoded and yielded while its body is received
+                            instead of once it is decoded whole, see
+                            :class:`~openstack.jsonutils.ItemStream`.
+                            It is ignored when prefetching.
         :param dict params: These keyword arguments are passed through the
             :meth:`~openstack.resource2.QueryParamter._transpose` method
             to find if any of them match expected query parameters to be
@@ -898,69 +1118,189 @@ class Resource(object):
         if not cls.allow_list:
             raise exceptions.MethodNotSupported(cls, "list")
 
-        more_data = True
         query_params = cls._query_mapping._transpose(params)
         uri = cls.get_list_uri(params)
-        service = cls.get_service_filter(cls, session)
-        while more_data:
-            endpoint_override = cls.service.get_endpoint_override()
-            resp = session.get(uri, endpoint_filter=cls.service,
-                               microversion=service.microversion,
-                               endpoint_override=endpoint_override,
-                               headers={"Accept": "application/json"},
-                               params=query_params)
-            response_json = resp.json()
-            if cls.resources_key:
-                resources = cls.find_value_by_accessor(response_json,
-                                                       cls.resources_key)
-            else:
-                resources = response_json
+        plan = cls._get_request_plan(session)
+        if prefetch and paginated:
+            pages = cls._prefetch_pages(session, uri, plan, query_params,
+                                        prefetch, lightweight)
+            for page in pages:
+                for value in page:
+                    yield value
+            return
 
-            if not resources:
-                more_data = False
+        while query_params is not None:
+            response_json, resources, trace = cls._get_page(
+                session, uri, plan, query_params, stream)
 
             # Keep track of how many items we've yielded. If we yielded
             # less than our limit, we don't need to do an extra request
             # to get back an empty data set, which acts as a sentinel.
             yielded = 0
             new_marker = None
-            for data in resources:
-                # Do not allow keys called "self" through. Glance chose
-                # to name a key "self", so we need to pop it out because
-                # we can't send it through cls.existing and into the
-                # Resource initializer. "self" is already the first
-                # argument and is practically a reserved word.
-                data.pop("self", None)
-
-                value = cls.existing(**data)
-                new_marker = value.id
-                yielded += 1
-                yield value
-
-            query_params = dict(query_params)
-            # if `next marker path` is explicit specified, use it as marker
-            next_marker = cls.get_next_marker(response_json,
-                                              yielded,
-                                              query_params)
-            if next_marker:
-                new_marker = next_marker if next_marker != -1 else None
-
-            # if cls.next_marker_path:
-            #     if isinstance(cls.next_marker_path, six.string_types):
-            #         new_marker = cls.find_value_by_accessor(response_json,
-            #                                                 cls.next_marker_path)
-            #     elif callable(cls.next_marker_path):
-            #         new_marker = cls.next_marker_path(response_json, yielded)
-
-            if not new_marker:
-                return
-            if not paginated:
+            try:
+                for data in resources:
+                    if trace is not None:
+                        started = trace.start()
+                    value = cls._existing_from_page(data, lightweight)
+                    if trace is not None:
+                        trace.record("build", started)
+                    new_marker = value.id
+                    yielded += 1
+                    yield value
+            finally:
+                if stream:
+                    resources.close()
+            if stream:
+                response_json = resources.document
+                if trace is not None:
+                    trace.fire(instrumentation.PARSED)
+            if trace is not None:
+                trace.fire(instrumentation.BUILT)
+
+            query_params = cls._get_next_query(response_json, resources,
+                                               yielded, new_marker,
+                                               query_params, paginated)
+
+    @classmethod
+    def _get_page(cls, session, uri, plan, query_params, stream=False):
+        """Fetch one page of a list
+
+        :param bool stream: Whether to decode the raw resources while the
+                            body is received. The response json is then
+                            None, it is the ``document`` of the
+                            :class:`~openstack.jsonutils.ItemStream` of
+                            the raw resources once they are all consumed.
+        :return: A tuple of the response json, the list of raw resources it
+                 contains and the
+                 :class:`~openstack.instrumentation.RequestTrace` of the
+                 request, None when it is not traced.
+        """
+        kwargs = {"stream": True} if stream else {}
+        resp = session.get(uri, endpoint_filter=cls.service,
+                           microversion=plan.microversion,
+                           endpoint_override=plan.endpoint_override,
+                           headers={"Accept": "application/json"},
+                           params=query_params, **kwargs)
+        trace = instrumentation.get_trace(resp)
+        if stream:
+            return (None,
+                    jsonutils.ItemStream.from_response(resp,
+                                                       cls.resources_key),
+                    trace)
+        if trace is not None:
+            started = trace.start()
+        response_json = resp.json()
+        if cls.resources_key:
+            resources = cls.find_value_by_accessor(response_json,
+                                                   cls.resources_key)
+        else:
+            resources = response_json
+        if trace is not None:
+            trace.record("parse", started)
+            trace.fire(instrumentation.PARSED)
+        return response_json, resources, trace
+
+    @classmethod
+    def _existing_from_page(cls, data, lightweight=False):
+        if lightweight:
+            return cls._get_lightweight_type()(data)
+        # Do not allow keys called "self" through. Glance chose
+        # to name a key "self", so we need to pop it out because
+        # we can't send it through cls.existing and into the
+        # Resource initializer. "self" is already the first
+        # argument and is practically a reserved word.
+        data.pop("self", None)
+        return cls.existing(**data)
+
+    @classmethod
+    def _get_next_query(cls, response_json, resources, yielded, new_marker,
+                        query_params, paginated):
+        """Return the query parameters of the next page
+
+        :return: The query parameters dict, or None when there is no
+                 next page to request.
+        """
+        if not resources:
+            return None
+
+        query_params = dict(query_params)
+        # if `next marker path` is explicit specified, use it as marker
+        next_marker = cls.get_next_marker(response_json,
+                                          yielded,
+                                          query_params)
+        if next_marker:
+            new_marker = next_marker if next_marker != -1 else None
+
+        if not new_marker:
+            return None
+        if not paginated:
+            return None
+        if cls.query_limit_key in query_params:
+            if yielded < query_params["limit"]:
+                return None
+        query_params[cls.query_limit_key] = yielded
+        query_params[cls.query_marker_key] = new_marker
+        return query_params
+
+    @classmethod
+    def _prefetch_pages(cls, session, uri, plan, query_params, depth,
+                        lightweight=False):
+        """Generate the pages of a list fetched by a background worker
+
+        The worker requests the next page as soon as its marker is known
+        and blocks once ``depth`` pages are waiting to be consumed. Closing
+        the generator stops the worker.
+        """
+        pages = queue.Queue(maxsize=depth)
+        cancelled = threading.Event()
+
+        def put(item):
+            while not cancelled.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            params = query_params
+            try:
+                while params is not None and not cancelled.is_set():
+                    response_json, resources, trace = cls._get_page(
+                        session, uri, plan, params)
+                    if trace is not None:
+                        started = trace.start()
+                    values = [cls._existing_from_page(data, lightweight)
+                              for data in resources]
+                    if trace is not None:
+                        trace.record("build", started)
+                        trace.fire(instrumentation.BUILT)
+                    new_marker = values[-1].id if values else None
+                    params = cls._get_next_query(response_json, resources,
+                                                 len(values), new_marker,
+                                                 params, True)
+                    if not put(values):
+                        return
+            except Exception:
+                put(sys.exc_info())
                 return
-            if cls.query_limit_key in query_params:
-                if yielded < query_params["limit"]:
+            put(_PAGES_DONE)
+
+        worker = threading.Thread(target=produce)
+        worker.daemon = True
+        worker.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is _PAGES_DONE:
                     return
-            query_params[cls.query_limit_key] = yielded
-            query_params[cls.query_marker_key] = new_marker
+                if isinstance(page, tuple):
+                    six.reraise(*page)
+                yield page
+        finally:
+            cancelled.set()
 
     @classmethod
     def list_once(cls, session, **params):
@@ -985,12 +1325,11 @@ class Resource(object):
             raise exceptions.MethodNotSupported(cls, "list")
         query_params = cls._query_mapping._transpose(params)
         uri = cls.get_list_uri(params)
-        service = cls.get_service_filter(cls, session)
-        endpoint_override = cls.service.get_endpoint_override()
+        plan = cls._get_request_plan(session)
 
         resp = session.get(uri, endpoint_filter=cls.service,
-                           microversion=service.microversion,
-                           endpoint_override=endpoint_override,
+                           microversion=plan.microversion,
+                           endpoint_override=plan.endpoint_override,
                            headers={"Accept": "application/json"},
                            params=query_params)
 
@@ -1002,7 +1341,8 @@ class Resource(object):
         return value
 
     @classmethod
-    def list_by_offset(cls, session, paginated=False, **params):
+    def list_by_offset(cls, session, paginated=False, concurrency=1,
+                       **params):
         """This method is a generator which yields resource objects.
 
         This resource object list generator handles pagination and takes query
@@ -1016,6 +1356,12 @@ class Resource(object):
                                **When paginated is False only one
                                page of data will be returned regardless
                                of the API's support of pagination.**
+        :param int concurrency: The number of pages fetched at the same time
+                                once the first page tells the total number
+                                of resources through
+                                :data:`Resource.total_path`. Pages are still
+                                yielded in order. When the total is unknown
+                                the pages are fetched one after another.
         :param dict params: These keyword arguments are passed through the
             :meth:`~openstack.resource2.QueryParamter._transpose` method
             to find if any of them match expected query parameters to be
@@ -1038,15 +1384,11 @@ class Resource(object):
         uri = cls.get_list_uri(params)
         offset = query_params.get("offset")
         limit = query_params.get("limit")
+        plan = cls._get_request_plan(session)
 
         while more_data:
-            endpoint_override = cls.service.get_endpoint_override()
-            resp = session.get(uri, endpoint_filter=cls.service,
-                               endpoint_override=endpoint_override,
-                               headers={"Accept": "application/json"},
-                               params=query_params)
-            response_json = resp.json()
-            resources = response_json
+            resources = cls._get_offset_page(session, uri, plan,
+                                             query_params)
 
             if not resources:
                 return
@@ -1070,11 +1412,59 @@ class Resource(object):
             # Check if you need to continue sending requests.
             if current_page_size < int(limit):
                 return
+
+            total = None
+            if cls.total_path and concurrency > 1:
+                total = cls.find_value_by_accessor(resources, cls.total_path)
+            if isinstance(total, six.integer_types):
+                pages = cls._list_offset_pages(session, uri, plan,
+                                               query_params, total,
+                                               concurrency)
+                for value in pages:
+                    yield value
+                return
+
+            if int(query_params.get("offset")) == 0:
+                query_params["offset"] = 2
             else:
-                if int(query_params.get("offset")) == 0:
-                    query_params["offset"] = 2
-                else:
-                    query_params["offset"] = int(query_params.get("offset")) + 1
+                query_params["offset"] = int(query_params.get("offset")) + 1
+
+    @classmethod
+    def _get_offset_page(cls, session, uri, plan, query_params):
+        resp = session.get(uri, endpoint_filter=cls.service,
+                           microversion=plan.microversion,
+                           endpoint_override=plan.endpoint_override,
+                           headers={"Accept": "application/json"},
+                           params=query_params)
+        return resp.json()
+
+    @classmethod
+    def _list_offset_pages(cls, session, uri, plan, query_params, total,
+                           concurrency):
+        """Fetch the pages following the current one in parallel
+
+        The offset is the number of a page, starting from 1, so the
+        remaining pages are addressable once the total is known.
+        """
+        limit = int(query_params["limit"])
+        first = max(int(query_params["offset"]), 1)
+        last = (total + limit - 1) // limit
+
+        def fetch(offset):
+            page_params = dict(query_params)
+            page_params["offset"] = offset
+            return cls._get_offset_page(session, uri, plan, page_params)
+
+        pages = utils.iter_concurrently(fetch, range(first + 1, last + 1),
+                                        concurrency)
+        try:
+            for resources in pages:
+                if not resources or not resources.get(cls.resources_key):
+                    return
+                resources.pop("self", None)
+                yield cls.existing(**resources)
+        finally:
+            pages.close()
 
     @classmethod
     def _get_one_match(cls, name_or_id, results):
@@ -1143,7 +1533,7 @@ class Resource(object):
 
 
 def wait_for_status(session, resource, status,
-                    failures=[], interval=5, wait=120):
+                    failures=[], interval=5, wait=120, backoff=None):
     """Wait for the resource to be in a particular status.
 
     :param session: The session to use for making this request.
@@ -1156,6 +1546,8 @@ def wait_for_status(session, resource, status,
                           failed such as 'ERROR'.
     :param interval: Number of seconds to wait between checks.
     :param wait: Maximum number of seconds to wait for transition.
+    :param backoff: A :class:`~openstack.waiter.Backoff` spacing the checks
+                    out, instead of the fixed ``interval``.
 
     :return: Method returns self on success.
     :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
@@ -1171,6 +1563,7 @@ def wait_for_status(session, resource, status,
     total_sleep = 0
     if failures is None:
         failures = []
+    delays = (backoff or waiter.Backoff.fixed(interval)).delays()
 
     while total_sleep < wait:
         resource.get(session)
@@ -1180,13 +1573,14 @@ def wait_for_status(session, resource, status,
             msg = ("Resource %s transitioned to failure state %s" %
                    (resource.id, resource.status))
             raise exceptions.ResourceFailure(msg)
-        time.sleep(interval)
-        total_sleep += interval
+        delay = next(delays)
+        time.sleep(delay)
+        total_sleep += delay
     msg = "Timeout waiting for %s to transition to %s" % (resource.id, status)
     raise exceptions.ResourceTimeout(msg)
 
 
-def wait_for_delete(session, resource, interval, wait):
+def wait_for_delete(session, resource, interval, wait, backoff=None):
     """Wait for the resource to be deleted.
 
     :param session: The session to use for making this request.
@@ -1195,18 +1589,22 @@ def wait_for_delete(session, resource, interval, wait):
     :type resource: :class:`~openstack.resource.Resource`
     :param interval: Number of seconds to wait between checks.
     :param wait: Maximum number of seconds to wait for the delete.
+    :param backoff: A :class:`~openstack.waiter.Backoff` spacing the checks
+                    out, instead of the fixed ``interval``.
 
     :return: Method returns self on success.
     :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
              to status failed to occur in wait seconds.
     """
     total_sleep = 0
+    delays = (backoff or waiter.Backoff.fixed(interval)).delays()
     while total_sleep < wait:
         try:
             resource.get(session)
         except exceptions.NotFoundException:
             return resource
-        time.sleep(interval)
-        total_sleep += interval
+        delay = next(delays)
+        time.sleep(delay)
+        total_sleep += delay
     msg = "Timeout waiting for %s delete" % (resource.id)
     raise exceptions.ResourceTimeout(msg)
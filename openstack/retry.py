@@ -0,0 +1,343 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Retries of throttled or failed requests, and client side rate limiting.
+
+A :class:`RetryPolicy` given to a session resends the requests which got a
+throttling or transient error response, waiting for the ``Retry-After``
+delay of the response or for an exponential backoff. It can also space out
+the requests sent to each service type so that the API gateway does not
+throttle them in the first place::
+
+    from openstack import connection
+    from openstack import retry
+
+    policy = retry.RetryPolicy(max_retries=5,
+                               rate_limits={"compute": (20, 40)})
+    conn = connection.Connection(retry_policy=policy, **auth)
+    ...
+    print(policy.metrics.snapshot())
+
+A policy keeps the state of its rate limiters, retry budget and metrics, so
+sharing it between sessions shares their limits.
+"""
+
+import collections
+import email.utils
+import threading
+import time
+
+import six
+from keystoneauth1 import _utils as log_utils
+from keystoneauth1 import exceptions as _exceptions
+
+from openstack import waiter
+
+_logger = log_utils.get_logger(__name__)
+
+#: Methods which can be sent again without changing their outcome.
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+#: Statuses retried for the idempotent methods.
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+#: Statuses retried for any method, the request having not been processed.
+THROTTLE_STATUSES = frozenset([429])
+
+
+class TokenBucket(object):
+    """Rate limiter letting ``rate`` requests per second through
+
+    Up to ``capacity`` requests can be sent at once after an idle period.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param float rate: number of tokens added every second
+        :param float capacity: maximum number of tokens, ``rate`` by default
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        # Take a token, possibly in advance, and return how long to wait
+        # for it to be available.
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Wait for a token
+
+        :return: the number of seconds waited
+        """
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class RetryBudget(object):
+    """Limit the retries to a fraction of the requests
+
+    Every request deposits ``ratio`` token and every retry withdraws one, so
+    that an unavailable service gets at most ``ratio`` retried requests per
+    request instead of ``max_retries`` of them.
+    """
+
+    def __init__(self, ratio=0.2, minimum=10):
+        """
+        :param float ratio: retries allowed per request
+        :param int minimum: retries allowed before any request was sent,
+                            the balance never goes above it plus the
+                            deposits of ``minimum / ratio`` requests
+        """
+        self.ratio = ratio
+        self.minimum = minimum
+        self.capacity = minimum * 2
+        self._balance = float(minimum)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self.capacity, self._balance + self.ratio)
+
+    def withdraw(self):
+        """Take the token of a retry
+
+        :return: ``False`` when the budget is exhausted
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryMetrics(object):
+    """Counters of the requests, retries and throttle waits of a policy"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = collections.Counter()
+        self._retries_by_status = collections.Counter()
+        self._retries_by_service = collections.Counter()
+        self._throttle_wait = 0.0
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._counters[key] += value
+
+    def _retry(self, service_type, status):
+        with self._lock:
+            self._counters["retries"] += 1
+            self._retries_by_status[status] += 1
+            self._retries_by_service[service_type] += 1
+
+    def _throttled(self, delay):
+        with self._lock:
+            self._counters["throttle_waits"] += 1
+            self._throttle_wait += delay
+
+    def snapshot(self):
+        """Return the current counters
+
+        :return: a dict with the numbers of ``requests``, ``retries``,
+                 ``gave_up`` requests, ``budget_exhausted`` requests and
+                 ``throttle_waits``, the total ``throttle_wait_seconds``,
+                 and the retries per status (``None`` for connection
+                 errors) under ``retries_by_status`` and per service type
+                 under ``retries_by_service``.
+        """
+        with self._lock:
+            result = dict((key, self._counters[key]) for key in
+                          ("requests", "retries", "gave_up",
+                           "budget_exhausted", "throttle_waits"))
+            result["throttle_wait_seconds"] = self._throttle_wait
+            result["retries_by_status"] = dict(self._retries_by_status)
+            result["retries_by_service"] = dict(self._retries_by_service)
+        return result
+
+
+class RetryPolicy(object):
+    """Which requests to retry, when, and how fast to send them"""
+
+    def __init__(self, max_retries=3, backoff=None,
+                 statuses=RETRY_STATUSES,
+                 throttle_statuses=THROTTLE_STATUSES,
+                 idempotent_methods=IDEMPOTENT_METHODS,
+                 retry_connect_errors=True, max_retry_after=60,
+                 budget=None, rate_limits=None):
+        """
+        :param int max_retries: Maximum number of times a request is sent
+                                again.
+        :param backoff: The :class:`~openstack.waiter.Backoff` between two
+                        attempts of a request when the response has no
+                        ``Retry-After`` header.
+        :param statuses: Response statuses retried for the idempotent
+                         methods.
+        :param throttle_statuses: Response statuses retried for all the
+                                  methods.
+        :param idempotent_methods: The HTTP methods safe to send again.
+        :param bool retry_connect_errors: Whether to retry the idempotent
+                                          requests which failed to connect.
+        :param float max_retry_after: Longest ``Retry-After`` delay waited
+                                      for, a response asking for more is
+                                      returned as is.
+        :param budget: The :class:`RetryBudget` shared by the requests,
+                       ``None`` for no budget.
+        :param dict rate_limits: Requests per second allowed for each
+                                 service type, as a number or as a
+                                 ``(rate, burst)`` tuple. The key ``None``
+                                 applies to the other service types.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff or waiter.Backoff(interval=0.5,
+                                                 max_interval=20, jitter=0.2)
+        self.statuses = frozenset(statuses)
+        self.throttle_statuses = frozenset(throttle_statuses)
+        self.idempotent_methods = frozenset(m.upper()
+                                            for m in idempotent_methods)
+        self.retry_connect_errors = retry_connect_errors
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+        self.metrics = RetryMetrics()
+        self._buckets = {}
+        for service_type, limit in (rate_limits or {}).items():
+            if not isinstance(limit, (tuple, list)):
+                limit = (limit,)
+            self._buckets[service_type] = TokenBucket(*limit)
+
+    def _get_bucket(self, service_type):
+        bucket = self._buckets.get(service_type)
+        if bucket is None:
+            bucket = self._buckets.get(None)
+        return bucket
+
+    def _is_retryable(self, method, status):
+        if status in self.throttle_statuses:
+            return True
+        return (method.upper() in self.idempotent_methods and
+                status in self.statuses)
+
+    def _get_retry_after(self, response):
+        # Return the delay asked by the response, None when there is none.
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        date = email.utils.parsedate_tz(value)
+        if date is None:
+            return None
+        return max(0.0, email.utils.mktime_tz(date) - time.time())
+
+    def send(self, method, send, service_type=None, body=None):
+        """Send a request, and send it again while it should be retried
+
+        :param str method: The HTTP method of the request.
+        :param send: Callable sending the request and returning its
+                     response.
+        :param str service_type: The service type of the request, selecting
+                                 its rate limiter.
+        :param body: The body sent by ``send``. A file-like body is rewound
+                     before every attempt, the requests whose body cannot
+                     be sent twice are not retried.
+        :return: the last response
+        :raises: the connection error of the last attempt
+        """
+        replayable, rewind = _get_rewind(body)
+        if rewind is not None:
+            send = _rewinding(send, rewind)
+        bucket = self._get_bucket(service_type)
+        metrics = self.metrics
+        metrics._count("requests")
+        if self.budget is not None:
+            self.budget.deposit()
+        delays = self.backoff.delays()
+        attempt = 0
+        while True:
+            if bucket is not None:
+                waited = bucket.acquire()
+                if waited:
+                    metrics._throttled(waited)
+            try:
+                response = send()
+            except _exceptions.ConnectFailure:
+                if not (self.retry_connect_errors and replayable and
+                        method.upper() in self.idempotent_methods and
+                        self._may_retry(attempt)):
+                    raise
+                status, delay = None, next(delays)
+            else:
+                status = response.status_code
+                if not (replayable and self._is_retryable(method, status)):
+                    return response
+                delay = self._get_retry_after(response)
+                if delay is not None and delay > self.max_retry_after:
+                    metrics._count("gave_up")
+                    return response
+                if not self._may_retry(attempt):
+                    return response
+                if delay is None:
+                    delay = next(delays)
+                response.close()
+
+            attempt += 1
+            metrics._retry(service_type, status)
+            _logger.debug("Retrying %s request to %s in %.2f seconds, "
+                          "attempt %d got %s", method, service_type, delay,
+                          attempt, status or "a connection error")
+            time.sleep(delay)
+
+    def _may_retry(self, attempt):
+        if attempt >= self.max_retries:
+            self.metrics._count("gave_up")
+            return False
+        if self.budget is not None and not self.budget.withdraw():
+            self.metrics._count("budget_exhausted")
+            return False
+        return True
+
+
+def _get_rewind(body):
+    # Return whether a body can be sent again, and the callable rewinding it
+    if body is None or isinstance(body, (six.binary_type, six.text_type,
+                                         dict, list, tuple)):
+        return True, None
+    if hasattr(body, "seek") and hasattr(body, "tell"):
+        try:
+            position = body.tell()
+        except (AttributeError, IOError, OSError):
+            return False, None
+        return True, lambda: body.seek(position)
+    return False, None
+
+
+def _rewinding(send, rewind):
+    def attempt():
+        rewind()
+        return send()
+    return attempt
@@ -19,6 +19,7 @@ mapping KSA exceptions to SDK exceptions.
 
 """
 from collections import namedtuple
+import functools
 import logging
 
 try:
@@ -47,6 +48,8 @@ from keystoneauth1 import exceptions as _exceptions
 from keystoneauth1 import session as _session
 
 from openstack import exceptions
+from openstack import instrumentation
+from openstack import jsonutils
 from openstack import utils
 from openstack import version as openstack_version
 
@@ -86,6 +89,15 @@ class Session(_session.Session):
                            is used, which contains the openstacksdk version
                            When a non-None value is passed, it will be
                            prepended to the default.
+        :param retry_policy: The :class:`~openstack.retry.RetryPolicy`
+                             retrying and rate limiting the requests, none
+                             are retried by default.
+        :param hooks: The :class:`~openstack.instrumentation.Hooks` called
+                      when the requests are sent and answered.
+        :param json_codec: The :class:`~openstack.jsonutils.Codec`, or its
+                           name, encoding the request bodies and decoding
+                           the response bodies. The fastest one installed
+                           by default.
         :type profile: :class:`~openstack.profile.Profile`
         """
         if user_agent is not None:
@@ -94,12 +106,18 @@ class Session(_session.Session):
             self.user_agent = DEFAULT_USER_AGENT
 
         self.profile = profile
+        self.retry_policy = kwargs.pop("retry_policy", None)
+        self.hooks = kwargs.pop("hooks", None)
+        if self.hooks is None:
+            self.hooks = instrumentation.Hooks()
+        self.json_codec = jsonutils.get_codec(kwargs.pop("json_codec", None))
         api_version_header = self._get_api_requests()
         self.endpoint_cache = {}
 
         super(Session, self).__init__(user_agent=self.user_agent,
                                       additional_headers=api_version_header,
                                       **kwargs)
+        self._json = self.json_codec
 
     def _get_api_requests(self):
         """Get API micro-version requests.
@@ -113,10 +131,7 @@ class Session(_session.Session):
         if self.profile is None:
             return None
 
-        req = []
-        for svc in self.profile.get_services():
-            if svc.service_type and svc.api_version:
-                req.append(" ".join([svc.service_type, svc.api_version]))
+        req = [" ".join(item) for item in self.profile.get_api_versions()]
         if req:
             return {API_REQUEST_HEADER: ",".join(req)}
 
@@ -365,8 +380,39 @@ class Session(_session.Session):
                 headers.setdefault("Openstack-API-Version", version)
 
     @map_exceptions
-    def request(self, *args, **kwargs):
+    def request(self, url, method, **kwargs):
         # Fix MRS service require *Content-Type* header in GET request
         headers = kwargs.setdefault('headers', dict())
         headers.setdefault('Content-Type', 'application/json')
-        return super(Session, self).request(*args, **kwargs)
\ No newline at end of file
+        endpoint_filter = kwargs.get('endpoint_filter')
+        service_type = endpoint_filter and endpoint_filter.get('service_type')
+        trace = self.hooks.start(service_type, method, url) if self.hooks else None
+        if trace is None and self.retry_policy is None:
+            return self.json_codec.bind(
+                super(Session, self).request(url, method, **kwargs))
+        if trace is not None:
+            trace.bytes_out = instrumentation.payload_size(kwargs.get('data'))
+            trace.fire(instrumentation.SENT)
+            started = trace.start()
+
+        raise_exc = kwargs.pop('raise_exc', True)
+        if self.retry_policy is None:
+            resp = super(Session, self).request(url, method, raise_exc=False,
+                                                **kwargs)
+        else:
+            send = functools.partial(super(Session, self).request, url,
+                                     method, raise_exc=False, **kwargs)
+            resp = self.retry_policy.send(method, send,
+                                          service_type=service_type,
+                                          body=kwargs.get('data'))
+
+        if trace is not None:
+            trace.url = resp.url or url
+            trace.record("send", started)
+            trace.durations["first_byte"] = resp.elapsed.total_seconds()
+            trace.attach(resp)
+            trace.fire(instrumentation.FIRST_BYTE)
+        self.json_codec.bind(resp)
+        if raise_exc and resp.status_code >= 400:
+            raise _exceptions.from_response(resp, method, url)
+        return resp
@@ -12,7 +12,12 @@
 # CONDITIONS OF ANY KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations under the License.
 
+import sys
+
+from openstack import exceptions
 from openstack import proxy2
+from openstack import utils
+from openstack.smn.v2 import cache as _cache
 from openstack.smn.v2 import message_template as _mt
 from openstack.smn.v2 import subscription as _subscription
 from openstack.smn.v2 import topic as _topic
@@ -20,6 +25,12 @@ from openstack.smn.v2 import topic as _topic
 
 class Proxy(proxy2.BaseProxy):
 
+    def __init__(self, session):
+        super(Proxy, self).__init__(session)
+        #: The :class:`~openstack.smn.v2.cache.TopicCache` of the topics
+        #: resolved by :meth:`publish_topic`.
+        self.topic_cache = _cache.TopicCache()
+
     def create_topic(self, **kwargs):
         """Create a topic
 
@@ -37,6 +48,7 @@ class Proxy(proxy2.BaseProxy):
                             :class:`~openstack.smn.v2.topic.Topic`
         :rtype: :class:`~openstack.smn.v2.topic.Topic
         """
+        self.topic_cache.invalidate(getattr(topic, "topic_urn", topic))
         return self._update(_topic.Topic, topic, **kwargs)
 
     def delete_topic(self, topic, ignore_missing=True):
@@ -50,6 +62,7 @@ class Proxy(proxy2.BaseProxy):
 
         :returns: ``None``
         """
+        self.topic_cache.invalidate(getattr(topic, "topic_urn", topic))
         self._delete(_topic.Topic, topic, ignore_missing=ignore_missing)
 
     def topics(self, **query):
@@ -293,6 +306,9 @@ class Proxy(proxy2.BaseProxy):
     def publish_topic(self, topic, **kwargs):
         """Publish message on topic
 
+        The topics given by URN or name are resolved once and kept in
+        :attr:`topic_cache`.
+
         :param topic: topic urn or an object of Topic of
                       :class:`~openstack.smn.v2.topic.Topic`
 
@@ -303,10 +319,63 @@ class Proxy(proxy2.BaseProxy):
         """
 
         if isinstance(topic, _topic.Topic):
-            obj = topic
-        else:
-            obj = self._find(_topic.Topic, topic, ignore_missing=False)
-        return obj.publish(self._session, **kwargs)
+            return topic.publish(self._session, **kwargs)
+        obj = self.topic_cache.get_or_resolve(
+            topic, lambda: self._find(_topic.Topic, topic,
+                                      ignore_missing=False))
+        try:
+            return obj.publish(self._session, **kwargs)
+        except exceptions.NotFoundException:
+            # the topic was deleted since it was resolved
+            self.topic_cache.invalidate(topic)
+            raise
+
+    def publish_many(self, messages, topic=None, concurrency=8):
+        """Publish messages on one or many topics at the same time
+
+        :param messages: An iterable of dicts of the arguments of
+                         :meth:`publish_topic`, e.g. ``subject`` and
+                         ``message``. A message with a ``topic`` key is
+                         published on this topic instead of ``topic``.
+        :param topic: The topic urn, name or
+                      :class:`~openstack.smn.v2.topic.Topic` of the messages
+                      without a ``topic`` key, or a list of them to publish
+                      every such message on each topic.
+        :param int concurrency: The number of messages published at the
+                                same time.
+
+        :returns: A generator of ``(topic, message, result, error)`` tuples,
+                  one per message and topic in the order of ``messages``:
+                  the topic and the arguments of the message, the dict
+                  returned by :meth:`publish_topic` or ``None``, and the
+                  exception raised by the publish or ``None``. A failed
+                  publish does not stop the others.
+        """
+        topics = topic if isinstance(topic, (list, tuple)) else [topic]
+
+        def deliveries():
+            for message in messages:
+                message = dict(message)
+                targets = ([message.pop("topic")] if "topic" in message
+                           else topics)
+                for target in targets:
+                    if target is None:
+                        raise exceptions.InvalidRequest(
+                            "No topic given for message %r" % message)
+                    yield target, message
+
+        def publish(delivery):
+            target, message = delivery
+            try:
+                return delivery, self.publish_topic(target, **message), None
+            except Exception:
+                return delivery, None, sys.exc_info()[1]
+
+        # deliveries() is consumed by the caller thread, an invalid message
+        # is raised when it is reached.
+        for (target, message), result, error in utils.iter_concurrently(
+                publish, deliveries(), concurrency):
+            yield target, message, result, error
 
     def direct_publish(self, **kwargs):
         """Direct publish message
@@ -0,0 +1,134 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Cache of the SMN topics resolved from their URN or name.
+
+Resolving a topic costs a GET, and a list of the topics when it is given
+by name. The SMN proxy keeps the resolved topics for ``ttl`` seconds, and
+remembers the missing ones for ``negative_ttl`` seconds, so that a burst of
+messages published on one topic resolves it once::
+
+    conn.smn.topic_cache.ttl = 600
+    conn.smn.topic_cache.clear()
+"""
+
+import collections
+import threading
+import time
+
+from openstack import exceptions
+
+# marks a key known to match no topic
+_MISSING = object()
+
+
+class TopicCache(object):
+    """Thread safe TTL cache of resolved topics with negative caching"""
+
+    def __init__(self, ttl=300, negative_ttl=30, max_size=1024):
+        """
+        :param ttl: Seconds a resolved topic stays valid, 0 disables the
+                    cache.
+        :param negative_ttl: Seconds a missing topic stays known as missing,
+                             0 disables the negative caching.
+        :param int max_size: Most entries kept, the oldest ones are evicted.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._locks = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_resolve(self, key, resolver):
+        """Return the cached topic, resolving it once on a miss
+
+        Concurrent callers missing the same key wait for the first one to
+        run ``resolver`` instead of running it themselves.
+
+        :param key: The topic URN or name.
+        :param resolver: Callable without argument returning the topic, or
+                         raising :class:`~openstack.exceptions.
+                         ResourceNotFound` when it does not exist.
+        :raises: :class:`~openstack.exceptions.ResourceNotFound` when the
+                 topic does not exist, or is cached as missing.
+        """
+        found, value = self._get(key)
+        if not found:
+            with self._key_lock(key):
+                found, value = self._get(key, count=False)
+                if not found:
+                    value = self._resolve(key, resolver)
+        if value is _MISSING:
+            raise exceptions.ResourceNotFound(
+                "No Topic found for %s" % key)
+        return value
+
+    def invalidate(self, key):
+        """Forget a topic, e.g. once it is deleted or renamed
+
+        :param key: The topic URN or name. The entries of the topic with
+                    this URN under other keys are forgotten too.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            for other, (_, value) in list(self._entries.items()):
+                if getattr(value, "topic_urn", None) == key:
+                    del self._entries[other]
+
+    def clear(self):
+        """Forget all the topics"""
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key, count=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self.hits += count
+                    return True, entry[1]
+                del self._entries[key]
+            self.misses += count
+            return False, None
+
+    def _resolve(self, key, resolver):
+        try:
+            value = resolver()
+            ttl = self.ttl
+        except exceptions.ResourceNotFound:
+            value = _MISSING
+            ttl = self.negative_ttl
+        if ttl:
+            with self._lock:
+                self._entries.pop(key, None)
+                self._entries[key] = (time.time() + ttl, value)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def _key_lock(self, key):
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                if len(self._locks) >= self.max_size:
+                    self._locks.clear()
+                lock = self._locks[key] = threading.Lock()
+            return lock
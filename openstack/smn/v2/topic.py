@@ -60,10 +60,10 @@ class Topic(_smnresource.Resource):
     def publish(self, session, **kwargs):
         url = utils.urljoin(self.base_path, self._get_id(self), 'publish')
 
+        # Content-Length is the one of the encoded body, set by requests
         headers = {
             "Accept": "application/json",
-            "Content-type": "application/json",
-            "Content-Length": str(len(str(kwargs)))
+            "Content-type": "application/json"
         }
 
         endpoint_override = self.service.get_endpoint_override()
@@ -84,10 +84,10 @@ class Topic(_smnresource.Resource):
         url = '/notifications/sms'
         endpoint_override = cls.service.get_endpoint_override()
 
+        # Content-Length is the one of the encoded body, set by requests
         headers = {
             "Accept": "application/json",
-            "Content-type": "application/json",
-            "Content-Length": str(len(str(kwargs)))
+            "Content-type": "application/json"
         }
 
         resp = session.post(url, endpoint_filter=cls.service,
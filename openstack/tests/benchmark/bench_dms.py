@@ -0,0 +1,101 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Benchmark of DMS messages per second against a local fake endpoint.
+
+Compares one request per message sent and a consume then an ack request
+per batch consumed with the batching producer and the pipelined consumer
+of :mod:`openstack.dms.v1.client`::
+
+    python -m openstack.tests.benchmark.bench_dms --count 2000 --latency 0.002
+"""
+
+import argparse
+import os
+import time
+
+from openstack.dms.v1 import _proxy
+from openstack.tests.benchmark import fake_dms
+from openstack import profile
+from openstack import session
+
+
+def _messages(count):
+    return ({"body": {"index": i}, "attributes": {"source": "bench"}}
+            for i in range(count))
+
+
+def produce_naive(proxy, queue, count):
+    for message in _messages(count):
+        proxy.send_messages(queue, messages=[message])
+
+
+def produce_batched(proxy, queue, count, concurrency):
+    proxy.producer(queue, concurrency=concurrency).send(_messages(count))
+
+
+def consume_naive(proxy, queue, group, count):
+    consumed = 0
+    while consumed < count:
+        messages = proxy.consume_message(queue, group, max_msgs=10,
+                                         time_wait=1)
+        if not messages:
+            break
+        consumed += len(messages)
+        proxy.ack_consumed_message(messages)
+
+
+def consume_pipelined(proxy, queue, group, count):
+    with proxy.consumer(queue, group, time_wait=1,
+                        stop_when_empty=True) as consumer:
+        for consumed, _ in enumerate(consumer, 1):
+            if consumed == count:
+                consumer.stop()
+
+
+def _report(name, count, elapsed):
+    print("%-18s %10.0f messages/s" % (name, count / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="seconds added to every response")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    with fake_dms.FakeDMS(latency=args.latency) as fake:
+        os.environ["OS_DMS_ENDPOINT_OVERRIDE"] = fake.endpoint
+        proxy = _proxy.Proxy(session.Session(profile.Profile()))
+        for naive in (True, False):
+            queue = "naive" if naive else "client"
+            proxy.create_groups(queue, groups=[{"name": "group"}])
+
+            start = time.time()
+            if naive:
+                produce_naive(proxy, queue, args.count)
+            else:
+                produce_batched(proxy, queue, args.count, args.concurrency)
+            _report("%s produce" % queue, args.count, time.time() - start)
+
+            start = time.time()
+            if naive:
+                consume_naive(proxy, queue, "group", args.count)
+            else:
+                consume_pipelined(proxy, queue, "group", args.count)
+            _report("%s consume" % queue, args.count, time.time() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Benchmark of the envelope encryption against a fake KMS.
+
+Compares a data key created and decrypted by KMS for every message with
+the cached data keys of :mod:`openstack.kms.v1.envelope`, then measures
+the throughput of the streaming encryption of a large payload::
+
+    python -m openstack.tests.benchmark.bench_kms --messages 200 --size-mb 512
+"""
+
+import argparse
+import binascii
+import os
+import time
+
+from openstack.kms.v1 import envelope
+from openstack.kms.v1 import key
+
+
+class _FakeKMS(object):
+    # Keeps the data keys by cipher text, every call sleeps latency
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.keys = {}
+
+    def create_datakey(self, key_id, **params):
+        time.sleep(self.latency)
+        plain = binascii.hexlify(os.urandom(envelope.KEY_BYTES))
+        cipher_text = "%08X" % len(self.keys)
+        self.keys[cipher_text] = plain
+        return key.DataKey(key_id=key_id, plain_text=plain,
+                           cipher_text=cipher_text)
+
+    def decrypt_datakey(self, key_id, cipher_text=None, **params):
+        time.sleep(self.latency)
+        return key.DataKey(key_id=key_id, data_key=self.keys[cipher_text])
+
+
+class _Sink(object):
+
+    def write(self, data):
+        pass
+
+
+class _Source(object):
+    # size bytes of the same random block
+
+    def __init__(self, size, block=1024 * 1024):
+        self.remaining = size
+        self.block = os.urandom(block)
+
+    def read(self, size):
+        size = min(size, self.remaining, len(self.block))
+        self.remaining -= size
+        return self.block[:size]
+
+
+def _messages(kms, count, size, **kwargs):
+    data = os.urandom(size)
+    encryptor = envelope.EnvelopeEncryptor(kms, "key", **kwargs)
+    decryptor = envelope.EnvelopeEncryptor(kms, "key", **kwargs)
+    start = time.time()
+    for _ in range(count):
+        decryptor.decrypt(encryptor.encrypt(data))
+    return count / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--message-size", type=int, default=4096)
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="seconds added to every KMS call")
+    args = parser.parse_args()
+    kms = _FakeKMS(args.latency)
+
+    for name, kwargs in (("key per message", {"max_uses": 1,
+                                              "cache_size": 0}),
+                         ("cached keys", {})):
+        print("%-18s %10.0f messages/s" % (
+            name, _messages(kms, args.messages, args.message_size,
+                            **kwargs)))
+
+    encryptor = envelope.EnvelopeEncryptor(kms, "key")
+    size = args.size_mb * 1024 * 1024
+    start = time.time()
+    encryptor.encrypt_stream(_Source(size), _Sink())
+    print("%-18s %10.0f MB/s" % ("stream encrypt",
+                                 args.size_mb / (time.time() - start)))
+
+
+if __name__ == "__main__":
+    main()
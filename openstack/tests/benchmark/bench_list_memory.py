@@ -0,0 +1,103 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Memory benchmark of ``Resource.list`` results, regular versus lightweight.
+
+A single page of fake servers is listed from a stub session and the memory
+held by the yielded objects is measured with ``tracemalloc``::
+
+    python -m openstack.tests.benchmark.bench_list_memory --count 10000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from openstack.compute.v2 import server
+
+
+class _Response(object):
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class _Session(object):
+
+    class profile(object):
+
+        @staticmethod
+        def get_filter(service_type):
+            return server.Server.service
+
+    def __init__(self, data):
+        self._data = data
+
+    def get(self, uri, **kwargs):
+        return _Response(self._data)
+
+
+def payload(count):
+    return {server.Server.resources_key: [{
+        "id": "%08d-0000-0000-0000-000000000000" % i,
+        "name": "server-%d" % i,
+        "status": "ACTIVE",
+        "created": "2018-01-01T00:00:00Z",
+        "updated": "2018-01-01T00:00:00Z",
+        "tenant_id": "project",
+        "user_id": "user",
+        "hostId": "host",
+        "accessIPv4": "",
+        "accessIPv6": "",
+        "flavor": {"id": "s3.small.1"},
+        "image": {"id": "image"},
+        "metadata": {},
+        "addresses": {},
+        "links": [],
+        "progress": 0,
+        "key_name": "key",
+        "OS-EXT-AZ:availability_zone": "az1",
+    } for i in range(count)]}
+
+
+def measure(data, lightweight):
+    session = _Session(data)
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    results = list(server.Server.list(session, lightweight=lightweight))
+    elapsed = time.time() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    data = payload(args.count)
+    for name, lightweight in (("resource", False), ("lightweight", True)):
+        size, elapsed = measure(data, lightweight)
+        print("%-12s %10.1f KiB  %8.1f B/item  %8.2f ms" % (
+            name, size / 1024.0, float(size) / args.count, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
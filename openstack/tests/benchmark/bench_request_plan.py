@@ -0,0 +1,103 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Benchmark of ``Server.get`` requests per second against a local stub server.
+
+Compares the cached request plans with plans rebuilt for every request,
+which is what every request did before they were cached::
+
+    python -m openstack.tests.benchmark.bench_request_plan --count 5000
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import mock
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from openstack.compute.v2 import server
+from openstack import profile
+from openstack import resource2
+from openstack import session
+
+BODY = b'{"server": {"id": "id", "name": "name", "status": "ACTIVE"}}'
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def _uncached(cls, session):
+    return cls._build_request_plan(session, None)
+
+
+def _run(sess, count):
+    value = server.Server.new(id="id")
+    start = time.time()
+    for _ in range(count):
+        value.get(sess)
+    return time.time() - start
+
+
+def run(sess, count, cached):
+    if cached:
+        return _run(sess, count)
+    with mock.patch.object(resource2.Resource, "_get_request_plan",
+                           classmethod(_uncached)):
+        return _run(sess, count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--count", type=int, default=5000)
+    args = parser.parse_args()
+
+    httpd = _Server(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    os.environ["OS_COMPUTE_ENDPOINT_OVERRIDE"] = (
+        "http://127.0.0.1:%d/v2.1" % httpd.server_port)
+    try:
+        sess = session.Session(profile.Profile())
+        run(sess, 100, True)
+        for cached in (False, True):
+            elapsed = run(sess, args.count, cached)
+            print("%-9s %10.0f requests/s  %8.1f us/request" % (
+                "cached" if cached else "uncached", args.count / elapsed,
+                elapsed * 1e6 / args.count))
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Micro-benchmark of ``Resource.existing(**payload)`` throughput.
+
+Builds resources from server payloads of growing size, then reads their id::
+
+    python -m openstack.tests.benchmark.bench_resource_existing --count 20000
+"""
+
+import argparse
+import time
+
+from openstack.compute.v2 import server
+
+
+def payload(i, extra):
+    data = {
+        "id": "%08d-0000-0000-0000-000000000000" % i,
+        "name": "server-%d" % i,
+        "status": "ACTIVE",
+        "tenant_id": "project",
+        "hostId": "host",
+        "flavor": {"id": "s3.small.1"},
+        "image": {"id": "image"},
+        "metadata": {},
+        "OS-EXT-AZ:availability_zone": "az1",
+    }
+    for n in range(extra):
+        data["extra_%d" % n] = n
+    return data
+
+
+def run(count, extra):
+    payloads = [payload(i, extra) for i in range(count)]
+    start = time.time()
+    for data in payloads:
+        server.Server.existing(**data).id
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    for extra in (0, 50, 200):
+        elapsed = run(args.count, extra)
+        print("%4d extra keys  %10.0f resources/s  %8.2f us/resource" % (
+            extra, args.count / elapsed, elapsed * 1e6 / args.count))
+
+
+if __name__ == "__main__":
+    main()
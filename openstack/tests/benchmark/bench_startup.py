@@ -0,0 +1,73 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Cold startup benchmark of ``import openstack`` and ``Connection(...)``.
+
+Every sample runs in a fresh interpreter so that nothing is already imported::
+
+    python -m openstack.tests.benchmark.bench_startup --runs 20
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+_SAMPLE = """
+import json
+import sys
+import time
+
+start = time.time()
+import openstack
+from openstack import connection
+imported = time.time()
+conn = connection.Connection(ak="ak", sk="sk", project_id="project",
+                             region="region", domain="example.com")
+connected = time.time()
+%(access)s
+accessed = time.time()
+print(json.dumps({
+    "import": imported - start,
+    "connection": connected - imported,
+    "first_proxy": accessed - connected,
+    "modules": len([m for m in sys.modules if m.startswith("openstack")]),
+}))
+"""
+
+
+def sample(service):
+    access = "conn.%s" % service if service else "pass"
+    out = subprocess.check_output([sys.executable, "-c",
+                                   _SAMPLE % {"access": access}],
+                                  stderr=subprocess.DEVNULL)
+    return json.loads(out.decode("utf-8").strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--service", default="compute",
+                        help="proxy attribute touched after connecting")
+    args = parser.parse_args()
+
+    samples = [sample(args.service) for _ in range(args.runs)]
+    for key in ("import", "connection", "first_proxy"):
+        values = sorted(s[key] for s in samples)
+        print("%-12s median %8.2f ms  min %8.2f ms" % (
+            key, values[len(values) // 2] * 1000, values[0] * 1000))
+    print("%-12s %d" % ("modules", samples[-1]["modules"]))
+
+
+if __name__ == "__main__":
+    main()
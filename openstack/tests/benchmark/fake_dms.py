@@ -0,0 +1,211 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Local fake DMS endpoint keeping its queues in memory.
+
+It serves the requests of the message, consume, ack and group APIs of
+:mod:`openstack.dms.v1.queue`, with an optional latency added to every
+response to mimic a remote endpoint::
+
+    with FakeDMS(latency=0.002) as fake:
+        os.environ["OS_DMS_ENDPOINT_OVERRIDE"] = fake.endpoint
+        ...
+
+Every consumer group of a queue receives the messages sent to the queue
+after it was created, its id is its name. The consumed messages are
+reserved until they are acknowledged, a message acknowledged with the
+``fail`` status is consumed again.
+"""
+
+import collections
+import itertools
+import json
+import re
+import threading
+import time
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib import parse
+
+_MESSAGES = re.compile(r"/queues/([^/]+)/messages$")
+_CONSUME = re.compile(r"/queues/([^/]+)/groups/([^/]+)/messages$")
+_ACK = re.compile(r"/queues/([^/]+)/groups/([^/]+)/ack$")
+_GROUPS = re.compile(r"/queues/([^/]+)/groups$")
+
+
+class _Group(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.available = collections.deque()
+        self.reserved = {}
+        self.consumed = 0
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = parse.urlsplit(self.path)
+        query = parse.parse_qs(url.query)
+        match = _CONSUME.search(url.path)
+        if match:
+            return self._reply(200, self.server.fake.consume(
+                match.group(1), match.group(2),
+                int(query.get("max_msgs", ["10"])[0]),
+                float(query.get("time_wait", ["0"])[0])))
+        match = _GROUPS.search(url.path)
+        if match:
+            return self._reply(200, self.server.fake.groups(match.group(1)))
+        self._reply(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(
+            int(self.headers.get("Content-Length", 0))).decode("utf-8"))
+        path = parse.urlsplit(self.path).path
+        match = _MESSAGES.search(path)
+        if match:
+            self.server.fake.send(match.group(1), body["messages"])
+            return self._reply(201, None)
+        match = _ACK.search(path)
+        if match:
+            return self._reply(200, self.server.fake.ack(
+                match.group(1), match.group(2), body["message"]))
+        match = _GROUPS.search(path)
+        if match:
+            return self._reply(201, self.server.fake.create_groups(
+                match.group(1), body["groups"]))
+        self._reply(404, {"error": {"message": "Not found"}})
+
+    def _reply(self, status, body):
+        if self.server.fake.latency:
+            time.sleep(self.server.fake.latency)
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class FakeDMS(object):
+    """In memory DMS queues served over HTTP on a local port"""
+
+    def __init__(self, latency=0.0, project_id="project"):
+        """
+        :param float latency: Seconds added to every response.
+        :param str project_id: The project in the endpoint url.
+        """
+        self.latency = latency
+        self.project_id = project_id
+        self._cond = threading.Condition()
+        self._queues = collections.defaultdict(dict)
+        self._produced = collections.Counter()
+        self._handlers = itertools.count()
+        self._httpd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def endpoint(self):
+        """The url to set as the DMS endpoint override"""
+        return "http://127.0.0.1:%d/v1.0/%s" % (self._httpd.server_port,
+                                                self.project_id)
+
+    def start(self):
+        self._httpd = _Server(("127.0.0.1", 0), _Handler)
+        self._httpd.fake = self
+        thread = threading.Thread(target=self._httpd.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _group(self, queue_id, group_id):
+        groups = self._queues[queue_id]
+        if group_id not in groups:
+            groups[group_id] = _Group(group_id)
+        return groups[group_id]
+
+    def create_groups(self, queue_id, groups):
+        with self._cond:
+            for group in groups:
+                self._group(queue_id, group["name"])
+        return {"groups": [{"id": group["name"], "name": group["name"]}
+                           for group in groups]}
+
+    def send(self, queue_id, messages):
+        with self._cond:
+            self._produced[queue_id] += len(messages)
+            for group in self._queues[queue_id].values():
+                group.available.extend(messages)
+            self._cond.notify_all()
+
+    def consume(self, queue_id, group_id, max_msgs, time_wait):
+        deadline = time.time() + time_wait
+        with self._cond:
+            group = self._group(queue_id, group_id)
+            while not group.available:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+            result = []
+            while group.available and len(result) < max_msgs:
+                message = group.available.popleft()
+                handler = "%s-%d" % (group_id, next(self._handlers))
+                group.reserved[handler] = message
+                result.append({"message": message, "handler": handler})
+            return result
+
+    def ack(self, queue_id, group_id, acks):
+        success = fail = 0
+        with self._cond:
+            group = self._group(queue_id, group_id)
+            for ack in acks:
+                message = group.reserved.pop(ack["handler"], None)
+                if message is None:
+                    fail += 1
+                    continue
+                success += 1
+                if ack["status"] == "success":
+                    group.consumed += 1
+                else:
+                    group.available.appendleft(message)
+                    self._cond.notify_all()
+        return {"success": success, "fail": fail}
+
+    def groups(self, queue_id):
+        with self._cond:
+            return {"groups": [
+                {"id": group.name, "name": group.name,
+                 "produced_messages": self._produced[queue_id],
+                 "consumed_messages": group.consumed,
+                 "available_messages": len(group.available)}
+                for group in self._queues[queue_id].values()]}
@@ -14,6 +14,7 @@
 # under the License.
 
 import os
+import sys
 
 import fixtures
 import testtools
@@ -21,6 +22,29 @@ import testtools
 _TRUE_VALUES = ('true', '1', 'yes')
 
 
+class UnloadedModule(fixtures.Fixture):
+    """Remove a module from sys.modules for the duration of a test
+
+    The module loaded before the test is put back afterwards, so that the
+    other tests do not see a second copy of it.
+    """
+
+    def __init__(self, name):
+        super(UnloadedModule, self).__init__()
+        self.name = name
+
+    def _setUp(self):
+        original = sys.modules.pop(self.name, None)
+        if original is not None:
+            self.addCleanup(self._restore, original)
+
+    def _restore(self, original):
+        sys.modules[self.name] = original
+        parent, _, child = self.name.rpartition(".")
+        if parent in sys.modules:
+            setattr(sys.modules[parent], child, original)
+
+
 class TestCase(testtools.TestCase):
 
     """Test case base class for all unit tests."""
@@ -0,0 +1,112 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+import math
+
+import mock
+import testtools
+
+from openstack.cloud_eye.v1 import _proxy
+from openstack.cloud_eye.v1 import aggregation
+from openstack import exceptions
+
+DIMENSIONS = [{"name": "instance_id", "value": "instance"}]
+
+
+def _datapoints(session, uri, params=None, **kwargs):
+    # one datapoint every period, the odd ones without value
+    step = params["period"] * 1000
+    first = -(-params["from"] // step) * step
+    points = []
+    for timestamp in range(first, params["to"] + 1, step):
+        point = {"timestamp": timestamp, "unit": "%"}
+        if timestamp // step % 2 == 0:
+            point[params["filter"]] = timestamp // step
+        points.append(point)
+    response = mock.Mock()
+    response.json.return_value = {"datapoints": points[::-1],
+                                  "metric_name": params["metric_name"]}
+    return response
+
+
+class TestSplitWindows(testtools.TestCase):
+
+    def test_windows(self):
+        self.assertEqual([(0, 600000), (600000, 1200000), (1200000, 1500000)],
+                         aggregation.split_windows(0, 1500000, 300,
+                                                   max_points=2))
+        self.assertEqual([(0, 1000)], aggregation.split_windows(0, 1000, 300))
+
+    def test_empty_range(self):
+        self.assertRaises(exceptions.InvalidRequest,
+                          aggregation.split_windows, 10, 10, 300)
+
+
+class TestBulkMetricAggregations(testtools.TestCase):
+
+    def setUp(self):
+        super(TestBulkMetricAggregations, self).setUp()
+        self.session = mock.Mock()
+        self.session.get.side_effect = lambda uri, **kwargs: _datapoints(
+            self.session, uri, **kwargs)
+        self.proxy = _proxy.Proxy(self.session)
+
+    def test_columns(self):
+        series = [("SYS.ECS", "cpu_util", DIMENSIONS),
+                  ("SYS.ECS", "mem_util", [])]
+
+        result = self.proxy.bulk_metric_aggregations(
+            series, 0, 3000000, 300, filter="max", concurrency=3,
+            max_points=4)
+
+        # 3 windows per series
+        self.assertEqual(6, self.session.get.call_count)
+        params = [call[1]["params"] for call in
+                  self.session.get.call_args_list]
+        self.assertEqual(
+            {"namespace": "SYS.ECS", "metric_name": "cpu_util",
+             "from": 0, "to": 1200000, "period": 300, "filter": "max",
+             "dim.0": "instance_id,instance"}, params[0])
+        self.assertEqual({(0, 1200000), (1200000, 2400000),
+                          (2400000, 3000000)},
+                         set((p["from"], p["to"]) for p in params))
+        self.assertEqual("/metric-data",
+                         self.session.get.call_args[0][0])
+
+        self.assertEqual(["cpu_util", "mem_util"],
+                         [item.metric_name for item in result])
+        cpu = result[0]
+        self.assertEqual(DIMENSIONS, cpu.dimensions)
+        self.assertEqual("%", cpu.unit)
+        # the datapoints at the edges of the windows are not repeated
+        self.assertEqual([i * 300000 for i in range(11)],
+                         list(cpu.timestamps))
+        self.assertEqual([0, 2, 4, 6, 8, 10], list(cpu.values)[::2])
+        self.assertTrue(all(math.isnan(value)
+                            for value in list(cpu.values)[1::2]))
+        self.assertEqual(11, len(result[1]))
+
+    def test_invalid(self):
+        series = [("SYS.ECS", "cpu_util", DIMENSIONS)]
+        self.assertRaises(exceptions.InvalidRequest,
+                          self.proxy.bulk_metric_aggregations,
+                          series, 0, 1, 60)
+        self.assertRaises(exceptions.InvalidRequest,
+                          self.proxy.bulk_metric_aggregations,
+                          series, 0, 1, 300, filter="median")
+        self.assertRaises(exceptions.InvalidRequest,
+                          self.proxy.bulk_metric_aggregations,
+                          [("SYS.ECS", "cpu_util", DIMENSIONS * 4)],
+                          0, 1, 300)
+        self.assertFalse(self.session.get.called)
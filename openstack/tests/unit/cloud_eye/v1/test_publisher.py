@@ -0,0 +1,136 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+import json
+import threading
+import time
+
+import mock
+import testtools
+
+from openstack.cloud_eye.v1 import metric_data as _metric_data
+from openstack.cloud_eye.v1 import publisher
+from openstack import exceptions
+
+
+def _point(value):
+    return {"metric": {"namespace": "MINE.APP", "metric_name": "cpu_util",
+                       "dimensions": [{"name": "instance_id",
+                                       "value": "instance"}]},
+            "ttl": 172800, "collect_time": 1463598260000 + value,
+            "value": value, "unit": "%"}
+
+
+class TestMetricPublisher(testtools.TestCase):
+
+    def setUp(self):
+        super(TestMetricPublisher, self).setUp()
+        self.batches = []
+        self.proxy = mock.Mock()
+        self.proxy.add_metric_data.side_effect = self.batches.append
+
+    def _publisher(self, **kwargs):
+        sot = publisher.MetricPublisher(self.proxy, **kwargs)
+        self.addCleanup(sot.close, 5)
+        return sot
+
+    def test_batch_count(self):
+        sot = self._publisher(max_batch_count=3, flush_interval=60)
+
+        self.assertEqual(0, sot.put_many(_point(i) for i in range(7)))
+        self.assertTrue(sot.flush(5))
+
+        self.assertEqual([3, 3, 1], [len(batch) for batch in self.batches])
+        self.assertEqual([_point(i) for i in range(7)],
+                         sum(self.batches, []))
+        stats = sot.stats()
+        self.assertEqual(7, stats["sent"])
+        self.assertEqual(3, stats["batches"])
+        self.assertEqual(0, stats["queued"])
+        self.assertTrue(stats["latency"]["max"] >= 0)
+
+    def test_batch_bytes(self):
+        size = len(json.dumps(_point(0))) + 1
+        sot = self._publisher(max_batch_bytes=size * 2 + 2,
+                              flush_interval=60)
+
+        sot.put_many(_point(i) for i in range(5))
+        sot.flush(5)
+
+        self.assertEqual([2, 2, 1], [len(batch) for batch in self.batches])
+
+    def test_oversized(self):
+        sot = self._publisher(max_batch_bytes=10)
+
+        self.assertFalse(sot.put(_point(0)))
+        self.assertEqual(1, sot.stats()["oversized"])
+
+    def test_flush_interval(self):
+        sot = self._publisher(flush_interval=0.05)
+
+        sot.put(_point(0))
+
+        for _ in range(100):
+            if self.batches:
+                break
+            time.sleep(0.01)
+        self.assertEqual([[_point(0)]], self.batches)
+
+    def test_full_buffer(self):
+        sending = threading.Event()
+        release = threading.Event()
+
+        def add_metric_data(data):
+            sending.set()
+            release.wait(5)
+            self.batches.append(data)
+        self.proxy.add_metric_data.side_effect = add_metric_data
+        sot = self._publisher(max_batch_count=1, max_queue=2,
+                              flush_interval=0)
+
+        sot.put(_point(0))
+        self.assertTrue(sending.wait(5))
+        # the sender is blocked on its request, the puts do not wait
+        self.assertTrue(sot.put(_point(1)))
+        self.assertTrue(sot.put(_point(2)))
+        self.assertFalse(sot.put(_point(3)))
+        self.assertFalse(sot.put(_point(4), timeout=0.01))
+        release.set()
+
+        self.assertTrue(sot.close(5))
+        stats = sot.stats()
+        self.assertEqual(2, stats["dropped"])
+        self.assertEqual(3, stats["sent"])
+        self.assertRaises(exceptions.SDKException, sot.put, _point(5))
+
+    def test_failed(self):
+        self.proxy.add_metric_data.side_effect = exceptions.HttpException(
+            "failed")
+        sot = self._publisher()
+
+        sot.put_many([_point(0), _point(1)])
+        self.assertTrue(sot.flush(5))
+
+        stats = sot.stats()
+        self.assertEqual(2, stats["failed"])
+        self.assertEqual(1, stats["failed_batches"])
+        self.assertEqual(0, stats["sent"])
+
+    def test_metric_data(self):
+        point = _metric_data.MetricData(
+            namespace="MINE.APP", metric_name="cpu_util",
+            dimensions=[{"name": "instance_id", "value": "instance"}],
+            ttl=172800, collect_time=1463598260000, value=0, unit="%")
+
+        self.assertEqual(_point(0), publisher.to_body(point))
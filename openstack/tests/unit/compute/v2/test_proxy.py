@@ -242,7 +242,17 @@ class TestComputeProxy(test_proxy_base2.TestProxyBase):
         self.verify_wait_for_status(
             self.proxy.wait_for_server,
             method_args=[value],
-            expected_args=[value, 'ACTIVE', ['ERROR'], 2, 120])
+            expected_args=[value, 'ACTIVE', ['ERROR'], 2, 120],
+            expected_kwargs={"backoff": None})
+
+    def test_servers_wait_for(self):
+        value = server.Server(id='1234')
+        self._verify2("openstack.waiter.wait_for_statuses",
+                      self.proxy.wait_for_servers,
+                      method_args=[[value]],
+                      expected_args=[self.session, [value], 'ACTIVE'],
+                      expected_kwargs={"failures": ['ERROR'], "wait": 120,
+                                       "backoff": None, "concurrency": 10})
 
     def test_server_resize(self):
         self._verify("openstack.compute.v2.server.Server.resize",
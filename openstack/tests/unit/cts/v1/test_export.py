@@ -0,0 +1,163 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+import os
+import threading
+
+import fixtures
+import mock
+import six
+import testtools
+
+from openstack.cts.v1 import export
+from openstack.cts.v1 import trace
+from openstack import exceptions
+from openstack import jsonutils
+
+TRACES = [{"trace_id": "t%d" % i, "time": i, "trace_name": "deleteEip"}
+          for i in range(100)]
+
+
+class _FakeCTS(object):
+    # Pages of TRACES, the newest first, the marker is the last trace id
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, uri, params=None, **kwargs):
+        with self._lock:
+            self.calls.append((uri, dict(params)))
+        traces = [item for item in reversed(TRACES)
+                  if params["from"] <= item["time"] <= params["to"]]
+        if "next" in params:
+            ids = [item["trace_id"] for item in traces]
+            traces = traces[ids.index(params["next"]) + 1:]
+        page = traces[:params["limit"]]
+        body = {"traces": page, "meta_data": {"count": len(page)}}
+        if len(traces) > params["limit"]:
+            body["meta_data"]["marker"] = page[-1]["trace_id"]
+        response = mock.Mock()
+        response.json.return_value = body
+        return response
+
+
+class TestSplitShards(testtools.TestCase):
+
+    def test_shards(self):
+        self.assertEqual([(0, 24), (25, 49), (50, 74), (75, 99)],
+                         export.split_shards(0, 99, 4))
+        self.assertEqual([(0, 0), (1, 1)], export.split_shards(0, 1, 8))
+        self.assertRaises(exceptions.InvalidRequest,
+                          export.split_shards, 5, 5, 2)
+
+
+class TestTraceExporter(testtools.TestCase):
+
+    def setUp(self):
+        super(TestTraceExporter, self).setUp()
+        self.session = _FakeCTS()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 "checkpoint.json")
+
+    def _exporter(self, **kwargs):
+        kwargs.setdefault("checkpoint", self.path)
+        kwargs.setdefault("concurrency", 2)
+        return export.TraceExporter(self.session, "system", 0, 99, shards=4,
+                                    limit=10, **kwargs)
+
+    def test_batches(self):
+        sot = self._exporter(service_type="VPC")
+
+        batches = list(sot.batches())
+
+        self.assertEqual(12, len(batches))
+        self.assertEqual(sorted(TRACES, key=lambda item: item["time"]),
+                         sorted(sum(batches, []),
+                                key=lambda item: item["time"]))
+        uri, params = self.session.calls[0]
+        self.assertEqual("/system/trace", uri)
+        self.assertEqual("VPC", params["service_type"])
+        self.assertEqual(10, params["limit"])
+        self.assertEqual(12, len(self.session.calls))
+        with open(self.path) as f:
+            state = json.load(f)
+        self.assertTrue(all(shard["done"] for shard in state["shards"]))
+        self.assertEqual([25] * 4,
+                         [shard["count"] for shard in state["shards"]])
+        self.assertEqual(0, state["shards"][0]["time"])
+        stats = sot.stats()
+        self.assertEqual(100, stats["traces"])
+        self.assertEqual(12, stats["pages"])
+        self.assertEqual(4, stats["shards_done"])
+
+    def test_resume(self):
+        sot = self._exporter(concurrency=1)
+        batches = sot.batches()
+        first = next(batches)
+        second = next(batches)
+        batches.close()
+
+        # the second batch was not checkpointed and is exported again
+        resumed = self._exporter()
+        calls = len(self.session.calls)
+        rest = list(resumed.batches())
+
+        exported = set(item["trace_id"] for item in first)
+        self.assertEqual(set(), exported & set(
+            item["trace_id"] for item in sum(rest, [])))
+        self.assertIn(second, rest)
+        self.assertEqual(set(item["trace_id"] for item in TRACES),
+                         exported | set(item["trace_id"]
+                                        for item in sum(rest, [])))
+        self.assertIn(first[-1]["trace_id"],
+                      [params.get("next")
+                       for _, params in self.session.calls[calls:]])
+        self.assertEqual([], list(self._exporter().batches()))
+
+    def test_other_export_checkpoint(self):
+        list(self._exporter().batches())
+
+        self.assertRaises(exceptions.SDKException, self._exporter,
+                          trace_rating="warning")
+
+    def test_write_ndjson(self):
+        sot = self._exporter(checkpoint=None, version=2)
+        out = six.StringIO()
+
+        self.assertEqual(100, sot.write_ndjson(out, codec="json"))
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(100, len(lines))
+        self.assertIn(json.loads(lines[0]), TRACES)
+        self.assertIs(trace.TraceV2, sot.trace_type)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_write_ndjson_session_codec(self):
+        self.session.json_codec = jsonutils.get_codec("json")
+        sot = self._exporter(checkpoint=None)
+        out = six.StringIO()
+
+        with mock.patch.object(self.session.json_codec, "encode",
+                               return_value=u"{}") as encode:
+            self.assertEqual(100, sot.write_ndjson(out))
+
+        self.assertEqual(100, encode.call_count)
+        self.assertEqual([u"{}"] * 100, out.getvalue().splitlines())
+
+    def test_error(self):
+        self.session.get = mock.Mock(side_effect=exceptions.HttpException)
+        sot = self._exporter()
+
+        self.assertRaises(exceptions.HttpException, list, sot)
+        self.assertGreaterEqual(sot.stats()["errors"], 1)
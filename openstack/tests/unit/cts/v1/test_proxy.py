@@ -57,3 +57,14 @@ class TestCTSProxy(test_proxy_base2.TestProxyBase):
                       expected_args=[mock.ANY],
                       expected_kwargs={'paginated': False,
                                        'tracker_name': 'system'})
+
+    def test_trace_exporter(self):
+        exporter = self.proxy.trace_exporter(
+            _tracker.Tracker(tracker_name='system'), 0, 99, shards=2,
+            trace_rating='warning')
+
+        self.assertEqual('system', exporter.tracker)
+        self.assertEqual({'trace_rating': 'warning'}, exporter.query)
+        self.assertEqual([(0, 49), (50, 99)],
+                         [(shard['from'], shard['to'])
+                          for shard in exporter.state['shards']])
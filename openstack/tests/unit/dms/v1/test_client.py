@@ -0,0 +1,166 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+
+import mock
+import testtools
+
+from openstack.dms.v1 import client
+from openstack.dms.v1 import queue
+from openstack import exceptions
+
+
+def _message(index):
+    return queue.MessageConsume.existing(
+        message={"body": index}, handler="h%d" % index)
+
+
+class TestProducer(testtools.TestCase):
+
+    def setUp(self):
+        super(TestProducer, self).setUp()
+        self.proxy = mock.Mock()
+        self.batches = []
+        self.proxy.send_messages.side_effect = (
+            lambda queue_id, messages: self.batches.append(messages))
+
+    def test_batch_count(self):
+        sot = client.Producer(self.proxy, "queue", max_batch_messages=4)
+
+        self.assertEqual(10, sot.send({"body": i} for i in range(10)))
+
+        self.assertEqual([4, 4, 2], [len(batch) for batch in self.batches])
+        self.assertEqual([{"body": i} for i in range(10)],
+                         sum(self.batches, []))
+        self.proxy.send_messages.assert_called_with("queue",
+                                                    messages=mock.ANY)
+        stats = sot.stats()
+        self.assertEqual(10, stats["sent"])
+        self.assertEqual(3, stats["batches"])
+        self.assertEqual("queue", stats["queue"])
+
+    def test_batch_bytes(self):
+        sot = client.Producer(self.proxy, "queue", max_batch_bytes=70,
+                              concurrency=2)
+
+        self.assertEqual(3, sot.send([{"body": "x" * 10}] * 3))
+
+        self.assertEqual([1, 2],
+                         sorted(len(batch) for batch in self.batches))
+        self.assertRaises(exceptions.InvalidRequest, sot.send,
+                          [{"body": "x" * 60}])
+
+    def test_failure(self):
+        self.proxy.send_messages.side_effect = exceptions.HttpException
+        sot = client.Producer(self.proxy, "queue")
+
+        self.assertRaises(exceptions.HttpException, sot.send,
+                          [{"body": 1}])
+        stats = sot.stats()
+        self.assertEqual(1, stats["failed"])
+        self.assertEqual(1, stats["failed_batches"])
+        self.assertEqual(0, stats["sent"])
+
+
+class TestConsumer(testtools.TestCase):
+
+    def setUp(self):
+        super(TestConsumer, self).setUp()
+        self.proxy = mock.Mock()
+        self.acks = []
+        self.proxy.ack_messages.side_effect = self._ack
+
+    def _ack(self, queue_id, group_id, handlers):
+        self.acks.append(handlers)
+        return {"success": len(handlers), "fail": 0}
+
+    def _consumer(self, **kwargs):
+        sot = client.Consumer(self.proxy, "queue", "group", **kwargs)
+        self.addCleanup(sot.close)
+        return sot
+
+    def test_consume_and_auto_ack(self):
+        self.proxy.consume_message.side_effect = [
+            [_message(0), _message(1)], [_message(2)], []]
+        sot = self._consumer(time_wait=5, tags=["t"], stop_when_empty=True)
+
+        consumed = [message.message["body"] for message in sot]
+        sot.close()
+
+        self.assertEqual([0, 1, 2], consumed)
+        self.proxy.consume_message.assert_called_with(
+            "queue", "group", max_msgs=10, time_wait=5, tags=["t"])
+        # the acks of a batch are posted with the next consume request
+        self.assertEqual([[("h0", "success"), ("h1", "success")],
+                          [("h2", "success")]], self.acks)
+        stats = sot.stats()
+        self.assertEqual(3, stats["consumed"])
+        self.assertEqual(3, stats["acked"])
+        self.assertEqual(3, stats["requests"])
+        self.assertEqual(1, stats["empty_requests"])
+        self.assertEqual(0, stats["in_flight"])
+
+    def test_acks_pipelined(self):
+        # the ack request is still running when the next consume is sent
+        release = threading.Event()
+
+        def ack(queue_id, group_id, handlers):
+            release.wait(5)
+            return self._ack(queue_id, group_id, handlers)
+
+        def consume(queue_id, group_id, **query):
+            if self.proxy.consume_message.call_count == 2:
+                self.assertEqual([], self.acks)
+                release.set()
+            return [_message(self.proxy.consume_message.call_count)]
+
+        self.proxy.ack_messages.side_effect = ack
+        self.proxy.consume_message.side_effect = consume
+        sot = self._consumer()
+
+        messages = iter(sot)
+        next(messages)
+        next(messages)
+        sot.close()
+
+        self.assertEqual([[("h1", "success")]], self.acks)
+
+    def test_in_flight_window(self):
+        self.proxy.consume_message.side_effect = (
+            lambda queue_id, group_id, max_msgs, time_wait:
+            [_message(i) for i in range(max_msgs)])
+        sot = self._consumer(max_in_flight=3, auto_ack=False)
+
+        messages = iter(sot)
+        held = [next(messages) for _ in range(3)]
+        self.assertEqual(3, sot.stats()["in_flight"])
+        self.assertRaises(exceptions.SDKException, next, messages)
+
+        messages = iter(sot)
+        sot.ack(held[0])
+        sot.ack(held[1], status="fail")
+        next(messages)
+        # the window had room for the two settled messages only
+        self.assertEqual(2, self.proxy.consume_message.call_args[1]
+                         ["max_msgs"])
+        self.assertEqual([[("h0", "success"), ("h1", "fail")]], self.acks)
+
+    def test_refresh_lag(self):
+        self.proxy.groups.return_value = [
+            queue.Group(id="other", available_messages=1),
+            queue.Group(id="group", available_messages=42)]
+        sot = self._consumer()
+
+        self.assertEqual(42, sot.refresh_lag())
+        self.assertEqual(42, sot.stats()["lag"])
+        self.proxy.groups.assert_called_once_with("queue")
@@ -75,5 +75,29 @@ class TestDMSProxy(test_proxy_base2.TestProxyBase):
     def test_ack_consumed_message(self):
         pass
 
+    def test_ack_messages(self):
+        self._verify2('openstack.dms.v1.queue.MessageConsume.ack_handlers',
+                      self.proxy.ack_messages,
+                      method_args=['queue', 'group', [('h', 'success')]],
+                      expected_args=[mock.ANY, 'queue', 'group',
+                                     [('h', 'success')]])
+
+    def test_producer(self):
+        producer = self.proxy.producer(_queue.Queue(id='queue'),
+                                       concurrency=4)
+
+        self.assertEqual('queue', producer.queue_id)
+        self.assertEqual(4, producer.concurrency)
+        self.assertIs(self.proxy, producer.proxy)
+
+    def test_consumer(self):
+        consumer = self.proxy.consumer('queue', _queue.Group(id='group'),
+                                       time_wait=5)
+
+        self.assertEqual('queue', consumer.queue_id)
+        self.assertEqual('group', consumer.consume_group_id)
+        self.assertEqual(5, consumer.time_wait)
+        consumer.close()
+
     def test_quotas(self):
         pass
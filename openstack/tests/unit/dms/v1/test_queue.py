@@ -125,7 +125,7 @@ class TestMessage(testtools.TestCase):
         sess = mock.Mock()
         sess.post.return_value = None
         url = self.objcls.base_path % {'queue_id': fake_queue_id}
-        headers = {'Content-type': 'application/json', 'Content-Length': '2'}
+        headers = {'Content-type': 'application/json'}
 
         self.objcls.create_messages(sess, queue_id=fake_queue_id)
         sess.post.assert_called_with(url, endpoint_filter=self.objcls.service,
@@ -150,3 +150,40 @@ class TestMessageConsume(testtools.TestCase):
         sot = self.objcls(**self.example)
         self.assertEqual(self.example['message'], sot.message)
         self.assertEqual(self.example['handler'], sot.handler)
+
+    @mock.patch("openstack.service_filter.ServiceFilter."
+                "get_endpoint_override")
+    def test_list_tags(self, mock_svc):
+        sess = mock.Mock()
+        sess.get.return_value.json.return_value = [self.example]
+
+        result = self.objcls.list(sess, queue_id='q', consumer_group_id='g',
+                                  max_msgs=10, time_wait=30,
+                                  tags=['a&b', 'c'])
+
+        sess.get.assert_called_once_with(
+            '/queues/q/groups/g/messages', endpoint_filter=self.objcls.service,
+            endpoint_override=mock_svc(),
+            headers={"Accept": "application/json",
+                     "Content-type": "application/json"},
+            params={'max_msgs': 10, 'time_wait': 30, 'tag': ['a&b', 'c']})
+        self.assertEqual(1, len(result))
+        self.assertEqual(self.example['handler'], result[0].handler)
+        self.assertEqual('g', result[0].consumer_group_id)
+
+    @mock.patch("openstack.service_filter.ServiceFilter."
+                "get_endpoint_override")
+    def test_ack_handlers(self, mock_svc):
+        sess = mock.Mock()
+        sess.post.return_value.json.return_value = {"success": 1, "fail": 1}
+
+        result = self.objcls.ack_handlers(sess, 'q', 'g',
+                                          [('h1', 'success'), ('h2', 'fail')])
+
+        self.assertEqual({"success": 1, "fail": 1}, result)
+        sess.post.assert_called_once_with(
+            '/queues/q/groups/g/ack', endpoint_filter=self.objcls.service,
+            endpoint_override=mock_svc(),
+            json={"message": [{"handler": "h1", "status": "success"},
+                              {"handler": "h2", "status": "fail"}]},
+            headers={'Content-type': 'application/json'})
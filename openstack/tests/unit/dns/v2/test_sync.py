@@ -0,0 +1,157 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from openstack.dns.v2 import _proxy
+from openstack.dns.v2 import recordset
+from openstack.dns.v2 import sync
+from openstack.dns.v2 import zone
+from openstack import exceptions
+from openstack.tests.unit import test_proxy_base2
+
+ZONE = zone.Zone(id="zone-id", name="example.com.")
+
+CURRENT = [
+    {"id": "soa", "name": "example.com.", "type": "SOA", "ttl": 300,
+     "records": ["ns1.example.com. xx.example.com. 1"], "default": True},
+    {"id": "api", "name": "api.example.com.", "type": "A", "ttl": 300,
+     "records": ["10.0.0.2", "10.0.0.1"], "default": False},
+    {"id": "www", "name": "www.example.com.", "type": "A", "ttl": 300,
+     "records": ["10.0.0.3"], "default": False},
+    {"id": "old", "name": "old.example.com.", "type": "A", "ttl": 300,
+     "records": ["10.0.0.4"], "default": False},
+    {"id": "txt", "name": "example.com.", "type": "TXT", "ttl": 300,
+     "records": ["\"v=spf1 -all\""], "default": False},
+]
+
+DESIRED = [
+    {"name": "API", "type": "a", "records": ["10.0.0.1", "10.0.0.2"]},
+    {"name": "www.example.com.", "type": "A", "records": ["10.0.0.3"],
+     "ttl": 60},
+    {"name": "db", "type": "A", "records": ["10.0.0.5"], "owner": "team"},
+    {"name": "@", "type": "TXT", "records": ["\"v=spf1 -all\""]},
+]
+
+
+def _recordsets(records):
+    lightweight = recordset.Recordset._get_lightweight_type()
+    return [lightweight(dict(record)) for record in records]
+
+
+class TestZoneSync(testtools.TestCase):
+
+    def setUp(self):
+        super(TestZoneSync, self).setUp()
+        self.proxy = mock.Mock()
+        self.proxy.recordsets.side_effect = lambda *args, **kwargs: iter(
+            _recordsets(CURRENT))
+
+    def test_plan(self):
+        sot = sync.ZoneSync(self.proxy, ZONE, DESIRED)
+
+        plan = sot.plan()
+
+        self.proxy.recordsets.assert_called_once_with(ZONE, limit=500,
+                                                      lightweight=True)
+        self.assertFalse(self.proxy.get_zone.called)
+        self.assertEqual(["db.example.com."],
+                         [record["name"] for record in plan.create])
+        self.assertEqual([("www", {"ttl": 60})],
+                         [(item.id, changes) for item, changes in
+                          plan.update])
+        self.assertEqual(["old"], [item.id for item in plan.delete])
+        self.assertEqual({"create": 1, "update": 1, "delete": 1,
+                          "unchanged": 2, "applied": 0, "errors": 0},
+                         plan.summary())
+        self.assertEqual(3, len(plan))
+
+    def test_plan_options(self):
+        self.proxy.get_zone.return_value = ZONE
+        sot = sync.ZoneSync(self.proxy, "zone-id", DESIRED[:1], prune=False,
+                            types=["A"], limit=1000)
+
+        plan = sot.plan()
+
+        self.proxy.get_zone.assert_called_once_with("zone-id")
+        self.assertEqual(500, sot.limit)
+        self.assertEqual({"create": 0, "update": 0, "delete": 0,
+                          "unchanged": 1, "applied": 0, "errors": 0},
+                         plan.summary())
+        self.assertRaises(exceptions.InvalidRequest, sync.ZoneSync,
+                          self.proxy, ZONE, DESIRED, types=["A"])
+        self.assertRaises(exceptions.InvalidRequest, sync.ZoneSync,
+                          self.proxy, ZONE, DESIRED[:1] * 2)
+        self.assertRaises(exceptions.InvalidRequest, sync.ZoneSync,
+                          self.proxy, ZONE, [{"name": "db", "type": "A"}])
+
+    def test_apply(self):
+        calls = []
+        self.proxy.delete_recordset.side_effect = \
+            lambda zone, id: calls.append("delete")
+        self.proxy.update_recordset.side_effect = \
+            lambda zone, id, **attrs: calls.append("update")
+        self.proxy.create_recordset.side_effect = exceptions.HttpException
+        sot = sync.ZoneSync(self.proxy, ZONE, DESIRED, concurrency=2)
+
+        plan = sot.sync()
+
+        self.assertEqual(["delete", "update"], calls)
+        self.proxy.delete_recordset.assert_called_once_with(ZONE, "old")
+        self.proxy.update_recordset.assert_called_once_with(ZONE, "www",
+                                                            ttl=60)
+        self.proxy.create_recordset.assert_called_once_with(
+            ZONE, name="db.example.com.", type="A", records=["10.0.0.5"])
+        self.assertEqual(2, plan.applied)
+        [(action, record, error)] = plan.errors
+        self.assertEqual("create", action)
+        self.assertEqual("team", record["owner"])
+        self.assertIsInstance(error, exceptions.HttpException)
+
+    def test_dry_run(self):
+        sot = sync.ZoneSync(self.proxy, ZONE, DESIRED, rate=100)
+
+        with mock.patch.object(sot._bucket, "acquire") as acquire:
+            plan = sot.sync(dry_run=True)
+            self.assertEqual(3, len(plan))
+            self.assertFalse(acquire.called)
+
+            results = list(sot.apply(plan))
+            self.assertEqual(3, acquire.call_count)
+
+        self.assertEqual(["delete", "update", "create"],
+                         [action for action, _, _, _ in results])
+        self.assertEqual(3, plan.applied)
+        self.assertEqual(1, self.proxy.recordsets.call_count)
+
+
+class TestProxySync(test_proxy_base2.TestProxyBase):
+
+    def setUp(self):
+        super(TestProxySync, self).setUp()
+        self.proxy = _proxy.Proxy(self.session)
+
+    def test_update_recordset(self):
+        self._verify2('openstack.proxy2.BaseProxy._update',
+                      self.proxy.update_recordset,
+                      method_args=[ZONE, 'recordset-id'],
+                      method_kwargs={'ttl': 600},
+                      expected_args=[recordset.Recordset, mock.ANY],
+                      expected_kwargs={'prepend_key': False, 'ttl': 600})
+
+    @mock.patch.object(sync.ZoneSync, "sync")
+    def test_sync_recordsets(self, mock_sync):
+        self.assertIs(mock_sync.return_value,
+                      self.proxy.sync_recordsets(ZONE, DESIRED, dry_run=True,
+                                                 prune=False))
+        mock_sync.assert_called_once_with(dry_run=True)
@@ -0,0 +1,143 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+import time
+
+import mock
+import testtools
+
+from openstack import exceptions
+from openstack.fgs.v2 import functions
+from openstack.fgs.v2 import invoke
+
+URN = "urn:fss:region:project:function:default:test:latest"
+
+
+class _FakeFGS(object):
+    # Echoes the payloads, the payloads with a delay wait before answering
+
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def post(self, uri, json=None, **kwargs):
+        with self._lock:
+            self.calls.append((uri, json, kwargs))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(json.get("delay", 0))
+            if json.get("fail"):
+                raise exceptions.HttpException("Too many requests")
+            response = mock.Mock()
+            response.json.return_value = {
+                "request_id": "r%d" % json["id"], "result": json["id"],
+                "status": 200}
+            return response
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestInvoker(testtools.TestCase):
+
+    def setUp(self):
+        super(TestInvoker, self).setUp()
+        self.session = _FakeFGS()
+
+    def test_map(self):
+        sot = invoke.Invoker(self.session, URN, concurrency=4)
+        payloads = [{"id": i} for i in range(20)]
+        payloads[3]["fail"] = True
+
+        results = list(sot.map(iter(payloads), ordered=True))
+
+        self.assertEqual(list(range(20)), [item[0] for item in results])
+        self.assertEqual([i for i in range(20) if i != 3],
+                         [result["result"] for _, _, result, _, _ in results
+                          if result is not None])
+        index, payload, result, error, latency = results[3]
+        self.assertIs(payloads[3], payload)
+        self.assertIsNone(result)
+        self.assertIsInstance(error, exceptions.HttpException)
+        self.assertLessEqual(self.session.max_in_flight, 4)
+        uri, _, kwargs = self.session.calls[0]
+        self.assertEqual("/fgs/functions/%s/invocations" % URN, uri)
+        self.assertEqual(functions.INVOCATION_HEADERS, kwargs["headers"])
+        stats = sot.stats()
+        self.assertEqual(20, stats["invoked"])
+        self.assertEqual(1, stats["errors"])
+        self.assertGreater(stats["latency"]["max"], 0)
+
+    def test_as_completed(self):
+        sot = invoke.Invoker(self.session, URN, asynchronous=True,
+                             concurrency=2)
+
+        results = list(sot.map([{"id": 0, "delay": 0.2}, {"id": 1}]))
+
+        self.assertEqual([1, 0], [item[0] for item in results])
+        self.assertGreaterEqual(results[1][4], 0.2)
+        self.assertEqual("/fgs/functions/%s/invocations-async" % URN,
+                         self.session.calls[0][0])
+
+    def test_backpressure(self):
+        sot = invoke.Invoker(self.session, URN, concurrency=2)
+        consumed = []
+
+        def payloads():
+            for i in range(100):
+                consumed.append(i)
+                yield {"id": i}
+
+        results = sot.map(payloads())
+        next(results)
+        self.assertLessEqual(len(consumed), 5)
+        results.close()
+
+    def test_headers_not_shared(self):
+        # the sessions sign the requests by setting headers in place
+        def post(uri, json=None, headers=None, **kwargs):
+            headers.setdefault("Authorization", "signature of %s" % json)
+            return mock.Mock()
+
+        expected = dict(functions.INVOCATION_HEADERS)
+        session = mock.Mock()
+        session.post.side_effect = post
+        sot = invoke.Invoker(session, URN, concurrency=1)
+
+        list(sot.map([{"id": 0}, {"id": 1}], ordered=True))
+
+        self.assertEqual(expected, functions.INVOCATION_HEADERS)
+        self.assertEqual(["signature of {'id': 0}", "signature of {'id': 1}"],
+                         [call[1]["headers"]["Authorization"]
+                          for call in session.post.call_args_list])
+
+    def test_rate(self):
+        sot = invoke.Invoker(self.session, URN, rate=10)
+
+        with mock.patch.object(sot._bucket, "acquire") as acquire:
+            list(sot.map({"id": i} for i in range(3)))
+
+        self.assertEqual(3, acquire.call_count)
+
+    def test_latency_without_throttling(self):
+        sot = invoke.Invoker(self.session, URN, rate=10)
+
+        with mock.patch.object(sot._bucket, "acquire",
+                               side_effect=lambda: time.sleep(0.2)):
+            results = list(sot.map([{"id": 0}]))
+
+        self.assertLess(results[0][4], 0.1)
+        self.assertLess(sot.stats()["latency"]["max"], 0.1)
@@ -0,0 +1,53 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from openstack.fgs.v2 import _proxy
+from openstack.fgs.v2 import invoke
+from openstack.tests.unit import test_proxy_base2
+
+URN = "urn:fss:region:project:function:default:test:latest"
+
+
+class TestFGSProxy(test_proxy_base2.TestProxyBase):
+
+    def setUp(self):
+        super(TestFGSProxy, self).setUp()
+        self.proxy = _proxy.Proxy(self.session)
+
+    def test_execute_function_synchronously(self):
+        self._verify2('openstack.fgs.v2.functions.FunctionInvocations.create',
+                      self.proxy.execute_function_synchronously,
+                      method_args=[URN],
+                      method_kwargs={'key': 'value'},
+                      expected_args=[self.session],
+                      expected_kwargs={'prepend_key': False,
+                                       'key': 'value'})
+
+    def test_function_invoker(self):
+        sot = self.proxy.function_invoker(URN, asynchronous=True,
+                                          concurrency=4)
+
+        self.assertIsInstance(sot, invoke.Invoker)
+        self.assertIs(self.session, sot.session)
+        self.assertEqual(4, sot.concurrency)
+        self.assertTrue(sot.asynchronous)
+
+    @mock.patch.object(invoke.Invoker, 'map')
+    def test_execute_functions(self, mock_map):
+        payloads = [{'key': 'value'}]
+
+        self.assertIs(mock_map.return_value,
+                      self.proxy.execute_functions(URN, payloads,
+                                                   ordered=True))
+        mock_map.assert_called_once_with(payloads, ordered=True)
@@ -10,9 +10,13 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import io
 import json
+import os
 
+import fixtures
 import mock
+import requests
 import testtools
 
 from openstack import exceptions
@@ -422,3 +426,70 @@ class TestImage(testtools.TestCase):
         call_args, call_kwargs = call
         self.assertEqual(url, call_args[0])
         self.assertEqual(json.loads(value), json.loads(call_kwargs['data']))
+
+
+class TestImageDownloadOutput(testtools.TestCase):
+
+    def setUp(self):
+        super(TestImageDownloadOutput, self).setUp()
+        self.resp = mock.Mock()
+        self.resp.headers = {"Content-MD5": "900150983cd24fb0d6963f7d28e17f72"}
+        self.resp.iter_content.return_value = iter([b"a", b"bc"])
+        self.sess = mock.Mock()
+        self.sess.get.return_value = self.resp
+        self.sot = image.Image(**EXAMPLE)
+
+    def test_download_stream_verified(self):
+        iter_content = self.resp.iter_content
+
+        rv = self.sot.download(self.sess, stream=True)
+
+        self.assertEqual([b"a", b"bc"], list(rv.iter_content(2)))
+        iter_content.assert_called_once_with(2)
+
+    def test_download_stream_mismatch(self):
+        self.resp.headers = {"Content-MD5": "the wrong checksum"}
+
+        rv = self.sot.download(self.sess, stream=True)
+
+        chunks = rv.iter_content(2)
+        self.assertEqual(b"a", next(chunks))
+        self.assertEqual(b"bc", next(chunks))
+        self.assertRaises(exceptions.InvalidResponse, next, chunks)
+
+    def test_download_stream_content_verified(self):
+        self.resp = requests.Response()
+        self.resp.raw = io.BytesIO(b"abd")
+        self.resp.headers["Content-MD5"] = "900150983cd24fb0d6963f7d28e17f72"
+        self.sess.get.return_value = self.resp
+
+        rv = self.sot.download(self.sess, stream=True)
+
+        self.assertRaises(exceptions.InvalidResponse, getattr, rv, "content")
+
+    def test_download_to_file(self):
+        out = io.BytesIO()
+
+        self.assertIsNone(self.sot.download(self.sess, output=out,
+                                            chunk_size=2))
+
+        self.assertEqual(b"abc", out.getvalue())
+        self.assertTrue(self.sess.get.call_args[1]["stream"])
+        self.resp.iter_content.assert_called_once_with(2)
+        self.resp.close.assert_called_once_with()
+
+    def test_download_to_path_mismatch(self):
+        self.resp.headers = {"Content-MD5": "the wrong checksum"}
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, "img")
+
+        self.assertRaises(exceptions.InvalidResponse, self.sot.download,
+                          self.sess, output=path)
+        self.assertFalse(os.path.exists(path))
+
+    def test_download_to_path(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, "img")
+
+        self.sot.download(self.sess, output=path)
+
+        with open(path, "rb") as downloaded:
+            self.assertEqual(b"abc", downloaded.read())
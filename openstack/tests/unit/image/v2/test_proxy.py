@@ -10,6 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mmap
+import os
+
+import fixtures
 import mock
 
 from openstack import exceptions
@@ -50,6 +54,52 @@ class TestImageProxy(test_proxy_base2.TestProxyBase):
         created_image.upload.assert_called_with(self.session)
         self.assertEqual(rv, created_image)
 
+    def test_image_create_filename(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, "img")
+        with open(path, "wb") as out:
+            out.write(b"0123456789")
+        uploaded = []
+        created_image = mock.Mock(spec=image.Image(id="id"))
+        created_image.upload.side_effect = lambda session: uploaded.append(
+            (created_image.data, created_image.data[:]))
+        self.proxy._create = mock.Mock(return_value=created_image)
+
+        rv = self.proxy.upload_image(filename=path, container_format="x",
+                                     disk_format="y", name="z")
+
+        [(data, content)] = uploaded
+        self.assertIsInstance(data, mmap.mmap)
+        self.assertEqual(b"0123456789", content)
+        self.assertTrue(data.closed)
+        self.assertIs(created_image, rv)
+        self.assertIsNone(rv.data)
+
+    def test_import_images(self):
+        failure = exceptions.HttpException("failed")
+
+        def upload_image(**attrs):
+            if attrs["name"] == "b":
+                raise failure
+            return attrs["name"]
+
+        with mock.patch.object(self.proxy, "upload_image",
+                               side_effect=upload_image):
+            results = list(self.proxy.import_images(
+                [{"name": "a"}, {"name": "b"}, {"name": "c"}],
+                concurrency=2))
+
+        self.assertEqual([({"name": "a"}, "a", None),
+                          ({"name": "b"}, None, failure),
+                          ({"name": "c"}, "c", None)], results)
+
+    def test_image_download_output(self):
+        self._verify2("openstack.image.v2.image.Image.download",
+                      self.proxy.download_image,
+                      method_args=["image"],
+                      method_kwargs={"output": "path", "chunk_size": 10},
+                      expected_args=[self.session],
+                      expected_kwargs={"output": "path", "chunk_size": 10})
+
     def test_image_delete(self):
         self.verify_delete(self.proxy.delete_image, image.Image, False)
 
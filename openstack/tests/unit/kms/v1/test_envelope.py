@@ -0,0 +1,137 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import binascii
+import hashlib
+import io
+import os
+import time
+
+import mock
+import testtools
+
+from openstack import exceptions
+from openstack.kms.v1 import envelope
+from openstack.kms.v1 import key
+
+KEY_ID = "0d0466b0-e727-4d9c-b35d-f84bb474a37f"
+
+
+class _FakeKMS(object):
+    # Data keys whose cipher text is a counter, known by a single KMS
+
+    def __init__(self):
+        self.keys = {}
+        self.create_datakey = mock.Mock(side_effect=self._create)
+        self.decrypt_datakey = mock.Mock(side_effect=self._decrypt)
+
+    def _create(self, key_id, **params):
+        plain = binascii.hexlify(os.urandom(32)).decode("ascii").upper()
+        cipher_text = "%04X" % len(self.keys)
+        self.keys[cipher_text] = plain
+        return key.DataKey(key_id=key_id, plain_text=plain,
+                           cipher_text=cipher_text)
+
+    def _decrypt(self, key_id, cipher_text=None, **params):
+        plain = self.keys[cipher_text]
+        digest = hashlib.sha256(binascii.unhexlify(plain)).hexdigest()
+        return key.DataKey(key_id=key_id, data_key=plain,
+                           datakey_dgst=digest.upper())
+
+
+@testtools.skipIf(envelope.aead is None, "cryptography is not installed")
+class TestEnvelopeEncryptor(testtools.TestCase):
+
+    def setUp(self):
+        super(TestEnvelopeEncryptor, self).setUp()
+        self.kms = _FakeKMS()
+
+    def test_round_trip(self):
+        sot = envelope.EnvelopeEncryptor(self.kms, KEY_ID, chunk_size=16)
+
+        for data in (b"", b"x" * 64, os.urandom(100)):
+            encrypted = sot.encrypt(data)
+            self.assertNotIn(b"x" * 16, encrypted)
+            self.assertEqual(data, sot.decrypt(encrypted))
+
+        self.kms.create_datakey.assert_called_once_with(
+            KEY_ID, datakey_length="256")
+        self.assertFalse(self.kms.decrypt_datakey.called)
+        stats = sot.stats()
+        self.assertEqual(3, stats["encrypted"])
+        self.assertEqual(164, stats["decrypted_bytes"])
+        self.assertEqual(3, stats["cache_hits"])
+
+    def test_decrypt_cache(self):
+        context = {"purpose": "test"}
+        data = os.urandom(1000)
+        encrypted = envelope.EnvelopeEncryptor(
+            self.kms, key.Key(key_id=KEY_ID),
+            encryption_context=context).encrypt(data)
+        sot = envelope.EnvelopeEncryptor(self.kms, KEY_ID,
+                                         encryption_context=context)
+
+        for _ in range(3):
+            out = io.BytesIO()
+            self.assertEqual(1000, sot.decrypt_stream(io.BytesIO(encrypted),
+                                                      out))
+            self.assertEqual(data, out.getvalue())
+
+        self.kms.decrypt_datakey.assert_called_once_with(
+            KEY_ID, cipher_text="0000", datakey_cipher_length="32",
+            encryption_context=context)
+
+    def test_max_uses_and_ttl(self):
+        sot = envelope.EnvelopeEncryptor(self.kms, KEY_ID, max_uses=2)
+
+        for _ in range(3):
+            sot.encrypt(b"data")
+        self.assertEqual(2, self.kms.create_datakey.call_count)
+
+        with mock.patch.object(envelope.time, "time",
+                               return_value=time.time() + 301):
+            sot.encrypt(b"data")
+        self.assertEqual(3, self.kms.create_datakey.call_count)
+
+        sot.rotate()
+        sot.encrypt(b"data")
+        self.assertEqual(4, sot.stats()["datakeys_created"])
+
+    def test_corrupted(self):
+        sot = envelope.EnvelopeEncryptor(self.kms, KEY_ID, chunk_size=16)
+        encrypted = bytearray(sot.encrypt(os.urandom(40)))
+        # three records of 32, 32 and 24 bytes follow the header
+        header = len(encrypted) - 88
+
+        for corrupted in (
+                encrypted[:-1], encrypted[:header + 64],
+                encrypted[:header + 32] + encrypted[header + 64:],
+                encrypted[:-1] + bytearray([encrypted[-1] ^ 1])):
+            self.assertRaises(exceptions.SDKException, sot.decrypt,
+                              bytes(corrupted))
+        self.assertRaises(exceptions.SDKException, sot.decrypt, b"plain")
+
+    def test_kms_error(self):
+        self.kms.create_datakey.side_effect = None
+        self.kms.create_datakey.return_value = key.DataKey(
+            error_code="KMS.0205", error_msg="The key is disabled")
+        sot = envelope.EnvelopeEncryptor(self.kms, KEY_ID)
+
+        self.assertRaises(exceptions.SDKException, sot.encrypt, b"data")
+
+
+class TestWithoutCryptography(testtools.TestCase):
+
+    @mock.patch.object(envelope, "aead", None)
+    def test_missing(self):
+        self.assertRaises(exceptions.SDKException,
+                          envelope.EnvelopeEncryptor, _FakeKMS(), KEY_ID)
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import binascii
 import hashlib
 import mock
 
@@ -96,7 +97,7 @@ class TestKMSProxy(test_proxy_base2.TestProxyBase):
 
         plain_text = PLAIN_TEXT
         hash = hashlib.sha256()
-        hex_data = str(PLAIN_TEXT).decode("hex")
+        hex_data = binascii.unhexlify(PLAIN_TEXT)
         hash.update(bytearray(hex_data))
         digest = hash.hexdigest()
         self._verify2('openstack.kms.v1.key.DataKey.encrypt',
@@ -134,3 +135,10 @@ class TestKMSProxy(test_proxy_base2.TestProxyBase):
                       method_args=[],
                       expected_args=[mock.ANY],
                       expected_kwargs={})
+
+    @mock.patch('openstack.kms.v1.envelope.EnvelopeEncryptor')
+    def test_envelope_encryptor(self, mock_encryptor):
+        self.assertIs(mock_encryptor.return_value,
+                      self.proxy.envelope_encryptor('key', max_uses=10))
+        mock_encryptor.assert_called_once_with(self.proxy, 'key',
+                                               max_uses=10)
@@ -10,9 +10,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import io
+
 import mock
 import testtools
 
+from openstack import exceptions
 from openstack.object_store.v1 import obj
 
 
@@ -135,3 +138,78 @@ class TestObject(testtools.TestCase):
 
     def test_create_no_data(self):
         self._test_create(self.sess.post, None, None)
+
+    def test_stream(self):
+        self.resp.status_code = 206
+        self.resp.iter_content.return_value = iter([b"0123", b"45"])
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+
+        chunks = list(sot.stream(self.sess, chunk_size=4, start=10, end=15))
+
+        self.assertEqual([b"0123", b"45"], chunks)
+        url = "%s/%s" % (CONTAINER_NAME, OBJECT_NAME)
+        self.sess.get.assert_called_with(
+            url, endpoint_filter=sot.service, stream=True,
+            headers={'Accept': 'bytes', 'Range': 'bytes=10-15'})
+        self.resp.iter_content.assert_called_once_with(4)
+        self.resp.close.assert_called_once_with()
+
+    def test_stream_if_match(self):
+        self.resp.status_code = 206
+        self.resp.headers = {"etag": '"abc"'}
+        self.resp.iter_content.return_value = iter([b"0123"])
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+
+        chunks = list(sot.stream(self.sess, start=0, end=3, if_match="abc"))
+
+        self.assertEqual([b"0123"], chunks)
+        url = "%s/%s" % (CONTAINER_NAME, OBJECT_NAME)
+        self.sess.get.assert_called_with(
+            url, endpoint_filter=sot.service, stream=True,
+            headers={'Accept': 'bytes', 'Range': 'bytes=0-3',
+                     'If-Match': 'abc'})
+
+    def test_stream_if_match_changed(self):
+        self.resp.status_code = 206
+        self.resp.headers = {"etag": "def"}
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+
+        self.assertRaises(exceptions.SDKException, list,
+                          sot.stream(self.sess, start=0, if_match="abc"))
+        self.resp.iter_content.assert_not_called()
+        self.resp.close.assert_called_once_with()
+
+    def test_stream_range_ignored(self):
+        self.resp.status_code = 200
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+
+        self.assertRaises(exceptions.SDKException, list,
+                          sot.stream(self.sess, start=10))
+        self.resp.close.assert_called_once_with()
+
+    def test_create_manifest(self):
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+        segments = [{"path": "/c/s", "etag": "e", "size_bytes": 1}]
+
+        rv = sot.create_manifest(self.sess, segments)
+
+        url = "%s/%s" % (CONTAINER_NAME, OBJECT_NAME)
+        self.sess.put.assert_called_with(
+            url, endpoint_filter=sot.service,
+            params={'multipart-manifest': 'put'}, json=segments,
+            headers={"Accept": ""})
+        self.assertEqual(self.resp.headers, rv.get_headers())
+
+
+class TestSegmentReader(testtools.TestCase):
+
+    def test_read(self):
+        sot = obj.SegmentReader(io.BytesIO(b"0123456789"), 3, 5)
+
+        self.assertEqual(5, len(sot))
+        self.assertEqual(b"34", sot.read(2))
+        self.assertEqual(b"567", sot.read())
+        self.assertEqual(b"", sot.read())
+        self.assertEqual(0, sot.seek(0))
+        self.assertEqual(b"34567", sot.read(100))
+        self.assertEqual(5, sot.seek(0, 2))
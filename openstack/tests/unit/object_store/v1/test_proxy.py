@@ -10,9 +10,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
+import os
+
+import fixtures
 import mock
 import six
 
+from openstack import exceptions
 from openstack.object_store.v1 import _proxy
 from openstack.object_store.v1 import account
 from openstack.object_store.v1 import container
@@ -252,23 +257,201 @@ class Test_objects(TestObjectStoreProxy):
 #                      httpretty.last_request().path)
 
 
+def _stream(data):
+    def stream(self, session, chunk_size=obj.DEFAULT_CHUNK_SIZE, start=None,
+               end=None, if_match=None):
+        part = data[start or 0:None if end is None else end + 1]
+        for offset in range(0, len(part), chunk_size):
+            yield part[offset:offset + chunk_size]
+    return stream
+
+
 class Test_download_object(TestObjectStoreProxy):
 
-    @mock.patch("openstack.object_store.v1._proxy.Proxy.get_object")
-    def test_download(self, mock_get):
-        the_data = "here's some data"
-        mock_get.return_value = the_data
-        ob = mock.Mock()
-
-        fake_open = mock.mock_open()
-        file_path = "blarga/somefile"
-        with mock.patch("openstack.object_store.v1._proxy.open",
-                        fake_open, create=True):
-            self.proxy.download_object(ob, container="tainer", path=file_path)
-
-        fake_open.assert_called_once_with(file_path, "w")
-        fake_handle = fake_open()
-        fake_handle.write.assert_called_once_with(the_data)
+    def setUp(self):
+        super(Test_download_object, self).setUp()
+        self.data = six.b("0123456789") * 10
+        self.useFixture(fixtures.MockPatchObject(
+            obj.Object, "stream", autospec=True,
+            side_effect=_stream(self.data)))
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 "object")
+
+    def test_download(self):
+        self.proxy.download_object("object", container="tainer",
+                                   path=self.path, chunk_size=7)
+
+        with open(self.path, "rb") as downloaded:
+            self.assertEqual(self.data, downloaded.read())
+        (res, session, chunk_size), _ = obj.Object.stream.call_args
+        self.assertEqual(("tainer", "object"), (res.container, res.name))
+        self.assertEqual(7, chunk_size)
+
+    def test_download_to_file(self):
+        out = six.BytesIO()
+
+        self.proxy.download_object("object", container="tainer", path=out)
+
+        self.assertEqual(self.data, out.getvalue())
+
+    def test_iter_object(self):
+        chunks = self.proxy.iter_object("object", container="tainer",
+                                        chunk_size=30)
+
+        self.assertEqual([30, 30, 30, 10], [len(chunk) for chunk in chunks])
+
+    @mock.patch.object(obj.Object, "head", autospec=True)
+    def test_download_parts(self, mock_head):
+        def head(res, session):
+            res.set_headers({"content-length": str(len(self.data)),
+                             "accept-ranges": "bytes", "etag": "abc"})
+            return res
+        mock_head.side_effect = head
+
+        self.proxy.download_object("object", container="tainer",
+                                   path=self.path, concurrency=3,
+                                   part_size=30)
+
+        with open(self.path, "rb") as downloaded:
+            self.assertEqual(self.data, downloaded.read())
+        ranges = sorted(call[0][3:] for call in
+                        obj.Object.stream.call_args_list)
+        self.assertEqual([(0, 29), (30, 59), (60, 89), (90, 99)], ranges)
+        self.assertEqual(
+            ["abc"] * 4,
+            [call[1]["if_match"] for call in obj.Object.stream.call_args_list])
+
+    @mock.patch.object(obj.Object, "head", autospec=True)
+    def test_download_parts_small_object(self, mock_head):
+        mock_head.side_effect = lambda res, session: res.set_headers(
+            {"content-length": "100", "accept-ranges": "bytes"})
+
+        self.proxy.download_object("object", container="tainer",
+                                   path=self.path, concurrency=3,
+                                   part_size=100)
+
+        self.assertEqual(1, obj.Object.stream.call_count)
+
+
+class Test_upload_object(TestObjectStoreProxy):
+
+    def setUp(self):
+        super(Test_upload_object, self).setUp()
+        self.session = mock.Mock()
+        self.proxy = _proxy.Proxy(self.session)
+        self.uploaded = {}
+
+        def put(url, **kwargs):
+            data = kwargs.get("data")
+            if hasattr(data, "read"):
+                data = data.read()
+            self.uploaded[url] = data
+            etag = hashlib.md5(data or six.b("")).hexdigest()
+            return mock.Mock(headers={"etag": etag})
+        self.session.put.side_effect = put
+
+    def _segments(self):
+        urls = sorted(url for url in self.uploaded
+                      if url.startswith("tainer_segments/"))
+        return [self.uploaded[url] for url in urls]
+
+    def test_segments(self):
+        data = six.b("0123456789") * 3
+
+        res = self.proxy.upload_object(container="tainer", name="big",
+                                       data=data, segment_size=8,
+                                       concurrency=2)
+
+        self.assertEqual("big", res.name)
+        self.assertEqual([data[:8], data[8:16], data[16:24], data[24:]],
+                         self._segments())
+        args, kwargs = self.session.put.call_args
+        self.assertEqual("tainer/big", args[0])
+        self.assertEqual({"multipart-manifest": "put"}, kwargs["params"])
+        manifest = kwargs["json"]
+        self.assertEqual([8, 8, 8, 6],
+                         [segment["size_bytes"] for segment in manifest])
+        self.assertEqual(hashlib.md5(data[:8]).hexdigest(),
+                         manifest[0]["etag"])
+        self.assertTrue(manifest[0]["path"].startswith(
+            "/tainer_segments/big/slo/"))
+        self.assertIn("/tainer_segments", self.uploaded)
+
+    def test_segments_from_stream(self):
+        chunks = [six.b("01234"), six.b("56789012"), six.b("345")]
+
+        self.proxy.upload_object(container="tainer", name="big",
+                                 data=iter(chunks), segment_size=6)
+
+        self.assertEqual([six.b("012345"), six.b("678901"), six.b("2345")],
+                         self._segments())
+
+    def test_small_data_not_segmented(self):
+        self.proxy.upload_object(container="tainer", name="small",
+                                 data=six.BytesIO(six.b("01234")),
+                                 segment_size=8)
+
+        self.assertEqual({"tainer/small": six.b("01234")}, self.uploaded)
+
+    def test_filename(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, "f")
+        with open(path, "wb") as out:
+            out.write(six.b("0123456789"))
+
+        self.proxy.upload_object(container="tainer", name="big",
+                                 filename=path, segment_size=4)
+
+        self.assertEqual([six.b("0123"), six.b("4567"), six.b("89")],
+                         self._segments())
+
+    def test_failed_segments_deleted(self):
+        put = self.session.put.side_effect
+
+        def failing_put(url, **kwargs):
+            if url.endswith("00000001"):
+                raise exceptions.HttpException("failed")
+            return put(url, **kwargs)
+        self.session.put.side_effect = failing_put
+
+        self.assertRaises(exceptions.HttpException,
+                          self.proxy.upload_object, container="tainer",
+                          name="big", data=six.b("0123456789") * 2,
+                          segment_size=4, concurrency=2)
+
+        deleted = [call[0][0] for call in self.session.delete.call_args_list]
+        uploaded = [url for url in self.uploaded
+                    if url.startswith("tainer_segments/")]
+        self.assertIn(uploaded[0].rsplit("/", 1)[0] + "/00000000", deleted)
+        self.assertEqual([], [url for url in uploaded if url not in deleted])
+
+    def test_failed_manifest_deletes_segments(self):
+        put = self.session.put.side_effect
+
+        def failing_put(url, **kwargs):
+            if kwargs.get("params"):
+                raise exceptions.HttpException("failed")
+            return put(url, **kwargs)
+        self.session.put.side_effect = failing_put
+
+        self.assertRaises(exceptions.HttpException,
+                          self.proxy.upload_object, container="tainer",
+                          name="big", data=six.b("0123456789"),
+                          segment_size=4)
+
+        deleted = [call[0][0] for call in self.session.delete.call_args_list]
+        self.assertEqual(3, len(deleted))
+        self.assertEqual(sorted(url for url in self.uploaded
+                                if url.startswith("tainer_segments/")),
+                         sorted(deleted))
+
+    def test_empty_stream(self):
+        self.proxy.upload_object(container="tainer", name="empty",
+                                 data=iter([]), segment_size=4)
+
+        self.assertEqual([], self._segments())
+        self.assertEqual(six.b(""), self.uploaded["tainer/empty"])
+        args, kwargs = self.session.put.call_args
+        self.assertNotIn("params", kwargs)
 
 
 class Test_copy_object(TestObjectStoreProxy):
@@ -0,0 +1,77 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from openstack import exceptions
+from openstack.smn.v2 import cache
+from openstack.smn.v2 import topic
+
+
+class TestTopicCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestTopicCache, self).setUp()
+        patcher = mock.patch.object(cache.time, "time", return_value=1000.0)
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.topic = topic.Topic(topic_urn="urn:smn:region:project:name",
+                                 name="name")
+        self.resolver = mock.Mock(return_value=self.topic)
+
+    def test_ttl(self):
+        sot = cache.TopicCache(ttl=60)
+
+        for _ in range(3):
+            self.assertIs(self.topic,
+                          sot.get_or_resolve("name", self.resolver))
+        self.assertEqual(1, self.resolver.call_count)
+        self.assertEqual((2, 1), (sot.hits, sot.misses))
+
+        self.clock.return_value += 61
+        sot.get_or_resolve("name", self.resolver)
+        self.assertEqual(2, self.resolver.call_count)
+
+    def test_negative(self):
+        sot = cache.TopicCache(negative_ttl=10)
+        self.resolver.side_effect = exceptions.ResourceNotFound
+
+        for _ in range(2):
+            self.assertRaises(exceptions.ResourceNotFound,
+                              sot.get_or_resolve, "gone", self.resolver)
+        self.assertEqual(1, self.resolver.call_count)
+
+        self.clock.return_value += 11
+        self.resolver.side_effect = None
+        self.assertIs(self.topic, sot.get_or_resolve("gone", self.resolver))
+
+    def test_disabled(self):
+        sot = cache.TopicCache(ttl=0, negative_ttl=0)
+
+        sot.get_or_resolve("name", self.resolver)
+        sot.get_or_resolve("name", self.resolver)
+
+        self.assertEqual(2, self.resolver.call_count)
+        self.assertEqual(0, len(sot))
+
+    def test_invalidate_and_evict(self):
+        sot = cache.TopicCache(max_size=2)
+        sot.get_or_resolve("name", self.resolver)
+        sot.get_or_resolve(self.topic.topic_urn, self.resolver)
+
+        sot.invalidate(self.topic.topic_urn)
+        self.assertEqual(0, len(sot))
+
+        for key in ("a", "b", "c"):
+            sot.get_or_resolve(key, self.resolver)
+        self.assertEqual(["b", "c"], list(sot._entries))
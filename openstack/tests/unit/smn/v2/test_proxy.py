@@ -12,6 +12,7 @@
 
 import mock
 
+from openstack import exceptions
 from openstack.smn.v2 import _proxy
 from openstack.smn.v2 import message_template as _message_template
 from openstack.smn.v2 import subscription as _subscription
@@ -113,8 +114,58 @@ class TestSMNProxy(test_proxy_base2.TestProxyBase):
         self.verify_delete(self.proxy.delete_message_template,
                            _message_template.MessageTemplate, True)
 
-    def test_publish_topic(self):
-        pass
+    @mock.patch.object(_topic.Topic, 'publish')
+    @mock.patch('openstack.proxy2.BaseProxy._find')
+    def test_publish_topic(self, mock_find, mock_publish):
+        mock_find.return_value = _topic.Topic(topic_urn='urn')
+        mock_publish.return_value = {'message_id': 'id'}
+
+        for _ in range(3):
+            self.assertEqual({'message_id': 'id'},
+                             self.proxy.publish_topic('urn', message='m'))
+
+        mock_find.assert_called_once_with(_topic.Topic, 'urn',
+                                          ignore_missing=False)
+        mock_publish.assert_called_with(self.session, message='m')
+        self.assertEqual(3, mock_publish.call_count)
+
+        with mock.patch('openstack.proxy2.BaseProxy._delete'):
+            self.proxy.delete_topic('urn')
+        self.proxy.publish_topic('urn', message='m')
+        self.assertEqual(2, mock_find.call_count)
+
+    @mock.patch('openstack.proxy2.BaseProxy._find')
+    def test_publish_topic_missing(self, mock_find):
+        mock_find.side_effect = exceptions.ResourceNotFound
+
+        for _ in range(2):
+            self.assertRaises(exceptions.ResourceNotFound,
+                              self.proxy.publish_topic, 'gone', message='m')
+        self.assertEqual(1, mock_find.call_count)
+
+    @mock.patch.object(_topic.Topic, 'publish')
+    def test_publish_many(self, mock_publish):
+        topics = [_topic.Topic(topic_urn='urn1'),
+                  _topic.Topic(topic_urn='urn2')]
+        mock_publish.side_effect = [{'message_id': '1'},
+                                    exceptions.HttpException,
+                                    {'message_id': '3'}]
+        messages = [{'message': 'a'}, {'message': 'b', 'topic': topics[1]}]
+
+        results = list(self.proxy.publish_many(messages, topic=topics,
+                                               concurrency=1))
+
+        self.assertEqual([(topics[0], {'message': 'a'}),
+                          (topics[1], {'message': 'a'}),
+                          (topics[1], {'message': 'b'})],
+                         [(topic, message) for topic, message, _, _ in
+                          results])
+        self.assertEqual([{'message_id': '1'}, None, {'message_id': '3'}],
+                         [result for _, _, result, _ in results])
+        self.assertIsInstance(results[1][3], exceptions.HttpException)
+        self.assertEqual(2, len(messages[1]))
+        self.assertRaises(exceptions.InvalidRequest, list,
+                          self.proxy.publish_many([{'message': 'a'}]))
 
     def test_direct_publish(self):
         pass
@@ -0,0 +1,221 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import asyncio
+import collections
+
+import mock
+import testtools
+
+from openstack import aio_proxy
+from openstack import aio_session
+from openstack import aksksession
+from openstack.compute.v2 import server
+from openstack import endpoint_cache
+from openstack import exceptions
+from openstack import instrumentation
+from openstack import profile
+from openstack import tokenid_session
+from openstack import waiter
+
+try:
+    from aiohttp import test_utils
+    from aiohttp import web
+except ImportError:
+    web = None
+
+
+class _Stub(object):
+    """Local HTTP stub of the servers API"""
+
+    def __init__(self, count=5):
+        self.hits = collections.Counter()
+        self.headers = []
+        self.servers = collections.OrderedDict(
+            ("id%d" % i, {"id": "id%d" % i, "name": "server%d" % i,
+                          "status": "BUILD"})
+            for i in range(count))
+        self.url = None
+        app = web.Application()
+        app.router.add_get("/v2.1/project/servers", self.list)
+        app.router.add_post("/v2.1/project/servers", self.create)
+        app.router.add_get("/v2.1/project/servers/{id}", self.get)
+        app.router.add_delete("/v2.1/project/servers/{id}", self.delete)
+        self.server = test_utils.TestServer(app)
+
+    async def start(self):
+        await self.server.start_server()
+        self.url = str(self.server.make_url("")).rstrip("/")
+
+    def _record(self, request):
+        self.hits[request.method + " " + request.path] += 1
+        self.headers.append(request.headers)
+
+    async def list(self, request):
+        self._record(request)
+        values = list(self.servers.values())
+        marker = request.query.get("marker")
+        if marker:
+            values = values[list(self.servers).index(marker) + 1:]
+        if "limit" in request.query:
+            values = values[:int(request.query["limit"])]
+        else:
+            values = values[:2]
+        return web.json_response({"servers": values})
+
+    async def get(self, request):
+        self._record(request)
+        value = self.servers.get(request.match_info["id"])
+        if value is None:
+            return web.json_response(
+                {"itemNotFound": {"message": "not found", "code": 404}},
+                status=404)
+        response = web.json_response({"server": dict(value)})
+        value["status"] = "ACTIVE"
+        return response
+
+    async def create(self, request):
+        self._record(request)
+        body = (await request.json())["server"]
+        body["id"] = "id%d" % len(self.servers)
+        self.servers[body["id"]] = body
+        return web.json_response({"server": body}, status=202)
+
+    async def delete(self, request):
+        self._record(request)
+        if self.servers.pop(request.match_info["id"], None) is None:
+            return web.json_response(
+                {"itemNotFound": {"message": "not found", "code": 404}},
+                status=404)
+        return web.Response(status=204)
+
+
+@testtools.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncProxy(testtools.TestCase):
+
+    def setUp(self):
+        super(TestAsyncProxy, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.stub = _Stub()
+        self._run(self.stub.start())
+        self.addCleanup(self._run, self.stub.server.close())
+
+        cache = endpoint_cache.MemoryEndpointCache()
+        sess = aksksession.ASKSession(profile.Profile(), ak="ak", sk="sk",
+                                      domain="example.com", region="region",
+                                      project_id="project",
+                                      endpoint_cache=cache)
+        cache.set(sess._get_endpoint_key("compute"),
+                  self.stub.url + "/v2.1/project")
+        self.session = aio_session.AsyncSession(sess)
+        self.addCleanup(self._run, self.session.close())
+        self.proxy = aio_proxy.AsyncProxy(self.session)
+
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_get_signed(self):
+        value = self._run(self.proxy._get(server.Server, "id1"))
+
+        self.assertEqual("server1", value.name)
+        headers = self.stub.headers[-1]
+        self.assertTrue(headers["Authorization"].startswith(
+            aksksession.ALGORITHM))
+        self.assertEqual("project", headers["X-Project-Id"])
+
+    def test_get_missing(self):
+        self.assertRaises(exceptions.ResourceNotFound, self._run,
+                          self.proxy._get(server.Server, "nope"))
+
+    def test_list_paginated(self):
+        async def collect():
+            return [value.id async for value in
+                    self.proxy._list(server.Server, paginated=True)]
+
+        self.assertEqual(["id0", "id1", "id2", "id3", "id4"],
+                         self._run(collect()))
+        self.assertEqual(3, self.stub.hits["GET /v2.1/project/servers"])
+
+    def test_create_delete(self):
+        value = self._run(self.proxy._create(server.Server, name="new"))
+
+        self.assertEqual("new", value.name)
+        self.assertIn(value.id, self.stub.servers)
+
+        self._run(self.proxy._delete(server.Server, value))
+        self.assertNotIn(value.id, self.stub.servers)
+        self.assertIsNone(self._run(self.proxy._delete(server.Server, value)))
+        self.assertRaises(exceptions.ResourceNotFound, self._run,
+                          self.proxy._delete(server.Server, value,
+                                             ignore_missing=False))
+
+    def test_wait_for_status(self):
+        value = server.Server.existing(id="id2", status="BUILD")
+        backoff = waiter.Backoff(interval=0.01, jitter=0)
+
+        self._run(self.proxy.wait_for_status(value, "ACTIVE",
+                                             backoff=backoff))
+
+        self.assertEqual("ACTIVE", value.status)
+
+    def test_hooks(self):
+        aggregator = instrumentation.LatencyAggregator()
+        self.session.session.hooks.register(aggregator)
+
+        self._run(self.proxy._get(server.Server, "id1"))
+
+        row, = aggregator.summary()
+        self.assertEqual("compute", row["service_type"])
+        self.assertEqual("GET /v2.1/project/servers/id1", row["operation"])
+        self.assertEqual(["build", "endpoint", "first_byte", "parse",
+                          "send", "sign"], sorted(row["stages"]))
+
+    def test_concurrent_calls(self):
+        get_endpoint = mock.Mock(wraps=self.session.session.get_endpoint)
+        self.session.session.get_endpoint = get_endpoint
+
+        async def many():
+            return await asyncio.gather(*[
+                self.proxy._get(server.Server, "id%d" % (i % 5))
+                for i in range(500)])
+
+        values = self._run(many())
+
+        self.assertEqual(500, len(values))
+        self.assertEqual(["server%d" % (i % 5) for i in range(500)],
+                         [value.name for value in values])
+        get_endpoint.assert_called_once_with(interface="public",
+                                             service_type="compute")
+
+
+@testtools.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncTokenSession(testtools.TestCase):
+
+    def test_token_header(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        stub = _Stub()
+        loop.run_until_complete(stub.start())
+        self.addCleanup(loop.run_until_complete, stub.server.close())
+
+        sess = tokenid_session.TokenSession(profile.Profile(),
+                                            auth_url=stub.url + "/v3",
+                                            auth_token="token")
+        session = aio_session.AsyncSession(sess)
+        self.addCleanup(loop.run_until_complete, session.close())
+
+        response = loop.run_until_complete(
+            session.get(stub.url + "/v2.1/project/servers/id0"))
+
+        self.assertEqual("id0", response.json()["server"]["id"])
+        self.assertEqual("token", stub.headers[-1]["X-Auth-Token"])
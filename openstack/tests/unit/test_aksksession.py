@@ -0,0 +1,152 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import io
+
+import mock
+import testtools
+
+from openstack import aksksession
+
+
+class TestSigningKeyCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestSigningKeyCache, self).setUp()
+        self.signer = aksksession.AkSksignature(accesskey="ak",
+                                                secretkey="sk",
+                                                region="region")
+
+    def test_signing_key_cached(self):
+        expected = self.signer._derive_signing_key("20180101T000000Z",
+                                                   "compute")
+        with mock.patch.object(self.signer, "_derive_signing_key",
+                               return_value=expected) as derive:
+            first = self.signer._make_signing_key("20180101T000000Z",
+                                                  "compute")
+            second = self.signer._make_signing_key("20180101T120000Z",
+                                                   "compute")
+
+        self.assertEqual(expected, first)
+        self.assertEqual(expected, second)
+        derive.assert_called_once_with("20180101T000000Z", "compute")
+        stats = self.signer.signing_key_cache.stats()
+        self.assertEqual(1, stats["hits"])
+        self.assertEqual(1, stats["misses"])
+        self.assertEqual(0.5, stats["hit_rate"])
+
+    def test_signing_key_per_service(self):
+        compute = self.signer._make_signing_key("20180101T000000Z", "compute")
+        network = self.signer._make_signing_key("20180101T000000Z", "network")
+
+        self.assertNotEqual(compute, network)
+        self.assertEqual(2, self.signer.signing_key_cache.stats()["size"])
+
+    def test_day_rollover(self):
+        self.signer._make_signing_key("20180101T235959Z", "compute")
+        self.signer._make_signing_key("20180101T235959Z", "network")
+        key = self.signer._make_signing_key("20180102T000000Z", "compute")
+
+        self.assertEqual(
+            self.signer._derive_signing_key("20180102T000000Z", "compute"),
+            key)
+        self.assertEqual(1, self.signer.signing_key_cache.stats()["size"])
+
+    def test_bounded(self):
+        cache = aksksession._SigningKeyCache(maxsize=2)
+        cache.set(("20180101", "r", "a"), b"a")
+        cache.set(("20180101", "r", "b"), b"b")
+        cache.get(("20180101", "r", "a"))
+        cache.set(("20180101", "r", "c"), b"c")
+
+        self.assertEqual(b"a", cache.get(("20180101", "r", "a")))
+        self.assertIsNone(cache.get(("20180101", "r", "b")))
+        self.assertEqual(2, cache.stats()["size"])
+
+    def test_signature_unchanged(self):
+        headers = {"Host": "ecs.region.example.com",
+                   "X-Sdk-Date": "20180101T000000Z"}
+        first = self.signer.signature(url="https://ecs.region.example.com/v1",
+                                      method="GET", headers=headers,
+                                      svr="compute")
+        self.signer.signing_key_cache.clear()
+        second = self.signer.signature(url="https://ecs.region.example.com/v1",
+                                       method="GET", headers=headers,
+                                       svr="compute")
+
+        self.assertEqual(first, second)
+
+
+class TestPayloadHashing(testtools.TestCase):
+
+    def setUp(self):
+        super(TestPayloadHashing, self).setUp()
+        self.data = b"x" * (aksksession.PAYLOAD_CHUNK_SIZE * 3 + 7)
+        self.expected = hashlib.sha256(self.data).hexdigest()
+
+    def test_hash_empty(self):
+        self.assertEqual(hashlib.sha256(b"").hexdigest(),
+                         aksksession.hash_payload(None))
+
+    def test_hash_str(self):
+        self.assertEqual(hashlib.sha256(b"abc").hexdigest(),
+                         aksksession.hash_payload(u"abc"))
+
+    def test_hash_memoryview(self):
+        self.assertEqual(self.expected,
+                         aksksession.hash_payload(memoryview(self.data)))
+
+    def test_hash_file_rewinds(self):
+        body = io.BytesIO(b"head" + self.data)
+        body.seek(4)
+
+        self.assertEqual(self.expected, aksksession.hash_payload(body))
+        self.assertEqual(4, body.tell())
+
+    def test_prepare_seekable_file(self):
+        body = io.BytesIO(self.data)
+        self.assertIs(body, aksksession.prepare_payload(body))
+
+    def test_prepare_generator(self):
+        chunks = (self.data[i:i + 1000] for i in range(0, len(self.data), 1000))
+        body = aksksession.prepare_payload(chunks)
+
+        self.assertEqual(self.expected, aksksession.hash_payload(body))
+        self.assertEqual(self.data, body.read())
+
+    def test_prepare_memoryview(self):
+        body = aksksession.prepare_payload(memoryview(self.data))
+
+        self.assertEqual(len(self.data), len(body))
+        self.assertEqual(self.expected, aksksession.hash_payload(body))
+        self.assertEqual(self.data, b"".join(
+            bytes(chunk) for chunk in iter(lambda: body.read(1024), b"")))
+
+    def test_prepare_plain_body(self):
+        self.assertEqual("{}", aksksession.prepare_payload("{}"))
+        self.assertIsNone(aksksession.prepare_payload(None))
+
+    def test_unsigned_payload(self):
+        signer = aksksession.AkSksignature(accesskey="ak", secretkey="sk",
+                                           region="region")
+        headers = {"Host": "obs.region.example.com",
+                   "X-Sdk-Date": "20180101T000000Z",
+                   aksksession.CONTENTSHA256HEADER:
+                       aksksession.UNSIGNED_PAYLOAD}
+        body = mock.Mock()
+        canonical = signer._make_canonical_request(
+            method="PUT", url="https://obs.region.example.com/bucket",
+            headers=headers, body=body)
+
+        self.assertTrue(canonical.endswith(aksksession.UNSIGNED_PAYLOAD))
+        body.read.assert_not_called()
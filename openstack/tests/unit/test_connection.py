@@ -27,6 +27,7 @@
 #             the License.
 
 import os
+import sys
 
 import fixtures
 from keystoneauth1 import session as ksa_session
@@ -38,6 +39,7 @@ from openstack import exceptions
 from openstack import profile
 from openstack import session
 from openstack.tests.unit import base
+from openstack import tokenid_session
 
 
 # CONFIG_AUTH_URL = "http://127.0.0.1:5000/v2.0"
@@ -307,7 +309,43 @@ class TestConnection(base.TestCase):
         conn.unset_microversion("compute")
         self.assertEqual(conn.profile.get_filter("compute").microversion, None)
 
+    def test_proxies_loaded_lazily(self):
+        self.useFixture(base.UnloadedModule('openstack.cdn.v1._proxy'))
+        conn = connection.Connection(ak="ak", sk="sk", project_id="project",
+                                     region="region", domain="example.com")
+        self.assertNotIn('cdn', conn.__dict__)
+        self.assertNotIn('openstack.cdn.v1._proxy', sys.modules)
 
+        proxy = conn.cdn
+        self.assertIn('openstack.cdn.v1._proxy', sys.modules)
+        self.assertIs(proxy, conn.cdn)
+        self.assertIs(conn.session, proxy._session)
 
+    def test_services_loaded_lazily_with_token(self):
+        self.useFixture(base.UnloadedModule('openstack.cdn.cdn_service'))
+        conn = connection.Connection(auth_token="token",
+                                     auth_url="https://iam.example.com/v3")
+        self.assertNotIn('openstack.cdn.cdn_service', sys.modules)
 
+        conn.profile.set_api_version('compute', '2.26')
+        self.assertEqual(
+            {tokenid_session.API_REQUEST_HEADER: 'compute 2.26'},
+            tokenid_session.TokenSession(
+                conn.profile, auth_token="token",
+                auth_url="https://iam.example.com/v3").additional_headers)
+        self.assertNotIn('openstack.cdn.cdn_service', sys.modules)
 
+    def test_services_loaded_lazily_with_password(self):
+        self.useFixture(base.UnloadedModule('openstack.cdn.cdn_service'))
+        connection.Connection(verify=False,
+                              project_id="project_id",
+                              auth_url="auth_url_hec",
+                              user_domain_id="userDomainId_hec",
+                              username="username_hec",
+                              password="password_hec")
+        self.assertNotIn('openstack.cdn.cdn_service', sys.modules)
+
+    def test_unknown_attribute(self):
+        conn = connection.Connection(ak="ak", sk="sk", project_id="project",
+                                     region="region", domain="example.com")
+        self.assertRaises(AttributeError, getattr, conn, 'bogus')
@@ -0,0 +1,157 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import threading
+import time
+
+import fixtures
+import mock
+import testtools
+
+from openstack import aksksession
+from openstack import endpoint_cache
+from openstack import profile
+
+
+class TestMemoryEndpointCache(testtools.TestCase):
+
+    def test_get_set(self):
+        cache = endpoint_cache.MemoryEndpointCache()
+        cache.set("key", {"compute": "https://ecs"})
+
+        self.assertEqual({"compute": "https://ecs"}, cache.get("key"))
+        self.assertIsNone(cache.get("other"))
+
+    def test_ttl(self):
+        cache = endpoint_cache.MemoryEndpointCache(ttl=10)
+        with mock.patch.object(time, "time", return_value=100):
+            cache.set("key", "value")
+        with mock.patch.object(time, "time", return_value=105):
+            self.assertEqual("value", cache.get("key"))
+        with mock.patch.object(time, "time", return_value=111):
+            self.assertIsNone(cache.get("key"))
+
+    def test_get_or_create_empty_not_cached(self):
+        cache = endpoint_cache.MemoryEndpointCache()
+        creator = mock.Mock(return_value="")
+
+        self.assertEqual("", cache.get_or_create("key", creator))
+        self.assertEqual("", cache.get_or_create("key", creator))
+        self.assertEqual(2, creator.call_count)
+
+    def test_get_or_create_single_flight(self):
+        cache = endpoint_cache.MemoryEndpointCache()
+        calls = []
+
+        def creator():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(cache.get_or_create("key", creator)))
+            for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(["value"] * 8, results)
+
+    def test_locks_bounded(self):
+        cache = endpoint_cache.MemoryEndpointCache()
+        self.useFixture(fixtures.MockPatchObject(cache, "_MAX_LOCKS", 4))
+
+        for index in range(10):
+            cache.get_or_create("key%d" % index, lambda: "value")
+
+        self.assertLessEqual(len(cache._locks), 4)
+
+
+class TestFileEndpointCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestFileEndpointCache, self).setUp()
+        self.directory = self.useFixture(fixtures.TempDir()).path
+
+    def test_shared_between_instances(self):
+        endpoint_cache.FileEndpointCache(self.directory).set(
+            "key", {"compute": "https://ecs"})
+        cache = endpoint_cache.FileEndpointCache(self.directory)
+
+        self.assertEqual({"compute": "https://ecs"}, cache.get("key"))
+        cache.delete("key")
+        self.assertIsNone(cache.get("key"))
+
+    def test_get_or_create(self):
+        cache = endpoint_cache.FileEndpointCache(self.directory, ttl=60)
+        creator = mock.Mock(return_value=["value"])
+
+        self.assertEqual(["value"], cache.get_or_create("key", creator))
+        self.assertEqual(["value"], cache.get_or_create("key", creator))
+        creator.assert_called_once_with()
+
+    def test_rewrite(self):
+        cache = endpoint_cache.FileEndpointCache(self.directory)
+        cache.set("key", "old")
+
+        cache.set("key", "new")
+
+        self.assertEqual("new", cache.get("key"))
+        self.assertEqual(1, len(os.listdir(self.directory)))
+
+
+class TestASKSessionEndpointCache(testtools.TestCase):
+
+    def _session(self, cache):
+        return aksksession.ASKSession(profile.Profile(), ak="ak", sk="sk",
+                                      domain="example.com", region="region",
+                                      project_id="project",
+                                      endpoint_cache=cache)
+
+    def test_catalog_shared_between_sessions(self):
+        cache = endpoint_cache.MemoryEndpointCache()
+        catalog = {"kms": "https://kms.region.example.com/v1.0/project"}
+        fetch = "_ASKSession__fetch_all_endpoint_service_project_level"
+        sessions = [self._session(cache), self._session(cache)]
+        for sess in sessions:
+            self.useFixture(fixtures.MockPatchObject(
+                sess, fetch, return_value=catalog))
+            self.useFixture(fixtures.MockPatchObject(
+                sess, "_get_endpoint_versions",
+                side_effect=aksksession.EndpointNotFound()))
+
+        for sess in sessions:
+            self.assertEqual(catalog["kms"],
+                             sess._get_endpoint_from_iamdata("kms"))
+
+        getattr(sessions[0], fetch).assert_called_once_with()
+        getattr(sessions[1], fetch).assert_not_called()
+        sessions[0]._get_endpoint_versions.assert_called_once_with(
+            "kms", catalog["kms"])
+        sessions[1]._get_endpoint_versions.assert_not_called()
+
+    def test_invalidate(self):
+        cache = endpoint_cache.MemoryEndpointCache()
+        sess = self._session(cache)
+        fetch = self.useFixture(fixtures.MockPatchObject(
+            sess, "_ASKSession__fetch_all_endpoint_service_project_level",
+            return_value={"iam": "https://iam.example.com/v3"})).mock
+
+        sess._get_endpoint_from_iamdata("iam")
+        sess.invalidate_endpoint_cache("iam")
+        sess._get_endpoint_from_iamdata("iam")
+
+        self.assertEqual(2, fetch.call_count)
@@ -0,0 +1,169 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import io
+
+from keystoneauth1 import session as ksa_session
+import mock
+import requests
+import testtools
+
+from openstack import aksksession
+from openstack import instrumentation
+from openstack import profile
+from openstack import resource2
+from openstack import service_filter
+from openstack import session
+
+
+def _response(status=200, content=b'{"thing": {"id": "a", "name": "b"}}'):
+    response = requests.Response()
+    response.status_code = status
+    response.url = "https://example.com/v1/%s/things/a" % ("f" * 32)
+    response.headers["Content-Length"] = str(len(content))
+    response._content = content
+    response.elapsed = datetime.timedelta(seconds=0.25)
+    return response
+
+
+class _Thing(resource2.Resource):
+    service = service_filter.ServiceFilter(service_type="compute")
+    base_path = "/things"
+    resource_key = "thing"
+    allow_get = True
+
+    name = resource2.Body("name")
+
+
+class TestUrlTemplate(testtools.TestCase):
+
+    def test_ids_replaced(self):
+        self.assertEqual(
+            "/v2.1/{id}/servers/{id}/os-interface",
+            instrumentation.url_template(
+                "https://example.com/v2.1/0123456789abcdef0123456789abcdef"
+                "/servers/8f1f3c4e-3a4b-4c5d-8e9f-0a1b2c3d4e5f/os-interface"))
+        self.assertEqual("/v1/jobs/{id}",
+                         instrumentation.url_template("/v1/jobs/42?x=1"))
+
+
+class TestHistogram(testtools.TestCase):
+
+    def test_percentile(self):
+        histogram = instrumentation.Histogram(buckets=(1, 2, 5))
+        for value in (0.5, 0.5, 1.5, 4, 8):
+            histogram.observe(value)
+
+        self.assertEqual(5, histogram.count)
+        self.assertEqual(14.5, histogram.total)
+        self.assertEqual(1, histogram.percentile(20))
+        self.assertEqual(2, histogram.percentile(50))
+        self.assertEqual(5, histogram.percentile(80))
+        self.assertEqual(8, histogram.percentile(99))
+        self.assertEqual({"mean": 2.9, "p50": 2, "p99": 8, "max": 8},
+                         histogram.summary())
+
+
+class TestHooks(testtools.TestCase):
+
+    def test_stages_filter(self):
+        hooks = instrumentation.Hooks()
+        self.assertFalse(hooks)
+        self.assertIsNone(hooks.start("thing", "get", "/things"))
+
+        calls = []
+        hooks.register(lambda stage, trace: calls.append(stage),
+                       stages=[instrumentation.SENT])
+        trace = hooks.start("thing", "get", "/things")
+        trace.fire(instrumentation.ENDPOINT_RESOLVED)
+        trace.fire(instrumentation.SENT)
+
+        self.assertTrue(hooks)
+        self.assertEqual([instrumentation.SENT], calls)
+
+    def test_failing_hook_ignored(self):
+        hooks = instrumentation.Hooks()
+        calls = []
+        failing = mock.Mock(side_effect=ValueError)
+        hooks.register(failing)
+        hooks.register(lambda stage, trace: calls.append(stage))
+
+        hooks.start("thing", "GET", "/things").fire(instrumentation.SENT)
+
+        self.assertEqual([instrumentation.SENT], calls)
+        hooks.unregister(failing)
+        self.assertEqual(1, len(hooks._callbacks))
+
+
+class TestSessionHooks(testtools.TestCase):
+
+    def setUp(self):
+        super(TestSessionHooks, self).setUp()
+        self.stages = []
+        self.aggregator = instrumentation.LatencyAggregator()
+        self.hooks = instrumentation.Hooks()
+        self.hooks.register(
+            lambda stage, trace: self.stages.append(
+                (stage, dict(trace.durations))))
+        self.hooks.register(self.aggregator)
+
+    @mock.patch.object(ksa_session.Session, "request")
+    def test_request_and_resource(self, mock_request):
+        mock_request.return_value = _response()
+        sot = session.Session(profile.Profile(), hooks=self.hooks)
+
+        thing = _Thing.new(id="a").get(sot)
+
+        self.assertEqual("b", thing.name)
+        self.assertEqual([instrumentation.SENT, instrumentation.FIRST_BYTE,
+                          instrumentation.PARSED, instrumentation.BUILT],
+                         [stage for stage, _ in self.stages])
+        self.assertEqual(["send", "first_byte", "parse", "build"],
+                         list(self.stages[-1][1]))
+        self.assertEqual(0.25, self.stages[-1][1]["first_byte"])
+
+        row, = self.aggregator.summary()
+        self.assertEqual("compute", row["service_type"])
+        self.assertEqual("GET /v1/{id}/things/a", row["operation"])
+        self.assertEqual(1, row["count"])
+        self.assertEqual(["build", "first_byte", "parse", "send"],
+                         sorted(row["stages"]))
+
+    @mock.patch.object(ksa_session.Session, "request")
+    def test_no_hooks(self, mock_request):
+        mock_request.return_value = _response()
+        sot = session.Session(profile.Profile())
+
+        response = sot.get("/things/a")
+
+        self.assertIsNone(instrumentation.get_trace(response))
+        self.assertNotIn("raise_exc", mock_request.call_args[1])
+
+    def test_aksk_build_request(self):
+        sess = aksksession.ASKSession(profile.Profile(), ak="ak", sk="sk",
+                                      domain="example.com", region="region",
+                                      project_id="project", hooks=self.hooks)
+        trace = sess.hooks.start("thing", "PUT", "/things/a")
+
+        url, kwargs = sess._build_request(
+            "/things/a", "PUT", data=io.BytesIO(b"0123456789"),
+            endpoint_override="https://example.com/v1/%(project_id)s",
+            trace=trace)
+
+        self.assertEqual("https://example.com/v1/project/things/a", url)
+        self.assertEqual([instrumentation.ENDPOINT_RESOLVED,
+                          instrumentation.SIGNED],
+                         [stage for stage, _ in self.stages])
+        self.assertEqual(["endpoint", "sign"], list(trace.durations))
+        self.assertEqual(10, trace.bytes_out)
+        self.assertEqual(url, trace.url)
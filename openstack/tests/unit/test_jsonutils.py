@@ -0,0 +1,169 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import io
+import json
+import uuid
+
+import mock
+import requests
+import testtools
+
+from openstack import jsonutils
+from openstack import resource2
+from openstack import service_filter
+from openstack import session
+
+
+def _chunks(data, size=1):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _response(content, encoding=None):
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = encoding
+    response.raw = io.BytesIO(content)
+    return response
+
+
+class _Thing(resource2.Resource):
+    service = service_filter.ServiceFilter(service_type="compute")
+    base_path = "/things"
+    resources_key = "things"
+    allow_list = True
+
+    name = resource2.Body("name")
+
+
+class TestCodec(testtools.TestCase):
+
+    def setUp(self):
+        super(TestCodec, self).setUp()
+        self.dumps = mock.Mock(return_value=b'{"a":1}')
+        self.loads = mock.Mock(return_value={"a": 1})
+        self.codec = jsonutils.Codec("fast", self.loads, self.dumps)
+
+    def test_encode(self):
+        self.assertEqual('{"a":1}', self.codec.encode({"a": 1}))
+
+        self.dumps.side_effect = TypeError
+        value = uuid.UUID(int=1)
+        self.assertEqual('{"id": "%s"}' % value,
+                         self.codec.encode({"id": value}))
+
+    def test_bind(self):
+        response = self.codec.bind(_response(b'{"a": 1}'))
+
+        self.assertIsInstance(response, requests.Response)
+        self.assertEqual({"a": 1}, response.json())
+        self.loads.assert_called_once_with(b'{"a": 1}')
+
+    def test_bind_other_encoding(self):
+        content = u'{"a": "é"}'.encode("latin-1")
+        response = self.codec.bind(_response(content, encoding="latin-1"))
+
+        self.assertEqual({"a": u"é"}, response.json())
+        self.assertFalse(self.loads.called)
+
+    def test_stdlib_not_bound(self):
+        response = _response(b"{}")
+
+        jsonutils.get_codec("json").bind(response)
+
+        self.assertIs(requests.Response, type(response))
+
+    def test_get_codec(self):
+        self.assertIs(self.codec, jsonutils.get_codec(self.codec))
+        self.assertEqual("json", jsonutils.get_codec("json").name)
+        self.assertRaises(ValueError, jsonutils.get_codec, "yaml")
+        with mock.patch.dict("os.environ", {jsonutils.CODEC_ENV: "json"}):
+            self.assertEqual("json", jsonutils.get_codec().name)
+
+    def test_get_codec_fastest_installed(self):
+        with mock.patch.dict(jsonutils._FACTORIES,
+                             orjson=mock.Mock(side_effect=ImportError),
+                             ujson=lambda: self.codec), \
+                mock.patch.dict(jsonutils._codecs, clear=True), \
+                mock.patch.dict("os.environ", clear=True):
+            self.assertIs(self.codec, jsonutils.get_codec())
+
+    def test_session(self):
+        sot = session.Session(None, json_codec=self.codec)
+
+        self.assertIs(self.codec, sot.json_codec)
+        self.assertEqual('{"a":1}', sot._json.encode({"a": 1}))
+
+
+class TestItemStream(testtools.TestCase):
+
+    def test_items(self):
+        document = {"count": 12345, "things": [{"id": 1}, {"id": u"é"},
+                                               [1, 2.5]],
+                    "links": {"next": "/things?marker=2"}}
+        data = json.dumps(document).encode("utf-8")
+
+        sot = jsonutils.ItemStream(_chunks(data), "things")
+
+        self.assertEqual(document["things"], list(sot))
+        self.assertEqual(3, len(sot))
+        self.assertEqual({"count": 12345, "things": [],
+                          "links": {"next": "/things?marker=2"}},
+                         sot.document)
+        self.assertRaises(RuntimeError, list, sot)
+
+    def test_items_are_lazy(self):
+        chunks = iter([b'{"things": [1, ', b'2, 3]}'])
+        sot = iter(jsonutils.ItemStream(chunks, "things"))
+
+        self.assertEqual(1, next(sot))
+        self.assertEqual([b'2, 3]}'], list(chunks))
+
+    def test_array(self):
+        sot = jsonutils.ItemStream([b" [1, ", b"22", b"3]"], None)
+
+        self.assertEqual([1, 223], list(sot))
+        self.assertEqual([], sot.document)
+
+    def test_missing_key(self):
+        sot = jsonutils.ItemStream([b'{"other": [1]}'], "things")
+
+        self.assertEqual([], list(sot))
+        self.assertEqual({"other": [1]}, sot.document)
+
+    def test_dotted_key(self):
+        sot = jsonutils.ItemStream([b'{"a": {"b": [1', b", 2]}}"], "a.b")
+
+        self.assertEqual([1, 2], list(sot))
+        self.assertEqual({"a": {"b": [1, 2]}}, sot.document)
+
+    def test_invalid(self):
+        for data in (b'{"things": [1, 2', b'{"things": [1 2]}', b""):
+            sot = jsonutils.ItemStream([data], "things")
+            self.assertRaises(ValueError, list, sot)
+
+    def test_resource_list(self):
+        pages = [b'{"things": [{"id": "a", "name": "x"}, {"id": "b"}],'
+                 b' "things_links": []}',
+                 b'{"things": []}']
+        sess = mock.Mock()
+        sess.get.side_effect = [_response(page) for page in pages]
+        sess.profile.generation = None
+
+        things = list(_Thing.list(sess, paginated=True, stream=True))
+
+        self.assertEqual(["a", "b"], [thing.id for thing in things])
+        self.assertEqual("x", things[0].name)
+        self.assertEqual(2, sess.get.call_count)
+        self.assertTrue(sess.get.call_args[1]["stream"])
+        self.assertEqual({"limit": 2, "marker": "b"},
+                         sess.get.call_args[1]["params"])
@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import sys
+
 from openstack import exceptions
 from openstack import profile
 from openstack.tests.unit import base
@@ -118,3 +120,40 @@ class TestProfile(base.TestCase):
             self.assertEqual('fee', prof.get_filter(service).service_name)
             self.assertEqual('fie', prof.get_filter(service).region)
             self.assertEqual('public', prof.get_filter(service).interface)
+
+    def test_services_loaded_lazily(self):
+        self.useFixture(base.UnloadedModule('openstack.cdn.cdn_service'))
+        prof = profile.Profile()
+        prof.set_region(prof.ALL, 'fie')
+        self.assertNotIn('openstack.cdn.cdn_service', sys.modules)
+
+        svc = prof.get_filter('cdn')
+        self.assertIn('openstack.cdn.cdn_service', sys.modules)
+        self.assertEqual('cdn', svc.service_type)
+        self.assertEqual('fie', svc.region)
+        self.assertIsNone(svc.interface)
+
+    def test_get_api_versions(self):
+        self.useFixture(base.UnloadedModule('openstack.cdn.cdn_service'))
+        prof = profile.Profile()
+        prof.set_api_version('cdn', '1.1')
+        prof.set_api_version('compute', '2.26')
+        prof.get_filter('compute')
+
+        self.assertEqual([('compute', '2.26'), ('cdn', '1.1')],
+                         prof.get_api_versions())
+        self.assertNotIn('openstack.cdn.cdn_service', sys.modules)
+
+    def test_registered_services(self):
+        prof = profile.Profile()
+        for service_type, module_name, _, version in profile.SERVICES:
+            svc = prof.get_filter(service_type)
+            self.assertEqual(service_type, svc.service_type)
+            self.assertEqual(module_name, svc.get_service_module())
+            self.assertEqual(version, svc.version)
+
+    def test_get_service_modules(self):
+        modules = profile.Profile().get_service_modules()
+        self.assertEqual('compute', modules['compute'])
+        self.assertEqual('vpc', modules['vpcv1'])
+        self.assertEqual('vpcv2.0', modules['vpc'])
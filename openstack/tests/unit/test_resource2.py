@@ -11,15 +11,19 @@
 # under the License.
 
 import itertools
+import time
 
 import mock
 import six
 
+from openstack import connection
 from openstack import exceptions
 from openstack import format
+from openstack import profile
 from openstack import resource2
 from openstack import service_filter
 from openstack import session
+from openstack import waiter
 from openstack.tests.unit import base
 
 
@@ -568,6 +572,30 @@ class TestResource(base.TestCase):
         self.assertIn("y", Test._uri_mapping())
         self.assertIn("z", Test._uri_mapping())
 
+    def test__mapping_cached_per_class(self):
+        class Parent(resource2.Resource):
+            x = resource2.Body("x")
+
+        class Child(Parent):
+            y = resource2.Body("y")
+
+        self.assertIs(Parent._body_mapping(), Parent._body_mapping())
+        self.assertIsNot(Parent._body_mapping(), Child._body_mapping())
+        self.assertNotIn("y", Parent._body_mapping())
+        self.assertIn("y", Child._body_mapping())
+        self.assertIn("x", Child._body_mapping())
+
+    def test__consume_attrs_fields_cached(self):
+        class Test(resource2.Resource):
+            x = resource2.Body("serverX")
+
+        self.assertEqual({"serverX": 1},
+                         Test._consume_attrs(resource2.Body, {"x": 1}))
+        fields = Test._get_fields(resource2.Body)
+        self.assertEqual({"serverX": 2},
+                         Test._consume_attrs(resource2.Body, {"serverX": 2}))
+        self.assertIs(fields, Test._get_fields(resource2.Body))
+
     def test__getattribute__id_in_body(self):
         id = "lol"
         sot = resource2.Resource(id=id)
@@ -1511,6 +1539,22 @@ class TestWaitForStatus(base.TestCase):
                           "session", resource, "status", None, 0, -1)
 
 
+    @mock.patch("time.sleep", return_value=None)
+    def test_backoff(self, mock_sleep):
+        status = "loling"
+        resource = mock.Mock()
+        statuses = ["other", "another", "another", "again", "again", status]
+        type(resource).status = mock.PropertyMock(side_effect=statuses)
+        backoff = waiter.Backoff(interval=1, jitter=0)
+
+        result = resource2.wait_for_status("session", resource, status,
+                                           None, 5, 120, backoff=backoff)
+
+        self.assertEqual(result, resource)
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         mock_sleep.call_args_list)
+
+
 class TestWaitForDelete(base.TestCase):
     @mock.patch("time.sleep", return_value=None)
     def test_success(self, mock_sleep):
@@ -1529,3 +1573,305 @@ class TestWaitForDelete(base.TestCase):
         self.assertRaises(exceptions.ResourceTimeout,
                           resource2.wait_for_delete,
                           "session", resource, 1, 3)
+
+
+class TestResourceListPrefetch(base.TestCase):
+
+    def setUp(self):
+        super(TestResourceListPrefetch, self).setUp()
+
+        class Test(resource2.Resource):
+            service = service_filter.ServiceFilter(service_type="service")
+            base_path = "base_path"
+            allow_list = True
+
+        self.test_class = Test
+        self.session = mock.Mock(spec=session.Session)
+        self.session.profile = mock.Mock()
+        self.session.profile.get_filter.return_value = Test.service
+
+    def _pages(self, *pages):
+        responses = []
+        for page in pages:
+            resp = mock.Mock()
+            resp.json.return_value = [{"id": id} for id in page]
+            responses.append(resp)
+        return responses
+
+    def test_prefetch(self):
+        self.session.get.side_effect = self._pages([1, 2], [3, 4], [5], [])
+
+        results = list(self.test_class.list(self.session, paginated=True,
+                                            prefetch=2))
+
+        self.assertEqual([1, 2, 3, 4, 5], [r.id for r in results])
+        self.assertEqual(3, self.session.get.call_count)
+        self.session.get.assert_called_with(
+            "base_path",
+            endpoint_filter=self.test_class.service,
+            microversion=None,
+            endpoint_override=None,
+            headers={"Accept": "application/json"},
+            params={"limit": 2, "marker": 4})
+
+    def test_prefetch_same_as_serial(self):
+        pages = ([1, 2], [3, 4], [])
+        self.session.get.side_effect = self._pages(*pages)
+        serial = list(self.test_class.list(self.session, paginated=True))
+        serial_calls = self.session.get.call_args_list
+
+        self.session.get.reset_mock()
+        self.session.get.side_effect = self._pages(*pages)
+        prefetched = list(self.test_class.list(self.session, paginated=True,
+                                               prefetch=1))
+
+        self.assertEqual(serial, prefetched)
+        self.assertEqual(serial_calls, self.session.get.call_args_list)
+
+    def test_prefetch_error(self):
+        self.session.get.side_effect = self._pages([1]) + [
+            exceptions.HttpException("boom")]
+
+        results = self.test_class.list(self.session, paginated=True,
+                                       prefetch=1)
+
+        self.assertEqual(1, next(results).id)
+        self.assertRaises(exceptions.HttpException, next, results)
+
+    def test_prefetch_close_stops_worker(self):
+        self.session.get.side_effect = self._pages(
+            *[[i] for i in range(1, 100)])
+
+        results = self.test_class.list(self.session, paginated=True,
+                                       prefetch=1)
+        self.assertEqual(1, next(results).id)
+        results.close()
+        calls = self.session.get.call_count
+        time.sleep(0.3)
+
+        self.assertEqual(calls, self.session.get.call_count)
+        self.assertLessEqual(calls, 4)
+
+
+class TestResourceListByOffset(base.TestCase):
+
+    def setUp(self):
+        super(TestResourceListByOffset, self).setUp()
+
+        class Test(resource2.Resource):
+            service = service_filter.ServiceFilter(service_type="service")
+            base_path = "base_path"
+            resources_key = "items"
+            total_path = "count"
+            allow_list = True
+            _query_mapping = resource2.QueryParameters("offset", "limit")
+            count = resource2.Body("count", type=int)
+            items = resource2.Body("items", type=list)
+
+        self.test_class = Test
+        self.session = mock.Mock(spec=session.Session)
+        self.session.profile = mock.Mock()
+        self.session.profile.get_filter.return_value = Test.service
+
+    def _page(self, params, total, limit=2):
+        offset = max(int(params["offset"]), 1)
+        start = (offset - 1) * limit
+        items = [{"id": i} for i in range(start, min(start + limit, total))]
+        resp = mock.Mock()
+        resp.json.return_value = {"count": total, "items": items}
+        return resp
+
+    def _list(self, total, **kwargs):
+        self.session.get.side_effect = (
+            lambda *args, **kw: self._page(kw["params"], total))
+        pages = self.test_class.list_by_offset(self.session, paginated=True,
+                                               offset=1, limit=2, **kwargs)
+        return [[item["id"] for item in page.items] for page in pages]
+
+    def test_serial(self):
+        self.assertEqual([[0, 1], [2, 3], [4]], self._list(5))
+        self.assertEqual(3, self.session.get.call_count)
+
+    def test_parallel_in_order(self):
+        self.assertEqual([[i, i + 1] for i in range(0, 20, 2)] + [[20]],
+                         self._list(21, concurrency=4))
+        offsets = sorted(c[1]["params"]["offset"]
+                         for c in self.session.get.call_args_list)
+        self.assertEqual(list(range(1, 12)), offsets)
+
+    def test_parallel_without_total_is_serial(self):
+        self.test_class.total_path = None
+        self.assertEqual([[0, 1], [2, 3], [4]], self._list(5, concurrency=4))
+
+    def test_request_plan(self):
+        plan = resource2._RequestPlan(None, mock.Mock(microversion="2.1"),
+                                      "https://override")
+        with mock.patch.object(self.test_class, "_get_request_plan",
+                               return_value=plan) as get_plan:
+            self._list(9, concurrency=2)
+
+        get_plan.assert_called_once_with(self.session)
+        self.assertEqual(5, self.session.get.call_count)
+        for call in self.session.get.call_args_list:
+            self.assertEqual("2.1", call[1]["microversion"])
+            self.assertEqual("https://override",
+                             call[1]["endpoint_override"])
+
+
+class TestResourceListLightweight(base.TestCase):
+
+    def setUp(self):
+        super(TestResourceListLightweight, self).setUp()
+
+        class Test(resource2.Resource):
+            service = service_filter.ServiceFilter(service_type="service")
+            base_path = "base_path"
+            allow_list = True
+
+            name = resource2.Body("name")
+            is_admin = resource2.Body("admin", type=bool)
+            flavor = resource2.Body("flavor", default="small")
+
+        self.test_class = Test
+        self.session = mock.Mock(spec=session.Session)
+        self.session.profile = mock.Mock()
+        self.session.profile.get_filter.return_value = Test.service
+
+    def _list(self, data):
+        resp = mock.Mock()
+        resp.json.return_value = data
+        self.session.get.return_value = resp
+        return list(self.test_class.list(self.session, lightweight=True))
+
+    def test_attributes(self):
+        result, = self._list([{"id": 1, "name": "a", "admin": True,
+                               "unknown": "x"}])
+
+        self.assertIs(self.test_class._get_lightweight_type(), type(result))
+        self.assertEqual(1, result.id)
+        self.assertEqual("a", result.name)
+        self.assertTrue(result.is_admin)
+        self.assertEqual("small", result.flavor)
+        self.assertRaises(AttributeError, getattr, result, "unknown")
+        self.assertFalse(hasattr(result, "__dict__"))
+
+    def test_read_only(self):
+        result, = self._list([{"id": 1}])
+
+        self.assertRaises(AttributeError, setattr, result, "name", "b")
+        self.assertRaises(AttributeError, delattr, result, "id")
+
+    def test_to_dict(self):
+        result, = self._list([{"id": 1, "name": "a"}])
+
+        self.assertEqual({"id": 1, "name": "a", "is_admin": None,
+                          "flavor": "small"},
+                         result.to_dict())
+        self.assertEqual({"id": 1, "name": "a", "flavor": "small"},
+                         result.to_dict(ignore_none=True))
+
+    def test_alternate_id(self):
+        class Test(self.test_class):
+            name = resource2.Body("name", alternate_id=True)
+
+        self.session.profile.get_filter.return_value = Test.service
+        resp = mock.Mock()
+        resp.json.return_value = [{"name": "a"}]
+        self.session.get.return_value = resp
+
+        result, = Test.list(self.session, lightweight=True)
+
+        self.assertEqual("a", result.id)
+        self.assertIsNot(self.test_class._get_lightweight_type(),
+                         Test._get_lightweight_type())
+
+    def test_resource_type_attribute(self):
+        class Test(self.test_class):
+            resource_type = resource2.Body("resource_type")
+
+        self.session.profile.get_filter.return_value = Test.service
+        resp = mock.Mock()
+        resp.json.return_value = [{"id": 1, "resource_type": "ecs"}]
+        self.session.get.return_value = resp
+
+        result, = Test.list(self.session, lightweight=True)
+
+        self.assertEqual("ecs", result.resource_type)
+        self.assertIn("resource_type=ecs", repr(result))
+
+    def test_paginated(self):
+        pages = []
+        for page in ([{"id": 1}, {"id": 2}], [{"id": 3}], []):
+            resp = mock.Mock()
+            resp.json.return_value = page
+            pages.append(resp)
+        self.session.get.side_effect = pages
+
+        results = list(self.test_class.list(self.session, paginated=True,
+                                            lightweight=True))
+
+        self.assertEqual([1, 2, 3], [r.id for r in results])
+        self.assertEqual({"limit": 2, "marker": 2},
+                         self.session.get.call_args_list[1][1]["params"])
+
+
+class TestRequestPlan(base.TestCase):
+
+    def setUp(self):
+        super(TestRequestPlan, self).setUp()
+
+        class Test(resource2.Resource):
+            service = service_filter.ServiceFilter(service_type="compute")
+            base_path = "/things"
+            allow_get = True
+
+        self.test_class = Test
+        self.profile = profile.Profile()
+        self.session = mock.Mock(spec=session.Session)
+        self.session.profile = self.profile
+
+    def test_cached_per_session(self):
+        with mock.patch.object(self.profile, "get_filter",
+                               wraps=self.profile.get_filter) as get_filter:
+            plan = self.test_class._get_request_plan(self.session)
+            self.assertIs(plan,
+                          self.test_class._get_request_plan(self.session))
+            self.assertIs(plan.service, self.test_class.get_service_filter(
+                self.test_class.new(), self.session))
+
+            other = mock.Mock(spec=session.Session)
+            other.profile = self.profile
+            self.assertIsNot(plan,
+                             self.test_class._get_request_plan(other))
+
+        self.assertEqual(2, get_filter.call_count)
+
+    def test_invalidated_by_profile(self):
+        plan = self.test_class._get_request_plan(self.session)
+        self.assertIsNone(plan.microversion)
+
+        conn = mock.Mock(profile=self.profile)
+        connection.Connection.set_microversion(conn, "compute", 2.26)
+        plan = self.test_class._get_request_plan(self.session)
+        self.assertEqual("2.26", plan.microversion)
+
+        self.profile.set_region("compute", "region")
+        plan = self.test_class._get_request_plan(self.session)
+        self.assertEqual("region", plan.service.region)
+
+    def test_used_by_requests(self):
+        self.profile.set_api_version("compute", "2.1")
+        plan = self.test_class._get_request_plan(self.session)
+        response = mock.Mock()
+        response.json.return_value = {}
+        response.headers = {}
+        self.session.get.return_value = response
+
+        with mock.patch.dict("os.environ", {
+                "OS_COMPUTE_ENDPOINT_OVERRIDE": "https://other"}):
+            self.test_class.new(id="a").get(self.session)
+
+        self.assertIs(plan, self.test_class._get_request_plan(self.session))
+        self.session.get.assert_called_once_with(
+            "things/a", endpoint_filter=self.test_class.service,
+            microversion=plan.microversion, endpoint_override=None)
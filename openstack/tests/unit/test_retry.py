@@ -0,0 +1,225 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import email.utils
+import io
+import time
+
+from keystoneauth1 import exceptions as _exceptions
+from keystoneauth1 import session as ksa_session
+import mock
+import requests
+import testtools
+
+from openstack import exceptions
+from openstack import profile
+from openstack import retry
+from openstack import session
+from openstack import waiter
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b""
+    response.raw = io.BytesIO()
+    return response
+
+
+class TestTokenBucket(testtools.TestCase):
+
+    @mock.patch("time.sleep")
+    @mock.patch("time.time", return_value=100.0)
+    def test_acquire(self, mock_time, mock_sleep):
+        bucket = retry.TokenBucket(2, capacity=2)
+
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0.5, bucket.acquire())
+        mock_sleep.assert_called_once_with(0.5)
+
+        mock_time.return_value = 102.0
+        self.assertEqual(0, bucket.acquire())
+
+
+class TestRetryBudget(testtools.TestCase):
+
+    def test_withdraw(self):
+        budget = retry.RetryBudget(ratio=0.5, minimum=1)
+
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+
+@mock.patch("time.sleep")
+class TestRetryPolicy(testtools.TestCase):
+
+    def setUp(self):
+        super(TestRetryPolicy, self).setUp()
+        self.policy = retry.RetryPolicy(
+            max_retries=2, backoff=waiter.Backoff(interval=1, jitter=0))
+
+    def test_retry_idempotent(self, mock_sleep):
+        send = mock.Mock(side_effect=[_response(503), _response(502),
+                                      _response(200)])
+
+        response = self.policy.send("GET", send, service_type="compute")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         mock_sleep.call_args_list)
+        metrics = self.policy.metrics.snapshot()
+        self.assertEqual(1, metrics["requests"])
+        self.assertEqual(2, metrics["retries"])
+        self.assertEqual({503: 1, 502: 1}, metrics["retries_by_status"])
+        self.assertEqual({"compute": 2}, metrics["retries_by_service"])
+
+    def test_no_retry_non_idempotent(self, mock_sleep):
+        send = mock.Mock(return_value=_response(503))
+
+        response = self.policy.send("POST", send)
+
+        self.assertEqual(503, response.status_code)
+        self.assertEqual(1, send.call_count)
+
+    def test_retry_throttled_non_idempotent(self, mock_sleep):
+        send = mock.Mock(side_effect=[_response(429), _response(201)])
+
+        self.assertEqual(201, self.policy.send("POST", send).status_code)
+
+    def test_retry_after_seconds(self, mock_sleep):
+        send = mock.Mock(side_effect=[_response(429, {"Retry-After": "7"}),
+                                      _response(200)])
+
+        self.policy.send("GET", send)
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test_retry_after_date(self, mock_sleep):
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        send = mock.Mock(side_effect=[_response(503, {"Retry-After": date}),
+                                      _response(200)])
+
+        self.policy.send("GET", send)
+
+        delay = mock_sleep.call_args[0][0]
+        self.assertTrue(25 < delay <= 30)
+
+    def test_retry_after_too_long(self, mock_sleep):
+        send = mock.Mock(return_value=_response(429, {"Retry-After": "600"}))
+
+        self.assertEqual(429, self.policy.send("GET", send).status_code)
+        self.assertEqual(1, send.call_count)
+        self.assertEqual(1, self.policy.metrics.snapshot()["gave_up"])
+
+    def test_max_retries(self, mock_sleep):
+        send = mock.Mock(return_value=_response(500))
+
+        self.assertEqual(500, self.policy.send("GET", send).status_code)
+        self.assertEqual(3, send.call_count)
+        self.assertEqual(1, self.policy.metrics.snapshot()["gave_up"])
+
+    def test_budget_exhausted(self, mock_sleep):
+        self.policy.budget = retry.RetryBudget(ratio=0, minimum=1)
+        send = mock.Mock(return_value=_response(500))
+
+        self.policy.send("GET", send)
+
+        self.assertEqual(2, send.call_count)
+        self.assertEqual(1,
+                         self.policy.metrics.snapshot()["budget_exhausted"])
+
+    def test_connect_failure(self, mock_sleep):
+        send = mock.Mock(side_effect=[_exceptions.ConnectFailure(),
+                                      _response(200)])
+
+        self.assertEqual(200, self.policy.send("GET", send).status_code)
+        self.assertEqual({None: 1},
+                         self.policy.metrics.snapshot()["retries_by_status"])
+
+        send = mock.Mock(side_effect=_exceptions.ConnectFailure())
+        self.assertRaises(_exceptions.ConnectFailure,
+                          self.policy.send, "POST", send)
+        self.assertEqual(1, send.call_count)
+
+    def test_rewind_body(self, mock_sleep):
+        body = io.BytesIO(b"0123456789")
+        body.seek(2)
+        sent = []
+
+        def send():
+            sent.append(body.read())
+            return _response(503 if len(sent) == 1 else 200)
+
+        self.policy.send("PUT", send, body=body)
+
+        self.assertEqual([b"23456789", b"23456789"], sent)
+
+    def test_stream_body_not_retried(self, mock_sleep):
+        send = mock.Mock(return_value=_response(503))
+
+        self.policy.send("PUT", send, body=iter([b"data"]))
+
+        self.assertEqual(1, send.call_count)
+
+    def test_rate_limit(self, mock_sleep):
+        send = mock.Mock(return_value=_response(200))
+
+        with mock.patch("time.time", return_value=100.0):
+            policy = retry.RetryPolicy(rate_limits={"compute": (1, 1)})
+            policy.send("GET", send, service_type="compute")
+            policy.send("GET", send, service_type="compute")
+            policy.send("GET", send, service_type="network")
+
+        mock_sleep.assert_called_once_with(1.0)
+        metrics = policy.metrics.snapshot()
+        self.assertEqual(1, metrics["throttle_waits"])
+        self.assertEqual(1.0, metrics["throttle_wait_seconds"])
+
+
+@mock.patch("time.sleep")
+class TestSessionRetry(testtools.TestCase):
+
+    def setUp(self):
+        super(TestSessionRetry, self).setUp()
+        self.policy = retry.RetryPolicy(
+            backoff=waiter.Backoff(interval=1, jitter=0))
+        self.sot = session.Session(profile.Profile(),
+                                   retry_policy=self.policy)
+
+    @mock.patch.object(ksa_session.Session, "request")
+    def test_retried(self, mock_request, mock_sleep):
+        mock_request.side_effect = [_response(503), _response(200)]
+        endpoint_filter = {"service_type": "compute"}
+
+        response = self.sot.request("/servers", "GET",
+                                    endpoint_filter=endpoint_filter)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, mock_request.call_count)
+        self.assertFalse(mock_request.call_args[1]["raise_exc"])
+        self.assertEqual({"compute": 1},
+                         self.policy.metrics.snapshot()["retries_by_service"])
+
+    @mock.patch.object(ksa_session.Session, "request")
+    def test_raise_after_retries(self, mock_request, mock_sleep):
+        response = _response(503, {"Content-Type": "application/json"})
+        response._content = b'{"code": "APIGW.0308", "message": "busy"}'
+        mock_request.return_value = response
+
+        self.assertRaises(exceptions.HttpException, self.sot.request,
+                          "http://example.com/servers", "GET")
+        self.assertEqual(4, mock_request.call_count)
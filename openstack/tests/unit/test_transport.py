@@ -0,0 +1,138 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+import time
+
+import mock
+from requests.packages.urllib3 import exceptions as urllib3_exceptions
+from six.moves import BaseHTTPServer
+import testtools
+
+from openstack import aksksession
+from openstack import connection
+from openstack import profile
+from openstack import transport
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport(testtools.TestCase):
+
+    def setUp(self):
+        super(TestTransport, self).setUp()
+        self.server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = "http://127.0.0.1:%d/" % self.server.server_port
+        self.host = "http://127.0.0.1:%d" % self.server.server_port
+
+    def test_sessions_share_connections(self):
+        shared = transport.Transport()
+        self.addCleanup(shared.close)
+        first = shared.new_session()
+        second = shared.new_session()
+
+        for sess in (first, second, first):
+            sess.get(self.url).raise_for_status()
+
+        stats = shared.stats()
+        self.assertEqual(1, stats["created"])
+        self.assertEqual(2, stats["reused"])
+        self.assertEqual(0, stats["in_use"])
+        self.assertEqual(1, stats["idle"])
+        self.assertEqual(stats["created"],
+                         stats["hosts"][self.host]["created"])
+
+    def test_idle_timeout(self):
+        shared = transport.Transport(idle_timeout=10)
+        self.addCleanup(shared.close)
+        sess = shared.new_session()
+
+        sess.get(self.url)
+        with mock.patch.object(time, "time", return_value=time.time() + 11):
+            sess.get(self.url)
+
+        stats = shared.stats()
+        self.assertEqual(1, stats["expired"])
+        self.assertEqual(2, stats["created"])
+        self.assertEqual(0, stats["reused"])
+
+    def test_max_connections(self):
+        shared = transport.Transport(max_connections=1)
+        self.addCleanup(shared.close)
+        pool = shared._adapter.poolmanager.connection_from_url(self.url)
+        conn = pool._get_conn()
+        acquired = threading.Event()
+
+        def other():
+            pool._put_conn(pool._get_conn())
+            acquired.set()
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        self.assertEqual(1, shared.stats()["in_use"])
+
+        pool._put_conn(conn)
+        thread.join()
+        self.assertTrue(acquired.is_set())
+        self.assertEqual(0, shared.stats()["in_use"])
+
+    def test_max_connections_timeout(self):
+        shared = transport.Transport(max_connections=1, pool_timeout=0.05)
+        self.addCleanup(shared.close)
+        pool = shared._adapter.poolmanager.connection_from_url(self.url)
+        conn = pool._get_conn()
+
+        self.assertRaises(urllib3_exceptions.EmptyPoolError,
+                          pool._get_conn)
+        self.assertRaises(urllib3_exceptions.EmptyPoolError,
+                          pool._get_conn, timeout=0.01)
+        self.assertEqual(1, shared.stats()["in_use"])
+
+        pool._put_conn(conn)
+        pool._put_conn(pool._get_conn())
+        self.assertEqual(0, shared.stats()["in_use"])
+
+    def test_connections_share_transport(self):
+        shared = transport.Transport()
+        conns = [connection.Connection(profile=profile.Profile(),
+                                       transport=shared, ak="ak", sk="sk",
+                                       project_id="project", region="region",
+                                       domain="example.com")
+                 for _ in range(2)]
+
+        adapters = set(conn.session.session.get_adapter(self.url)
+                       for conn in conns)
+        self.assertEqual(1, len(adapters))
+
+    def test_construct_session(self):
+        shared = transport.Transport()
+
+        session_obj = aksksession.construct_session(transport=shared)
+
+        self.assertIs(shared._adapter, session_obj.get_adapter(self.url))
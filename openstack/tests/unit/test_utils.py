@@ -12,6 +12,9 @@
 
 import mock
 import sys
+import threading
+import time
+
 import testtools
 
 from openstack import utils
@@ -88,3 +91,70 @@ class Test_urljoin(testtools.TestCase):
 
         result = utils.urljoin(root, *leaves)
         self.assertEqual(result, "http://www.example.com/foo/")
+
+
+class Test_iter_concurrently(testtools.TestCase):
+
+    def test_ordered(self):
+        def slow_square(i):
+            time.sleep(0.01 * (5 - i))
+            return i * i
+
+        results = list(utils.iter_concurrently(slow_square, range(5), 3))
+        self.assertEqual([0, 1, 4, 9, 16], results)
+
+    def test_unordered(self):
+        results = utils.iter_concurrently(lambda i: i, range(10), 4,
+                                          ordered=False)
+        self.assertEqual(list(range(10)), sorted(results))
+
+    def test_bounded(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work(i):
+            with lock:
+                running.append(i)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(i)
+            return i
+
+        list(utils.iter_concurrently(work, range(20), 3))
+        self.assertLessEqual(max(peak), 3)
+
+    def test_exception(self):
+        def fail(i):
+            if i == 2:
+                raise ValueError(i)
+            return i
+
+        results = utils.iter_concurrently(fail, range(5), 2)
+        self.assertEqual(0, next(results))
+        self.assertEqual(1, next(results))
+        self.assertRaises(ValueError, next, results)
+
+    def test_close_cancels_pending(self):
+        calls = []
+        results = utils.iter_concurrently(
+            lambda i: calls.append(i) or time.sleep(0.01), range(100), 2)
+        next(results)
+        results.close()
+        time.sleep(0.1)
+        self.assertLess(len(calls), 10)
+
+    def test_wait_running(self):
+        finished = []
+
+        def work(i):
+            if i == 0:
+                raise ValueError(i)
+            time.sleep(0.05)
+            finished.append(i)
+
+        results = utils.iter_concurrently(work, range(100), 2, wait=True)
+        self.assertRaises(ValueError, next, results)
+        self.assertNotEqual([], finished)
+        self.assertLess(len(finished), 10)
@@ -0,0 +1,160 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import itertools
+
+import mock
+import testtools
+
+from openstack import exceptions
+from openstack import resource2
+from openstack import service_filter
+from openstack import session
+from openstack import waiter
+
+
+class TestBackoff(testtools.TestCase):
+
+    def test_exponential(self):
+        backoff = waiter.Backoff(interval=1, max_interval=10, jitter=0)
+
+        self.assertEqual([1, 2, 4, 8, 10, 10],
+                         list(itertools.islice(backoff.delays(), 6)))
+
+    def test_jitter(self):
+        backoff = waiter.Backoff(interval=10, max_interval=10, jitter=0.5)
+
+        for delay in itertools.islice(backoff.delays(), 50):
+            self.assertTrue(5 <= delay <= 15)
+
+    def test_fixed(self):
+        backoff = waiter.Backoff.fixed(3)
+
+        self.assertEqual([3, 3, 3], list(itertools.islice(backoff.delays(), 3)))
+
+
+class _Resource(resource2.Resource):
+    service = service_filter.ServiceFilter(service_type="service")
+    base_path = "/things"
+    resources_key = "things"
+    allow_get = True
+    allow_list = True
+
+    status = resource2.Body("status")
+
+
+class _Listable(_Resource):
+    _query_mapping = resource2.QueryParameters("id")
+    id_filter = "id"
+
+
+@mock.patch("time.sleep", return_value=None)
+class TestWaitForStatuses(testtools.TestCase):
+
+    def setUp(self):
+        super(TestWaitForStatuses, self).setUp()
+        self.session = mock.Mock(spec=session.Session)
+        self.session.profile = mock.Mock()
+        self.session.profile.get_filter.return_value = _Resource.service
+
+    def test_single_gets(self, mock_sleep):
+        statuses = {"a": ["BUILD", "ACTIVE"], "b": ["ACTIVE"],
+                    "c": ["BUILD", "ERROR"]}
+
+        def get(self, sess):
+            self._body.attributes["status"] = statuses[self.id].pop(0)
+            return self
+
+        resources = [_Resource.existing(id=id, status="BUILD")
+                     for id in ("a", "b", "c")]
+        with mock.patch.object(_Resource, "get", autospec=True,
+                               side_effect=get):
+            results = list(waiter.wait_for_statuses(
+                self.session, resources, "ACTIVE", failures=["ERROR"],
+                backoff=waiter.Backoff(interval=1, jitter=0)))
+
+        self.assertEqual(["b", "a", "c"], [r.id for r, _ in results])
+        self.assertIsNone(results[0][1])
+        self.assertIsNone(results[1][1])
+        self.assertIsInstance(results[2][1], exceptions.ResourceFailure)
+        mock_sleep.assert_called_once_with(1)
+
+    def test_already_in_status(self, mock_sleep):
+        resource = _Resource.existing(id="a", status="ACTIVE")
+
+        results = list(waiter.wait_for_statuses(self.session, [resource],
+                                                "ACTIVE"))
+
+        self.assertEqual([(resource, None)], results)
+        self.session.get.assert_not_called()
+
+    def test_batched_list(self, mock_sleep):
+        pages = [{"things": [{"id": "a", "status": "BUILD"},
+                             {"id": "b", "status": "ACTIVE"}]},
+                 {"things": [{"id": "a", "status": "ACTIVE"}]}]
+        responses = []
+        for page in pages:
+            response = mock.Mock()
+            response.json.return_value = page
+            responses.append(response)
+        self.session.get.side_effect = responses
+
+        resources = [_Listable.existing(id=id, status="BUILD")
+                     for id in ("a", "b")]
+        results = list(waiter.wait_for_statuses(self.session, resources,
+                                                "ACTIVE"))
+
+        self.assertEqual([(resources[1], None), (resources[0], None)],
+                         results)
+        self.assertEqual("ACTIVE", resources[0].status)
+        self.assertEqual(2, self.session.get.call_count)
+        self.assertEqual({"id": ["a", "b"]},
+                         self.session.get.call_args_list[0][1]["params"])
+        self.assertEqual({"id": ["a"]},
+                         self.session.get.call_args_list[1][1]["params"])
+
+    def test_timeout(self, mock_sleep):
+        resource = _Resource.existing(id="a", status="BUILD")
+
+        with mock.patch.object(_Resource, "get", autospec=True):
+            results = list(waiter.wait_for_statuses(
+                self.session, [resource], "ACTIVE", wait=10,
+                backoff=waiter.Backoff(interval=4, jitter=0)))
+
+        self.assertEqual(1, len(results))
+        self.assertIsInstance(results[0][1], exceptions.ResourceTimeout)
+        self.assertEqual([mock.call(4), mock.call(6)],
+                         mock_sleep.call_args_list)
+
+
+@mock.patch("time.sleep", return_value=None)
+class TestWaitForDeletes(testtools.TestCase):
+
+    def test_deleted(self, mock_sleep):
+        remaining = {"a": 1, "b": 0}
+
+        def get(self, sess):
+            if remaining[self.id] == 0:
+                raise exceptions.NotFoundException()
+            remaining[self.id] -= 1
+            return self
+
+        resources = [_Resource.existing(id=id) for id in ("a", "b")]
+        with mock.patch.object(_Resource, "get", autospec=True,
+                               side_effect=get):
+            results = list(waiter.wait_for_deletes(
+                mock.Mock(), resources,
+                backoff=waiter.Backoff(interval=1, jitter=0)))
+
+        self.assertEqual([(resources[1], None), (resources[0], None)],
+                         results)
+        self.assertEqual(1, mock_sleep.call_count)
@@ -4,6 +4,8 @@ import logging
 import functools
 from keystoneauth1 import session as _session
 from openstack.identity import identity_service
+from openstack import instrumentation
+from openstack import jsonutils
 from keystoneauth1 import exceptions
 from six.moves import urllib
 from openstack.session import map_exceptions
@@ -34,6 +36,15 @@ class TokenSession(_session.Session):
                            is used, which contains the openstacksdk version
                            When a non-None value is passed, it will be
                            prepended to the default.
+        :param retry_policy: The :class:`~openstack.retry.RetryPolicy`
+                             retrying and rate limiting the requests, none
+                             are retried by default.
+        :param hooks: The :class:`~openstack.instrumentation.Hooks` called
+                      at every stage of the requests.
+        :param json_codec: The :class:`~openstack.jsonutils.Codec`, or its
+                           name, encoding the request bodies and decoding
+                           the response bodies. The fastest one installed
+                           by default.
         :type profile: :class:`~openstack.profile.Profile`
         """
         if user_agent is not None:
@@ -42,6 +53,11 @@ class TokenSession(_session.Session):
             self.user_agent = DEFAULT_USER_AGENT
 
         self.profile = profile
+        self.retry_policy = kwargs.pop("retry_policy", None)
+        self.hooks = kwargs.pop("hooks", None)
+        if self.hooks is None:
+            self.hooks = instrumentation.Hooks()
+        self.json_codec = jsonutils.get_codec(kwargs.pop("json_codec", None))
 
         for arg in ['auth_url', 'auth_token']:
             if kwargs.get(arg) is None:
@@ -56,6 +72,7 @@ class TokenSession(_session.Session):
         super(TokenSession, self).__init__(user_agent=self.user_agent,
                                            additional_headers=api_version_header,
                                            **kwargs)
+        self._json = self.json_codec
 
     def _get_api_requests(self):
         """Get API micro-version requests.
@@ -69,10 +86,7 @@ class TokenSession(_session.Session):
         if self.profile is None:
             return None
 
-        req = []
-        for svc in self.profile.get_services():
-            if svc.service_type and svc.api_version:
-                req.append(" ".join([svc.service_type, svc.api_version]))
+        req = [" ".join(item) for item in self.profile.get_api_versions()]
         if req:
             return {API_REQUEST_HEADER: ",".join(req)}
 
@@ -133,13 +147,19 @@ class TokenSession(_session.Session):
                     break
         return kvendpoints
 
-    @map_exceptions
-    def request(self, url, method, json=None, original_ip=None,
-                user_agent=None, redirect=None, endpoint_filter=None,
-                raise_exc=True, log=True, microversion=None,
-                endpoint_override=None, connect_retries=0,
-                allow=None, client_name=None, client_version=None,
-                **kwargs):
+    def _build_request(self, url, method, json=None, user_agent=None,
+                       endpoint_filter=None, endpoint_override=None,
+                       client_name=None, client_version=None, trace=None,
+                       **kwargs):
+        """Resolve the url of a request and build its headers and body
+
+        :param trace: The :class:`~openstack.instrumentation.RequestTrace`
+                      recording the endpoint and building durations.
+        :return: A tuple of the absolute url and the keyword arguments of the
+                 transport, holding the headers and the encoded data.
+        """
+        if trace is not None:
+            started = trace.start()
         self._determined_user_agent = None
         headers = kwargs.setdefault('headers', dict())
         auth_headers = self.get_auth_headers()
@@ -158,6 +178,11 @@ class TokenSession(_session.Session):
             if not urllib.parse.urlparse(base_url).netloc:
                 raise exceptions.EndpointNotFound()
             url = '%s/%s' % (base_url.rstrip('/'), url.lstrip('/'))
+        if trace is not None:
+            trace.url = url
+            trace.record("endpoint", started)
+            trace.fire(instrumentation.ENDPOINT_RESOLVED)
+            started = trace.start()
         headers.setdefault("Host", urllib.parse.urlparse(url).netloc)
         if self.cert:
             kwargs.setdefault('cert', self.cert)
@@ -207,6 +232,30 @@ class TokenSession(_session.Session):
                 headers.setdefault(k, v)
 
         kwargs.setdefault('verify', self.verify)
+        if trace is not None:
+            trace.bytes_out = instrumentation.payload_size(kwargs.get('data'))
+            trace.record("sign", started)
+            trace.fire(instrumentation.SIGNED)
+        return url, kwargs
+
+    @map_exceptions
+    def request(self, url, method, json=None, original_ip=None,
+                user_agent=None, redirect=None, endpoint_filter=None,
+                raise_exc=True, log=True, microversion=None,
+                endpoint_override=None, connect_retries=0,
+                allow=None, client_name=None, client_version=None,
+                **kwargs):
+        trace = self.hooks.start(endpoint_filter and endpoint_filter.get('service_type'),
+                                 method, url) if self.hooks else None
+        url, kwargs = self._build_request(url, method, json=json,
+                                          user_agent=user_agent,
+                                          endpoint_filter=endpoint_filter,
+                                          endpoint_override=endpoint_override,
+                                          client_name=client_name,
+                                          client_version=client_version,
+                                          trace=trace,
+                                          **kwargs)
+        headers = kwargs['headers']
 
         # if requests_auth:
         #     kwargs['auth'] = requests_auth
@@ -234,7 +283,22 @@ class TokenSession(_session.Session):
                                  url, method, redirect, log, _logger,
                                  connect_retries)
 
-        resp = send(**kwargs)
+        if trace is not None:
+            trace.fire(instrumentation.SENT)
+            started = trace.start()
+        if self.retry_policy is None:
+            resp = send(**kwargs)
+        else:
+            resp = self.retry_policy.send(
+                method, functools.partial(send, **kwargs),
+                service_type=endpoint_filter and endpoint_filter.get('service_type'),
+                body=kwargs.get('data'))
+        if trace is not None:
+            trace.record("send", started)
+            trace.durations["first_byte"] = resp.elapsed.total_seconds()
+            trace.attach(resp)
+            trace.fire(instrumentation.FIRST_BYTE)
+        self.json_codec.bind(resp)
 
         # log callee and caller request-id for each api call
         if log:
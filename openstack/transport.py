@@ -0,0 +1,252 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+HTTP connection pooling shared by sessions.
+
+A :class:`Transport` owns one set of connection pools. Every session built
+with it, whatever its kind and its :class:`~openstack.connection.Connection`,
+reuses the same sockets::
+
+    from openstack import connection
+    from openstack import transport
+
+    shared = transport.Transport(pool_size=50, max_connections=200,
+                                 idle_timeout=30)
+    conns = [connection.Connection(transport=shared, **auth) for auth in auths]
+    ...
+    print(shared.stats())
+
+With ``max_connections``, a response requested with ``stream=True`` keeps
+its connection until its content is read or it is closed, close such
+responses, e.g. with a ``with`` block, so that their connections are
+released.
+"""
+
+import collections
+import threading
+import time
+import weakref
+
+import requests
+from keystoneauth1.session import TCPKeepAliveAdapter
+from requests.packages.urllib3 import connectionpool
+from requests.packages.urllib3 import exceptions as urllib3_exceptions
+
+
+class _Slots(object):
+    """Counting semaphore whose acquisition can time out on Python 2"""
+
+    def __init__(self, size):
+        self._free = size
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while self._free <= 0:
+                if deadline is None:
+                    self._cond.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._free -= 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self._free += 1
+            self._cond.notify()
+
+
+class _TrackedPoolMixin(object):
+    """Connection pool counting its connections for a Transport"""
+
+    #: The Transport owning the pools, set on the generated subclasses.
+    transport = None
+
+    def __init__(self, *args, **kwargs):
+        super(_TrackedPoolMixin, self).__init__(*args, **kwargs)
+        self.transport._register(self)
+
+    def _new_conn(self):
+        conn = super(_TrackedPoolMixin, self)._new_conn()
+        conn._sdk_new = True
+        self.transport._count(self, "created")
+        return conn
+
+    def _get_conn(self, timeout=None):
+        transport = self.transport
+        if transport._slots is not None:
+            if timeout is None:
+                timeout = transport.pool_timeout
+            if not transport._slots.acquire(timeout):
+                raise urllib3_exceptions.EmptyPoolError(
+                    self, "The transport reached max_connections and no "
+                          "connection was released in time.")
+        try:
+            conn = super(_TrackedPoolMixin, self)._get_conn(timeout=timeout)
+        except Exception:
+            if transport._slots is not None:
+                transport._slots.release()
+            raise
+
+        if getattr(conn, "_sdk_new", False):
+            conn._sdk_new = False
+        elif transport._expired(conn):
+            # The socket is reopened on the next request.
+            conn.close()
+            transport._count(self, "expired")
+            transport._count(self, "created")
+        else:
+            transport._count(self, "reused")
+        transport._count(self, "in_use")
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._sdk_idle_since = time.time()
+        transport = self.transport
+        transport._count(self, "in_use", -1)
+        try:
+            super(_TrackedPoolMixin, self)._put_conn(conn)
+        finally:
+            if transport._slots is not None:
+                transport._slots.release()
+
+    def _idle(self):
+        with self.pool.mutex:
+            return len([conn for conn in self.pool.queue if conn is not None])
+
+
+class _PooledAdapter(TCPKeepAliveAdapter):
+    """Keep-alive adapter whose pools are tracked by a Transport"""
+
+    def __init__(self, transport):
+        self._transport = transport
+        super(_PooledAdapter, self).__init__(
+            pool_connections=transport.max_hosts,
+            pool_maxsize=transport.pool_size,
+            pool_block=transport.pool_block)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(_PooledAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._transport._pool_classes
+
+
+class Transport(object):
+    """Connection pools and their settings, shareable between sessions"""
+
+    def __init__(self, pool_size=10, max_hosts=10, max_connections=None,
+                 idle_timeout=None, pool_block=False, pool_timeout=60):
+        """
+        :param int pool_size: Maximum number of idle connections kept per
+                              host.
+        :param int max_hosts: Number of hosts whose pool is kept.
+        :param int max_connections: Maximum number of connections in use at
+                                    the same time across all hosts; further
+                                    requests wait for a free connection.
+                                    ``None`` means no limit. A streamed
+                                    response holds its connection until
+                                    it is read or closed, so streamed
+                                    responses must be closed.
+        :param float idle_timeout: Seconds after which an idle connection is
+                                   closed instead of being reused. ``None``
+                                   keeps idle connections open.
+        :param bool pool_block: When ``True``, a host never has more than
+                                ``pool_size`` connections open, requests
+                                wait for a free one instead.
+        :param float pool_timeout: Seconds a request waits for a free
+                                   connection once ``max_connections`` are
+                                   in use before
+                                   :class:`urllib3.exceptions.EmptyPoolError`
+                                   is raised. ``None`` waits without limit.
+        """
+        self.pool_size = pool_size
+        self.max_hosts = max_hosts
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.pool_block = pool_block
+        self.pool_timeout = pool_timeout
+        self._slots = _Slots(max_connections) if max_connections else None
+        self._lock = threading.Lock()
+        self._counters = collections.defaultdict(collections.Counter)
+        self._pools = weakref.WeakSet()
+        self._pool_classes = {
+            "http": type("HTTPConnectionPool",
+                         (_TrackedPoolMixin, connectionpool.HTTPConnectionPool),
+                         {"transport": self}),
+            "https": type("HTTPSConnectionPool",
+                          (_TrackedPoolMixin,
+                           connectionpool.HTTPSConnectionPool),
+                          {"transport": self}),
+        }
+        self._adapter = _PooledAdapter(self)
+
+    def mount(self, session_obj):
+        """Make a :class:`requests.Session` use the pools of this transport
+
+        :param session_obj: The :class:`requests.Session` to configure.
+        :return: ``session_obj``
+        """
+        for scheme in ("http://", "https://"):
+            session_obj.mount(scheme, self._adapter)
+        return session_obj
+
+    def new_session(self):
+        """Return a new :class:`requests.Session` using this transport"""
+        return self.mount(requests.Session())
+
+    def close(self):
+        """Close all the pooled connections"""
+        self._adapter.close()
+
+    def stats(self):
+        """Return the statistics of the pools
+
+        :return: A dict with the ``in_use``, ``idle``, ``created``,
+                 ``reused`` and ``expired`` connection counts over all
+                 hosts, and the same counts per ``scheme://host:port``
+                 under ``hosts``.
+        """
+        keys = ("in_use", "idle", "created", "reused", "expired")
+        with self._lock:
+            hosts = dict((host, dict((key, counter[key]) for key in keys))
+                         for host, counter in self._counters.items())
+        for pool in list(self._pools):
+            host = self._host(pool)
+            hosts.setdefault(host, dict((key, 0) for key in keys))
+            hosts[host]["idle"] += pool._idle()
+        total = dict((key, sum(host[key] for host in hosts.values()))
+                     for key in keys)
+        total["hosts"] = hosts
+        return total
+
+    @staticmethod
+    def _host(pool):
+        return "%s://%s:%s" % (pool.scheme, pool.host, pool.port)
+
+    def _register(self, pool):
+        self._pools.add(pool)
+
+    def _count(self, pool, key, value=1):
+        with self._lock:
+            self._counters[self._host(pool)][key] += value
+
+    def _expired(self, conn):
+        idle_since = getattr(conn, "_sdk_idle_since", None)
+        return (self.idle_timeout is not None and idle_since is not None and
+                time.time() - idle_since > self.idle_timeout)
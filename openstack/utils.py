@@ -27,6 +27,8 @@
 #         the License.
 
 import base64
+import collections
+from concurrent import futures
 import functools
 import logging
 import time
@@ -130,3 +132,49 @@ def b64encode(source):
         source = source.encode('utf-8')
     content = base64.b64encode(source).decode('utf-8')
     return content
+
+
+def iter_concurrently(func, items, concurrency, ordered=True, wait=False):
+    """Call ``func`` on every item from a bounded pool of threads.
+
+    At most ``concurrency`` calls run at the same time and at most
+    ``concurrency`` finished results wait for the caller, so that memory
+    stays bounded whatever the number of items. Closing the generator
+    cancels the calls which have not started yet.
+
+    :param func: A callable taking one item.
+    :param items: An iterable of items, consumed as results are yielded.
+    :param int concurrency: The number of worker threads.
+    :param bool ordered: Yield results in the order of ``items`` when
+                         ``True``, or as soon as they complete otherwise.
+    :param bool wait: Wait for the calls already running when the generator
+                      is closed or an exception is raised, e.g. to clean up
+                      after them.
+
+    :return: A generator of the results of ``func``. An exception raised
+             by ``func`` is raised when its result is reached.
+    """
+    concurrency = max(int(concurrency), 1)
+    executor = futures.ThreadPoolExecutor(max_workers=concurrency)
+    pending = collections.deque()
+    items = iter(items)
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            while len(pending) >= concurrency * 2:
+                yield _pop_result(pending, ordered)
+        while pending:
+            yield _pop_result(pending, ordered)
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=wait)
+
+
+def _pop_result(pending, ordered):
+    if ordered:
+        return pending.popleft().result()
+    done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+    future = next(iter(done))
+    pending.remove(future)
+    return future.result()
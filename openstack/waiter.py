@@ -0,0 +1,209 @@
+# -*- coding:utf-8 -*-
+# Copyright 2018 Huawei Technologies Co.,Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License.  You may obtain a copy of the
+# License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations under the License.
+
+"""
+Waiters polling many resources until they reach a status or are deleted.
+
+Every round checks all the pending resources at once: resource classes with
+an :attr:`~openstack.resource2.Resource.id_filter` are refreshed by one list
+call per batch of ids, the others by concurrent GETs. Rounds are spaced out
+by a :class:`Backoff` and the outcome of every resource is yielded as soon
+as it is known::
+
+    servers = [conn.compute.create_server(**attrs) for attrs in specs]
+    for server, error in conn.compute.wait_for_servers(servers):
+        if error is not None:
+            print("%s failed: %s" % (server.id, error))
+"""
+
+import collections
+import random
+import time
+
+from openstack import exceptions
+from openstack import utils
+
+#: Maximum number of ids sent in one filtered list call.
+ID_FILTER_BATCH_SIZE = 50
+
+
+class Backoff(object):
+    """Exponentially growing delays between two polls, with jitter"""
+
+    def __init__(self, interval=2, max_interval=30, factor=2, jitter=0.1):
+        """
+        :param interval: seconds to wait before the first new poll
+        :param max_interval: upper bound of the delay between two polls
+        :param factor: multiplier applied to the delay after every poll
+        :param jitter: fraction of every delay randomly added or removed so
+                       that concurrent waiters do not poll in lockstep
+        """
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.factor = factor
+        self.jitter = jitter
+
+    @classmethod
+    def fixed(cls, interval):
+        """Return a backoff always waiting ``interval`` seconds"""
+        return cls(interval, interval, factor=1, jitter=0)
+
+    def delays(self):
+        """Generate the successive delays, forever"""
+        delay = self.interval
+        while True:
+            if self.jitter:
+                yield delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            else:
+                yield delay
+            delay = min(delay * self.factor, self.max_interval)
+
+
+def wait_for_statuses(session, resources, status, failures=None, wait=120,
+                      backoff=None, concurrency=10):
+    """Wait for many resources to be in a particular status.
+
+    :param session: The session to use for making the requests.
+    :type session: :class:`~openstack.session.Session`
+    :param resources: The resources to wait on. They must have a status
+                      attribute.
+    :param status: Desired status of the resources.
+    :param list failures: Statuses that would indicate the transition
+                          failed such as 'ERROR'.
+    :param wait: Maximum number of seconds to wait for the transitions.
+    :param backoff: The :class:`Backoff` spacing the rounds of polls.
+    :param concurrency: The number of GETs sent at the same time for
+                        resources which cannot be listed by id.
+
+    :return: A generator of ``(resource, error)`` tuples in order of
+             completion. ``error`` is None on success, a
+             :class:`~openstack.exceptions.ResourceFailure` when the resource
+             reached a failure status or disappeared, and a
+             :class:`~openstack.exceptions.ResourceTimeout` when ``wait``
+             elapsed.
+    """
+    failures = failures or []
+
+    def check(resource, found):
+        if not found:
+            raise exceptions.ResourceFailure(
+                "Resource %s no longer exists" % resource.id)
+        if resource.status == status:
+            return True
+        if resource.status in failures:
+            raise exceptions.ResourceFailure(
+                "Resource %s transitioned to failure state %s" %
+                (resource.id, resource.status))
+        return False
+
+    # Resources already in the desired status need no request at all.
+    pending = []
+    for resource in resources:
+        if resource.status == status:
+            yield resource, None
+        else:
+            pending.append(resource)
+
+    msg = "Timeout waiting for %%s to transition to %s" % status
+    for result in _wait(session, pending, check, msg, wait, backoff,
+                        concurrency):
+        yield result
+
+
+def wait_for_deletes(session, resources, wait=120, backoff=None,
+                     concurrency=10):
+    """Wait for many resources to be deleted.
+
+    :param session: The session to use for making the requests.
+    :type session: :class:`~openstack.session.Session`
+    :param resources: The resources to wait on to be deleted.
+    :param wait: Maximum number of seconds to wait for the deletes.
+    :param backoff: The :class:`Backoff` spacing the rounds of polls.
+    :param concurrency: The number of GETs sent at the same time for
+                        resources which cannot be listed by id.
+
+    :return: A generator of ``(resource, error)`` tuples in order of
+             completion, see :func:`wait_for_statuses`.
+    """
+    def check(resource, found):
+        return not found
+
+    msg = "Timeout waiting for %s delete"
+    for result in _wait(session, list(resources), check, msg, wait, backoff,
+                        concurrency):
+        yield result
+
+
+def _wait(session, pending, check, timeout_msg, wait, backoff, concurrency):
+    delays = (backoff or Backoff()).delays()
+    total_sleep = 0
+    while pending:
+        remaining = []
+        for resource, found in _poll(session, pending, concurrency):
+            try:
+                done = check(resource, found)
+            except exceptions.ResourceFailure as e:
+                yield resource, e
+                continue
+            if done:
+                yield resource, None
+            else:
+                remaining.append(resource)
+        pending = remaining
+        if not pending or total_sleep >= wait:
+            break
+        delay = min(next(delays), wait - total_sleep)
+        time.sleep(delay)
+        total_sleep += delay
+
+    for resource in pending:
+        yield resource, exceptions.ResourceTimeout(timeout_msg % resource.id)
+
+
+def _poll(session, resources, concurrency):
+    """Refresh the resources, yielding whether each one still exists"""
+    groups = collections.OrderedDict()
+    singles = []
+    for resource in resources:
+        cls = type(resource)
+        if getattr(cls, "id_filter", None) and resource.id is not None:
+            key = (cls, tuple(sorted(resource._uri.attributes.items())))
+            groups.setdefault(key, []).append(resource)
+        else:
+            singles.append(resource)
+
+    for (cls, uri), group in groups.items():
+        for start in range(0, len(group), ID_FILTER_BATCH_SIZE):
+            batch = group[start:start + ID_FILTER_BATCH_SIZE]
+            params = dict(uri)
+            params[cls.id_filter] = [resource.id for resource in batch]
+            listed = dict((item.id, item) for item in
+                          cls.list(session, paginated=False, **params))
+            for resource in batch:
+                item = listed.get(resource.id)
+                if item is not None:
+                    resource._body.attributes.update(item._body.attributes)
+                    resource._body.clean()
+                yield resource, item is not None
+
+    def get(resource):
+        try:
+            resource.get(session)
+        except exceptions.NotFoundException:
+            return False
+        return True
+
+    results = utils.iter_concurrently(get, singles, concurrency)
+    for resource, found in zip(singles, results):
+        yield resource, found